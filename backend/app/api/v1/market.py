@@ -1,38 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
+from typing import List, Dict, Optional
 from ...services.upbit_service import UpbitService
+from ...services.scanner import MarketScanner
+from ...services.resample import normalize_timeframe
 from ...core.deps import get_upbit_service
+from ...core.encoding import candle_response
 
 router = APIRouter()
 
 @router.get("/daily-candles/{market}")
 async def get_daily_candles(
+    request: Request,
     market: str,
     count: int = 21,
+    since: Optional[int] = Query(None, description="이 시각(UTC ms) 이후에 시작한 봉만 반환 (이미 받은 마감 봉 제외)"),
     upbit_service: UpbitService = Depends(get_upbit_service)
-) -> List[Dict]:
+) -> Response:
     """
     특정 마켓의 최근 일봉 데이터를 가져옵니다.
+    Accept 헤더로 columnar JSON/packed 이진 형식을 고를 수 있고, ETag(If-None-Match)를 지원합니다.
     Args:
         market: 마켓 코드 (예: KRW-BTC)
         count: 가져올 캔들 개수 (기본값: 21)
     Returns:
-        List[Dict]: 일봉 데이터 리스트
+        List[Dict]: 일봉 데이터 리스트 (기본 형식)
     """
     try:
-        candles = await upbit_service.get_daily_candles(market, count)
-        return candles
+        frame = await upbit_service.get_daily_frame(market, count)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return candle_response(request, frame.since(since) if since is not None else frame)
 
 @router.get("/volatility/{market}")
 async def get_volatility(
+    request: Request,
     market: str,
     window: int = 20,
     upbit_service: UpbitService = Depends(get_upbit_service)
-) -> Dict:
+) -> Response:
     """
     특정 마켓의 일별 종가 데이터 기반 변동성을 계산합니다.
+    columnar/packed 형식에서는 data 리스트 대신 timestamp/close 컬럼과 volatility 값을 돌려줍니다.
     Args:
         market: 마켓 코드 (예: KRW-BTC)
         window: 변동성 계산에 사용할 기간 (기본값: 20)
@@ -43,28 +52,105 @@ async def get_volatility(
         }
     """
     try:
-        result = await upbit_service.calculate_volatility(market, window)
-        return result
+        frame = await upbit_service.get_daily_frame(market, window + 1)
+        volatility = UpbitService.frame_volatility(frame)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return candle_response(
+        request,
+        frame,
+        columns=('timestamp', 'close'),
+        extra={'volatility': volatility},
+        records=lambda: UpbitService.volatility_result(frame),
+    )
 
 @router.get("/candles")
 async def get_candles(
-    unit: str = Query(..., description="봉 타입 (days, minutes, etc)"),
+    request: Request,
+    unit: str = Query(..., description="봉 타입 (days, minutes) 또는 타임프레임 (5m, 15m, 1h, 2h, 4h, 1d 등, Upbit에 없는 단위는 리샘플링)"),
     market_code: str = Query(..., description="마켓 코드 (예: KRW-BTC)"),
     count: int = Query(50, description="가져올 캔들 개수"),
+    minute_unit: int = Query(1, description="분봉 단위 (1, 3, 5, 10, 15, 30, 60, 240)"),
+    since: Optional[int] = Query(None, description="이 시각(UTC ms) 이후에 시작한 봉만 반환 (이미 받은 마감 봉 제외)"),
     upbit_service: UpbitService = Depends(get_upbit_service)
-):
+) -> Response:
     """
     다양한 봉 타입(일봉, 분봉 등)과 마켓코드, 개수로 캔들 데이터 조회
+    Accept 헤더로 columnar JSON/packed 이진 형식을 고를 수 있고, ETag(If-None-Match)를 지원합니다.
     """
+    if unit not in ("days", "minutes"):
+        try:
+            normalize_timeframe(unit)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="지원하지 않는 unit입니다.")
     try:
         if unit == "days":
-            candles = await upbit_service.get_daily_candles(market_code, count)
-        # elif unit == "minutes":
-        #     candles = await upbit_service.get_minute_candles(market_code, count)
+            frame = await upbit_service.get_frame(market_code, "days", count)
+        elif unit == "minutes":
+            frame = await upbit_service.get_frame(market_code, f"minutes/{minute_unit}", count)
         else:
-            raise HTTPException(status_code=400, detail="지원하지 않는 unit입니다.")
-        return candles
+            frame = await upbit_service.get_timeframe(market_code, unit, count)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+    return candle_response(request, frame.since(since) if since is not None else frame)
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    upbit_service: UpbitService = Depends(get_upbit_service)
+) -> Dict:
+    """
+    캔들 캐시의 hit/miss/eviction 통계를 조회합니다.
+    """
+    return upbit_service.candle_cache.stats()
+
+@router.get("/scan")
+async def scan_markets(
+    quote: str = Query("KRW", description="호가 통화 (KRW, BTC, USDT)"),
+    signal: Optional[str] = Query(None, description="신호 필터 (breakout, breakdown, overbought, oversold, uptrend, downtrend)"),
+    sort: str = Query("change", description="정렬 기준 (change, value, breakout_distance, breakdown_distance, extension, trend)"),
+    order: str = Query("desc", description="정렬 방향 (asc, desc)"),
+    n_days: int = Query(20, ge=1, description="돌파 채널/평균 변동폭 기간"),
+    k_value: float = Query(2.2, description="역추세 진입 배수"),
+    short_period: int = Query(20, ge=1, description="단기 이동평균 기간"),
+    long_period: int = Query(50, ge=1, description="장기 이동평균 기간"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    upbit_service: UpbitService = Depends(get_upbit_service)
+) -> Dict:
+    """
+    전체 마켓에 돌파/역추세/추세 규칙을 한 번에 적용하고 순위를 매겨 페이지 단위로 반환합니다.
+    """
+    try:
+        scanner = MarketScanner(upbit_service)
+        return await scanner.scan_page(
+            quote, n_days, k_value, short_period, long_period,
+            signal=signal, sort=sort, descending=(order != "asc"), offset=offset, limit=limit,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/pairs")
+async def screen_pairs(
+    quote: str = Query("KRW", description="호가 통화 (KRW, BTC, USDT)"),
+    lookback: int = Query(120, ge=10, le=1000, description="검정에 사용할 마감 일봉 개수"),
+    significance: float = Query(0.05, description="유의수준 (0.01, 0.05, 0.1)"),
+    min_correlation: float = Query(0.0, ge=-1, le=1, description="최소 일간 수익률 상관계수"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    upbit_service: UpbitService = Depends(get_upbit_service)
+) -> Dict:
+    """
+    전체 마켓 페어에 Engle-Granger 공적분 검정을 적용하고 통계량이 강한 순으로 페이지 단위로 반환합니다.
+    """
+    try:
+        scanner = MarketScanner(upbit_service)
+        pairs = await scanner.screen_pairs(quote, lookback, significance, min_correlation)
+        return {
+            "total": len(pairs),
+            "offset": offset,
+            "limit": limit,
+            "items": pairs[offset:offset + limit],
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
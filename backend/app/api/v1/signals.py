@@ -0,0 +1,136 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional
+import asyncio
+import json
+from ...services.signal_hub import SignalHub
+from ...core.deps import get_signal_hub
+
+router = APIRouter()
+
+# 프록시가 유휴 연결을 끊지 않도록 보내는 SSE 주석 간격 (초)
+HEARTBEAT_INTERVAL = 15
+
+
+def _parse_parameters(parameters: str) -> Dict:
+    try:
+        value = json.loads(parameters)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"parameters must be a JSON object: {e}")
+    if not isinstance(value, dict):
+        raise HTTPException(status_code=400, detail="parameters must be a JSON object")
+    return value
+
+
+def _parse_types(types: Optional[str]) -> Optional[List[str]]:
+    return [t for t in types.split(",") if t] if types else None
+
+
+@router.get("")
+async def get_signals(
+    strategy: str = Query(..., description="전략 이름 (moving_average, counter_trend)"),
+    market: str = Query(..., description="마켓 코드 (예: KRW-BTC)"),
+    parameters: str = Query("{}", description="전략 파라미터 (JSON)"),
+    hub: SignalHub = Depends(get_signal_hub)
+) -> Dict:
+    """
+    캐시된 신호와 차트 계열(캔들 + 지표 + 봉별 신호)을 반환합니다. 같은 조합은 봉마다 한 번만 계산합니다.
+    """
+    try:
+        return await hub.get(strategy, _parse_parameters(parameters), market)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/stream")
+async def stream_signals(
+    strategy: str = Query(..., description="전략 이름 (moving_average, counter_trend)"),
+    market: List[str] = Query(..., description="마켓 코드 (여러 번 지정 가능)"),
+    parameters: str = Query("{}", description="전략 파라미터 (JSON)"),
+    types: Optional[str] = Query(None, description="받을 메시지 종류 (tick,signal,bar). snapshot은 항상 받습니다."),
+    hub: SignalHub = Depends(get_signal_hub)
+):
+    """
+    Server-Sent Events로 구독한 마켓들의 snapshot과 이후 변경분을 밀어 줍니다.
+    이벤트 이름은 메시지 종류(snapshot/tick/signal/bar)이고 data는 JSON입니다.
+    """
+    options = _parse_parameters(parameters)
+    try:
+        client = hub.connect(_parse_types(types))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        for code in dict.fromkeys(market):
+            await hub.subscribe(client, strategy, options, code)
+    except ValueError as e:
+        client.close()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events():
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(client.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield message.sse
+        finally:
+            client.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def signals_websocket(websocket: WebSocket, hub: SignalHub = Depends(get_signal_hub)):
+    """
+    WebSocket으로 구독을 주고받습니다. 연결 URL의 ?types=tick,signal로 메시지 종류를 거를 수 있습니다.
+    요청: {"action": "subscribe", "strategy": ..., "market": ..., "parameters": {...}}
+          {"action": "unsubscribe", "key": ...}
+    응답: {"type": "subscribed", "key": ...} / {"type": "error", "message": ...} 와 허브 메시지
+    """
+    await websocket.accept()
+    try:
+        client = hub.connect(_parse_types(websocket.query_params.get("types")))
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close()
+        return
+
+    async def send_messages():
+        async for message in client:
+            await websocket.send_text(message.data)
+
+    sender = asyncio.create_task(send_messages())
+    try:
+        while True:
+            request = await websocket.receive_json()
+            action = request.get("action")
+            try:
+                if action == "subscribe":
+                    key = await hub.subscribe(
+                        client, request["strategy"], request.get("parameters") or {}, request["market"]
+                    )
+                    await websocket.send_json({"type": "subscribed", "key": key})
+                elif action == "unsubscribe":
+                    hub.unsubscribe(client, request["key"])
+                    await websocket.send_json({"type": "unsubscribed", "key": request["key"]})
+                else:
+                    raise ValueError(f"Unknown action: {action}")
+            except (KeyError, ValueError) as e:
+                await websocket.send_json({"type": "error", "message": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        client.close()
+
+
+@router.get("/stats")
+async def get_signal_stats(hub: SignalHub = Depends(get_signal_hub)) -> Dict:
+    """신호 허브의 토픽/클라이언트/큐 통계를 반환합니다."""
+    return hub.stats()
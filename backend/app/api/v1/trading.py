@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import Dict, List
+from typing import Dict, List, Optional
 from ...services.trading.tradingService import TradingService
-from ...services.upbit_service import UpbitService
-from ...core.deps import get_upbit_service
+from ...services.trading.registry import REGISTRY, StrategyPool
+from ...core.deps import get_trading_service, get_strategy_pool
 
 router = APIRouter()
 
@@ -11,39 +11,48 @@ async def start_trading(
     market: str,
     strategy: str,
     parameters: Dict,
-    upbit_service: UpbitService = Depends(get_upbit_service)
+    trading_service: TradingService = Depends(get_trading_service)
 ):
-    """거래를 시작합니다."""
+    """거래를 시작합니다. 워밍업과 실행은 스케줄러가 백그라운드에서 진행합니다."""
     try:
-        trading_service = TradingService(upbit_service)
-        await trading_service.start_trading(market, strategy, parameters)
-        return {"status": "success", "message": f"Trading started for {market}"}
+        session = await trading_service.start_trading(market, strategy, parameters)
+        return {"status": "success", "message": f"Trading started for {market}", "session": session}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/stop")
 async def stop_trading(
-    market: str,
-    upbit_service: UpbitService = Depends(get_upbit_service)
+    market: Optional[str] = None,
+    trading_service: TradingService = Depends(get_trading_service)
 ):
-    """거래를 중지합니다."""
+    """거래를 중지합니다. market을 생략하면 모든 마켓을 중지합니다."""
     try:
-        trading_service = TradingService(upbit_service)
-        trading_service.stop_trading(market)
-        return {"status": "success", "message": f"Trading stopped for {market}"}
+        stopped = await trading_service.stop_trading(market)
+        if market and not stopped:
+            raise ValueError(f"Trading is not active for {market}")
+        return {"status": "success", "message": f"Trading stopped for {', '.join(stopped) or 'no markets'}"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/status")
 async def get_trading_status(
-    upbit_service: UpbitService = Depends(get_upbit_service)
+    trading_service: TradingService = Depends(get_trading_service)
 ):
     """현재 실행 중인 거래 상태를 조회합니다."""
     try:
-        trading_service = TradingService(upbit_service)
+        scheduler = await trading_service.status()
         return {
             "status": "success",
-            "active_markets": list(trading_service.active_strategies.keys())
+            "active_markets": [session["market"] for session in scheduler["sessions"]],
+            "scheduler": scheduler
         }
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/strategies")
+async def list_strategies(
+    strategy_pool: StrategyPool = Depends(get_strategy_pool)
+):
+    """등록된 전략과 파라미터 스키마, 전략 인스턴스 풀 통계를 조회합니다."""
+    return {"strategies": REGISTRY.describe(), "pool": strategy_pool.stats()}
@@ -6,13 +6,91 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
     
-    # Upbit API 설정
-    UPBIT_ACCESS_KEY: str
-    UPBIT_SECRET_KEY: str
+    # Upbit API 설정. 키가 없으면 시세 조회만 하는 읽기 전용 모드로 실행합니다. (거래/계좌 API 비활성화)
+    UPBIT_ACCESS_KEY: Optional[str] = None
+    UPBIT_SECRET_KEY: Optional[str] = None
+    # REST API 주소 (mock_exchange로 바꾸면 실제 주문 없이 실행 경로를 검증할 수 있습니다)
+    UPBIT_API_URL: str = "https://api.upbit.com/v1"
+
+    # Upbit HTTP 커넥션 풀 설정
+    UPBIT_POOL_LIMIT: int = 100
+    UPBIT_POOL_LIMIT_PER_HOST: int = 30
+    UPBIT_KEEPALIVE_TIMEOUT: float = 30
+    UPBIT_DNS_CACHE_TTL: int = 300
+    UPBIT_REQUEST_TIMEOUT: float = 10
+
+    # Upbit 레이트 리밋 설정 (시세 조회 API 기준)
+    UPBIT_RATE_PER_SEC: float = 10
+    UPBIT_RATE_PER_MIN: float = 600
+    UPBIT_MAX_RETRIES: int = 3
+    # 거래 API 쿼터 (주문 / 주문 외 거래 API)
+    UPBIT_ORDER_RATE_PER_SEC: float = 8
+    UPBIT_ORDER_RATE_PER_MIN: float = 200
+    UPBIT_EXCHANGE_RATE_PER_SEC: float = 30
+    UPBIT_EXCHANGE_RATE_PER_MIN: float = 900
+    # 계좌 잔고 캐시 시간 (초). 주문이 접수되면 바로 무효화됩니다.
+    ACCOUNT_CACHE_TTL: float = 30
+
+    # 캔들 캐시 설정 (TTL 단위: 초)
+    CANDLE_CACHE_SIZE: int = 1024
+    CANDLE_CACHE_OPEN_TTL: float = 5
+    CANDLE_CACHE_CLOSED_TTL: float = 6 * 60 * 60
+    # Upbit이 제공하지 않는 타임프레임(2h/6h/12h ...)을 리샘플링할 때 받을 베이스 봉의 최대 개수. 넘으면 요청을 거절합니다.
+    RESAMPLE_MAX_BASE_BARS: int = 2000
+    # 마켓 목록(/market/all) 캐시 시간 (초)
+    MARKET_LIST_TTL: float = 60 * 60
+
+    # 시세 수집 방식: polling(REST 주기 조회) 또는 websocket(Upbit WebSocket 구독)
+    MARKET_DATA_MODE: str = "polling"
+    UPBIT_WS_URL: str = "wss://api.upbit.com/websocket/v1"
+    # 설정하면 수신한 WebSocket 메시지를 JSONL로 녹화합니다. (ws_replay로 재생)
+    MARKET_DATA_RECORD_PATH: Optional[str] = None
+    # polling 모드에서 전체 전략을 평가하는 주기 (초)
+    TRADING_TICK_INTERVAL: float = 60
+    # 전략 파라미터(orderAmount)가 없을 때 시장가 매수 1회 주문 총액 (KRW)
+    TRADING_ORDER_AMOUNT: float = 10000
+    
+    # 대시보드 신호 허브 (SSE/WebSocket): 현재가 갱신 주기(초), 차트 일봉 수, 구독자 없는 토픽 보관 시간(초)
+    SIGNAL_REFRESH_INTERVAL: float = 5
+    SIGNAL_HISTORY_BARS: int = 365
+    SIGNAL_IDLE_TTL: float = 300
+    SIGNAL_MAX_TOPICS: int = 256
+    SIGNAL_CLIENT_QUEUE_SIZE: int = 256
+
+    # /trading/execute가 (전략, 파라미터)별로 재사용하는 전략 인스턴스 수
+    STRATEGY_POOL_SIZE: int = 1024
+    # 시작 시 import하여 register(registry)로 전략을 추가할 모듈 (쉼표 구분)
+    STRATEGY_PLUGINS: str = ""
     
+    # 시작 직후 백그라운드 워밍업: 마켓 목록과 관심 마켓(쉼표 구분)의 최근 캔들을 미리 받아 둡니다.
+    # 워밍업이 끝나면 /ready가 200을 반환하므로 롤링 배포 시 준비된 워커에만 트래픽을 보낼 수 있습니다.
+    WARMUP_ENABLED: bool = True
+    WARMUP_MARKETS: str = ""
+    WARMUP_UNITS: str = "days"
+    WARMUP_CANDLE_COUNT: int = 200
+    WARMUP_CONCURRENCY: int = 8
+    # 이 시간(초) 안에 끝나지 않으면 남은 작업을 취소하고 준비 상태로 넘어갑니다.
+    WARMUP_TIMEOUT: float = 30
+
+    # 로그 설정 (LOG_FORMAT: json 또는 text)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+
+    # 다중 워커 모드 (uvicorn --workers N): 같은 호스트의 워커들이 공유할 SQLite 파일 경로.
+    # 설정하면 캔들 캐시/레이트 리밋 예산을 워커끼리 나눠 쓰고, 거래 스케줄러는 임대를 가진 워커 하나만 실행합니다.
+    SHARED_STATE_PATH: Optional[str] = None
+    # 거래 스케줄러 임대 유효 시간 (초). 리더 워커가 죽으면 이 시간 안에 다른 워커가 이어받습니다.
+    LEADER_LEASE_TTL: float = 15
+
     # 데이터베이스 설정
     DATABASE_URL: Optional[str] = "sqlite:///./trading.db"
+    # DATABASE_URL의 SQLite 파일에 캔들 이력을 저장하고 누락 구간만 동기화합니다.
+    CANDLE_STORE_ENABLED: bool = True
     
+    @property
+    def read_only(self) -> bool:
+        return not (self.UPBIT_ACCESS_KEY and self.UPBIT_SECRET_KEY)
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,5 +1,169 @@
+from typing import List, Optional
+from fastapi import Request
+from fastapi.requests import HTTPConnection
 from app.core.config import settings
 from app.services.upbit_service import UpbitService
+from app.services.rate_limiter import RateLimiter
+from app.services.candle_cache import CandleCache
+from app.services.candle_store import CandleStore
+from app.services.market_data import MarketDataBus, UpbitWebSocketClient
+from app.services.trading.tradingService import TradingService
+from app.services.trading.registry import REGISTRY, StrategyPool, StrategyRegistry
+from app.services.execution import OrderExecutor
+from app.services.pair_stats import PairStatsCache
+from app.services.portfolio import CovarianceCache
+from app.services.signal_hub import SignalHub
+from app.services.shared_state import SharedState
+from app.services.warmup import Warmup
 
-def get_upbit_service():
-    return UpbitService(settings.UPBIT_ACCESS_KEY, settings.UPBIT_SECRET_KEY) 
\ No newline at end of file
+def _split(value: str) -> List[str]:
+    """쉼표로 구분한 설정값을 리스트로 나눕니다."""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def create_candle_store() -> Optional[CandleStore]:
+    """설정에 따라 로컬 캔들 저장소를 생성합니다. 비활성화되어 있으면 None."""
+    if not settings.CANDLE_STORE_ENABLED or not settings.DATABASE_URL:
+        return None
+    return CandleStore.from_url(settings.DATABASE_URL)
+
+def create_shared_state() -> Optional[SharedState]:
+    """SHARED_STATE_PATH가 설정되어 있으면 워커 간 공유 저장소를 엽니다. (다중 워커 모드)"""
+    if not settings.SHARED_STATE_PATH:
+        return None
+    return SharedState(settings.SHARED_STATE_PATH)
+
+def create_upbit_service(
+    candle_store: Optional[CandleStore] = None, shared: Optional[SharedState] = None
+) -> UpbitService:
+    """앱 전역에서 공유할 UpbitService를 설정값으로 생성합니다. shared가 있으면 캐시와 쿼터를 워커끼리 나눠 씁니다."""
+    return UpbitService(
+        settings.UPBIT_ACCESS_KEY,
+        settings.UPBIT_SECRET_KEY,
+        pool_limit=settings.UPBIT_POOL_LIMIT,
+        pool_limit_per_host=settings.UPBIT_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=settings.UPBIT_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl=settings.UPBIT_DNS_CACHE_TTL,
+        request_timeout=settings.UPBIT_REQUEST_TIMEOUT,
+        rate_limiter=RateLimiter(
+            settings.UPBIT_RATE_PER_SEC,
+            settings.UPBIT_RATE_PER_MIN,
+            limits={
+                "order": (settings.UPBIT_ORDER_RATE_PER_SEC, settings.UPBIT_ORDER_RATE_PER_MIN),
+                "exchange": (settings.UPBIT_EXCHANGE_RATE_PER_SEC, settings.UPBIT_EXCHANGE_RATE_PER_MIN),
+            },
+            shared=shared,
+        ),
+        max_retries=settings.UPBIT_MAX_RETRIES,
+        candle_cache=CandleCache(
+            max_size=settings.CANDLE_CACHE_SIZE,
+            open_bar_ttl=settings.CANDLE_CACHE_OPEN_TTL,
+            closed_bar_ttl=settings.CANDLE_CACHE_CLOSED_TTL,
+            shared=shared,
+        ),
+        candle_store=candle_store,
+        market_list_ttl=settings.MARKET_LIST_TTL,
+        account_ttl=settings.ACCOUNT_CACHE_TTL,
+        resample_max_base_bars=settings.RESAMPLE_MAX_BASE_BARS,
+        base_url=settings.UPBIT_API_URL,
+    )
+
+def create_market_feed() -> Optional[UpbitWebSocketClient]:
+    """MARKET_DATA_MODE가 websocket이면 WebSocket 시세 수집기를 생성합니다."""
+    if settings.MARKET_DATA_MODE != "websocket":
+        return None
+    return UpbitWebSocketClient(
+        MarketDataBus(),
+        url=settings.UPBIT_WS_URL,
+        record_path=settings.MARKET_DATA_RECORD_PATH,
+    )
+
+def load_strategy_plugins() -> StrategyRegistry:
+    """STRATEGY_PLUGINS에 적은 모듈의 전략을 레지스트리에 추가합니다."""
+    REGISTRY.load_plugins(_split(settings.STRATEGY_PLUGINS))
+    return REGISTRY
+
+def create_strategy_pool(
+    upbit_service: UpbitService, pair_cache: PairStatsCache, covariance_cache: CovarianceCache
+) -> StrategyPool:
+    """(전략, 파라미터)별 전략 인스턴스를 재사용할 앱 단위 풀을 생성합니다."""
+    return StrategyPool(
+        upbit_service,
+        REGISTRY,
+        resources={"pair_cache": pair_cache, "covariance_cache": covariance_cache},
+        max_size=settings.STRATEGY_POOL_SIZE,
+    )
+
+def create_trading_service(
+    upbit_service: UpbitService,
+    market_feed: Optional[UpbitWebSocketClient] = None,
+    shared: Optional[SharedState] = None,
+) -> TradingService:
+    """모든 마켓의 전략을 실행할 앱 단위 스케줄러를 생성합니다. shared가 있으면 임대를 가진 워커만 실행합니다."""
+    return TradingService(
+        upbit_service,
+        market_feed,
+        tick_interval=settings.TRADING_TICK_INTERVAL,
+        order_executor=OrderExecutor(upbit_service, order_amount=settings.TRADING_ORDER_AMOUNT),
+        shared=shared,
+        lease_ttl=settings.LEADER_LEASE_TTL,
+    )
+
+def create_signal_hub(
+    upbit_service: UpbitService, trading_service: TradingService, market_feed: Optional[UpbitWebSocketClient] = None
+) -> SignalHub:
+    """대시보드 구독자에게 신호를 밀어 줄 앱 단위 신호 허브를 생성합니다. 전략은 스케줄러와 같은 방식으로 만듭니다."""
+    return SignalHub(
+        upbit_service,
+        trading_service.create_strategy,
+        market_feed,
+        refresh_interval=settings.SIGNAL_REFRESH_INTERVAL,
+        history_bars=settings.SIGNAL_HISTORY_BARS,
+        idle_ttl=settings.SIGNAL_IDLE_TTL,
+        max_topics=settings.SIGNAL_MAX_TOPICS,
+        client_queue_size=settings.SIGNAL_CLIENT_QUEUE_SIZE,
+    )
+
+def create_warmup(upbit_service: UpbitService) -> Warmup:
+    """시작 직후 전략 모듈과 마켓 목록, 관심 마켓의 최근 캔들을 미리 불러올 워밍업을 생성합니다."""
+    return Warmup(
+        upbit_service,
+        REGISTRY,
+        markets=_split(settings.WARMUP_MARKETS),
+        units=_split(settings.WARMUP_UNITS),
+        candle_count=settings.WARMUP_CANDLE_COUNT,
+        concurrency=settings.WARMUP_CONCURRENCY,
+        timeout=settings.WARMUP_TIMEOUT,
+        enabled=settings.WARMUP_ENABLED,
+    )
+
+def get_upbit_service(request: Request) -> UpbitService:
+    """lifespan에서 생성한 앱 단위 UpbitService를 주입합니다."""
+    return request.app.state.upbit_service
+
+def get_market_feed(request: Request) -> Optional[UpbitWebSocketClient]:
+    """WebSocket 시세 수집기를 주입합니다. polling 모드면 None."""
+    return getattr(request.app.state, "market_feed", None)
+
+def get_trading_service(request: Request) -> TradingService:
+    """lifespan에서 생성한 앱 단위 TradingService(스케줄러)를 주입합니다."""
+    return request.app.state.trading_service
+
+def get_pair_cache(request: Request) -> PairStatsCache:
+    """lifespan에서 생성한 페어 통계 캐시를 주입합니다."""
+    return request.app.state.pair_cache
+
+def get_covariance_cache(request: Request) -> CovarianceCache:
+    """lifespan에서 생성한 바스켓 공분산 캐시를 주입합니다."""
+    return request.app.state.covariance_cache
+
+def get_strategy_pool(request: Request) -> StrategyPool:
+    """lifespan에서 생성한 전략 인스턴스 풀을 주입합니다."""
+    return request.app.state.strategy_pool
+
+def get_signal_hub(connection: HTTPConnection) -> SignalHub:
+    """lifespan에서 생성한 신호 허브를 주입합니다. (HTTP/WebSocket 라우트 공용)"""
+    return connection.app.state.signal_hub
+
+def get_warmup(request: Request) -> Warmup:
+    """lifespan에서 시작한 워밍업 상태를 주입합니다."""
+    return request.app.state.warmup
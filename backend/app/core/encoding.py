@@ -0,0 +1,191 @@
+"""
+캔들 응답 인코딩입니다. 응답 형식은 Accept 헤더로 고르고, 지정하지 않으면 기존 JSON 그대로입니다.
+
+- application/json: 기존 Upbit 형식 (최신 봉이 앞인 dict 리스트)
+- application/vnd.candles.columnar+json: 오래된 봉이 앞인 컬럼 배열 {"market", "unit", "timestamp": [...], "open": [...], ...}
+- application/vnd.candles.packed: 리틀 엔디언 이진 컬럼 (브라우저에서 Float64Array로 복사 없이 읽을 수 있습니다)
+
+    magic "CNDL" | version u8 | 패딩 3 | header 길이 u32 | header JSON | 8바이트 정렬 패딩 | 컬럼 버퍼들
+    header: {"market", "unit", "rows", "columns": [[이름, "i8" | "f8"], ...], ...추가 필드}
+    컬럼은 header의 columns 순서대로 rows × 8바이트씩 이어집니다. (timestamp는 int64 ms, 나머지는 float64)
+
+모든 형식은 orjson으로 직렬화하고, Accept-Encoding에 따라 br(brotli 설치 시) 또는 gzip으로 압축합니다.
+ETag는 압축 전 표현(형식 + 컬럼 버퍼)의 해시이며, If-None-Match가 맞으면 본문 없이 304를 돌려줍니다.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+import gzip
+import hashlib
+import struct
+import numpy as np
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from app.services.candle_frame import CandleFrame, PRICE_COLUMNS
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 협상합니다.
+    brotli = None
+
+RECORDS = 'application/json'
+COLUMNAR = 'application/vnd.candles.columnar+json'
+PACKED = 'application/vnd.candles.packed'
+FORMATS = {
+    RECORDS: RECORDS,
+    COLUMNAR: COLUMNAR,
+    PACKED: PACKED,
+    'application/octet-stream': PACKED,
+}
+CANDLE_COLUMNS = ('timestamp',) + PRICE_COLUMNS
+PACKED_MAGIC = b'CNDL'
+PACKED_VERSION = 1
+# 이보다 작은 본문은 압축해도 이득이 적어 그대로 보냅니다.
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def _parse_header(value: Optional[str]) -> Sequence[Tuple[str, float]]:
+    """'a;q=0.5, b' 형식의 헤더를 q값 내림차순 (값, q) 목록으로 바꿉니다. (같은 q면 적힌 순서)"""
+    items = []
+    for index, part in enumerate((value or '').split(',')):
+        token, _, params = part.strip().partition(';')
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, number = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        items.append((token.strip().lower(), q, index))
+    return [(token, q) for token, q, _ in sorted(items, key=lambda item: (-item[1], item[2])) if q > 0]
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """Accept 헤더에서 지원하는 형식 중 가장 선호하는 것을 고릅니다. 없거나 */*이면 기존 JSON입니다."""
+    for media_type, _ in _parse_header(accept):
+        if media_type in FORMATS:
+            return FORMATS[media_type]
+        if media_type in ('*/*', 'application/*'):
+            return RECORDS
+    return RECORDS
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    for coding, _ in _parse_header(accept_encoding):
+        if coding == 'br' and brotli is not None:
+            return 'br'
+        if coding in ('gzip', '*'):
+            return 'gzip'
+    return None
+
+
+def compress(body: bytes, coding: Optional[str]) -> bytes:
+    if coding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if coding == 'gzip':
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+def _column(frame: CandleFrame, name: str):
+    return frame.timestamp.astype('<i8', copy=False) if name == 'timestamp' else getattr(frame, name).astype('<f8', copy=False)
+
+
+def frame_etag(frame: CandleFrame, media_type: str, columns: Sequence[str], extra: Optional[Dict] = None) -> str:
+    """형식과 컬럼 내용이 같으면 같은 값을 돌려주는 약한(W/) ETag입니다. (압축 방식과 무관)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{media_type}|{frame.market}|{frame.unit}|{','.join(columns)}|".encode())
+    if extra:
+        digest.update(orjson.dumps(extra, option=orjson.OPT_SORT_KEYS))
+    for name in columns:
+        digest.update(memoryview(np.ascontiguousarray(_column(frame, name))).cast('B'))
+    return f'W/"{digest.hexdigest()}"'
+
+
+def encode_columnar(frame: CandleFrame, columns: Sequence[str] = CANDLE_COLUMNS, extra: Optional[Dict] = None) -> bytes:
+    payload = {'market': frame.market, 'unit': frame.unit, **(extra or {})}
+    for name in columns:
+        payload[name] = _column(frame, name)
+    # NaN은 null로 직렬화됩니다.
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def encode_packed(frame: CandleFrame, columns: Sequence[str] = CANDLE_COLUMNS, extra: Optional[Dict] = None) -> bytes:
+    header = orjson.dumps({
+        'market': frame.market,
+        'unit': frame.unit,
+        'rows': len(frame),
+        'columns': [[name, 'i8' if name == 'timestamp' else 'f8'] for name in columns],
+        **(extra or {}),
+    })
+    prefix = struct.pack('<4sB3xI', PACKED_MAGIC, PACKED_VERSION, len(header)) + header
+    padding = b'\0' * (-len(prefix) % 8)
+    return b''.join([prefix, padding, *(_column(frame, name).tobytes() for name in columns)])
+
+
+def decode_packed(body: bytes) -> Tuple[Dict, Dict]:
+    """encode_packed()의 역변환입니다. Returns: (header, 이름 → NumPy 배열)"""
+    magic, version, length = struct.unpack_from('<4sB3xI', body)
+    if magic != PACKED_MAGIC or version != PACKED_VERSION:
+        raise ValueError("Not a packed candle payload")
+    start = struct.calcsize('<4sB3xI')
+    header = orjson.loads(body[start:start + length])
+    offset = start + length + (-(start + length) % 8)
+    columns = {}
+    for name, dtype in header['columns']:
+        columns[name] = np.frombuffer(body, dtype='<' + dtype, count=header['rows'], offset=offset)
+        offset += header['rows'] * 8
+    return header, columns
+
+
+def encoded_response(
+    request: Request,
+    media_type: str,
+    etag: str,
+    render,
+) -> Response:
+    """
+    ETag가 If-None-Match와 맞으면 304를, 아니면 render()로 만든 본문을 협상한 방식으로 압축해 돌려줍니다.
+    render는 304일 때 호출하지 않으므로 직렬화 비용도 들지 않습니다.
+    """
+    headers = {'ETag': etag, 'Vary': 'Accept, Accept-Encoding', 'Cache-Control': 'no-cache'}
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and (if_none_match.strip() == '*' or etag in (t.strip() for t in if_none_match.split(','))):
+        return Response(status_code=304, headers=headers)
+    body = render()
+    coding = negotiate_encoding(request.headers.get('accept-encoding')) if len(body) >= MIN_COMPRESS_SIZE else None
+    if coding is not None:
+        body = compress(body, coding)
+        headers['Content-Encoding'] = coding
+    return Response(body, media_type=media_type, headers=headers)
+
+
+def candle_response(
+    request: Request,
+    frame: CandleFrame,
+    columns: Sequence[str] = CANDLE_COLUMNS,
+    extra: Optional[Dict] = None,
+    records=None,
+) -> Response:
+    """
+    Accept 헤더에 맞는 형식으로 캔들 프레임을 응답합니다.
+    Args:
+        columns: columnar/packed 형식에 담을 컬럼
+        extra: columnar/packed 형식의 최상위(헤더)에 함께 담을 값 (예: volatility)
+        records: 기존 JSON 형식의 본문을 만드는 함수. 생략하면 frame.to_records()
+    """
+    media_type = negotiate_format(request.headers.get('accept'))
+    etag = frame_etag(frame, media_type, columns, extra)
+
+    def render() -> bytes:
+        if media_type == COLUMNAR:
+            return encode_columnar(frame, columns, extra)
+        if media_type == PACKED:
+            return encode_packed(frame, columns, extra)
+        return orjson.dumps(records() if records is not None else frame.to_records())
+
+    return encoded_response(request, media_type, etag, render)
@@ -0,0 +1,92 @@
+"""
+구조화(JSON) 로그 설정입니다.
+이벤트 루프에서는 QueueHandler로 레코드를 큐에 넣기만 하고, 포맷과 출력은 QueueListener 스레드가 맡으므로
+로그 출력이 느려도 거래 루프가 막히지 않습니다.
+
+    logger = logging.getLogger(__name__)
+    logger.warning("order failed", extra={'market': 'KRW-BTC', 'error': str(e)})
+"""
+from typing import Optional
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime, timezone
+
+# LogRecord 기본 속성. 이 외의 속성은 extra로 넘긴 필드로 보고 JSON에 함께 씁니다.
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드 하나를 한 줄의 JSON으로 씁니다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    기본 QueueHandler는 예외를 메시지 문자열에 붙여 버리므로,
+    메시지와 예외 텍스트를 따로 남겨 JsonFormatter가 필드로 쓸 수 있게 합니다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: str = 'INFO', fmt: str = 'json') -> None:
+    """
+    루트 로거에 큐 기반 핸들러를 설치하고 출력 스레드를 시작합니다. 여러 번 호출해도 한 번만 설치합니다.
+    Args:
+        fmt: 'json' 또는 'text'
+    """
+    global _listener
+    if _listener is not None:
+        return
+    stream = logging.StreamHandler(sys.stderr)
+    if fmt == 'json':
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(_QueueHandler(records))
+    root.setLevel(level.upper())
+    _listener = logging.handlers.QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 레코드를 모두 쓰고 출력 스레드를 멈춥니다."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    _listener = None
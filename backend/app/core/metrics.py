@@ -0,0 +1,263 @@
+"""
+Prometheus 텍스트 형식으로 내보내는 경량 메트릭 모음입니다.
+
+샘플 하나를 기록하는 비용을 1µs 아래로 유지하기 위해 기록 시점에는 버킷 배열의 칸 하나만 올리고,
+누적 버킷/합계 계산과 문자열 변환은 /metrics를 조회할 때만 합니다.
+라벨 조합별 자식 객체는 labels()로 한 번 만들어 두고 재사용하는 것을 권장합니다.
+모든 기록은 이벤트 루프 스레드에서 일어난다고 가정하므로 락을 쓰지 않습니다.
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from bisect import bisect_left
+import math
+
+# 초 단위 지연 시간용 기본 버킷 (100µs ~ 10s)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# 지표 계산처럼 아주 짧은 구간용 버킷 (1µs ~ 10ms)
+FAST_BUCKETS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional["Registry"] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[tuple, object] = {}
+        self._lookup: Dict[tuple, object] = {}  # 변환 전 라벨 값 → 자식 (labels()의 빠른 경로)
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """라벨 값 조합에 해당하는 자식 메트릭을 반환합니다. (없으면 생성)"""
+        child = self._lookup.get(values)
+        if child is None:
+            key = tuple(str(v) for v in values)
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+            self._lookup[values] = child
+        return child
+
+    def _default(self):
+        return self.labels()
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple, child) -> List[str]:
+        return [f'{self.name}{_label_text(self.labelnames, values)} {_format_value(child.get())}']
+
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def get(self) -> float:
+        return self.value
+
+
+class Counter(_Metric):
+    """단조 증가하는 카운터입니다."""
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ('value', 'function')
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """조회 시점에 function()을 호출해 값을 구합니다. (캐시 적중률처럼 다른 객체가 가진 값에 사용)"""
+        self.function = function
+
+    def get(self) -> float:
+        if self.function is not None:
+            try:
+                return float(self.function())
+            except Exception:
+                return float('nan')
+        return self.value
+
+
+class Gauge(_Metric):
+    """오르내리는 값입니다."""
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._default().set_function(function)
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    """버킷 히스토그램입니다. 버킷 경계는 이하(le) 기준입니다."""
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        registry: Optional["Registry"] = None,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def _render_child(self, values: tuple, child: _HistogramChild) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), list(child.counts)):
+            cumulative += count
+            labels = _label_text(self.labelnames, values, ('le', _format_value(bound)))
+            lines.append(f'{self.name}_bucket{labels} {cumulative}')
+        labels = _label_text(self.labelnames, values)
+        lines.append(f'{self.name}_sum{labels} {_format_value(child.sum)}')
+        lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class Registry:
+    """메트릭 목록을 보관하고 Prometheus 텍스트 형식으로 내보냅니다."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# ---- 앱 메트릭 ----
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', "API 요청 처리 시간", ('method', 'route', 'status'),
+)
+UPBIT_REQUEST_SECONDS = Histogram(
+    'upbit_request_duration_seconds', "Upbit API 호출 시간 (레이트 리미터 대기 제외)", ('endpoint', 'status'),
+)
+UPBIT_RATE_LIMIT_WAIT_SECONDS = Histogram(
+    'upbit_rate_limit_wait_seconds', "레이트 리미터 대기 시간", ('group',),
+)
+UPBIT_RETRIES = Counter('upbit_retries_total', "429 응답으로 재시도한 횟수", ('endpoint',))
+CACHE_EVENTS = Gauge('candle_cache_events', "캔들 캐시 누적 조회 수 (hits/misses/coalesced/evictions)", ('event',))
+CACHE_HIT_RATIO = Gauge('candle_cache_hit_ratio', "캔들 캐시 적중률 (single-flight 합류 포함)")
+CACHE_SIZE = Gauge('candle_cache_entries', "캔들 캐시 항목 수")
+STRATEGY_COMPUTE_SECONDS = Histogram(
+    'strategy_compute_seconds', "전략 지표/신호 계산 시간", ('strategy', 'stage'), buckets=FAST_BUCKETS,
+)
+SCHEDULER_TICK_LAG_SECONDS = Histogram('scheduler_tick_lag_seconds', "예정 시각 대비 tick 시작 지연")
+SCHEDULER_TICK_SECONDS = Histogram('scheduler_tick_duration_seconds', "tick 한 번의 처리 시간")
+SCHEDULER_SESSIONS = Gauge('scheduler_sessions', "실행 중인 거래 세션 수")
+SCHEDULER_LEADER = Gauge('scheduler_leader', "이 워커가 거래 스케줄러를 실행 중이면 1 (다중 워커 모드의 리더)")
+ORDER_ROUND_TRIP_SECONDS = Histogram(
+    'order_round_trip_seconds', "주문 큐 진입부터 거래소 응답까지의 시간", ('action', 'outcome'),
+)
+ORDER_BATCH_SIZE = Histogram(
+    'order_batch_size', "주문 실행기 배치 크기", buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+SIGNAL_HUB_TOPICS = Gauge('signal_hub_topics', "신호 허브에 캐시된 토픽 수")
+SIGNAL_HUB_CLIENTS = Gauge('signal_hub_clients', "신호 허브에 연결된 SSE/WebSocket 클라이언트 수")
+SIGNAL_HUB_MESSAGES = Counter('signal_hub_messages_total', "토픽별로 인코딩한 메시지 수", ('type',))
+SIGNAL_HUB_RESYNCS = Counter('signal_hub_resyncs_total', "큐가 넘쳐 snapshot을 다시 보낸 횟수")
+STRATEGY_POOL_EVENTS = Gauge('strategy_pool_events', "전략 인스턴스 풀 누적 조회 수 (hits/misses/evictions)", ('event',))
+STRATEGY_POOL_SIZE = Gauge('strategy_pool_instances', "전략 인스턴스 풀에 보관 중인 인스턴스 수")
+WARMUP_SECONDS = Gauge('warmup_duration_seconds', "시작 워밍업에 걸린 시간 (끝나기 전에는 0)")
+
+
+def bind_candle_cache(cache) -> None:
+    """캔들 캐시 통계를 조회 시점에 읽어 오도록 게이지에 연결합니다."""
+    for event in ('hits', 'misses', 'coalesced', 'evictions'):
+        CACHE_EVENTS.labels(event).set_function(lambda event=event: getattr(cache, event))
+    CACHE_HIT_RATIO.set_function(lambda: cache.stats()['hit_ratio'])
+    CACHE_SIZE.set_function(lambda: cache.stats()['size'])
+
+
+def bind_signal_hub(hub) -> None:
+    """신호 허브의 토픽/클라이언트 수를 조회 시점에 읽어 오도록 게이지에 연결합니다."""
+    SIGNAL_HUB_TOPICS.set_function(lambda: len(hub.topics))
+    SIGNAL_HUB_CLIENTS.set_function(lambda: len(hub.clients))
+
+
+def bind_strategy_pool(pool) -> None:
+    """전략 인스턴스 풀의 적중/생성/제거 수를 조회 시점에 읽어 오도록 게이지에 연결합니다."""
+    for event in ('hits', 'misses', 'evictions'):
+        STRATEGY_POOL_EVENTS.labels(event).set_function(lambda event=event: getattr(pool, event))
+    STRATEGY_POOL_SIZE.set_function(lambda: len(pool))
@@ -0,0 +1,46 @@
+"""
+라우트별 요청 처리 시간을 기록하는 ASGI 미들웨어입니다.
+BaseHTTPMiddleware를 거치지 않는 순수 ASGI 미들웨어라 요청마다 태스크/스트림을 추가로 만들지 않습니다.
+라벨에는 실제 경로 대신 라우트 템플릿(/api/v1/trading/{strategy})을 써서 라벨 수가 늘어나지 않게 합니다.
+"""
+import time
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+from . import metrics
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.HTTP_REQUEST_SECONDS.labels(scope['method'], _route_path(scope), status).observe(
+                time.perf_counter() - started
+            )
+
+
+def _route_path(scope: Scope) -> str:
+    route = scope.get('route')
+    if route is None:
+        # 라우터가 scope에 route를 남기지 않는 버전에서는 직접 찾습니다.
+        for candidate in scope['app'].router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, 'path', 'unmatched')
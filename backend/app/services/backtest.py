@@ -0,0 +1,480 @@
+"""
+저장된 캔들로 전략을 과거 구간에 대해 검증하는 백테스트 엔진입니다.
+
+- 벡터화 경로: 전략의 vectorized_signals()로 (markets × bars) 전체 신호를 한 번에 계산합니다.
+- 이벤트 경로: 봉을 하나씩 update_bar() / calculate_signals_incremental()에 흘려 보내 실거래와 같은 코드로 재생합니다.
+
+두 경로는 같은 체결 규칙을 따르므로 결과가 일치합니다.
+t 봉 종가에서 신호를 계산하고 t+1 봉 시가에 슬리피지를 더해 체결하며, 수수료는 체결 금액에 부과합니다.
+현물 거래이므로 포지션은 보유(1)/미보유(0)이고, 마켓마다 같은 금액을 배분해 독립적으로 운용합니다.
+페어 전략(spread)은 두 마켓(y, x)을 받아 봉 종가 기준 스프레드 포지션을 다음 봉 수익률부터 반영합니다.
+모든 계산은 네트워크 없이 로컬 저장소/파일만 사용하며 결과는 결정적입니다.
+
+    python -m app.services.backtest KRW-BTC KRW-ETH --strategy counter_trend --params '{"nDays": 20}'
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import csv
+import json
+import os
+import numpy as np
+from .candle_frame import CandleFrame
+from .candle_store import CandleStore, UNIT_INTERVAL_MS
+from .resample import interval_ms, normalize_timeframe, resample
+from .trading.baseStrategy import BaseStrategy
+from .trading.registry import REGISTRY
+from .trading.spread import SpreadStrategy
+from .trading.tradingService import SIGNAL_ACTIONS
+
+DEFAULT_FEE = 0.0005  # Upbit KRW 마켓 거래 수수료 0.05%
+DEFAULT_SLIPPAGE = 0.0005
+
+
+# ---- 데이터 적재 ----
+
+def load_frame_file(path: str, market: str, unit: str = 'days') -> CandleFrame:
+    """
+    캔들 파일 하나를 읽습니다.
+    - .json: Upbit 캔들 응답 형식의 리스트
+    - .csv: timestamp(ms), open, high, low, close, volume, value 헤더를 가진 오래된 순 행
+    """
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            return CandleFrame.from_upbit(json.load(f), market, unit)
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = [
+            (int(row['timestamp']), float(row['open']), float(row['high']), float(row['low']),
+             float(row['close']), float(row.get('volume') or 0), float(row.get('value') or 0))
+            for row in csv.DictReader(f)
+        ]
+    return CandleFrame.from_rows(rows, market, unit)
+
+
+def load_frames(
+    markets: Sequence[str],
+    unit: str = 'days',
+    store: Optional[CandleStore] = None,
+    data_dir: Optional[str] = None,
+    start_ts: Optional[int] = None,
+    end_ts: Optional[int] = None,
+) -> List[CandleFrame]:
+    """
+    로컬 저장소(CandleStore) 또는 data_dir의 {market}.csv / {market}.json 파일에서 캔들을 읽습니다.
+    """
+    frames = []
+    for market in markets:
+        if data_dir is not None:
+            for ext in ('.csv', '.json'):
+                path = os.path.join(data_dir, market + ext)
+                if os.path.exists(path):
+                    frame = load_frame_file(path, market, unit)
+                    break
+            else:
+                raise FileNotFoundError(f"No candle file for {market} in {data_dir}")
+        elif store is not None:
+            frame = store.range(market, unit, start_ts or 0, end_ts or np.iinfo(np.int64).max)
+        else:
+            raise ValueError("Either store or data_dir is required")
+        if start_ts is not None or end_ts is not None:
+            lo = np.searchsorted(frame.timestamp, start_ts) if start_ts is not None else 0
+            hi = np.searchsorted(frame.timestamp, end_ts, side='right') if end_ts is not None else len(frame)
+            frame = frame[lo:hi]
+        frames.append(frame)
+    return frames
+
+
+def align(frames: Sequence[CandleFrame]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    여러 마켓의 봉을 시각 기준 합집합 축에 맞춰 (markets × bars) 배열로 정렬합니다.
+    해당 시각에 봉이 없는 칸(상장 전 등)은 NaN입니다.
+    """
+    timestamps = np.unique(np.concatenate([f.timestamp for f in frames])) if frames else np.empty(0, dtype=np.int64)
+    bars = {name: np.full((len(frames), len(timestamps)), np.nan) for name in ('open', 'high', 'low', 'close')}
+    for i, frame in enumerate(frames):
+        index = np.searchsorted(timestamps, frame.timestamp)
+        for name in bars:
+            bars[name][i, index] = getattr(frame, name)
+    return timestamps, bars
+
+
+# ---- 성과 지표 ----
+
+def periods_per_year(unit: str) -> float:
+    """연 환산에 쓰는 봉 개수입니다. (암호화폐는 365일 24시간 거래)"""
+    return 365 * UNIT_INTERVAL_MS['days'] / interval_ms(unit)
+
+
+def compute_stats(equity: np.ndarray, unit: str = 'days') -> Dict:
+    """
+    자산 곡선(시작 1.0)으로 성과 지표를 계산합니다.
+    Returns:
+        Dict: total_return, cagr, volatility, sharpe, max_drawdown
+    """
+    if len(equity) < 2:
+        return {'total_return': 0.0, 'cagr': 0.0, 'volatility': 0.0, 'sharpe': 0.0, 'max_drawdown': 0.0}
+    ppy = periods_per_year(unit)
+    returns = np.diff(equity) / equity[:-1]
+    years = len(returns) / ppy
+    total_return = float(equity[-1] / equity[0] - 1)
+    std = float(np.std(returns))
+    drawdown = 1 - equity / np.maximum.accumulate(equity)
+    return {
+        'total_return': total_return,
+        'cagr': float((equity[-1] / equity[0]) ** (1 / years) - 1) if equity[-1] > 0 else -1.0,
+        'volatility': float(std * np.sqrt(ppy)),
+        'sharpe': float(np.mean(returns) / std * np.sqrt(ppy)) if std > 0 else 0.0,
+        'max_drawdown': float(np.max(drawdown)),
+    }
+
+
+def _result(markets: Sequence[str], timestamps: np.ndarray, equity: np.ndarray, positions: np.ndarray, unit: str) -> Dict:
+    """
+    마켓별 자산 곡선(markets × bars)과 포지션으로 결과 dict를 만듭니다.
+    포트폴리오 자산은 마켓별 자산의 평균(균등 배분, 리밸런싱 없음)입니다.
+    """
+    portfolio = equity.mean(axis=0) if len(markets) else np.ones(len(timestamps))
+    trades = np.abs(np.diff(positions, axis=1, prepend=0)) > 0
+    return {
+        'timestamps': timestamps.tolist(),
+        'equity': portfolio.tolist(),
+        'stats': {
+            **compute_stats(portfolio, unit),
+            'trades': int(trades.sum()),
+            'exposure': float((positions > 0).mean()) if positions.size else 0.0,
+        },
+        'markets': {
+            market: {
+                **compute_stats(equity[i], unit),
+                'trades': int(trades[i].sum()),
+                'final_equity': float(equity[i, -1]) if equity.shape[1] else 1.0,
+            }
+            for i, market in enumerate(markets)
+        },
+    }
+
+
+# ---- 벡터화 경로 ----
+
+def signals_to_positions(signals: np.ndarray) -> np.ndarray:
+    """
+    신호(1/-1/0)를 봉마다 보유 여부로 바꿉니다.
+    t 봉 종가의 신호는 t+1 봉 시가에 체결되므로 결과는 한 봉 밀려 있습니다. (hold는 직전 상태 유지)
+    """
+    rows, n = signals.shape
+    index = np.where(signals != 0, np.arange(n), -1)
+    index = np.maximum.accumulate(index, axis=1)
+    target = np.where(index >= 0, np.take_along_axis(signals, np.maximum(index, 0), axis=1) > 0, False)
+    positions = np.zeros((rows, n), dtype=np.int8)
+    positions[:, 1:] = target[:, :-1]
+    return positions
+
+
+def simulate_positions(
+    bars: Dict[str, np.ndarray],
+    positions: np.ndarray,
+    fee: float = DEFAULT_FEE,
+    slippage: float = DEFAULT_SLIPPAGE,
+) -> np.ndarray:
+    """
+    보유 여부(markets × bars)로 마켓별 자산 곡선(시작 1.0, 종가 기준)을 계산합니다.
+    전일 종가→시가 구간은 이전 포지션이, 시가→종가 구간은 새 포지션이 가져가며
+    진입/청산 봉에는 수수료와 슬리피지를 곱으로 반영합니다. (이벤트 경로의 현금/수량 계산과 동일)
+    """
+    open_, close = bars['open'], bars['close']
+    prev_close = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gap = np.nan_to_num(open_ / prev_close - 1)
+        intraday = np.nan_to_num(close / open_ - 1)
+    held = positions.astype(np.float64)
+    prev_held = np.concatenate([np.zeros((held.shape[0], 1)), held[:, :-1]], axis=1)
+    growth = (1 + prev_held * gap) * (1 + held * intraday)
+    growth *= np.where(held > prev_held, (1 - fee) / (1 + slippage), 1.0)
+    growth *= np.where(held < prev_held, (1 - fee) * (1 - slippage), 1.0)
+    return np.cumprod(growth, axis=1)
+
+
+def _tradable(bars: Dict[str, np.ndarray]) -> np.ndarray:
+    """체결 가능한 봉(시가/종가가 있는 봉)인지 여부입니다."""
+    return ~np.isnan(bars['open']) & ~np.isnan(bars['close'])
+
+
+def run_vectorized(
+    strategy_name: str,
+    frames: Sequence[CandleFrame],
+    parameters: Optional[Dict] = None,
+    fee: float = DEFAULT_FEE,
+    slippage: float = DEFAULT_SLIPPAGE,
+) -> Dict:
+    """전략 신호를 전체 이력에 대해 한 번에 계산하여 백테스트합니다."""
+    markets = [f.market for f in frames]
+    unit = frames[0].unit if frames else 'days'
+    timestamps, bars = align(frames)
+    return run_bars(strategy_name, markets, timestamps, bars, parameters, fee, slippage, unit)
+
+
+def run_bars(
+    strategy_name: str,
+    markets: Sequence[str],
+    timestamps: np.ndarray,
+    bars: Dict[str, np.ndarray],
+    parameters: Optional[Dict] = None,
+    fee: float = DEFAULT_FEE,
+    slippage: float = DEFAULT_SLIPPAGE,
+    unit: str = 'days',
+    start: int = 0,
+) -> Dict:
+    """
+    align()으로 정렬된 배열 위에서 벡터화 백테스트를 실행합니다.
+    신호는 전달된 전체 구간으로 계산하고(지표 워밍업), 성과는 start 봉부터 집계합니다.
+    """
+    parameters = parameters or {}
+    spec = REGISTRY.require(strategy_name)
+    if spec.kind == 'portfolio':
+        strategy = spec.create(None, {**parameters, 'tickers': list(markets)})
+        weights = strategy.vectorized_weights(bars['close'])
+        window = {name: column[:, start:] for name, column in bars.items()}
+        return _run_weights(markets, timestamps[start:], window, weights[:, start:], unit, fee, slippage)
+    if spec.kind == 'pair':
+        strategy = _create_pair_strategy(strategy_name, markets, parameters)
+        positions, betas = strategy.vectorized_positions(bars['close'][0], bars['close'][1])
+        weights = pair_weights(positions, betas)
+        window = {name: column[:, start:] for name, column in bars.items()}
+        return _run_weights(markets, timestamps[start:], window, weights[:, start:], unit, fee, slippage)
+
+    strategy = _create_strategy(strategy_name, markets[0] if markets else None, parameters)
+    signals = strategy.vectorized_signals(bars)
+    positions = signals_to_positions(signals)
+    positions[~_tradable(bars)] = 0
+    window = {name: column[:, start:] for name, column in bars.items()}
+    positions = positions[:, start:]
+    equity = simulate_positions(window, positions, fee, slippage)
+    return _result(markets, timestamps[start:], equity, positions, unit)
+
+
+def _run_weights(
+    markets: Sequence[str],
+    timestamps: np.ndarray,
+    bars: Dict[str, np.ndarray],
+    weights: np.ndarray,
+    unit: str,
+    fee: float,
+    slippage: float,
+) -> Dict:
+    """
+    봉마다 목표 비중(markets × bars)으로 리밸런싱하는 포트폴리오를 백테스트합니다.
+    비용은 비중 변화량(회전율)에 (수수료 + 슬리피지)를 곱해 차감합니다.
+    """
+    close = bars['close']
+    prev_close = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.nan_to_num(close / prev_close - 1)
+    weights = np.where(_tradable(bars), weights, 0.0)
+    turnover = np.abs(np.diff(weights, axis=1, prepend=0)).sum(axis=0)
+    portfolio = np.cumprod(1 + (weights * returns).sum(axis=0) - turnover * (fee + slippage))
+    contribution = np.cumprod(1 + weights * returns, axis=1)
+    result = _result(markets, timestamps, contribution, weights, unit)
+    result['equity'] = portfolio.tolist()
+    result['stats'].update(compute_stats(portfolio, unit))
+    result['stats']['turnover'] = float(turnover.sum())
+    result['weights'] = {market: weights[i].tolist() for i, market in enumerate(markets)}
+    return result
+
+
+def pair_weights(positions: np.ndarray, betas: np.ndarray) -> np.ndarray:
+    """
+    봉 종가 기준 스프레드 포지션(1/-1/0)과 헤지 비율로 두 마켓의 목표 비중(2 × bars)을 만듭니다.
+    헤지 비율은 진입 봉의 값으로 고정하고, 총 노출이 1이 되도록 (1, -beta)를 1 + |beta|로 나눕니다.
+    t 봉 종가의 포지션은 t+1 봉 수익률부터 반영합니다.
+    (현물 거래소에서는 공매도가 불가능하므로 매도 다리는 합성 포지션으로 가정합니다.)
+    """
+    n = len(positions)
+    weights = np.zeros((2, n))
+    beta = 0.0
+    for t in range(n - 1):
+        position = int(positions[t])
+        if position != 0 and (t == 0 or positions[t - 1] != position):
+            beta = float(betas[t])
+        if position != 0:
+            weights[0, t + 1] = position / (1 + abs(beta))
+            weights[1, t + 1] = -position * beta / (1 + abs(beta))
+    return weights
+
+
+# ---- 이벤트 경로 ----
+
+def _create_strategy(strategy_name: str, market: Optional[str], parameters: Dict) -> BaseStrategy:
+    # 백테스트는 시세를 조회하지 않으므로 upbit_service 없이 생성합니다.
+    return REGISTRY.require(strategy_name, 'single').create(None, {**parameters, 'tickers': [market]})
+
+
+def _create_pair_strategy(strategy_name: str, markets: Sequence[str], parameters: Dict) -> SpreadStrategy:
+    if len(markets) != 2:
+        raise ValueError(f"{strategy_name} requires exactly two markets (y, x)")
+    return REGISTRY.require(strategy_name, 'pair').create(None, {**parameters, 'tickers': list(markets)})
+
+
+def replay_pair(strategy: SpreadStrategy, bars: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    두 마켓의 마감 봉을 순서대로 페어 전략에 흘려 보내며 봉별 스프레드 포지션과 헤지 비율을 기록합니다.
+    어느 한쪽이라도 봉이 없으면 그 봉은 건너뜁니다.
+    """
+    timestamps = bars['timestamp']
+    close_y, close_x = bars['close'][0], bars['close'][1]
+    n = len(timestamps)
+    positions = np.zeros(n, dtype=np.int8)
+    betas = np.full(n, np.nan)
+    for t in range(n):
+        if not (np.isnan(close_y[t]) or np.isnan(close_x[t])):
+            strategy.update_bar({
+                'timestamp': int(timestamps[t]),
+                'close': float(close_y[t]), 'close_x': float(close_x[t]),
+            })
+            signal = strategy.calculate_signals_incremental()
+            strategy.update_position(signal)
+            beta = signal.get('hedge_ratio')
+            betas[t] = np.nan if beta is None else beta
+        positions[t] = strategy.spreadPosition
+    return positions, betas
+
+
+def replay_market(
+    strategy: BaseStrategy,
+    bars: Dict[str, np.ndarray],
+    row: int,
+    fee: float = DEFAULT_FEE,
+    slippage: float = DEFAULT_SLIPPAGE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    한 마켓의 봉을 순서대로 전략에 흘려 보내며 현금/수량으로 체결을 기록합니다.
+    Returns:
+        (자산 곡선, 봉별 보유 여부)
+    """
+    open_, high, low, close = (bars[name][row] for name in ('open', 'high', 'low', 'close'))
+    timestamps = bars['timestamp']
+    n = len(close)
+    equity = np.ones(n)
+    positions = np.zeros(n, dtype=np.int8)
+    cash, quantity = 1.0, 0.0
+    pending = None
+    for t in range(n):
+        if np.isnan(open_[t]) or np.isnan(close[t]):
+            equity[t] = cash + quantity * (close[t - 1] if t and not np.isnan(close[t - 1]) else 0.0)
+            positions[t] = int(quantity > 0)
+            pending = None
+            continue
+        # 직전 봉 종가에서 나온 신호를 이번 봉 시가에 체결합니다.
+        if pending == 'buy' and quantity == 0:
+            quantity = cash * (1 - fee) / (open_[t] * (1 + slippage))
+            cash = 0.0
+            strategy.update_position({'signal': 'buy'})
+        elif pending == 'sell' and quantity > 0:
+            cash = quantity * open_[t] * (1 - slippage) * (1 - fee)
+            quantity = 0.0
+            strategy.update_position({'signal': 'sell'})
+        pending = None
+        if t > 0 and not np.isnan(close[t - 1]):
+            strategy.update_bar({
+                'timestamp': int(timestamps[t - 1]),
+                'open': float(open_[t - 1]), 'high': float(high[t - 1]),
+                'low': float(low[t - 1]), 'close': float(close[t - 1]),
+            })
+        signal = strategy.calculate_signals_incremental(float(close[t]))
+        action = SIGNAL_ACTIONS.get(signal.get('signal'))
+        if action is not None:
+            pending = action
+        equity[t] = cash + quantity * close[t]
+        positions[t] = int(quantity > 0)
+    return equity, positions
+
+
+def run_event_driven(
+    strategy_name: str,
+    frames: Sequence[CandleFrame],
+    parameters: Optional[Dict] = None,
+    fee: float = DEFAULT_FEE,
+    slippage: float = DEFAULT_SLIPPAGE,
+) -> Dict:
+    """실거래와 같은 증분 API로 봉을 하나씩 재생하여 백테스트합니다."""
+    spec = REGISTRY.require(strategy_name)
+    if spec.kind == 'portfolio':
+        raise ValueError(f"{strategy_name} is only supported on the vectorized path")
+    parameters = parameters or {}
+    markets = [f.market for f in frames]
+    unit = frames[0].unit if frames else 'days'
+    timestamps, bars = align(frames)
+    bars['timestamp'] = timestamps
+    if spec.kind == 'pair':
+        strategy = _create_pair_strategy(strategy_name, markets, parameters)
+        positions, betas = replay_pair(strategy, bars)
+        weights = pair_weights(positions, betas)
+        del bars['timestamp']
+        return _run_weights(markets, timestamps, bars, weights, unit, fee, slippage)
+    equity = np.ones((len(markets), len(timestamps)))
+    positions = np.zeros((len(markets), len(timestamps)), dtype=np.int8)
+    for i, market in enumerate(markets):
+        strategy = _create_strategy(strategy_name, market, parameters)
+        equity[i], positions[i] = replay_market(strategy, bars, i, fee, slippage)
+    return _result(markets, timestamps, equity, positions, unit)
+
+
+def run_backtest(
+    strategy_name: str,
+    frames: Sequence[CandleFrame],
+    parameters: Optional[Dict] = None,
+    mode: str = 'vectorized',
+    fee: float = DEFAULT_FEE,
+    slippage: float = DEFAULT_SLIPPAGE,
+) -> Dict:
+    """
+    Args:
+        mode: 'vectorized' 또는 'event'
+    Returns:
+        Dict: {'timestamps', 'equity', 'stats', 'markets'}
+    """
+    if mode == 'vectorized':
+        return run_vectorized(strategy_name, frames, parameters, fee, slippage)
+    if mode == 'event':
+        return run_event_driven(strategy_name, frames, parameters, fee, slippage)
+    raise ValueError(f"Unknown mode: {mode}")
+
+
+def main():
+    from datetime import datetime
+    from .history_loader import to_utc_ms
+    parser = argparse.ArgumentParser(description="저장된 캔들로 전략을 백테스트합니다.")
+    parser.add_argument('markets', nargs='+')
+    parser.add_argument('--strategy', required=True, choices=sorted(REGISTRY.names()))
+    parser.add_argument('--params', default='{}', help="전략 파라미터 (JSON)")
+    parser.add_argument('--mode', default='vectorized', choices=('vectorized', 'event'))
+    parser.add_argument('--unit', default='days')
+    parser.add_argument('--timeframe', help="--unit 봉을 이 단위로 리샘플링하여 백테스트 (예: --unit minutes/1 --timeframe 1h)")
+    parser.add_argument('--db', default='sqlite:///./trading.db', help="캔들 저장소 DATABASE_URL")
+    parser.add_argument('--data-dir', help="{market}.csv / {market}.json 파일 디렉터리 (지정 시 --db 대신 사용)")
+    parser.add_argument('--start', type=datetime.fromisoformat)
+    parser.add_argument('--end', type=datetime.fromisoformat)
+    parser.add_argument('--fee', type=float, default=DEFAULT_FEE)
+    parser.add_argument('--slippage', type=float, default=DEFAULT_SLIPPAGE)
+    parser.add_argument('--equity', action='store_true', help="자산 곡선까지 출력")
+    args = parser.parse_args()
+
+    store = None if args.data_dir else CandleStore.from_url(args.db)
+    try:
+        frames = load_frames(
+            args.markets, args.unit, store, args.data_dir,
+            to_utc_ms(args.start) if args.start else None,
+            to_utc_ms(args.end) if args.end else None,
+        )
+    finally:
+        if store is not None:
+            store.close()
+    if args.timeframe:
+        unit = normalize_timeframe(args.timeframe)
+        frames = [resample(frame, unit, drop_partial=True) for frame in frames]
+    result = run_backtest(args.strategy, frames, json.loads(args.params), args.mode, args.fee, args.slippage)
+    if not args.equity:
+        result = {'stats': result['stats'], 'markets': result['markets']}
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from collections import OrderedDict
+import asyncio
+import time
+from .shared_state import SharedState, decode_value, encode_value
+
+
+class CandleCache:
+    """
+    캔들 응답을 위한 TTL + LRU 캐시입니다.
+    같은 키에 대한 동시 요청은 하나의 upstream 호출로 합쳐집니다(single-flight).
+
+    키는 (market, unit, count, to) 형태를 사용합니다.
+    to가 없는 요청은 진행 중인 봉을 포함하므로 짧은 TTL을,
+    to가 지정된 요청은 마감된 봉만 포함하므로 긴 TTL을 적용합니다.
+
+    shared를 주면 로컬에 없는 값은 upstream 대신 다른 워커가 공유 저장소에 넣어 둔 값을 먼저 찾고,
+    upstream에서 받은 값은 남은 TTL과 함께 공유 저장소에도 넣어 워커들이 upstream 호출을 나눠 씁니다.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        open_bar_ttl: float = 5,
+        closed_bar_ttl: float = 6 * 60 * 60,
+        shared: Optional[SharedState] = None,
+    ):
+        self.max_size = max_size
+        self.open_bar_ttl = open_bar_ttl
+        self.closed_bar_ttl = closed_bar_ttl
+        self.shared = shared
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.shared_hits = 0
+
+    def ttl_for(self, to: Optional[str]) -> float:
+        return self.open_bar_ttl if to is None else self.closed_bar_ttl
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """만료되지 않은 캐시 값을 반환합니다. 없으면 None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float, share: bool = True
+    ) -> Any:
+        """
+        캐시에 값이 있으면 반환하고, 없으면 loader를 한 번만 호출해 채웁니다.
+        Args:
+            key: 캐시 키
+            loader: upstream에서 값을 가져오는 코루틴 함수
+            ttl: 저장할 값의 유효 시간(초)
+            share: False면 공유 저장소를 쓰지 않습니다. (계좌 잔고처럼 워커 안에서 무효화하는 값)
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 선행 요청이 취소된 경우에는 직접 다시 불러옵니다.
+                if inflight.cancelled():
+                    return await self.get_or_load(key, loader, ttl, share)
+                raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            if share and self.shared is not None:
+                value, ttl = await self._load_shared(key, loader, ttl)
+            else:
+                value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없을 때 "exception was never retrieved" 경고를 막습니다.
+            future.exception()
+            raise
+        else:
+            self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load_shared(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float) -> tuple:
+        """공유 저장소를 먼저 찾고, 없으면 loader로 받아 공유 저장소에도 넣습니다. Returns: (값, 로컬 TTL)"""
+        shared_key = f'cache:{key!r}'
+        found = await asyncio.to_thread(self.shared.get_with_ttl, shared_key)
+        if found is not None:
+            self.shared_hits += 1
+            data, remaining = found
+            return decode_value(data), remaining
+        value = await loader()
+        data = encode_value(value)
+        if data is not None:
+            await asyncio.to_thread(self.shared.set, shared_key, data, ttl)
+        return value, ttl
+
+    def invalidate(self, key: Hashable) -> None:
+        """키 하나를 캐시에서 지웁니다. (잔고처럼 변경을 알고 있는 값에 사용)"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        """모니터링용 캐시 통계를 반환합니다."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'shared_hits': self.shared_hits,
+            'inflight': len(self._inflight),
+            'hit_ratio': (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
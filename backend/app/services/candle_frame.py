@@ -0,0 +1,186 @@
+from typing import Dict, List, Optional, Sequence, Union
+from datetime import datetime, timedelta, timezone
+import numpy as np
+
+KST = timezone(timedelta(hours=9))
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'value')
+
+
+def _parse_utc_ms(value: str) -> int:
+    return int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+class CandleFrame:
+    """
+    한 마켓의 캔들을 컬럼 배열로 보관하는 컨테이너입니다.
+    모든 컬럼은 오래된 봉이 앞에 오는 연속된 NumPy 배열이며,
+    슬라이싱은 복사 없이 같은 버퍼를 공유하는 뷰를 반환합니다.
+
+    Columns:
+        timestamp: 봉 시작 시각 (UTC, ms, int64)
+        open, high, low, close: 시가/고가/저가/종가 (float64)
+        volume: 누적 거래량 (float64)
+        value: 누적 거래대금 (float64)
+    """
+
+    __slots__ = ('market', 'unit', 'timestamp', 'open', 'high', 'low', 'close', 'volume', 'value')
+
+    def __init__(
+        self,
+        market: str,
+        unit: str,
+        timestamp: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        value: np.ndarray,
+    ):
+        self.market = market
+        self.unit = unit
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.value = value
+
+    @classmethod
+    def empty(cls, market: str = '', unit: str = 'days') -> "CandleFrame":
+        return cls(market, unit, np.empty(0, dtype=np.int64), *(np.empty(0) for _ in PRICE_COLUMNS))
+
+    @classmethod
+    def from_upbit(cls, candles: List[Dict], market: Optional[str] = None, unit: str = 'days') -> "CandleFrame":
+        """
+        Upbit 캔들 응답(최신 봉이 앞)을 한 번에 컬럼 배열로 변환합니다.
+        """
+        if not candles:
+            return cls.empty(market or '', unit)
+        n = len(candles)
+        timestamp = np.empty(n, dtype=np.int64)
+        prices = np.empty((len(PRICE_COLUMNS), n), dtype=np.float64)
+        # 응답은 최신 봉이 앞이므로 뒤에서부터 채워 오래된 순으로 만듭니다.
+        for i, c in enumerate(candles):
+            j = n - 1 - i
+            timestamp[j] = _parse_utc_ms(c['candle_date_time_utc'])
+            prices[0, j] = c['opening_price']
+            prices[1, j] = c['high_price']
+            prices[2, j] = c['low_price']
+            prices[3, j] = c['trade_price']
+            prices[4, j] = c.get('candle_acc_trade_volume') or 0.0
+            prices[5, j] = c.get('candle_acc_trade_price') or 0.0
+        return cls(market or candles[0].get('market', ''), unit, timestamp, *prices)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple], market: str, unit: str = 'days') -> "CandleFrame":
+        """
+        (timestamp, open, high, low, close, volume, value) 튜플을 오래된 순으로 담은 행에서 만듭니다.
+        """
+        if not rows:
+            return cls.empty(market, unit)
+        table = np.array(rows, dtype=np.float64).T
+        return cls(market, unit, table[0].astype(np.int64), *(np.ascontiguousarray(col) for col in table[1:]))
+
+    @classmethod
+    def concat(cls, frames: Sequence["CandleFrame"]) -> "CandleFrame":
+        """
+        여러 프레임을 시간순으로 합치고 같은 시각의 봉은 나중 프레임의 값을 남깁니다.
+        """
+        frames = [f for f in frames if len(f)]
+        if not frames:
+            return cls.empty()
+        if len(frames) == 1:
+            return frames[0]
+        timestamp = np.concatenate([f.timestamp for f in frames])
+        # 역순에서 첫 등장 = 원래 순서의 마지막 등장
+        _, last = np.unique(timestamp[::-1], return_index=True)
+        order = len(timestamp) - 1 - last
+        columns = [np.concatenate([getattr(f, name) for f in frames])[order] for name in PRICE_COLUMNS]
+        return cls(frames[0].market, frames[0].unit, timestamp[order], *columns)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union["CandleFrame", Dict]:
+        """
+        slice는 복사 없는 CandleFrame 뷰를, int는 해당 봉의 dict를 반환합니다.
+        """
+        if isinstance(index, slice):
+            return CandleFrame(
+                self.market,
+                self.unit,
+                self.timestamp[index],
+                *(getattr(self, name)[index] for name in PRICE_COLUMNS),
+            )
+        bar = {'timestamp': int(self.timestamp[index])}
+        for name in PRICE_COLUMNS:
+            bar[name] = float(getattr(self, name)[index])
+        return bar
+
+    def tail(self, n: int) -> "CandleFrame":
+        """최근 n개 봉의 뷰를 반환합니다."""
+        return self[max(len(self) - n, 0):]
+
+    def since(self, timestamp: int) -> "CandleFrame":
+        """timestamp(UTC ms) 이후에 시작한 봉들의 뷰를 반환합니다. (timestamp 시각의 봉 포함)"""
+        return self[int(self.timestamp.searchsorted(timestamp, side='left')):]
+
+    def dates(self, tz: timezone = KST) -> List[str]:
+        """봉 시작 시각을 ISO 문자열(기본 KST)로 반환합니다."""
+        return [
+            datetime.fromtimestamp(ts / 1000, tz=tz).strftime('%Y-%m-%dT%H:%M:%S')
+            for ts in self.timestamp.tolist()
+        ]
+
+    def to_columns(self) -> Dict[str, List]:
+        """JSON 응답용 컬럼 리스트(오래된 순)를 반환합니다."""
+        columns = {'market': self.market, 'unit': self.unit, 'timestamp': self.timestamp.tolist()}
+        for name in PRICE_COLUMNS:
+            columns[name] = getattr(self, name).tolist()
+        return columns
+
+    def to_bytes(self) -> bytes:
+        """
+        프로세스 간 공유용 이진 표현입니다. (from_bytes()로 복원)
+        market\0unit\0 | 봉 개수 u32 | timestamp int64 × n | 가격 컬럼 float64 × n × 6
+        """
+        header = f'{self.market}\0{self.unit}\0'.encode() + len(self).to_bytes(4, 'little')
+        return b''.join([
+            header,
+            self.timestamp.astype('<i8', copy=False).tobytes(),
+            *(getattr(self, name).astype('<f8', copy=False).tobytes() for name in PRICE_COLUMNS),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CandleFrame":
+        market, unit, rest = data.split(b'\0', 2)
+        n = int.from_bytes(rest[:4], 'little')
+        # 복사 한 번으로 정렬된 버퍼를 만들고 컬럼은 그 뷰로 씁니다.
+        table = np.frombuffer(rest, dtype='<f8', offset=4, count=n * (1 + len(PRICE_COLUMNS))).reshape(1 + len(PRICE_COLUMNS), n).copy()
+        return cls(market.decode(), unit.decode(), table[0].view(np.int64), *table[1:])
+
+    def to_records(self) -> List[Dict]:
+        """
+        기존 API와 호환되는 Upbit 형식의 캔들 리스트(최신 봉이 앞)를 반환합니다.
+        """
+        utc = self.dates(timezone.utc)
+        kst = self.dates(KST)
+        opens, highs, lows, closes = (getattr(self, n).tolist() for n in ('open', 'high', 'low', 'close'))
+        volumes, values = self.volume.tolist(), self.value.tolist()
+        return [
+            {
+                'market': self.market,
+                'candle_date_time_utc': utc[i],
+                'candle_date_time_kst': kst[i],
+                'opening_price': opens[i],
+                'high_price': highs[i],
+                'low_price': lows[i],
+                'trade_price': closes[i],
+                'candle_acc_trade_price': values[i],
+                'candle_acc_trade_volume': volumes[i],
+            }
+            for i in range(len(self) - 1, -1, -1)
+        ]
@@ -0,0 +1,180 @@
+from typing import Optional, Tuple
+from datetime import timezone
+import sqlite3
+import threading
+import time
+from .candle_frame import CandleFrame, KST
+
+# 봉 단위별 간격 (ms). 주/월봉은 간격이 일정하지 않아 저장소에서 다루지 않습니다.
+UNIT_INTERVAL_MS = {
+    'days': 24 * 60 * 60 * 1000,
+    **{f'minutes/{n}': n * 60 * 1000 for n in (1, 3, 5, 10, 15, 30, 60, 240)},
+}
+
+
+class CandleStoreNotConfiguredError(RuntimeError):
+    """로컬 캔들 저장소가 필요한 작업(구간 조회, 백필)을 저장소 없이(CANDLE_STORE_ENABLED=false) 요청한 경우입니다."""
+
+    def __init__(self):
+        super().__init__("Candle store is not configured")
+
+
+def sqlite_path_from_url(database_url: str) -> str:
+    """
+    sqlite URL에서 파일 경로를 추출합니다.
+    Args:
+        database_url: 예) sqlite:///./trading.db
+    """
+    prefix = 'sqlite:///'
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Unsupported DATABASE_URL for candle store: {database_url}")
+    return database_url[len(prefix):]
+
+
+class CandleStore:
+    """
+    SQLite(WAL 모드) 기반의 로컬 OHLCV 저장소입니다.
+    (market, unit, start_ts)를 기본키로 봉을 한 번만 저장하고 범위 조회를 제공합니다.
+    모든 메서드는 동기 함수이므로 이벤트 루프에서는 asyncio.to_thread로 호출합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS candles (
+                market TEXT NOT NULL,
+                unit TEXT NOT NULL,
+                start_ts INTEGER NOT NULL,
+                candle_date_time_utc TEXT NOT NULL,
+                candle_date_time_kst TEXT NOT NULL,
+                opening_price REAL NOT NULL,
+                high_price REAL NOT NULL,
+                low_price REAL NOT NULL,
+                trade_price REAL NOT NULL,
+                timestamp INTEGER,
+                candle_acc_trade_price REAL,
+                candle_acc_trade_volume REAL,
+                PRIMARY KEY (market, unit, start_ts)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS candle_sync (
+                market TEXT NOT NULL,
+                unit TEXT NOT NULL,
+                history_complete INTEGER NOT NULL DEFAULT 0,
+                synced_at REAL NOT NULL,
+                PRIMARY KEY (market, unit)
+            )
+            """
+        )
+
+    @classmethod
+    def from_url(cls, database_url: str) -> "CandleStore":
+        return cls(sqlite_path_from_url(database_url))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def upsert(self, market: str, unit: str, frame: CandleFrame) -> int:
+        """
+        캔들 프레임을 저장합니다. 같은 봉은 최신 값으로 덮어씁니다(진행 중인 봉 갱신).
+        Returns:
+            int: 저장한 봉 개수
+        """
+        if not len(frame):
+            return 0
+        rows = list(zip(
+            [market] * len(frame),
+            [unit] * len(frame),
+            frame.timestamp.tolist(),
+            frame.dates(timezone.utc),
+            frame.dates(KST),
+            frame.open.tolist(),
+            frame.high.tolist(),
+            frame.low.tolist(),
+            frame.close.tolist(),
+            frame.volume.tolist(),
+            frame.value.tolist(),
+        ))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO candles (market, unit, start_ts, candle_date_time_utc, "
+                    "candle_date_time_kst, opening_price, high_price, low_price, trade_price, "
+                    "candle_acc_trade_volume, candle_acc_trade_price) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def _select(self, market: str, unit: str, where: str, params: tuple, order: str, limit: Optional[int] = None) -> CandleFrame:
+        sql = (
+            f"SELECT start_ts, opening_price, high_price, low_price, trade_price, "
+            f"COALESCE(candle_acc_trade_volume, 0), COALESCE(candle_acc_trade_price, 0) "
+            f"FROM candles WHERE market = ? AND unit = ? {where} ORDER BY start_ts {order}"
+        )
+        params = (market, unit) + params
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + (limit,)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        if order == "DESC":
+            rows.reverse()
+        return CandleFrame.from_rows(rows, market, unit)
+
+    def latest(self, market: str, unit: str, count: int) -> CandleFrame:
+        """최근 count개의 봉을 반환합니다."""
+        return self._select(market, unit, "", (), "DESC", count)
+
+    def range(self, market: str, unit: str, start_ts: int, end_ts: int) -> CandleFrame:
+        """
+        [start_ts, end_ts] 구간(봉 시작 시각 기준, UTC ms)의 봉을 반환합니다.
+        """
+        return self._select(market, unit, "AND start_ts BETWEEN ? AND ?", (start_ts, end_ts), "ASC")
+
+    def bounds(self, market: str, unit: str) -> Optional[Tuple[int, int, int]]:
+        """
+        저장된 봉의 (가장 오래된 시각, 가장 최근 시각, 개수)를 반환합니다. 없으면 None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(start_ts), MAX(start_ts), COUNT(*) FROM candles WHERE market = ? AND unit = ?",
+                (market, unit),
+            ).fetchone()
+        if not row or row[2] == 0:
+            return None
+        return row
+
+    def is_history_complete(self, market: str, unit: str) -> bool:
+        """상장 시점까지 과거 봉을 모두 내려받았는지 여부를 반환합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT history_complete FROM candle_sync WHERE market = ? AND unit = ?",
+                (market, unit),
+            ).fetchone()
+        return bool(row and row[0])
+
+    def mark_synced(self, market: str, unit: str, history_complete: Optional[bool] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO candle_sync (market, unit, history_complete, synced_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (market, unit) DO UPDATE SET
+                    history_complete = MAX(history_complete, excluded.history_complete),
+                    synced_at = excluded.synced_at
+                """,
+                (market, unit, int(bool(history_complete)), time.time()),
+            )
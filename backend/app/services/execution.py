@@ -0,0 +1,216 @@
+"""
+전략 신호를 거래소 주문으로 바꾸는 주문 실행기입니다.
+
+- 멱등성: 주문 ID(identifier)는 (마켓, 전략, 방향, 신호 봉)에서 uuid5로 만들어, 같은 신호가 여러 번 들어와도
+  주문은 한 번만 나갑니다. 재시도 역시 같은 identifier를 쓰므로 거래소에서 중복 접수되지 않습니다.
+- 배치: 여러 마켓의 신호가 동시에 들어오면 큐에 쌓인 주문을 한 번에 꺼내, 매도 수량 확인을 위한 잔고 조회를
+  한 번으로 합치고 주문은 동시에 제출합니다. 제출 속도는 RateLimiter의 order 그룹 쿼터가 조절합니다.
+- 잔고 캐시는 주문이 접수되면 무효화됩니다.
+"""
+from typing import Dict, List, Optional
+from collections import OrderedDict, deque
+import asyncio
+import logging
+import time
+import uuid
+from .upbit_service import UpbitService
+from ..core import metrics
+
+logger = logging.getLogger(__name__)
+
+# identifier 생성용 네임스페이스 (값 자체는 의미 없이 고정되어 있기만 하면 됩니다)
+ORDER_NAMESPACE = uuid.UUID('7b0c6a52-3f1e-4d8a-9a57-2f4be1c0d9e3')
+
+
+def order_identifier(market: str, strategy_name: str, action: str, signal_key) -> str:
+    """같은 신호에 대해 항상 같은 주문 ID를 만듭니다. signal_key는 보통 신호를 낸 봉의 타임스탬프입니다."""
+    return str(uuid.uuid5(ORDER_NAMESPACE, f"{market}:{strategy_name}:{action}:{signal_key}"))
+
+
+class OrderRequest:
+    """큐에서 대기 중인 주문 하나입니다."""
+
+    def __init__(self, market: str, action: str, identifier: str, amount: Optional[float], volume: Optional[float]):
+        self.market = market
+        self.action = action  # buy | sell
+        self.identifier = identifier
+        self.amount = amount  # 시장가 매수 총액 (호가 통화)
+        self.volume = volume  # 시장가 매도 수량 (None이면 전량)
+        self.enqueued_at = time.perf_counter()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class OrderExecutor:
+    """
+    주문 큐를 하나의 워커가 배치 단위로 처리합니다.
+    큐가 비어 있으면 바로 다음 주문을 기다리므로, 동시에 들어온 주문만 묶이고 추가 대기 시간은 없습니다.
+    """
+
+    def __init__(self, upbit_service: UpbitService, order_amount: float = 10000, history_size: int = 10000):
+        """
+        Args:
+            order_amount: 금액을 지정하지 않은 시장가 매수의 기본 주문 총액
+            history_size: 중복 제출을 막기 위해 기억할 완료 주문 수
+        """
+        self.upbit_service = upbit_service
+        self.order_amount = order_amount
+        self.history_size = history_size
+        self._queue: "asyncio.Queue[OrderRequest]" = asyncio.Queue()
+        self._pending: Dict[str, OrderRequest] = {}
+        self._completed: "OrderedDict[str, Dict]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+        self.submitted = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.max_batch_size = 0
+        self._latencies = deque(maxlen=1000)  # 큐 진입 → 거래소 응답 (초)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._worker())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for request in self._pending.values():
+            if not request.future.done():
+                request.future.cancel()
+        self._pending.clear()
+
+    async def submit(
+        self,
+        market: str,
+        action: str,
+        identifier: str,
+        amount: Optional[float] = None,
+        volume: Optional[float] = None,
+    ) -> Optional[Dict]:
+        """
+        주문을 큐에 넣고 거래소 응답을 기다립니다.
+        같은 identifier의 주문이 이미 처리 중이거나 완료되었으면 새로 제출하지 않고 그 결과를 반환합니다.
+        Returns:
+            Optional[Dict]: 주문 응답. 매도할 잔고가 없으면 None
+        """
+        if action not in ('buy', 'sell'):
+            raise ValueError(f"Unknown order action: {action}")
+        if identifier in self._completed:
+            self.duplicates += 1
+            return self._completed[identifier]
+        request = self._pending.get(identifier)
+        if request is not None:
+            self.duplicates += 1
+        else:
+            if self._task is None:
+                await self.start()
+            request = OrderRequest(market, action, identifier, amount, volume)
+            self._pending[identifier] = request
+            self._queue.put_nowait(request)
+        return await asyncio.shield(request.future)
+
+    async def _worker(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._execute_batch(batch)
+            except Exception as e:
+                for request in batch:
+                    self._finish(request, error=e)
+
+    async def _execute_batch(self, batch: List[OrderRequest]) -> None:
+        self.batches += 1
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+        metrics.ORDER_BATCH_SIZE.observe(len(batch))
+        sells = [r for r in batch if r.action == 'sell' and r.volume is None]
+        if sells:
+            # 전량 매도 주문들의 수량은 잔고 조회 한 번으로 채웁니다.
+            # Upbit 잔고는 통화마다 하나이고, unit_currency는 평균 매수가의 기준 통화일 뿐 마켓과는 상관없습니다.
+            balances = {
+                account['currency']: account
+                for account in await self.upbit_service.get_accounts()
+            }
+            for request in sells:
+                account = balances.get(request.market.split('-', 1)[1])
+                request.volume = float(account['balance']) if account else 0.0
+        await asyncio.gather(*(self._execute(request) for request in batch))
+        # 배치 안의 주문이 체결되어 잔고가 바뀌었으므로 다음 조회는 새로 받습니다.
+        self.upbit_service.invalidate_accounts()
+
+    async def _execute(self, request: OrderRequest) -> None:
+        try:
+            if request.action == 'buy':
+                order = await self.upbit_service.create_order(
+                    market=request.market,
+                    side='bid',
+                    price=request.amount or self.order_amount,
+                    ord_type='price',
+                    identifier=request.identifier,
+                )
+            elif request.volume and request.volume > 0:
+                order = await self.upbit_service.create_order(
+                    market=request.market,
+                    side='ask',
+                    volume=request.volume,
+                    ord_type='market',
+                    identifier=request.identifier,
+                )
+            else:
+                order = None
+        except Exception as e:
+            self._finish(request, error=e)
+        else:
+            self._finish(request, order)
+
+    def _finish(self, request: OrderRequest, order: Optional[Dict] = None, error: Optional[Exception] = None) -> None:
+        self._pending.pop(request.identifier, None)
+        if request.future.done():
+            return
+        latency = time.perf_counter() - request.enqueued_at
+        self._latencies.append(latency)
+        outcome = 'error' if error is not None else ('skipped' if order is None else 'accepted')
+        metrics.ORDER_ROUND_TRIP_SECONDS.labels(request.action, outcome).observe(latency)
+        if error is not None:
+            self.failed += 1
+            logger.warning(
+                "order failed",
+                exc_info=error,
+                extra={'market': request.market, 'action': request.action, 'identifier': request.identifier},
+            )
+            request.future.set_exception(error)
+            # 기다리는 쪽이 없어도 "exception was never retrieved" 경고가 나지 않게 합니다.
+            request.future.exception()
+            return
+        if order is not None:
+            self.submitted += 1
+        self._completed[request.identifier] = order
+        while len(self._completed) > self.history_size:
+            self._completed.popitem(last=False)
+        request.future.set_result(order)
+
+    def stats(self) -> Dict:
+        """모니터링용 실행 통계를 반환합니다. 지연 시간은 최근 주문 기준(ms)입니다."""
+        latencies = sorted(self._latencies)
+
+        def percentile(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+
+        return {
+            'submitted': self.submitted,
+            'failed': self.failed,
+            'duplicates': self.duplicates,
+            'pending': len(self._pending),
+            'batches': self.batches,
+            'max_batch_size': self.max_batch_size,
+            'latency_p50_ms': percentile(0.5),
+            'latency_p99_ms': percentile(0.99),
+            'latency_max_ms': latencies[-1] * 1000 if latencies else None,
+        }
@@ -0,0 +1,199 @@
+from typing import AsyncIterator, Dict, List, Optional
+from collections import deque
+from datetime import datetime, timezone
+import argparse
+import asyncio
+from .candle_frame import CandleFrame
+from .candle_store import CandleStoreNotConfiguredError, UNIT_INTERVAL_MS
+
+# Upbit 캔들 API가 한 번에 돌려주는 최대 개수
+PAGE_SIZE = 200
+
+
+def format_cursor(ts_ms: int) -> str:
+    """UTC ms를 Upbit to 파라미터 형식(yyyy-MM-dd HH:mm:ss, UTC)으로 변환합니다."""
+    return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def to_utc_ms(value: datetime) -> int:
+    """datetime을 UTC ms로 변환합니다. tzinfo가 없으면 UTC로 간주합니다."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+class HistoryLoader:
+    """
+    to 커서를 과거 방향으로 이동하며 200개 제한을 넘는 캔들 이력을 내려받습니다.
+
+    봉 간격이 일정하므로 각 페이지의 커서를 미리 계산할 수 있어,
+    여러 페이지를 동시에(레이트 리미터 범위 안에서) 요청하고 순서대로 내보냅니다.
+    거래가 없어 빠진 분봉 때문에 페이지가 겹치는 경우, 각 페이지는
+    자신의 커서 구간 [T(k+1), T(k)) 안의 봉만 남겨 중복을 제거합니다.
+    """
+
+    def __init__(self, upbit_service, concurrency: int = 8):
+        self.upbit_service = upbit_service
+        self.concurrency = concurrency
+
+    async def pages(
+        self,
+        market: str,
+        unit: str = 'days',
+        count: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> AsyncIterator[CandleFrame]:
+        """
+        중복이 제거된 캔들 페이지를 최신 구간부터 과거 방향으로 내보냅니다.
+        각 페이지는 오래된 순으로 정렬된 컬럼형 CandleFrame입니다.
+        Args:
+            market: 마켓 코드 (예: KRW-BTC)
+            unit: 봉 단위 (days, minutes/1 등)
+            count: 받을 봉 개수 (생략 시 start 또는 상장 시점까지)
+            start: 가장 오래된 봉 시각 (UTC, 포함)
+            end: 가장 최근 봉 시각 (UTC, 제외, 생략 시 진행 중인 봉까지)
+        """
+        interval = UNIT_INTERVAL_MS[unit]
+        span = PAGE_SIZE * interval
+        start_ts = to_utc_ms(start) if start else None
+        if end is not None:
+            top = to_utc_ms(end)
+        else:
+            now = int(datetime.now(timezone.utc).timestamp() * 1000)
+            top = (now // interval + 1) * interval
+
+        def cursor(k: int) -> int:
+            return top - k * span
+
+        def page_size(k: int) -> int:
+            size = PAGE_SIZE
+            if count is not None:
+                size = min(size, count - k * PAGE_SIZE)
+            if start_ts is not None:
+                # start까지 남은 봉 수보다 많이 받지 않습니다.
+                size = min(size, -(-(cursor(k) - start_ts) // interval))
+            return size
+
+        def has_page(k: int) -> bool:
+            if count is not None and page_size(k) <= 0:
+                return False
+            if start_ts is not None and cursor(k) <= start_ts:
+                return False
+            return True
+
+        async def fetch(k: int) -> CandleFrame:
+            to = None if (k == 0 and end is None) else format_cursor(cursor(k))
+            return await self.upbit_service._fetch_candles(unit, market, page_size(k), to)
+
+        pending: deque = deque()
+        next_page = 0
+        received = 0
+        oldest_ts = None
+        try:
+            while True:
+                while has_page(next_page) and len(pending) < self.concurrency:
+                    pending.append((next_page, asyncio.create_task(fetch(next_page))))
+                    next_page += 1
+                if not pending:
+                    break
+
+                k, task = pending.popleft()
+                raw = await task
+                lower = max(cursor(k + 1), start_ts) if start_ts is not None else cursor(k + 1)
+                lo = int(raw.timestamp.searchsorted(lower))
+                hi = len(raw) if (k == 0 and end is None) else int(raw.timestamp.searchsorted(cursor(k)))
+                page = raw[lo:hi]
+                if len(page):
+                    received += len(page)
+                    oldest_ts = int(page.timestamp[0])
+                    yield page
+                if len(raw) < page_size(k):
+                    # 상장 시점에 도달했으므로 이후 페이지는 비어 있습니다.
+                    return
+
+            # 빠진 봉 때문에 count에 못 미치면 가장 오래된 봉부터 순차적으로 채웁니다.
+            while count is not None and received < count and oldest_ts is not None:
+                requested = min(PAGE_SIZE, count - received)
+                raw = await self.upbit_service._fetch_candles(unit, market, requested, format_cursor(oldest_ts))
+                page = raw if start_ts is None else raw[int(raw.timestamp.searchsorted(start_ts)):]
+                if len(page):
+                    received += len(page)
+                    oldest_ts = int(page.timestamp[0])
+                    yield page
+                if len(raw) < requested or len(page) < len(raw):
+                    return
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def stream(
+        self,
+        market: str,
+        unit: str = 'days',
+        count: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> AsyncIterator[CandleFrame]:
+        """pages()의 별칭입니다. 컬럼형 청크를 최신 구간부터 내보냅니다."""
+        async for page in self.pages(market, unit, count, start, end):
+            yield page
+
+    async def fetch(
+        self,
+        market: str,
+        unit: str = 'days',
+        count: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> CandleFrame:
+        """모든 페이지를 받아 하나의 CandleFrame으로 합쳐 반환합니다."""
+        pages = [page async for page in self.pages(market, unit, count, start, end)]
+        if not pages:
+            return CandleFrame.empty(market, unit)
+        return CandleFrame.concat(pages[::-1])
+
+    async def backfill(self, markets: List[str], unit: str, start: datetime) -> Dict[str, int]:
+        """
+        여러 마켓의 start 이후 이력을 동시에 받아 로컬 캔들 저장소에 저장합니다.
+        Returns:
+            Dict[str, int]: 마켓별 저장한 봉 개수
+        """
+        store = self.upbit_service.candle_store
+        if store is None:
+            raise CandleStoreNotConfiguredError()
+
+        async def backfill_market(market: str) -> int:
+            saved = 0
+            async for page in self.pages(market, unit, start=start):
+                saved += await asyncio.to_thread(store.upsert, market, unit, page)
+            return saved
+
+        results = await asyncio.gather(*(backfill_market(market) for market in markets))
+        return dict(zip(markets, results))
+
+
+async def _main(args) -> None:
+    from app.core.deps import create_candle_store, create_upbit_service
+
+    candle_store = create_candle_store()
+    upbit_service = create_upbit_service(candle_store)
+    try:
+        loader = HistoryLoader(upbit_service, concurrency=args.concurrency)
+        start = datetime.strptime(args.start, '%Y-%m-%d')
+        saved = await loader.backfill(args.markets, args.unit, start)
+        for market, n in saved.items():
+            print(f"{market}: {n} candles")
+    finally:
+        await upbit_service.close()
+        if candle_store is not None:
+            candle_store.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Upbit 캔들 이력을 로컬 저장소로 백필합니다.")
+    parser.add_argument('markets', nargs='+', help="마켓 코드 (예: KRW-BTC)")
+    parser.add_argument('--unit', default='days', help="봉 단위 (days, minutes/1, minutes/5 ...)")
+    parser.add_argument('--start', required=True, help="시작 날짜 (YYYY-MM-DD, UTC)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,212 @@
+"""
+(markets × bars) 2차원 배열 위에서 동작하는 벡터화 지표 함수 모음입니다.
+1차원 배열을 넘기면 한 마켓으로 취급하고 같은 모양으로 돌려줍니다.
+창이 채워지지 않았거나 창 안에 NaN(상장 전 구간 등)이 있으면 결과는 NaN입니다.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from .candle_frame import CandleFrame
+
+
+def _as_2d(values) -> Tuple[np.ndarray, bool]:
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 1:
+        return array[np.newaxis, :], True
+    return array, False
+
+
+def _restore(result: np.ndarray, squeeze: bool) -> np.ndarray:
+    return result[0] if squeeze else result
+
+
+def stack(frames: Sequence[CandleFrame], field: str = 'close', length: Optional[int] = None) -> np.ndarray:
+    """
+    여러 CandleFrame의 컬럼을 최근 봉 기준으로 맞춰 (markets × bars) 배열로 쌓습니다.
+    길이가 다른 마켓은 앞부분을 NaN으로 채웁니다.
+    Args:
+        frames: 마켓별 캔들 프레임
+        field: open, high, low, close, volume, value 중 하나
+        length: 사용할 최근 봉 개수 (생략 시 가장 긴 프레임 길이)
+    """
+    if length is None:
+        length = max((len(f) for f in frames), default=0)
+    matrix = np.full((len(frames), length), np.nan)
+    for i, frame in enumerate(frames):
+        column = getattr(frame, field)[-length:] if length else getattr(frame, field)[:0]
+        if len(column):
+            matrix[i, length - len(column):] = column
+    return matrix
+
+
+def _window_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """누적합으로 각 창의 합을 구합니다. 결과 길이는 n - window + 1 입니다."""
+    csum = np.cumsum(np.pad(x, ((0, 0), (1, 0))), axis=1)
+    return csum[:, window:] - csum[:, :-window]
+
+
+def _window_has_nan(x: np.ndarray, window: int) -> np.ndarray:
+    return _window_sum(np.isnan(x).astype(np.float64), window) > 0
+
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    """누적합을 이용한 O(n) 이동평균(SMA)입니다."""
+    x, squeeze = _as_2d(values)
+    result = np.full(x.shape, np.nan)
+    if 0 < window <= x.shape[1]:
+        mean = _window_sum(np.nan_to_num(x), window) / window
+        mean[_window_has_nan(x, window)] = np.nan
+        result[:, window - 1:] = mean
+    return _restore(result, squeeze)
+
+
+def rolling_std(values, window: int, ddof: int = 0) -> np.ndarray:
+    """제곱 누적합을 이용한 O(n) 이동 표준편차입니다. (ddof=0이면 np.std와 같음)"""
+    x, squeeze = _as_2d(values)
+    result = np.full(x.shape, np.nan)
+    if 0 < window <= x.shape[1] and window > ddof:
+        # 수치 오차를 줄이기 위해 행별 평균을 빼고 계산합니다.
+        with np.errstate(invalid='ignore'):
+            centered = np.nan_to_num(x - np.nanmean(x, axis=1, keepdims=True))
+        s1 = _window_sum(centered, window)
+        s2 = _window_sum(centered * centered, window)
+        std = np.sqrt(np.maximum((s2 - s1 * s1 / window) / (window - ddof), 0.0))
+        std[_window_has_nan(x, window)] = np.nan
+        result[:, window - 1:] = std
+    return _restore(result, squeeze)
+
+
+def _rolling_extreme(values, window: int, func) -> np.ndarray:
+    """
+    van Herk/Gil-Werman 알고리즘으로 창 크기와 무관한 O(n) 이동 최대/최소를 구합니다.
+    window 단위 블록마다 앞→뒤 누적값(prefix)과 뒤→앞 누적값(suffix)을 만든 뒤
+    각 창의 결과를 suffix[i]와 prefix[i + window - 1]의 비교 한 번으로 얻습니다.
+    """
+    x, squeeze = _as_2d(values)
+    rows, n = x.shape
+    result = np.full(x.shape, np.nan)
+    if window <= 0 or window > n:
+        return _restore(result, squeeze)
+    fill = -np.inf if func is np.maximum else np.inf
+    blocks = -(-n // window)
+    padded = np.full((rows, blocks * window), fill)
+    padded[:, :n] = x
+    shaped = padded.reshape(rows, blocks, window)
+    prefix = func.accumulate(shaped, axis=2).reshape(rows, -1)
+    suffix = func.accumulate(shaped[:, :, ::-1], axis=2)[:, :, ::-1].reshape(rows, -1)
+    result[:, window - 1:] = func(suffix[:, :n - window + 1], prefix[:, window - 1:n])
+    return _restore(result, squeeze)
+
+
+def rolling_max(values, window: int) -> np.ndarray:
+    """이동 최댓값 (Donchian 상단)"""
+    return _rolling_extreme(values, window, np.maximum)
+
+
+def rolling_min(values, window: int) -> np.ndarray:
+    """이동 최솟값 (Donchian 하단)"""
+    return _rolling_extreme(values, window, np.minimum)
+
+
+def ema(values, alpha: float, seed=None, seed_window: int = 1) -> np.ndarray:
+    """
+    지수이동평균 ema[t] = ema[t-1] + alpha * (x[t] - ema[t-1]) 을 계산합니다.
+    마켓 축은 벡터화하고 봉 축만 순차 계산합니다.
+    Args:
+        values: (markets × bars) 또는 (bars,) 배열
+        alpha: 평활 계수 (0 < alpha <= 1)
+        seed: 첫 봉 이전의 EMA 값 (마켓별 배열 또는 스칼라). 생략 시 첫 봉 값으로 시작합니다.
+        seed_window: seed가 없을 때 처음 seed_window개 값의 평균으로 시작합니다. (RunningEMA와 동일)
+    """
+    x, squeeze = _as_2d(values)
+    result = np.empty(x.shape)
+    if x.shape[1] == 0:
+        return _restore(result, squeeze)
+    start = rolling_mean(x, seed_window) if seed is None and seed_window > 1 else x
+    if seed is None:
+        prev = start[:, 0].copy()
+    else:
+        prev = np.broadcast_to(np.asarray(seed, dtype=np.float64), (x.shape[0],)).copy()
+        prev += alpha * (x[:, 0] - prev)
+    result[:, 0] = prev
+    for t in range(1, x.shape[1]):
+        # 상장 전(NaN) 구간이나 seed 창이 끝나는 봉에서 해당 마켓의 EMA를 시작합니다.
+        # RunningEMA와 같은 식으로 갱신해 증분 계산과 반올림 오차까지 일치시킵니다.
+        prev = np.where(np.isnan(prev), start[:, t], prev + alpha * (x[:, t] - prev))
+        result[:, t] = prev
+    return _restore(result, squeeze)
+
+
+def pct_change(values) -> np.ndarray:
+    """봉 간 수익률 (x[t] / x[t-1] - 1). 결과는 봉 축이 하나 짧습니다."""
+    x, squeeze = _as_2d(values)
+    return _restore(np.diff(x, axis=1) / x[:, :-1], squeeze)
+
+
+def average_range(high, low, window: int) -> np.ndarray:
+    """(고가 - 저가)의 이동평균입니다."""
+    h, squeeze = _as_2d(high)
+    l, _ = _as_2d(low)
+    return _restore(rolling_mean(h - l, window), squeeze)
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True Range = max(고가-저가, |고가-전일종가|, |저가-전일종가|)"""
+    h, squeeze = _as_2d(high)
+    l, _ = _as_2d(low)
+    c, _ = _as_2d(close)
+    prev_close = np.concatenate([c[:, :1], c[:, :-1]], axis=1)
+    tr = np.maximum(h - l, np.maximum(np.abs(h - prev_close), np.abs(l - prev_close)))
+    return _restore(tr, squeeze)
+
+
+def average_true_range(high, low, close, window: int) -> np.ndarray:
+    """True Range의 이동평균(ATR)입니다."""
+    return rolling_mean(true_range(high, low, close), window)
+
+
+def volatility(close, window: int) -> np.ndarray:
+    """최근 window개 수익률의 표준편차입니다. 결과는 봉 축이 하나 짧습니다."""
+    return rolling_std(pct_change(close), window)
+
+
+def shift(values, periods: int = 1) -> np.ndarray:
+    """봉 축으로 periods만큼 뒤로 민 배열을 반환합니다. 앞부분은 NaN."""
+    x, squeeze = _as_2d(values)
+    result = np.full(x.shape, np.nan)
+    if periods < x.shape[1]:
+        result[:, periods:] = x[:, :x.shape[1] - periods]
+    return _restore(result, squeeze)
+
+
+def latest(values) -> np.ndarray:
+    """각 마켓의 마지막 봉 값을 반환합니다."""
+    x, squeeze = _as_2d(values)
+    result = x[:, -1]
+    return result[0] if squeeze else result
+
+
+def counter_trend_levels(high, low, n_days: int, k_value: float) -> Dict[str, np.ndarray]:
+    """
+    역추세 진입 레벨을 봉마다 계산합니다.
+    t 시점의 레벨은 t-1 봉의 고가/저가와 그 이전 n_days개 봉의 평균 변동폭으로 정합니다.
+    Returns:
+        Dict: {'long': 롱 진입 레벨, 'short': 숏 진입 레벨, 'avg_range': 평균 변동폭}
+    """
+    avg_range = shift(average_range(high, low, n_days), 2)
+    prev_high = shift(high, 1)
+    prev_low = shift(low, 1)
+    return {
+        'long': prev_high - k_value * avg_range,
+        'short': prev_low + k_value * avg_range,
+        'avg_range': avg_range,
+    }
+
+
+def donchian(high, low, n_days: int) -> Dict[str, np.ndarray]:
+    """
+    t 시점 이전 n_days개 봉의 최고가/최저가 채널입니다. (t 봉 자신은 제외)
+    """
+    return {
+        'upper': shift(rolling_max(high, n_days), 1),
+        'lower': shift(rolling_min(low, n_days), 1),
+    }
@@ -0,0 +1,323 @@
+"""
+Upbit WebSocket 시세 수집 모듈입니다.
+
+하나의 연결로 모든 활성 마켓의 ticker/trade/orderbook을 구독하고,
+체결(trade)을 프로세스 안에서 봉으로 집계한 뒤 MarketDataBus로 구독자에게 전달합니다.
+"""
+from typing import Dict, Iterable, List, Optional, Set
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+UPBIT_WEBSOCKET_URL = "wss://api.upbit.com/websocket/v1"
+DEFAULT_TYPES = ('ticker', 'trade', 'orderbook')
+
+
+class Subscription:
+    """
+    MarketDataBus 구독자입니다. 이벤트 타입/마켓 필터와 자신만의 bounded queue를 가집니다.
+    policy가 'block'이면 큐가 찰 때 발행자가 기다리고(역압),
+    'drop_oldest'면 가장 오래된 이벤트를 버리고 최신 이벤트를 넣습니다.
+    """
+
+    def __init__(
+        self,
+        bus: "MarketDataBus",
+        types: Optional[Iterable[str]] = None,
+        markets: Optional[Iterable[str]] = None,
+        maxsize: int = 1000,
+        policy: str = 'drop_oldest',
+    ):
+        if policy not in ('block', 'drop_oldest'):
+            raise ValueError(f"Unknown policy: {policy}")
+        self.bus = bus
+        self.types: Optional[Set[str]] = set(types) if types is not None else None
+        self.markets: Optional[Set[str]] = set(markets) if markets is not None else None
+        self.policy = policy
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def matches(self, event: Dict) -> bool:
+        if self.types is not None and event.get('type') not in self.types:
+            return False
+        if self.markets is not None and event.get('code') not in self.markets:
+            return False
+        return True
+
+    async def put(self, event: Dict) -> None:
+        if self.policy == 'block':
+            await self.queue.put(event)
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Dict:
+        return await self.queue.get()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict:
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+
+class MarketDataBus:
+    """수집한 시세 이벤트를 구독자들에게 비동기로 나눠 주는 fan-out 버스입니다."""
+
+    def __init__(self):
+        self._subscribers: List[Subscription] = []
+        self.published = 0
+
+    def subscribe(
+        self,
+        types: Optional[Iterable[str]] = None,
+        markets: Optional[Iterable[str]] = None,
+        maxsize: int = 1000,
+        policy: str = 'drop_oldest',
+    ) -> Subscription:
+        subscription = Subscription(self, types, markets, maxsize, policy)
+        self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.remove(subscription)
+
+    async def publish(self, event: Dict) -> None:
+        self.published += 1
+        for subscription in list(self._subscribers):
+            if subscription.matches(event):
+                await subscription.put(event)
+
+    def stats(self) -> Dict:
+        return {
+            'published': self.published,
+            'subscribers': len(self._subscribers),
+            'dropped': sum(s.dropped for s in self._subscribers),
+            'queued': sum(s.queue.qsize() for s in self._subscribers),
+        }
+
+
+class BarAggregator:
+    """
+    체결 이벤트를 봉 단위로 집계합니다.
+    체결 시각이 다음 구간으로 넘어가면 이전 봉을 마감하여 돌려줍니다.
+    이미 마감한 구간의 늦은 체결은 버려서, 같은 구간의 일부만 담긴 봉이 다시 마감되지 않게 합니다.
+    """
+
+    def __init__(self, units: Dict[str, int]):
+        """
+        Args:
+            units: 봉 단위 이름 → 간격(ms). 예) {'minutes/1': 60000, 'days': 86400000}
+        """
+        self.units = units
+        self._bars: Dict[tuple, Dict] = {}
+        # (마켓, 단위)별 마지막으로 마감한 봉의 시작 시각
+        self._closed: Dict[tuple, int] = {}
+
+    def add_trade(self, market: str, price: float, volume: float, timestamp: int) -> List[Dict]:
+        """
+        체결 하나를 반영합니다.
+        Returns:
+            List[Dict]: 이번 체결로 마감된 봉 이벤트 목록
+        """
+        closed = []
+        for unit, interval in self.units.items():
+            start = timestamp - timestamp % interval
+            key = (market, unit)
+            if start <= self._closed.get(key, -1):
+                continue
+            bar = self._bars.get(key)
+            if bar is not None and start > bar['timestamp']:
+                closed.append(self._close(market, unit, bar))
+                bar = None
+            if bar is None:
+                self._bars[key] = {
+                    'timestamp': start,
+                    'open': price,
+                    'high': price,
+                    'low': price,
+                    'close': price,
+                    'volume': volume,
+                    'value': price * volume,
+                }
+            elif start == bar['timestamp']:
+                bar['high'] = max(bar['high'], price)
+                bar['low'] = min(bar['low'], price)
+                bar['close'] = price
+                bar['volume'] += volume
+                bar['value'] += price * volume
+        return closed
+
+    def flush(self, now: int) -> List[Dict]:
+        """체결이 없어 마감되지 못한 봉 중 구간이 지난 봉들을 마감합니다."""
+        closed = []
+        for (market, unit), bar in list(self._bars.items()):
+            if now >= bar['timestamp'] + self.units[unit]:
+                closed.append(self._close(market, unit, bar))
+                del self._bars[(market, unit)]
+        return closed
+
+    def _close(self, market: str, unit: str, bar: Dict) -> Dict:
+        self._closed[(market, unit)] = bar['timestamp']
+        return self._bar_event(market, unit, bar, True)
+
+    def current(self, market: str, unit: str) -> Optional[Dict]:
+        """진행 중인 봉을 반환합니다."""
+        return self._bars.get((market, unit))
+
+    @staticmethod
+    def _bar_event(market: str, unit: str, bar: Dict, closed: bool) -> Dict:
+        return {'type': 'bar', 'code': market, 'unit': unit, 'closed': closed, 'bar': dict(bar)}
+
+
+class UpbitWebSocketClient:
+    """
+    하나의 WebSocket 연결로 활성 마켓 전체를 구독하는 수집기입니다.
+    연결이 끊기면 지수 백오프로 재연결하고, 마켓 목록이 바뀌면 구독 메시지를 다시 보냅니다.
+    """
+
+    def __init__(
+        self,
+        bus: MarketDataBus,
+        url: str = UPBIT_WEBSOCKET_URL,
+        types: Iterable[str] = DEFAULT_TYPES,
+        bar_units: Optional[Dict[str, int]] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        record_path: Optional[str] = None,
+        flush_interval: float = 1.0,
+    ):
+        self.bus = bus
+        self.url = url
+        self.types = tuple(types)
+        self.aggregator = BarAggregator(bar_units or {'minutes/1': 60_000, 'days': 86_400_000})
+        self.record_path = record_path
+        self.flush_interval = flush_interval
+        self.markets: Set[str] = set()
+        self.last_prices: Dict[str, float] = {}
+        self.connected = asyncio.Event()
+        self._session = session
+        self._owns_session = session is None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._record_file = None
+        self.reconnects = 0
+
+    def subscribe_message(self) -> List[Dict]:
+        codes = sorted(self.markets)
+        message: List[Dict] = [{'ticket': str(uuid.uuid4())}]
+        for event_type in self.types:
+            message.append({'type': event_type, 'codes': codes})
+        message.append({'format': 'DEFAULT'})
+        return message
+
+    async def set_markets(self, markets: Iterable[str]) -> None:
+        """구독 마켓 목록을 바꾸고, 연결되어 있으면 구독 메시지를 다시 보냅니다."""
+        markets = set(markets)
+        if markets == self.markets:
+            return
+        self.markets = markets
+        if self._ws is not None and not self._ws.closed and self.markets:
+            await self._ws.send_json(self.subscribe_message())
+
+    async def add_markets(self, markets: Iterable[str]) -> None:
+        await self.set_markets(self.markets | set(markets))
+
+    async def remove_markets(self, markets: Iterable[str]) -> None:
+        await self.set_markets(self.markets - set(markets))
+
+    def last_price(self, market: str) -> Optional[float]:
+        return self.last_prices.get(market)
+
+    async def start(self) -> None:
+        if self._task is None:
+            if self._session is None:
+                self._session = aiohttp.ClientSession()
+            if self.record_path:
+                self._record_file = open(self.record_path, 'a', encoding='utf-8')
+            self._task = asyncio.create_task(self._run())
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._flush_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._flush_task = None
+        if self._ws is not None:
+            await self._ws.close()
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._record_file is not None:
+            self._record_file.close()
+            self._record_file = None
+
+    async def _run(self) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                async with self._session.ws_connect(self.url, heartbeat=30) as ws:
+                    self._ws = ws
+                    self.connected.set()
+                    backoff = 0.5
+                    if self.markets:
+                        await ws.send_json(self.subscribe_message())
+                    async for message in ws:
+                        if message.type in (aiohttp.WSMsgType.BINARY, aiohttp.WSMsgType.TEXT):
+                            await self.handle_message(message.data)
+                        elif message.type == aiohttp.WSMsgType.ERROR:
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("market data websocket disconnected", exc_info=True, extra={'url': self.url})
+            finally:
+                self._ws = None
+                self.connected.clear()
+            self.reconnects += 1
+            await asyncio.sleep(random.uniform(0, backoff))
+            backoff = min(backoff * 2, 30)
+
+    async def _flush_loop(self) -> None:
+        # 체결이 없던 마켓의 봉도 구간이 지나면 마감합니다.
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            for event in self.aggregator.flush(int(time.time() * 1000)):
+                await self.bus.publish(event)
+
+    async def handle_message(self, data) -> None:
+        """수신한 메시지 하나를 파싱하여 버스로 발행합니다."""
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        if self._record_file is not None:
+            self._record_file.write(data + '\n')
+        event = json.loads(data)
+        event_type = event.get('type')
+        if event_type is None or 'code' not in event:
+            return
+        if event_type == 'ticker':
+            self.last_prices[event['code']] = event['trade_price']
+        await self.bus.publish(event)
+        if event_type == 'trade':
+            self.last_prices[event['code']] = event['trade_price']
+            closed = self.aggregator.add_trade(
+                event['code'], event['trade_price'], event['trade_volume'], event['trade_timestamp']
+            )
+            for bar_event in closed:
+                await self.bus.publish(bar_event)
@@ -0,0 +1,257 @@
+"""
+오프라인 테스트와 지연 시간 측정을 위한 로컬 모의 거래소(Upbit REST API 일부)입니다.
+UPBIT_API_URL을 이 서버로 바꾸면 실제 주문 없이 주문 실행 경로 전체를 검증할 수 있습니다.
+
+- JWT 서명(HS256)과 query_hash를 실제 거래소처럼 검증합니다.
+- 시장가 주문(price/market)은 현재가로 즉시 체결하고 잔고에 반영합니다. 지정가 주문은 대기(wait) 상태로 둡니다.
+- identifier가 이미 쓰였으면 400으로 거절합니다.
+- 주문 API는 초당 쿼터를 넘으면 429를 돌려주며, 모든 응답에 Remaining-Req 헤더를 붙입니다.
+- 캔들 프레임을 넘기면 /candles/{unit}도 count/to 파라미터대로 응답합니다. (벤치마크/오프라인 테스트용 시세)
+
+    python -m app.services.mock_exchange --port 8780 --latency 0.005 --markets KRW-BTC KRW-ETH
+"""
+from typing import Dict, List, Optional, Sequence
+import argparse
+import asyncio
+import hashlib
+import json
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+import jwt
+from aiohttp import web
+from .rate_limiter import TokenBucket
+from .candle_frame import CandleFrame
+
+DEFAULT_FEE = 0.0005
+
+
+class MockExchange:
+    """모의 거래소의 계좌/주문 상태입니다."""
+
+    def __init__(
+        self,
+        prices: Dict[str, float],
+        balances: Optional[Dict[str, float]] = None,
+        access_key: str = 'mock-access-key',
+        secret_key: str = 'mock-secret-key-for-local-testing-only',
+        latency: float = 0.0,
+        order_rate: float = 8,
+        exchange_rate: float = 30,
+        fee: float = DEFAULT_FEE,
+        frames: Optional[Sequence[CandleFrame]] = None,
+    ):
+        """
+        Args:
+            prices: 마켓별 현재가 (frames가 있으면 빠진 마켓은 마지막 종가)
+            balances: 통화별 초기 잔고 (기본 KRW 1억)
+            latency: 요청마다 더할 처리 지연 (초)
+            order_rate, exchange_rate: 주문/기타 거래 API의 초당 쿼터
+        """
+        self.frames = {(f.market, f.unit): f for f in frames or ()}
+        self.prices = {f.market: float(f.close[-1]) for f in frames or () if len(f)}
+        self.prices.update(prices)
+        self.balances = dict(balances or {'KRW': 100_000_000.0})
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.latency = latency
+        self.fee = fee
+        self.buckets = {
+            'order': TokenBucket(order_rate, order_rate),
+            'exchange': TokenBucket(exchange_rate, exchange_rate),
+        }
+        self.orders: Dict[str, Dict] = {}
+        self.identifiers: Dict[str, str] = {}
+        self.rejected = 0
+
+    # ---- 인증 / 쿼터 ----
+
+    def authenticate(self, request: web.Request, params: Dict) -> None:
+        header = request.headers.get('Authorization', '')
+        if not header.startswith('Bearer '):
+            raise _error(401, 'jwt_verification', 'Missing token')
+        try:
+            payload = jwt.decode(header[len('Bearer '):], self.secret_key, algorithms=['HS256'])
+        except jwt.PyJWTError as e:
+            raise _error(401, 'jwt_verification', str(e))
+        if payload.get('access_key') != self.access_key:
+            raise _error(401, 'invalid_access_key', 'Unknown access key')
+        if params:
+            expected = hashlib.sha512(urlencode(params, doseq=True).encode()).hexdigest()
+            if payload.get('query_hash') != expected:
+                raise _error(401, 'invalid_query_payload', 'query_hash mismatch')
+
+    def consume(self, group: str) -> str:
+        """
+        쿼터를 차감하고 Remaining-Req 헤더 값을 돌려줍니다. 쿼터가 없으면 429.
+        분당 쿼터는 흉내 내지 않으므로 헤더에 min을 넣지 않습니다. (min=0이면 클라이언트의 분당 버킷이 비워집니다.)
+        """
+        bucket = self.buckets[group]
+        if bucket.wait_time() > 0:
+            self.rejected += 1
+            raise _error(429, 'too_many_requests', 'Too many requests', {'Remaining-Req': f"group={group}; sec=0"})
+        bucket.tokens -= 1
+        return f"group={group}; sec={int(bucket.tokens)}"
+
+    # ---- 주문 ----
+
+    def _adjust(self, currency: str, amount: float) -> None:
+        balance = self.balances.get(currency, 0.0) + amount
+        if balance < -1e-9:
+            raise _error(400, 'insufficient_funds_' + ('bid' if currency == 'KRW' else 'ask'), 'Insufficient funds')
+        self.balances[currency] = max(balance, 0.0)
+
+    def place_order(self, params: Dict) -> Dict:
+        market = params.get('market')
+        if market not in self.prices:
+            raise _error(400, 'invalid_market', f"Unknown market: {market}")
+        identifier = params.get('identifier')
+        if identifier is not None and identifier in self.identifiers:
+            raise _error(400, 'duplicate_identifier', 'Identifier already used')
+        quote, currency = market.split('-', 1)
+        side, ord_type = params.get('side'), params.get('ord_type')
+        price = self.prices[market]
+        order = {
+            'uuid': str(uuid.uuid4()),
+            'side': side,
+            'ord_type': ord_type,
+            'price': params.get('price'),
+            'state': 'wait',
+            'market': market,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'volume': params.get('volume'),
+            'remaining_volume': params.get('volume'),
+            'executed_volume': '0',
+            'paid_fee': '0',
+            'trades_count': 0,
+            'identifier': identifier,
+        }
+        if side == 'bid' and ord_type == 'price':
+            total = float(params['price'])
+            volume = total * (1 - self.fee) / price
+            self._adjust(quote, -total)
+            self._adjust(currency, volume)
+            order.update(state='cancel', executed_volume=str(volume), paid_fee=str(total * self.fee), trades_count=1)
+        elif side == 'ask' and ord_type == 'market':
+            volume = float(params['volume'])
+            proceeds = volume * price
+            self._adjust(currency, -volume)
+            self._adjust(quote, proceeds * (1 - self.fee))
+            order.update(state='done', executed_volume=str(volume), remaining_volume='0',
+                         paid_fee=str(proceeds * self.fee), trades_count=1)
+        elif ord_type != 'limit' or side not in ('bid', 'ask'):
+            raise _error(400, 'invalid_order', f"Unsupported order: {side} {ord_type}")
+        self.orders[order['uuid']] = order
+        if identifier is not None:
+            self.identifiers[identifier] = order['uuid']
+        return order
+
+    def find_order(self, params: Dict) -> Dict:
+        order_uuid = params.get('uuid') or self.identifiers.get(params.get('identifier'))
+        order = self.orders.get(order_uuid)
+        if order is None:
+            raise _error(404, 'order_not_found', 'Order not found')
+        return order
+
+    def candles(self, unit: str, params: Dict) -> List[Dict]:
+        """Upbit와 같이 to 이전(미포함)의 최근 count개 봉을 최신 봉이 앞에 오도록 반환합니다."""
+        frame = self.frames.get((params.get('market'), unit))
+        if frame is None:
+            raise _error(404, 'not_found', f"No candles for {params.get('market')} {unit}")
+        count = min(int(params.get('count', 1)), 200)
+        end = len(frame)
+        if params.get('to'):
+            to = datetime.fromisoformat(params['to'].replace('Z', '')).replace(tzinfo=timezone.utc)
+            end = int(frame.timestamp.searchsorted(int(to.timestamp() * 1000), side='left'))
+        return frame[max(end - count, 0):end].to_records()
+
+    def accounts(self) -> List[Dict]:
+        return [
+            {'currency': currency, 'balance': str(balance), 'locked': '0',
+             'avg_buy_price': '0', 'avg_buy_price_modified': False, 'unit_currency': 'KRW'}
+            for currency, balance in self.balances.items()
+        ]
+
+
+def _error(status: int, name: str, message: str, headers: Optional[Dict] = None) -> web.HTTPException:
+    body = json.dumps({'error': {'name': name, 'message': message}})
+    error_class = {400: web.HTTPBadRequest, 401: web.HTTPUnauthorized, 404: web.HTTPNotFound,
+                   429: web.HTTPTooManyRequests}[status]
+    return error_class(text=body, content_type='application/json', headers=headers)
+
+
+def create_mock_app(exchange: MockExchange) -> web.Application:
+    """MockExchange를 Upbit와 같은 경로(/v1/...)로 노출하는 aiohttp 앱을 만듭니다."""
+
+    async def private(request: web.Request, group: str, handler):
+        if exchange.latency > 0:
+            await asyncio.sleep(exchange.latency)
+        if request.method == 'POST':
+            params = await request.json()
+        else:
+            params = dict(request.query)
+        exchange.authenticate(request, params)
+        remaining = exchange.consume(group)
+        return web.json_response(handler(params), status=201 if request.method == 'POST' else 200,
+                                 headers={'Remaining-Req': remaining})
+
+    async def accounts(request: web.Request):
+        return await private(request, 'exchange', lambda params: exchange.accounts())
+
+    async def orders(request: web.Request):
+        return await private(request, 'order', exchange.place_order)
+
+    async def order(request: web.Request):
+        return await private(request, 'exchange', exchange.find_order)
+
+    async def ticker(request: web.Request):
+        markets = request.query.get('markets', '').split(',')
+        return web.json_response([
+            {'market': market, 'trade_price': exchange.prices[market]}
+            for market in markets if market in exchange.prices
+        ])
+
+    async def candles(request: web.Request):
+        if exchange.latency > 0:
+            await asyncio.sleep(exchange.latency)
+        return web.json_response(exchange.candles(request.match_info['unit'], dict(request.query)))
+
+    async def market_all(request: web.Request):
+        return web.json_response([
+            {'market': market, 'korean_name': market, 'english_name': market} for market in exchange.prices
+        ])
+
+    app = web.Application()
+    app['exchange'] = exchange
+    app.router.add_get('/v1/accounts', accounts)
+    app.router.add_post('/v1/orders', orders)
+    app.router.add_get('/v1/order', order)
+    app.router.add_get('/v1/ticker', ticker)
+    app.router.add_get('/v1/market/all', market_all)
+    app.router.add_get('/v1/candles/{unit:.+}', candles)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 모의 거래소 (Upbit REST API 일부)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8780)
+    parser.add_argument('--markets', nargs='+', default=['KRW-BTC', 'KRW-ETH'])
+    parser.add_argument('--price', type=float, default=1000.0, help="모든 마켓의 초기 현재가")
+    parser.add_argument('--balance', type=float, default=100_000_000.0, help="초기 KRW 잔고")
+    parser.add_argument('--latency', type=float, default=0.0, help="요청마다 더할 지연 (초)")
+    parser.add_argument('--access-key', default='mock-access-key')
+    parser.add_argument('--secret-key', default='mock-secret-key-for-local-testing-only')
+    args = parser.parse_args()
+    exchange = MockExchange(
+        {market: args.price for market in args.markets},
+        {'KRW': args.balance},
+        access_key=args.access_key,
+        secret_key=args.secret_key,
+        latency=args.latency,
+    )
+    web.run_app(create_mock_app(exchange), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+"""
+전략 파라미터를 병렬로 탐색하는 최적화 모듈입니다.
+
+- 정렬된 캔들 배열은 공유 메모리 블록 하나에 올리고, 워커는 시작 시 한 번만 붙어서(attach) 복사 없이 읽습니다.
+  작업마다 전달되는 것은 파라미터와 구간 인덱스뿐입니다.
+- grid / random 탐색과 walk-forward(학습 구간에서 고른 파라미터를 다음 구간에서 검증) 분할을 지원합니다.
+- 앞부분 구간으로 먼저 평가해 성과가 나쁜 파라미터는 전체 구간 평가 전에 제외합니다. (prune_ratio)
+- 결과는 배치가 끝날 때마다 JSONL 파일에 기록합니다.
+
+    python -m app.services.optimizer KRW-BTC KRW-ETH --strategy counter_trend \\
+        --space '{"kValue": {"min": 1.0, "max": 3.0}, "nDays": [10, 20, 30]}' --random 200 \\
+        --walk-forward 730 180 --out results.jsonl
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+from .backtest import align, compute_stats, load_frames, run_bars, DEFAULT_FEE, DEFAULT_SLIPPAGE
+from .candle_frame import CandleFrame
+from .candle_store import CandleStore
+
+BAR_FIELDS = ('open', 'high', 'low', 'close')
+# 값이 작을수록 좋은 지표
+LOWER_IS_BETTER = {'max_drawdown', 'volatility'}
+
+
+# ---- 공유 메모리 ----
+
+class SharedBars:
+    """
+    align()된 캔들 배열을 하나의 공유 메모리 블록에 담습니다.
+    레이아웃: timestamps(int64, bars) 다음에 (fields × markets × bars) float64 배열
+    """
+
+    def __init__(self, markets: Sequence[str], timestamps: np.ndarray, bars: Dict[str, np.ndarray], unit: str = 'days'):
+        rows, n = bars['close'].shape
+        size = (n + len(BAR_FIELDS) * rows * n) * 8
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 8))
+        np.ndarray((n,), dtype=np.int64, buffer=self.shm.buf)[:] = timestamps
+        block = np.ndarray((len(BAR_FIELDS), rows, n), dtype=np.float64, buffer=self.shm.buf, offset=n * 8)
+        for i, name in enumerate(BAR_FIELDS):
+            block[i] = bars[name]
+        self.spec = {'name': self.shm.name, 'markets': list(markets), 'bars': n, 'unit': unit}
+
+    @classmethod
+    def from_frames(cls, frames: Sequence[CandleFrame]) -> "SharedBars":
+        timestamps, bars = align(frames)
+        return cls([f.market for f in frames], timestamps, bars, frames[0].unit if frames else 'days')
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedBars":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_shared_bars(spec: Dict) -> Tuple[shared_memory.SharedMemory, np.ndarray, Dict[str, np.ndarray]]:
+    """
+    SharedBars.spec으로 공유 메모리에 붙어 복사 없는 배열 뷰를 만듭니다.
+    Returns:
+        (공유 메모리 핸들, timestamps, bars)
+    """
+    # 풀 워커는 부모 프로세스의 리소스 트래커를 공유하므로 블록 해제는 SharedBars.close()가 맡습니다.
+    shm = shared_memory.SharedMemory(name=spec['name'])
+    n, rows = spec['bars'], len(spec['markets'])
+    timestamps = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+    block = np.ndarray((len(BAR_FIELDS), rows, n), dtype=np.float64, buffer=shm.buf, offset=n * 8)
+    return shm, timestamps, {name: block[i] for i, name in enumerate(BAR_FIELDS)}
+
+
+_worker: Dict = {}
+
+
+def _init_worker(spec: Dict) -> None:
+    shm, timestamps, bars = attach_shared_bars(spec)
+    _worker.update(shm=shm, spec=spec, timestamps=timestamps, bars=bars)
+
+
+def _evaluate_batch(
+    strategy_name: str,
+    candidates: List[Dict],
+    start: int,
+    end: int,
+    fee: float,
+    slippage: float,
+    with_equity: bool = False,
+) -> List[Dict]:
+    """워커에서 파라미터 묶음을 [start, end) 구간에 대해 평가합니다. 지표 워밍업에는 start 이전 봉도 사용합니다."""
+    spec = _worker['spec']
+    bars = {name: column[:, :end] for name, column in _worker['bars'].items()}
+    results = []
+    for parameters in candidates:
+        result = run_bars(
+            strategy_name, spec['markets'], _worker['timestamps'][:end], bars,
+            parameters, fee, slippage, spec['unit'], start,
+        )
+        row = {'params': parameters, 'stats': result['stats']}
+        if with_equity:
+            row['equity'] = result['equity']
+        results.append(row)
+    return results
+
+
+# ---- 탐색 공간 ----
+
+def grid(space: Dict[str, Sequence]) -> List[Dict]:
+    """모든 값 조합을 만듭니다. 예) {'nDays': [10, 20], 'kValue': [1.5, 2.0]}"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_search(space: Dict, n: int, seed: int = 0) -> List[Dict]:
+    """
+    무작위 조합을 n개 만듭니다. (seed가 같으면 항상 같은 조합)
+    값이 리스트면 그중 하나를, {'min', 'max'} dict면 구간에서 균등하게 뽑습니다. (min/max가 정수면 정수)
+    """
+    rng = random.Random(seed)
+    candidates = []
+    for _ in range(n):
+        candidate = {}
+        for name, values in space.items():
+            if isinstance(values, dict):
+                lo, hi = values['min'], values['max']
+                candidate[name] = rng.randint(lo, hi) if isinstance(lo, int) and isinstance(hi, int) else rng.uniform(lo, hi)
+            else:
+                candidate[name] = rng.choice(list(values))
+        candidates.append(candidate)
+    return candidates
+
+
+def walk_forward_splits(n_bars: int, train_bars: int, test_bars: int, step: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """
+    이동 창 walk-forward 분할을 만듭니다.
+    Returns:
+        List[(학습 시작, 학습 끝 = 검증 시작, 검증 끝)]
+    """
+    step = step or test_bars
+    splits = []
+    test_start = train_bars
+    while test_start < n_bars:
+        splits.append((test_start - train_bars, test_start, min(test_start + test_bars, n_bars)))
+        test_start += step
+    return splits
+
+
+# ---- 최적화 ----
+
+class Optimizer:
+    """
+    프로세스 풀에서 파라미터 조합을 평가합니다. with 문으로 사용하면 공유 메모리와 풀을 정리합니다.
+    """
+
+    def __init__(
+        self,
+        strategy_name: str,
+        frames: Sequence[CandleFrame],
+        metric: str = 'sharpe',
+        workers: Optional[int] = None,
+        fee: float = DEFAULT_FEE,
+        slippage: float = DEFAULT_SLIPPAGE,
+        batch_size: int = 8,
+        prune_ratio: float = 0.0,
+        prune_fraction: float = 0.3,
+        out_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            metric: 순위를 정할 성과 지표 (compute_stats 키 또는 trades 등)
+            batch_size: 작업 하나에 묶어 보낼 파라미터 개수
+            prune_ratio: 앞부분 구간 평가 후 제외할 비율 (0이면 가지치기 없음)
+            prune_fraction: 가지치기 평가에 쓰는 구간 비율
+            out_path: 결과를 기록할 JSONL 파일
+        """
+        self.strategy_name = strategy_name
+        self.metric = metric
+        self.fee = fee
+        self.slippage = slippage
+        self.batch_size = batch_size
+        self.prune_ratio = prune_ratio
+        self.prune_fraction = prune_fraction
+        self.shared = SharedBars.from_frames(frames)
+        self.n_bars = self.shared.spec['bars']
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(self.shared.spec,),
+        )
+        self._out = open(out_path, 'a', encoding='utf-8') if out_path else None
+
+    def close(self) -> None:
+        self.executor.shutdown()
+        self.shared.close()
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    def __enter__(self) -> "Optimizer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def score(self, stats: Dict) -> float:
+        value = stats.get(self.metric)
+        if value is None or not math.isfinite(value):
+            return -math.inf
+        return -value if self.metric in LOWER_IS_BETTER else value
+
+    def _write(self, rows: Iterable[Dict], **fields) -> None:
+        if self._out is None:
+            return
+        for row in rows:
+            self._out.write(json.dumps({**fields, 'params': row['params'], 'stats': row['stats']}) + '\n')
+        self._out.flush()
+
+    def _run(self, candidates: List[Dict], start: int, end: int, with_equity: bool = False, **fields) -> List[Dict]:
+        """파라미터를 batch_size씩 묶어 제출하고, 끝나는 대로 기록합니다. 결과는 입력 순서로 반환합니다."""
+        futures = {}
+        for i in range(0, len(candidates), self.batch_size):
+            batch = candidates[i:i + self.batch_size]
+            future = self.executor.submit(
+                _evaluate_batch, self.strategy_name, batch, start, end, self.fee, self.slippage, with_equity
+            )
+            futures[future] = i
+        results: List[Optional[Dict]] = [None] * len(candidates)
+        for future in as_completed(futures):
+            rows = future.result()
+            self._write(rows, **fields)
+            offset = futures[future]
+            results[offset:offset + len(rows)] = rows
+        return results
+
+    def _rank(self, rows: List[Dict]) -> List[Dict]:
+        # 점수가 같으면 파라미터 문자열로 정렬해 결과를 결정적으로 만듭니다.
+        return sorted(rows, key=lambda row: (-self.score(row['stats']), json.dumps(row['params'], sort_keys=True)))
+
+    def search(self, candidates: List[Dict], start: int = 0, end: Optional[int] = None, split: Optional[int] = None) -> List[Dict]:
+        """
+        [start, end) 구간에서 후보를 평가하고 점수 순으로 반환합니다.
+        prune_ratio가 있으면 앞부분 구간으로 먼저 평가해 하위 후보를 제외합니다.
+        """
+        end = self.n_bars if end is None else end
+        if self.prune_ratio > 0 and len(candidates) > 1:
+            screen_end = start + max(int((end - start) * self.prune_fraction), 2)
+            screened = self._rank(self._run(candidates, start, screen_end, stage='screen', split=split))
+            keep = max(1, math.ceil(len(candidates) * (1 - self.prune_ratio)))
+            candidates = [row['params'] for row in screened[:keep]]
+        return self._rank(self._run(candidates, start, end, stage='full', split=split))
+
+    def walk_forward(self, candidates: List[Dict], train_bars: int, test_bars: int, step: Optional[int] = None) -> Dict:
+        """
+        분할마다 학습 구간의 최고 파라미터를 다음 검증 구간에 적용합니다.
+        Returns:
+            Dict: {'splits': 분할별 결과, 'equity': 검증 구간을 이어 붙인 자산 곡선, 'stats': 검증 구간 통계}
+        """
+        splits = []
+        equity = [1.0]
+        for i, (train_start, test_start, test_end) in enumerate(walk_forward_splits(self.n_bars, train_bars, test_bars, step)):
+            best = self.search(candidates, train_start, test_start, split=i)[0]
+            test = self._run([best['params']], test_start, test_end, with_equity=True, stage='test', split=i)[0]
+            curve = np.asarray(test['equity'])
+            equity.extend((equity[-1] * curve / curve[0])[1:].tolist())
+            splits.append({
+                'split': i,
+                'train': [train_start, test_start],
+                'test': [test_start, test_end],
+                'params': best['params'],
+                'train_stats': best['stats'],
+                'test_stats': test['stats'],
+            })
+        return {'splits': splits, 'equity': equity, 'stats': compute_stats(np.asarray(equity), self.shared.spec['unit'])}
+
+
+def main():
+    from datetime import datetime
+    from .history_loader import to_utc_ms
+    parser = argparse.ArgumentParser(description="전략 파라미터를 병렬로 탐색합니다.")
+    parser.add_argument('markets', nargs='+')
+    parser.add_argument('--strategy', required=True)
+    parser.add_argument('--space', required=True, help="탐색 공간 (JSON)")
+    parser.add_argument('--params', default='{}', help="고정 파라미터 (JSON)")
+    parser.add_argument('--random', type=int, default=0, help="무작위 탐색 개수 (0이면 grid)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--walk-forward', nargs=2, type=int, metavar=('TRAIN', 'TEST'))
+    parser.add_argument('--metric', default='sharpe')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--prune', type=float, default=0.0, help="가지치기 비율 (0~1)")
+    parser.add_argument('--unit', default='days')
+    parser.add_argument('--db', default='sqlite:///./trading.db')
+    parser.add_argument('--data-dir')
+    parser.add_argument('--start', type=datetime.fromisoformat)
+    parser.add_argument('--end', type=datetime.fromisoformat)
+    parser.add_argument('--out', help="결과 JSONL 파일")
+    args = parser.parse_args()
+
+    store = None if args.data_dir else CandleStore.from_url(args.db)
+    try:
+        frames = load_frames(
+            args.markets, args.unit, store, args.data_dir,
+            to_utc_ms(args.start) if args.start else None,
+            to_utc_ms(args.end) if args.end else None,
+        )
+    finally:
+        if store is not None:
+            store.close()
+
+    space = json.loads(args.space)
+    fixed = json.loads(args.params)
+    candidates = random_search(space, args.random, args.seed) if args.random else grid(space)
+    candidates = [{**fixed, **candidate} for candidate in candidates]
+    with Optimizer(args.strategy, frames, args.metric, args.workers, prune_ratio=args.prune, out_path=args.out) as optimizer:
+        if args.walk_forward:
+            result = optimizer.walk_forward(candidates, *args.walk_forward)
+            result.pop('equity')
+        else:
+            result = {'top': optimizer.search(candidates)[:10]}
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""
+페어 트레이딩용 통계 모듈입니다.
+
+- rolling_ols / spread_zscore: 이동 창 헤지 비율(OLS)과 스프레드 z-score를 누적합으로 한 번에 계산합니다.
+- screen_pairs: N개 마켓의 모든 페어(N²)에 Engle-Granger 공적분 검정을 적용합니다.
+  잔차를 페어마다 만들지 않고, 수준/차분 행렬의 교차 적률(N × N 행렬곱 3번)에서 검정 통계량을 바로 구합니다.
+- PairStatsCache: 페어별 증분 상태를 보관하여 새 봉이 들어올 때 O(1)로 갱신합니다.
+
+가격은 모두 로그 가격으로 다룹니다.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+import math
+import numpy as np
+from . import indicators
+from .candle_frame import CandleFrame
+from .streaming_indicators import RollingOLS, RollingVariance
+
+# Engle-Granger(2변수, 상수항 포함) 공적분 검정 임계값 (MacKinnon)
+EG_CRITICAL_VALUES = {0.01: -3.90, 0.05: -3.34, 0.10: -3.04}
+
+
+def rolling_ols(y, x, window: int) -> Dict[str, np.ndarray]:
+    """
+    y = alpha + beta * x 의 이동 창 OLS 계수를 구합니다. 창 안에 NaN이 있으면 NaN입니다.
+    Args:
+        y, x: 같은 모양의 (pairs × bars) 또는 (bars,) 배열
+    """
+    y = np.asarray(y, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    # 상쇄 오차를 줄이기 위해 행별 평균을 빼고 계산합니다. (기울기는 이동에 불변)
+    with np.errstate(invalid='ignore'):
+        y0 = np.nanmean(y, axis=-1, keepdims=True)
+        x0 = np.nanmean(x, axis=-1, keepdims=True)
+    yc, xc = y - y0, x - x0
+    mean_x = indicators.rolling_mean(xc, window)
+    mean_y = indicators.rolling_mean(yc, window)
+    cov = indicators.rolling_mean(xc * yc, window) - mean_x * mean_y
+    var = indicators.rolling_mean(xc * xc, window) - mean_x * mean_x
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = np.where(var > 0, cov / var, np.nan)
+    alpha = (mean_y + y0) - beta * (mean_x + x0)
+    return {'beta': beta, 'alpha': alpha}
+
+
+def spread_zscore(y, x, ols_window: int, z_window: int) -> Dict[str, np.ndarray]:
+    """
+    봉마다 그 시점의 헤지 비율로 스프레드를 만들고, 최근 z_window개 스프레드로 z-score를 구합니다.
+    Args:
+        y, x: 로그 가격
+    Returns:
+        Dict: {'beta', 'alpha', 'spread', 'zscore'}
+    """
+    ols = rolling_ols(y, x, ols_window)
+    spread = np.asarray(y, dtype=np.float64) - (ols['alpha'] + ols['beta'] * np.asarray(x, dtype=np.float64))
+    mean = indicators.rolling_mean(spread, z_window)
+    std = indicators.rolling_std(spread, z_window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zscore = np.where(std > 0, (spread - mean) / std, np.nan)
+    return {**ols, 'spread': spread, 'zscore': zscore}
+
+
+def critical_value(significance: float) -> float:
+    """유의수준에 해당하는 Engle-Granger 임계값을 반환합니다. 표에 없는 유의수준이면 ValueError."""
+    critical = EG_CRITICAL_VALUES.get(significance)
+    if critical is None:
+        choices = ', '.join(str(level) for level in EG_CRITICAL_VALUES)
+        raise ValueError(f"Unsupported significance: {significance} (choose one of {choices})")
+    return critical
+
+
+def screen_pairs(
+    log_prices: np.ndarray,
+    markets: Sequence[str],
+    significance: float = 0.05,
+    min_correlation: float = 0.0,
+) -> List[Dict]:
+    """
+    모든 페어의 Engle-Granger 공적분 검정 통계량을 한 번에 계산합니다.
+    y_i = a + b * x_j 의 잔차 e에 대해 Δe_t = ρ e_{t-1} + ε 의 t-통계량을 구하며,
+    필요한 합(Σe_{t-1}Δe_t, Σe_{t-1}², ΣΔe²)은 모두 수준/차분 행렬의 교차 적률로 전개됩니다.
+    Args:
+        log_prices: (markets × bars) 로그 가격. NaN이 있는 마켓은 제외됩니다.
+        significance: 0.01, 0.05, 0.10 중 하나
+        min_correlation: 수익률 상관계수가 이보다 낮은 페어는 제외
+    Returns:
+        List[Dict]: 공적분으로 판정된 페어 (통계량이 작은 순). 순서가 없는 페어마다 더 강한 방향 하나만 남깁니다.
+    """
+    critical = critical_value(significance)
+    valid = ~np.isnan(log_prices).any(axis=1)
+    prices = log_prices[valid]
+    names = [m for m, ok in zip(markets, valid) if ok]
+    n, t = prices.shape
+    if n < 2 or t < 4:
+        return []
+
+    centered = prices - prices.mean(axis=1, keepdims=True)
+    lagged = centered[:, :-1]
+    diffs = np.diff(centered, axis=1)
+    var = np.einsum('ij,ij->i', centered, centered)
+    cov = centered @ centered.T                # Σ y_i x_j (전체 구간, 헤지 비율용)
+    lag_diff = lagged @ diffs.T                # Σ y_{i,t-1} Δx_{j,t}
+    lag_lag = lagged @ lagged.T                # Σ y_{i,t-1} x_{j,t-1}
+    diff_diff = diffs @ diffs.T                # Σ Δy_i Δx_j
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = cov / var[np.newaxis, :]        # beta[i, j]: y_i를 x_j에 회귀한 기울기
+        d_ll = np.diag(lag_lag)[:, None]
+        d_ld = np.diag(lag_diff)[:, None]
+        d_dd = np.diag(diff_diff)[:, None]
+        numerator = d_ld - beta * lag_diff - beta * lag_diff.T + beta ** 2 * np.diag(lag_diff)[None, :]
+        denominator = d_ll - 2 * beta * lag_lag + beta ** 2 * np.diag(lag_lag)[None, :]
+        rho = numerator / denominator
+        sum_sq = d_dd - 2 * beta * diff_diff + beta ** 2 * np.diag(diff_diff)[None, :]
+        residual = np.maximum(sum_sq - rho * numerator, 0.0)
+        stat = rho / np.sqrt(residual / (t - 2) / denominator)
+        std = np.sqrt(np.diag(diff_diff))
+        correlation = diff_diff / np.outer(std, std)
+        half_life = -math.log(2) / np.log1p(rho)
+
+    np.fill_diagonal(stat, np.nan)
+    # 순서가 없는 페어마다 통계량이 더 작은(더 강한) 방향을 고릅니다.
+    upper = np.triu_indices(n, 1)
+    forward, backward = stat[upper], stat.T[upper]
+    use_forward = ~(backward < forward)
+    ys = np.where(use_forward, upper[0], upper[1])
+    xs = np.where(use_forward, upper[1], upper[0])
+    best = np.where(use_forward, forward, backward)
+    selected = (best < critical) & (correlation[ys, xs] >= min_correlation)
+    order = np.argsort(best[selected], kind='stable')
+    ys, xs, best = ys[selected][order], xs[selected][order], best[selected][order]
+    return [
+        {
+            'y': names[i],
+            'x': names[j],
+            'hedge_ratio': float(beta[i, j]),
+            'adf_stat': float(s),
+            'half_life': float(half_life[i, j]) if np.isfinite(half_life[i, j]) else None,
+            'correlation': float(correlation[i, j]),
+        }
+        for i, j, s in zip(ys.tolist(), xs.tolist(), best.tolist())
+    ]
+
+
+def align_pair(frame_y: CandleFrame, frame_x: CandleFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """두 마켓에 모두 있는 봉만 남겨 (timestamps, y 종가, x 종가)를 반환합니다."""
+    timestamps, index_y, index_x = np.intersect1d(frame_y.timestamp, frame_x.timestamp, return_indices=True)
+    return timestamps, frame_y.close[index_y], frame_x.close[index_x]
+
+
+class PairState:
+    """페어 하나의 증분 상태입니다. 봉마다 헤지 비율과 스프레드 분포를 O(1)로 갱신합니다."""
+
+    def __init__(self, ols_window: int, z_window: int):
+        self.ols = RollingOLS(ols_window)
+        self.spreads = RollingVariance(z_window)
+        self.last_timestamp: Optional[int] = None
+        self.spread: Optional[float] = None
+
+    def update(self, timestamp: int, y: float, x: float) -> None:
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return
+        log_y, log_x = math.log(y), math.log(x)
+        self.ols.update((log_y, log_x))
+        if self.ols.ready:
+            self.spread = log_y - (self.ols.alpha + self.ols.beta * log_x)
+            self.spreads.update(self.spread)
+        self.last_timestamp = timestamp
+
+    def zscore(self, y: Optional[float] = None, x: Optional[float] = None) -> Optional[float]:
+        """
+        마지막 마감 봉의 z-score를 반환합니다.
+        y, x(현재가)를 넘기면 마감 봉 기준 헤지 비율/분포로 현재 스프레드의 z-score를 계산합니다.
+        """
+        std = self.spreads.value
+        if std is None or std == 0 or self.spread is None:
+            return None
+        spread = self.spread
+        if y is not None and x is not None:
+            spread = math.log(y) - (self.ols.alpha + self.ols.beta * math.log(x))
+        return (spread - self.spreads.mean) / std
+
+    def snapshot(self) -> Dict:
+        return {
+            'ols': self.ols.snapshot(),
+            'spreads': self.spreads.snapshot(),
+            'last_timestamp': self.last_timestamp,
+            'spread': self.spread,
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> "PairState":
+        pair = cls(state['ols']['window'], state['spreads']['window'])
+        pair.ols = RollingOLS.restore(state['ols'])
+        pair.spreads = RollingVariance.restore(state['spreads'])
+        pair.last_timestamp = state['last_timestamp']
+        pair.spread = state['spread']
+        return pair
+
+
+class PairStatsCache:
+    """
+    페어별 증분 상태를 LRU로 보관합니다.
+    같은 페어를 다시 요청하면 마지막으로 반영한 봉 이후의 봉만 반영합니다.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._states: "OrderedDict[tuple, PairState]" = OrderedDict()
+
+    def put(self, y: str, x: str, state: PairState) -> None:
+        """복원한 상태를 캐시에 넣습니다."""
+        key = (y, x, state.ols.window, state.spreads.window)
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_size:
+            self._states.popitem(last=False)
+
+    def get(self, y: str, x: str, ols_window: int, z_window: int) -> PairState:
+        key = (y, x, ols_window, z_window)
+        state = self._states.get(key)
+        if state is None:
+            state = PairState(ols_window, z_window)
+            self._states[key] = state
+            while len(self._states) > self.max_size:
+                self._states.popitem(last=False)
+        self._states.move_to_end(key)
+        return state
+
+    def update(self, frame_y: CandleFrame, frame_x: CandleFrame, ols_window: int, z_window: int) -> PairState:
+        """두 프레임의 공통 봉 중 아직 반영하지 않은 봉을 상태에 반영합니다."""
+        state = self.get(frame_y.market, frame_x.market, ols_window, z_window)
+        timestamps, closes_y, closes_x = align_pair(frame_y, frame_x)
+        start = 0 if state.last_timestamp is None else int(np.searchsorted(timestamps, state.last_timestamp, side='right'))
+        for ts, y, x in zip(timestamps[start:].tolist(), closes_y[start:].tolist(), closes_x[start:].tolist()):
+            state.update(ts, y, x)
+        return state
+
+    def __len__(self) -> int:
+        return len(self._states)
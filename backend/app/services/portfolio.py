@@ -0,0 +1,259 @@
+"""
+(tickers × bars) 수익률 행렬 위에서 동작하는 포트폴리오 구성 모듈입니다.
+
+- EWMACovariance: 지수가중 공분산(RiskMetrics 방식, 평균 0 가정)을 봉마다 rank-1 갱신으로 O(n²)에 유지합니다.
+  상장 전 구간처럼 수익률이 없는 마켓은 쌍별 가중치 합으로 나누어 편향 없이 다룹니다.
+- shrink: 표본 공분산을 대각(상관 0) 행렬 쪽으로 수축시켜 바스켓이 클 때의 추정 오차를 줄입니다.
+- inverse_volatility_weights / equal_risk_contribution_weights / volatility_target: 공분산 행렬 하나로 비중을 계산합니다.
+- CovarianceCache: 바스켓별 공분산 상태를 보관하여 새 봉이 들어올 때 그 봉만 반영합니다.
+"""
+from typing import Dict, Optional, Sequence
+from collections import OrderedDict
+import math
+import numpy as np
+from .candle_frame import CandleFrame
+
+MODES = ('inverse_vol', 'erc', 'vol_target')
+
+
+class EWMACovariance:
+    """
+    지수가중 공분산의 증분 상태입니다.
+    S ← λS + (1-λ) r rᵀ, W ← λW + (1-λ) a aᵀ (a: 수익률이 있는 마켓 표시) 이고 공분산은 S / W 입니다.
+    """
+
+    def __init__(self, size: int, halflife: float):
+        self.size = size
+        self.halflife = halflife
+        self.decay = 0.5 ** (1 / halflife)
+        self._moments = np.zeros((size, size))
+        self._weights = np.zeros((size, size))
+        self.counts = np.zeros(size, dtype=np.int64)
+        self.last_close = np.full(size, np.nan)
+        self.last_timestamp: Optional[int] = None
+
+    def update(self, returns: np.ndarray) -> None:
+        """봉 하나의 수익률 벡터(없는 마켓은 NaN)를 반영합니다."""
+        active = ~np.isnan(returns)
+        r = np.where(active, returns, 0.0)
+        a = active.astype(np.float64)
+        lam = self.decay
+        self._moments *= lam
+        self._moments += (1 - lam) * np.outer(r, r)
+        self._weights *= lam
+        self._weights += (1 - lam) * np.outer(a, a)
+        self.counts += active
+
+    def update_prices(self, timestamp: int, closes: np.ndarray) -> None:
+        """봉 하나의 종가 벡터로 직전 종가 대비 수익률을 구해 반영합니다. 이미 반영한 봉은 무시합니다."""
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = closes / self.last_close - 1
+        self.update(returns)
+        self.last_close = np.where(np.isnan(closes), self.last_close, closes)
+        self.last_timestamp = timestamp
+
+    def covariance(self) -> np.ndarray:
+        """현재 공분산 행렬입니다. 함께 관측된 적이 없는 쌍은 0입니다."""
+        return np.divide(self._moments, self._weights, out=np.zeros_like(self._moments), where=self._weights > 0)
+
+    def snapshot(self) -> Dict:
+        return {
+            'size': self.size,
+            'halflife': self.halflife,
+            'moments': self._moments.tolist(),
+            'weights': self._weights.tolist(),
+            'counts': self.counts.tolist(),
+            'last_close': [None if math.isnan(c) else c for c in self.last_close.tolist()],
+            'last_timestamp': self.last_timestamp,
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> "EWMACovariance":
+        cov = cls(state['size'], state['halflife'])
+        cov._moments = np.array(state['moments'], dtype=np.float64).reshape(cov.size, cov.size)
+        cov._weights = np.array(state['weights'], dtype=np.float64).reshape(cov.size, cov.size)
+        cov.counts = np.array(state['counts'], dtype=np.int64)
+        cov.last_close = np.array([np.nan if c is None else c for c in state['last_close']], dtype=np.float64)
+        cov.last_timestamp = state['last_timestamp']
+        return cov
+
+
+def ewma_covariance(returns: np.ndarray, halflife: float) -> np.ndarray:
+    """(tickers × bars) 수익률 전체로 마지막 봉 기준 지수가중 공분산을 한 번에 계산합니다."""
+    returns = np.asarray(returns, dtype=np.float64)
+    active = ~np.isnan(returns)
+    r = np.where(active, returns, 0.0)
+    decay = 0.5 ** (1 / halflife)
+    scale = np.sqrt((1 - decay) * decay ** np.arange(returns.shape[1] - 1, -1, -1))
+    rs, a = r * scale, active * scale
+    moments, weights = rs @ rs.T, a @ a.T
+    return np.divide(moments, weights, out=np.zeros_like(moments), where=weights > 0)
+
+
+def shrink(cov: np.ndarray, intensity: float = 0.1) -> np.ndarray:
+    """공분산을 대각 행렬(상관 0) 쪽으로 intensity만큼 수축시킵니다. (0: 그대로, 1: 대각만)"""
+    if intensity <= 0:
+        return cov
+    return (1 - intensity) * cov + intensity * np.diag(np.diag(cov))
+
+
+def inverse_volatility_weights(cov: np.ndarray) -> np.ndarray:
+    """변동성의 역수에 비례하는 비중입니다. 변동성이 0이거나 없는 마켓은 0입니다."""
+    vol = np.sqrt(np.maximum(np.diag(cov), 0.0))
+    with np.errstate(divide='ignore'):
+        inverse = np.where(vol > 0, 1 / vol, 0.0)
+    total = inverse.sum()
+    return inverse / total if total > 0 else inverse
+
+
+def equal_risk_contribution_weights(
+    cov: np.ndarray,
+    budget: Optional[np.ndarray] = None,
+    initial: Optional[np.ndarray] = None,
+    tol: float = 1e-14,
+    max_iter: int = 50,
+) -> np.ndarray:
+    """
+    위험 기여도(w_i (Σw)_i)가 budget 비율(기본 균등)이 되는 비중을 구합니다.
+    볼록 함수 ½yᵀΣy - Σ b_i log y_i 의 최솟값을 뉴턴법으로 찾고 합이 1이 되도록 정규화합니다. (Spinu, 2013)
+    initial(직전 비중)을 넘기면 그 점에서 시작하므로 리밸런싱 때는 보통 몇 번의 반복으로 수렴합니다.
+    변동성이 0인 마켓은 제외(비중 0)합니다.
+    """
+    n = cov.shape[0]
+    weights = np.zeros(n)
+    usable = np.diag(cov) > 0
+    if not usable.any():
+        return weights
+    sigma = cov[np.ix_(usable, usable)]
+    b = np.full(sigma.shape[0], 1.0) if budget is None else np.asarray(budget, dtype=np.float64)[usable]
+    b = b / b.sum()
+    if initial is not None and (np.asarray(initial)[usable] > 0).all():
+        y = np.asarray(initial, dtype=np.float64)[usable]
+    else:
+        y = 1 / np.sqrt(np.diag(sigma))
+    # 같은 방향의 해는 모두 같은 비중이 되므로 yᵀΣy = 1 근처로 맞춰 시작합니다.
+    y = y / math.sqrt(y @ sigma @ y)
+
+    def objective(v):
+        return 0.5 * v @ sigma @ v - b @ np.log(v)
+
+    value = objective(y)
+    for _ in range(max_iter):
+        sigma_y = sigma @ y
+        gradient = sigma_y - b / y
+        hessian = sigma + np.diag(b / (y * y))
+        step = np.linalg.solve(hessian, gradient)
+        # 뉴턴 감소량은 스텝 길이의 제곱이므로 비중의 상대 오차는 대략 sqrt(tol)입니다.
+        decrement = gradient @ step
+        if decrement < tol:
+            break
+        # y > 0을 유지하고 목적함수가 줄어드는 범위에서 스텝을 줄입니다.
+        t = 1.0
+        while True:
+            candidate = y - t * step
+            if (candidate > 0).all():
+                candidate_value = objective(candidate)
+                if candidate_value <= value - 0.25 * t * decrement:
+                    break
+            t *= 0.5
+            if t < 1e-12:
+                candidate, candidate_value = y, value
+                break
+        if candidate is y:
+            break
+        y, value = candidate, candidate_value
+    weights[usable] = y / y.sum()
+    return weights
+
+
+def portfolio_volatility(weights: np.ndarray, cov: np.ndarray, periods_per_year: float = 365) -> float:
+    """비중과 봉 단위 공분산으로 연환산 포트폴리오 변동성을 구합니다."""
+    return math.sqrt(max(float(weights @ cov @ weights), 0.0) * periods_per_year)
+
+
+def volatility_target(
+    weights: np.ndarray,
+    cov: np.ndarray,
+    target: float,
+    periods_per_year: float = 365,
+    max_leverage: float = 1.0,
+) -> np.ndarray:
+    """
+    포트폴리오 연환산 변동성이 target이 되도록 비중 전체를 조정합니다.
+    합이 max_leverage를 넘지 않게 제한하며, 남는 비중은 현금입니다.
+    """
+    vol = portfolio_volatility(weights, cov, periods_per_year)
+    total = weights.sum()
+    if vol <= 0 or total <= 0:
+        return weights
+    scale = min(target / vol, max_leverage / total)
+    return weights * scale
+
+
+def target_weights(
+    cov: np.ndarray,
+    mode: str = 'inverse_vol',
+    target_volatility: float = 0.2,
+    periods_per_year: float = 365,
+    max_leverage: float = 1.0,
+    initial: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    공분산 행렬 하나로 모드별 목표 비중을 계산합니다.
+    Args:
+        mode: 'inverse_vol'(변동성 역수), 'erc'(위험 기여도 균등), 'vol_target'(위험 기여도 균등 + 목표 변동성)
+        initial: ERC 뉴턴법의 시작점 (직전 비중)
+    """
+    if mode == 'inverse_vol':
+        return inverse_volatility_weights(cov)
+    if mode == 'erc':
+        return equal_risk_contribution_weights(cov, initial=initial)
+    if mode == 'vol_target':
+        base = equal_risk_contribution_weights(cov, initial=initial)
+        return volatility_target(base, cov, target_volatility, periods_per_year, max_leverage)
+    raise ValueError(f"Unknown mode: {mode}")
+
+
+def align_closes(frames: Sequence[CandleFrame]) -> tuple:
+    """여러 마켓의 봉을 타임스탬프 합집합으로 맞춰 (timestamps, (tickers × bars) 종가)를 반환합니다."""
+    timestamps = np.unique(np.concatenate([f.timestamp for f in frames])) if frames else np.array([], dtype=np.int64)
+    closes = np.full((len(frames), len(timestamps)), np.nan)
+    for i, frame in enumerate(frames):
+        closes[i, np.searchsorted(timestamps, frame.timestamp)] = frame.close
+    return timestamps, closes
+
+
+class CovarianceCache:
+    """
+    바스켓(마켓 목록, 반감기)별 EWMACovariance를 LRU로 보관합니다.
+    같은 바스켓을 다시 요청하면 마지막으로 반영한 봉 이후의 봉만 반영합니다.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._states: "OrderedDict[tuple, EWMACovariance]" = OrderedDict()
+
+    def get(self, markets: Sequence[str], halflife: float) -> EWMACovariance:
+        key = (tuple(markets), halflife)
+        state = self._states.get(key)
+        if state is None:
+            state = EWMACovariance(len(markets), halflife)
+            self._states[key] = state
+            while len(self._states) > self.max_size:
+                self._states.popitem(last=False)
+        self._states.move_to_end(key)
+        return state
+
+    def update(self, frames: Sequence[CandleFrame], halflife: float) -> EWMACovariance:
+        """마감된 봉 프레임들 중 아직 반영하지 않은 봉을 공분산 상태에 반영합니다."""
+        state = self.get([f.market for f in frames], halflife)
+        timestamps, closes = align_closes(frames)
+        start = 0 if state.last_timestamp is None else int(np.searchsorted(timestamps, state.last_timestamp, side='right'))
+        for t in range(start, len(timestamps)):
+            state.update_prices(int(timestamps[t]), closes[:, t])
+        return state
+
+    def __len__(self) -> int:
+        return len(self._states)
@@ -0,0 +1,173 @@
+from typing import Dict, Optional, Set
+import asyncio
+import logging
+import time
+from .shared_state import SharedState
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    초당 rate 개씩 토큰이 채워지는 토큰 버킷입니다.
+    대기자는 Lock으로 직렬화되어 요청 순서대로 토큰을 받습니다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """토큰 1개를 얻기까지 남은 시간(초)을 반환합니다."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                wait = self.wait_time()
+                if wait <= 0:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep(wait)
+
+    def limit_remaining(self, remaining: int) -> None:
+        """서버가 알려준 잔여 요청 수보다 많은 토큰을 들고 있지 않도록 맞춥니다."""
+        self._refill()
+        self.tokens = min(self.tokens, float(remaining))
+
+
+class SharedTokenBucket:
+    """
+    여러 프로세스가 SharedState의 버킷 하나를 나눠 쓰는 토큰 버킷입니다. (TokenBucket과 같은 인터페이스)
+    acquire()는 공유 버킷에서 토큰을 예약하고, 예약한 토큰이 채워질 때까지 기다립니다.
+    """
+
+    def __init__(self, shared: SharedState, name: str, rate: float, capacity: float):
+        self.shared = shared
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        # 스레드에서 진행 중인 잔량 보정 작업
+        self._updates: Set[asyncio.Task] = set()
+
+    async def acquire(self) -> None:
+        wait = await asyncio.to_thread(self.shared.reserve_token, self.name, self.rate, self.capacity)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def limit_remaining(self, remaining: int) -> None:
+        """
+        공유 버킷 잔량을 보정합니다. 응답마다 호출되는 SQLite 쓰기이므로 이벤트 루프를 막지 않도록 스레드에 넘기고 기다리지 않습니다.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.shared.limit_tokens(self.name, self.rate, self.capacity, remaining)
+            return
+        task = loop.create_task(
+            asyncio.to_thread(self.shared.limit_tokens, self.name, self.rate, self.capacity, remaining)
+        )
+        self._updates.add(task)
+        task.add_done_callback(self._finish_update)
+
+    def _finish_update(self, task: asyncio.Task) -> None:
+        self._updates.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("shared rate limit update failed", exc_info=task.exception(), extra={'bucket': self.name})
+
+
+class RateLimiter:
+    """
+    Upbit 요청 그룹별 초당/분당 쿼터를 함께 지키는 중앙 스케줄러입니다.
+    응답의 Remaining-Req 헤더(예: "group=candles; min=1799; sec=29")로 버킷을 보정합니다.
+    """
+
+    def __init__(
+        self,
+        per_second: float = 10,
+        per_minute: float = 600,
+        limits: Optional[Dict[str, tuple]] = None,
+        shared: Optional[SharedState] = None,
+    ):
+        """
+        Args:
+            per_second, per_minute: 그룹별 기본 쿼터
+            limits: 쿼터가 다른 그룹의 {group: (per_second, per_minute)} (예: 주문 API)
+            shared: 주면 버킷을 공유 저장소에 두어 같은 호스트의 모든 워커가 쿼터를 함께 지킵니다.
+        """
+        self.per_second = per_second
+        self.per_minute = per_minute
+        self.limits = limits or {}
+        self.shared = shared
+        self._buckets: Dict[str, tuple] = {}
+
+    def _get_buckets(self, group: str) -> tuple:
+        buckets = self._buckets.get(group)
+        if buckets is None:
+            per_second, per_minute = self.limits.get(group, (self.per_second, self.per_minute))
+            if self.shared is not None:
+                buckets = (
+                    SharedTokenBucket(self.shared, f'{group}/sec', per_second, per_second),
+                    SharedTokenBucket(self.shared, f'{group}/min', per_minute / 60, per_minute),
+                )
+            else:
+                buckets = (
+                    TokenBucket(per_second, per_second),
+                    TokenBucket(per_minute / 60, per_minute),
+                )
+            self._buckets[group] = buckets
+        return buckets
+
+    async def acquire(self, group: str = "default") -> None:
+        """group 쿼터 안에서 요청 1건을 보낼 수 있을 때까지 대기합니다."""
+        second_bucket, minute_bucket = self._get_buckets(group)
+        await minute_bucket.acquire()
+        await second_bucket.acquire()
+
+    def update_from_header(self, header: Optional[str], group: Optional[str] = None) -> None:
+        """
+        Remaining-Req 헤더 값을 반영합니다.
+        group을 넘기면 헤더의 group 이름 대신 요청을 보낸 그룹의 버킷을 보정합니다.
+        """
+        parsed = parse_remaining_req(header)
+        if not parsed:
+            return
+        second_bucket, minute_bucket = self._get_buckets(group or parsed.get("group", "default"))
+        if "sec" in parsed:
+            second_bucket.limit_remaining(int(parsed["sec"]))
+        if "min" in parsed:
+            minute_bucket.limit_remaining(int(parsed["min"]))
+
+    def penalize(self, group: str = "default") -> None:
+        """429 응답을 받은 경우 해당 그룹의 초당 버킷을 비웁니다."""
+        second_bucket, _ = self._get_buckets(group)
+        second_bucket.limit_remaining(0)
+
+
+def parse_remaining_req(header: Optional[str]) -> Dict[str, str]:
+    """
+    Remaining-Req 헤더를 파싱합니다.
+    Args:
+        header: 예) "group=candles; min=1799; sec=29"
+    Returns:
+        Dict[str, str]: {'group': 'candles', 'min': '1799', 'sec': '29'}
+    """
+    if not header:
+        return {}
+    result = {}
+    for part in header.split(";"):
+        if "=" in part:
+            key, value = part.split("=", 1)
+            result[key.strip()] = value.strip()
+    return result
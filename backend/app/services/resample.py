@@ -0,0 +1,136 @@
+"""
+짧은 봉에서 상위 봉(2m/2h/6h/12h/1d ...)을 만드는 리샘플링 엔진입니다.
+
+봉 시작 시각을 간격으로 나눈 몫을 버킷 번호로 보고, 버킷 경계에서 np.*.reduceat으로 한 번에 집계합니다.
+버킷은 UTC 00:00(에폭) 기준으로 정렬되므로 1d는 Upbit 일봉과 같은 시각(KST 09:00)에 시작합니다.
+
+Resampler는 Upbit이 직접 제공하지 않는 타임프레임만 리샘플링합니다. (Resampler 참고)
+"""
+from typing import Optional
+import re
+import numpy as np
+from .candle_frame import CandleFrame
+from .candle_store import UNIT_INTERVAL_MS
+
+MINUTE_MS = UNIT_INTERVAL_MS['minutes/1']
+
+_TIMEFRAME = re.compile(r'^(?:(\d+)([mhd])|minutes/(\d+)|days)$')
+
+
+def normalize_timeframe(timeframe: str) -> str:
+    """
+    타임프레임 표기를 봉 단위 이름으로 바꿉니다.
+    '5m' → 'minutes/5', '4h' → 'minutes/240', '1d' → 'days'. 'minutes/N', 'days'는 그대로 받습니다.
+    Raises:
+        ValueError: 알 수 없는 표기이거나 하루를 나누어떨어지게 하지 않는 분 단위, 1일이 아닌 일 단위
+    """
+    match = _TIMEFRAME.match(timeframe.strip().lower()) if isinstance(timeframe, str) else None
+    if match is None:
+        raise ValueError(f"unsupported timeframe: {timeframe}")
+    number, suffix, minutes = match.groups()
+    if number is None and minutes is None:
+        return 'days'
+    if suffix == 'd':
+        if int(number) != 1:
+            raise ValueError(f"unsupported timeframe: {timeframe} (only 1d)")
+        return 'days'
+    n = int(minutes if minutes is not None else number) * (60 if suffix == 'h' else 1)
+    if n <= 0 or (24 * 60) % n:
+        raise ValueError(f"unsupported timeframe: {timeframe} (minutes must divide a day)")
+    return 'days' if n == 24 * 60 else f'minutes/{n}'
+
+
+def interval_ms(unit: str) -> int:
+    """봉 단위 이름의 간격(ms)입니다. Upbit이 제공하지 않는 분 단위(minutes/120 등)도 계산합니다."""
+    interval = UNIT_INTERVAL_MS.get(unit)
+    if interval is None:
+        unit = normalize_timeframe(unit)
+        interval = UNIT_INTERVAL_MS.get(unit) or int(unit.split('/')[1]) * MINUTE_MS
+    return interval
+
+
+def resample(frame: CandleFrame, unit: str, drop_partial: bool = False) -> CandleFrame:
+    """
+    오래된 순으로 정렬된 프레임을 unit 간격의 봉으로 집계합니다. (빠진 봉이 있어도 됩니다)
+    시가=버킷 첫 봉의 시가, 종가=마지막 봉의 종가, 고가/저가=최대/최소, 거래량/거래대금=합계입니다.
+    마지막 버킷은 원본의 진행 중인 봉을 포함하므로 진행 중인 봉이 됩니다.
+    Args:
+        drop_partial: 첫 버킷이 버킷 시작 이후부터 시작하면(앞부분이 잘린 버킷) 버립니다.
+    """
+    interval = interval_ms(unit)
+    if not len(frame):
+        return CandleFrame.empty(frame.market, unit)
+    bucket = frame.timestamp // interval
+    starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+    if drop_partial and frame.timestamp[0] != bucket[0] * interval:
+        if len(starts) == 1:
+            return CandleFrame.empty(frame.market, unit)
+        return resample(frame[int(starts[1]):], unit)
+    ends = np.concatenate((starts[1:], [len(frame)])) - 1
+    return CandleFrame(
+        frame.market,
+        unit,
+        bucket[starts] * interval,
+        frame.open[starts],
+        np.maximum.reduceat(frame.high, starts),
+        np.minimum.reduceat(frame.low, starts),
+        frame.close[ends],
+        np.add.reduceat(frame.volume, starts),
+        np.add.reduceat(frame.value, starts),
+    )
+
+
+class Resampler:
+    """
+    UpbitService의 타임프레임 조회를 담당합니다. (UpbitService.get_timeframe 참고)
+
+    - Upbit이 제공하는 봉 단위(1/3/5/10/15/30/60/240분, 일봉)는 그대로 받습니다.
+    - 그 밖의 분 단위는 간격을 나누어떨어지게 하는 가장 긴 Upbit 분봉에서 리샘플링합니다.
+      예) 2h는 1시간봉, 12h는 4시간봉, 6m은 3분봉에서 만듭니다.
+    - 필요한 베이스 봉이 max_base_bars를 넘으면 ValueError입니다.
+
+    같은 베이스 단위의 짧은 조회는 UpbitService.get_frame()이 캐시된 긴 프레임의 꼬리로 응답하므로,
+    2h와 6h처럼 베이스가 같은 타임프레임은 베이스 프레임을 나눠 씁니다.
+    """
+
+    def __init__(self, upbit_service, max_base_bars: int = 2000):
+        self.upbit_service = upbit_service
+        self.max_base_bars = max_base_bars
+
+    @staticmethod
+    def base_unit(unit: str) -> str:
+        """unit 봉을 만들 Upbit 봉 단위. Upbit이 제공하는 단위면 그 자신입니다."""
+        if unit in UNIT_INTERVAL_MS:
+            return unit
+        interval = interval_ms(unit)
+        return max(
+            (base for base, base_interval in UNIT_INTERVAL_MS.items()
+             if base.startswith('minutes/') and interval % base_interval == 0),
+            key=UNIT_INTERVAL_MS.get,
+        )
+
+    def base_count(self, unit: str, count: int) -> Optional[int]:
+        """unit 봉 count개를 만드는 데 필요한 베이스 봉 수. max_base_bars를 넘으면 None."""
+        ratio = interval_ms(unit) // interval_ms(self.base_unit(unit))
+        # 앞부분이 잘린 첫 버킷과 진행 중인 마지막 버킷 몫으로 한 버킷씩 더 받습니다.
+        need = (count + 1) * ratio
+        return need if need <= self.max_base_bars else None
+
+    async def get_frame(self, market: str, timeframe: str, count: int) -> CandleFrame:
+        unit = normalize_timeframe(timeframe)
+        base_unit = self.base_unit(unit)
+        if base_unit == unit:
+            return await self.upbit_service.get_frame(market, unit, count)
+        need = self.base_count(unit, count)
+        if need is None:
+            raise ValueError(f"{timeframe} x {count} needs more than {self.max_base_bars} {base_unit} bars")
+        cache = self.upbit_service.candle_cache
+        return await cache.get_or_load(
+            ('resample', market, unit, count),
+            lambda: self._resample(market, unit, count, base_unit, need),
+            cache.ttl_for(None),
+        )
+
+    async def _resample(self, market: str, unit: str, count: int, base_unit: str, need: int) -> CandleFrame:
+        base = await self.upbit_service.get_frame(market, base_unit, need)
+        return resample(base, unit, drop_partial=len(base) >= need).tail(count)
@@ -0,0 +1,192 @@
+"""
+거래소 전체 마켓을 한 번에 훑는 횡단면(cross-sectional) 스캐너입니다.
+마켓 목록은 캐시하고, 전 마켓의 일봉을 한 번의 레이트 리밋 사이클로 받아
+(markets × bars) 배열 위에서 돌파/역추세/추세 규칙을 한 번에 계산합니다.
+같은 배열로 전 마켓 페어의 공적분 검정(screen_pairs)도 수행합니다.
+"""
+from typing import Dict, List, Optional, Sequence
+import math
+import numpy as np
+from . import indicators
+from .candle_frame import CandleFrame
+from .pair_stats import critical_value, screen_pairs
+
+SIGNALS = ('breakout', 'breakdown', 'overbought', 'oversold', 'uptrend', 'downtrend')
+SORT_KEYS = ('change', 'value', 'breakout_distance', 'breakdown_distance', 'extension', 'trend')
+
+
+def _clean(value: float) -> Optional[float]:
+    """NaN(이력 부족)은 JSON에서 null이 되도록 None으로 바꿉니다."""
+    return None if math.isnan(value) else value
+
+
+def scan_frames(
+    frames: Sequence[CandleFrame],
+    n_days: int = 20,
+    k_value: float = 2.2,
+    short_period: int = 20,
+    long_period: int = 50,
+) -> List[Dict]:
+    """
+    마켓별 최근 일봉(마지막 봉은 진행 중인 봉)으로 스캔 지표를 한 번에 계산합니다.
+    규칙은 TrendFollowingStrategy(breakout, sma), CounterTrendStrategy와 같습니다.
+    Returns:
+        List[Dict]: 마켓별 지표와 해당하는 신호 목록
+    """
+    if not frames:
+        return []
+    length = max(n_days, long_period) + 2
+    high = indicators.stack(frames, 'high', length)
+    low = indicators.stack(frames, 'low', length)
+    close = indicators.stack(frames, 'close', length)
+    value = indicators.stack(frames, 'value', length)
+
+    price = close[:, -1]
+    prev_close = close[:, -2]
+    channel = indicators.donchian(high, low, n_days)
+    upper, lower = channel['upper'][:, -1], channel['lower'][:, -1]
+    levels = indicators.counter_trend_levels(high, low, n_days, k_value)
+    long_level, short_level = levels['long'][:, -1], levels['short'][:, -1]
+    avg_range = levels['avg_range'][:, -1]
+    # 이동평균은 마감된 봉으로만 계산합니다.
+    short_sma = indicators.rolling_mean(close[:, :-1], short_period)[:, -1]
+    long_sma = indicators.rolling_mean(close[:, :-1], long_period)[:, -1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        metrics = {
+            'change': price / prev_close - 1,
+            'value': value[:, -1],
+            'breakout_distance': price / upper - 1,
+            'breakdown_distance': price / lower - 1,
+            'extension': (price - prev_close) / avg_range,
+            'trend': short_sma / long_sma - 1,
+        }
+        flags = {
+            'breakout': price >= upper,
+            'breakdown': price <= lower,
+            'overbought': price > short_level,
+            'oversold': price < long_level,
+            'uptrend': short_sma >= long_sma,
+            'downtrend': short_sma < long_sma,
+        }
+
+    rows = []
+    for i, frame in enumerate(frames):
+        row = {'market': frame.market, 'price': _clean(float(price[i]))}
+        row.update({name: _clean(float(column[i])) for name, column in metrics.items()})
+        row['long_level'] = _clean(float(long_level[i]))
+        row['short_level'] = _clean(float(short_level[i]))
+        row['signals'] = [name for name in SIGNALS if flags[name][i]]
+        rows.append(row)
+    return rows
+
+
+def rank(rows: List[Dict], sort: str = 'change', descending: bool = True, signal: Optional[str] = None) -> List[Dict]:
+    """
+    신호로 거르고 지표 기준으로 정렬합니다. 지표가 없는 마켓(이력 부족)은 항상 뒤에 둡니다.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort}")
+    if signal is not None:
+        if signal not in SIGNALS:
+            raise ValueError(f"Unknown signal: {signal}")
+        rows = [row for row in rows if signal in row['signals']]
+    present = [row for row in rows if row[sort] is not None]
+    missing = [row for row in rows if row[sort] is None]
+    present.sort(key=lambda row: (-row[sort] if descending else row[sort], row['market']))
+    return present + missing
+
+
+class MarketScanner:
+    """
+    UpbitService의 캐시/레이트 리미터를 그대로 사용하는 스캐너입니다.
+    같은 조건의 스캔 결과는 진행 중인 봉 TTL 동안 캐시되어 페이지를 넘겨도 다시 계산하지 않습니다.
+    """
+
+    def __init__(self, upbit_service):
+        self.upbit_service = upbit_service
+
+    async def scan(
+        self,
+        quote: str = 'KRW',
+        n_days: int = 20,
+        k_value: float = 2.2,
+        short_period: int = 20,
+        long_period: int = 50,
+    ) -> List[Dict]:
+        """전체 마켓 스캔 결과(정렬 전)를 반환합니다."""
+        cache = self.upbit_service.candle_cache
+        key = ('scan', quote, n_days, k_value, short_period, long_period)
+        return await cache.get_or_load(
+            key,
+            lambda: self._scan(quote, n_days, k_value, short_period, long_period),
+            cache.open_bar_ttl,
+        )
+
+    async def _scan(self, quote: str, n_days: int, k_value: float, short_period: int, long_period: int) -> List[Dict]:
+        markets = await self.upbit_service.get_markets(quote)
+        codes = [m['market'] for m in markets]
+        names = {m['market']: m.get('korean_name') for m in markets}
+        frames = await self.upbit_service.get_daily_frames_many(codes, max(n_days, long_period) + 2)
+        rows = scan_frames([frames[code] for code in codes], n_days, k_value, short_period, long_period)
+        for row in rows:
+            row['korean_name'] = names.get(row['market'])
+        return rows
+
+    async def scan_page(
+        self,
+        quote: str = 'KRW',
+        n_days: int = 20,
+        k_value: float = 2.2,
+        short_period: int = 20,
+        long_period: int = 50,
+        signal: Optional[str] = None,
+        sort: str = 'change',
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> Dict:
+        """
+        스캔 결과를 거르고 정렬한 뒤 한 페이지를 반환합니다.
+        Returns:
+            Dict: {'total': 조건에 맞는 마켓 수, 'offset', 'limit', 'items': 마켓별 결과}
+        """
+        rows = await self.scan(quote, n_days, k_value, short_period, long_period)
+        ranked = rank(rows, sort, descending, signal)
+        return {
+            'total': len(ranked),
+            'offset': offset,
+            'limit': limit,
+            'items': ranked[offset:offset + limit],
+        }
+
+    async def screen_pairs(
+        self,
+        quote: str = 'KRW',
+        lookback: int = 120,
+        significance: float = 0.05,
+        min_correlation: float = 0.0,
+    ) -> List[Dict]:
+        """
+        최근 lookback개 마감 일봉으로 전 마켓 페어의 공적분을 검정합니다.
+        이력이 lookback보다 짧은 마켓은 제외되며 결과는 진행 중인 봉 TTL 동안 캐시됩니다.
+        지원하지 않는 significance는 일봉을 받기 전에 ValueError로 거절합니다.
+        """
+        critical_value(significance)
+        cache = self.upbit_service.candle_cache
+        key = ('pairs', quote, lookback, significance, min_correlation)
+        return await cache.get_or_load(
+            key,
+            lambda: self._screen_pairs(quote, lookback, significance, min_correlation),
+            cache.open_bar_ttl,
+        )
+
+    async def _screen_pairs(self, quote: str, lookback: int, significance: float, min_correlation: float) -> List[Dict]:
+        markets = await self.upbit_service.get_markets(quote)
+        codes = [m['market'] for m in markets]
+        frames = await self.upbit_service.get_daily_frames_many(codes, lookback + 1)
+        # 진행 중인 봉을 빼고 마감된 봉만 사용합니다.
+        close = indicators.stack([frames[code] for code in codes], 'close', lookback + 1)[:, :-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_prices = np.log(close)
+        return screen_pairs(log_prices, codes, significance, min_correlation)
@@ -0,0 +1,293 @@
+"""
+여러 워커 프로세스(uvicorn --workers N)가 함께 쓰는 SQLite(WAL) 기반 공유 상태입니다.
+같은 호스트의 프로세스끼리 파일 하나로 다음을 나눠 씁니다.
+
+- kv: TTL이 있는 키-값 (캔들 캐시의 2차 계층, 리더가 게시하는 스케줄러 상태)
+- buckets: 레이트 리미터 토큰 버킷 (Upbit 쿼터는 IP 단위이므로 프로세스 전체가 한 예산을 나눠 씁니다)
+- leases: 리더 임대 (거래 스케줄러는 임대를 가진 워커 하나만 실행합니다)
+- trading_sessions: 거래 세션 설정과 전략 상태 (리더가 바뀌어도 새 리더가 이어서 실행합니다)
+
+모든 메서드는 짧은 동기 트랜잭션입니다. 대기할 수 있는 쓰기는 호출하는 쪽에서 asyncio.to_thread로 실행합니다.
+시각은 프로세스 간에 비교해야 하므로 time.time()을 씁니다.
+"""
+from typing import Any, Dict, List, Optional
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import orjson
+from .candle_frame import CandleFrame
+
+# kv 값의 형식 표시 (첫 바이트)
+FRAME_PREFIX = b'F'
+JSON_PREFIX = b'J'
+# kv에 이만큼 쓸 때마다 만료된 항목을 한 번 지웁니다.
+PURGE_EVERY = 512
+
+
+def encode_value(value: Any) -> Optional[bytes]:
+    """캐시 값을 공유 저장용 바이트로 바꿉니다. 공유할 수 없는 형식이면 None."""
+    if isinstance(value, CandleFrame):
+        return FRAME_PREFIX + value.to_bytes()
+    try:
+        return JSON_PREFIX + orjson.dumps(value)
+    except TypeError:
+        return None
+
+
+def decode_value(data: bytes) -> Any:
+    if data[:1] == FRAME_PREFIX:
+        return CandleFrame.from_bytes(data[1:])
+    return orjson.loads(data[1:])
+
+
+def worker_id() -> str:
+    """임대 소유자 이름으로 쓸 이 프로세스의 고유 ID입니다. (호스트:PID:난수)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SharedState:
+    """
+    프로세스 간 공유 상태 저장소입니다. 프로세스마다 하나씩 열고, 프로세스 안에서는 Lock으로 연결을 직렬화합니다.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=busy_timeout)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS kv (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                name TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS trading_sessions (
+                market TEXT PRIMARY KEY,
+                strategy TEXT NOT NULL,
+                parameters TEXT NOT NULL,
+                state TEXT,
+                updated_at REAL NOT NULL
+            );
+            """
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---- kv ----
+
+    def get(self, key: str) -> Optional[bytes]:
+        """만료되지 않은 값을 반환합니다. 없으면 None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kv WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_with_ttl(self, key: str):
+        """(값, 남은 유효 시간) 또는 None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM kv WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        return (row[0], row[1] - now) if row else None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)", (key, value, now + ttl)
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM kv WHERE expires_at <= ?", (now,))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        """만료된 kv 항목을 지웁니다. Returns: 지운 개수"""
+        with self._lock:
+            return self._conn.execute("DELETE FROM kv WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    # ---- 토큰 버킷 ----
+
+    def reserve_token(self, name: str, rate: float, capacity: float) -> float:
+        """
+        버킷에서 토큰 1개를 예약하고, 예약한 토큰을 쓸 수 있을 때까지 기다릴 시간(초)을 반환합니다.
+        토큰이 없으면 잔량을 음수로 두어 순서대로 다음 충전분을 예약하므로, 호출자는 반환값만큼 잔 뒤 요청하면 됩니다.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (name,)).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+                tokens -= 1
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)", (name, tokens, now)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return 0.0 if tokens >= 0 else -tokens / rate
+
+    def limit_tokens(self, name: str, rate: float, capacity: float, remaining: float) -> None:
+        """버킷 잔량이 remaining(서버가 알려준 잔여 요청 수)을 넘지 않도록 맞춥니다."""
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                """
+                INSERT INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    tokens = MIN(MIN(?, buckets.tokens + (? - buckets.updated_at) * ?), excluded.tokens),
+                    updated_at = excluded.updated_at
+                """,
+                (name, float(remaining), now, capacity, now, rate),
+            )
+
+    # ---- 리더 임대 ----
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """
+        임대가 비었거나 만료되었거나 이미 owner의 것이면 ttl만큼 (다시) 잡습니다.
+        Returns:
+            bool: owner가 임대를 가지고 있으면 True
+        """
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                """
+                INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE leases.owner = excluded.owner OR leases.expires_at <= ?
+                """,
+                (name, owner, now + ttl, now),
+            )
+            row = self._conn.execute("SELECT owner FROM leases WHERE name = ?", (name,)).fetchone()
+        return row is not None and row[0] == owner
+
+    def release_lease(self, name: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def lease_owner(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT owner FROM leases WHERE name = ? AND expires_at > ?", (name, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    # ---- 거래 세션 ----
+
+    def add_session(self, market: str, strategy: str, parameters: Dict) -> bool:
+        """세션을 등록합니다. 이미 같은 마켓의 세션이 있으면 False."""
+        with self._lock:
+            return self._conn.execute(
+                "INSERT OR IGNORE INTO trading_sessions (market, strategy, parameters, updated_at) VALUES (?, ?, ?, ?)",
+                (market, strategy, orjson.dumps(parameters).decode(), time.time()),
+            ).rowcount == 1
+
+    def remove_sessions(self, market: Optional[str] = None) -> List[str]:
+        """market을 생략하면 모든 세션을 지웁니다. Returns: 지운 마켓 목록"""
+        where, params = ("", ()) if market is None else (" WHERE market = ?", (market,))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                markets = [row[0] for row in self._conn.execute(f"SELECT market FROM trading_sessions{where}", params)]
+                self._conn.execute(f"DELETE FROM trading_sessions{where}", params)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return markets
+
+    def save_session_states(self, states: Dict[str, Dict]) -> None:
+        """market → strategy.snapshot_state() 를 한 트랜잭션으로 저장합니다."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "UPDATE trading_sessions SET state = ?, updated_at = ? WHERE market = ?",
+                    [(orjson.dumps(state).decode(), now, market) for market, state in states.items()],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def load_sessions(self) -> Dict[str, Dict]:
+        """
+        Returns:
+            Dict[str, Dict]: market → {'strategy', 'parameters', 'state'(없으면 None)}
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT market, strategy, parameters, state FROM trading_sessions").fetchall()
+        return {
+            market: {
+                'strategy': strategy,
+                'parameters': orjson.loads(parameters),
+                'state': orjson.loads(state) if state else None,
+            }
+            for market, strategy, parameters, state in rows
+        }
+
+
+class LeaderLease:
+    """
+    SharedState의 임대 하나를 잡고 갱신합니다. ttl 안에 갱신하지 못하면 다른 워커가 가져갑니다.
+    is_valid()는 마지막 갱신 시각 기준으로 아직 임대가 유효한지를 로컬 시계로 판단합니다.
+    """
+
+    def __init__(self, shared: SharedState, name: str, ttl: float = 15, owner: Optional[str] = None):
+        self.shared = shared
+        self.name = name
+        self.ttl = ttl
+        self.owner = owner or worker_id()
+        self.held = False
+        self._valid_until = 0.0
+
+    @property
+    def renew_interval(self) -> float:
+        return self.ttl / 3
+
+    def acquire(self) -> bool:
+        """임대를 잡거나 갱신합니다. (동기 함수이므로 asyncio.to_thread로 호출합니다)"""
+        started = time.monotonic()
+        self.held = self.shared.acquire_lease(self.name, self.owner, self.ttl)
+        self._valid_until = started + self.ttl if self.held else 0.0
+        return self.held
+
+    def is_valid(self) -> bool:
+        # 갱신 직전에 만료되는 경계에서 두 워커가 동시에 리더로 행동하지 않도록 여유를 둡니다.
+        return self.held and time.monotonic() < self._valid_until - self.renew_interval / 2
+
+    def release(self) -> None:
+        if self.held:
+            self.shared.release_lease(self.name, self.owner)
+        self.held = False
+        self._valid_until = 0.0
+
+    def current_owner(self) -> Optional[str]:
+        return self.shared.lease_owner(self.name)
@@ -0,0 +1,433 @@
+"""
+대시보드용 신호 허브입니다.
+
+(전략, 파라미터, 마켓) 조합을 하나의 토픽으로 보고, 토픽마다 신호와 차트 계열을 한 번만 계산해 두었다가
+SSE/WebSocket 구독자에게 변경분만 밀어 줍니다. 같은 토픽을 보는 브라우저 탭이 몇 개든 계산과 JSON 인코딩은
+한 번이고, 탭마다 드는 비용은 큐에 메시지를 넣는 것뿐입니다.
+
+- 차트 계열(캔들 + 지표 + 봉별 신호)은 새 봉이 마감될 때만 벡터화 경로로 다시 계산합니다.
+- 봉 사이에는 현재가로 증분 신호만 계산합니다. (websocket 모드면 수집기의 마지막 체결가, 아니면 /ticker 한 번)
+- 메시지 종류: snapshot(구독 직후 전체), tick(현재가/신호), signal(신호가 바뀔 때만), bar(새 봉이 생긴 뒤 바뀐 행들)
+- 모든 메시지에는 토픽별 seq가 붙습니다. 느린 클라이언트의 큐가 넘치면 밀린 메시지를 버리고 snapshot을 다시 보냅니다.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import numpy as np
+from .candle_frame import CandleFrame
+from .upbit_service import UpbitService
+from .market_data import UpbitWebSocketClient
+from .trading.baseStrategy import BaseStrategy
+from ..core import metrics
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_TYPES = ('snapshot', 'tick', 'signal', 'bar')
+# 증분 신호 → 봉별 신호 계열 값 (vectorized_signals와 같은 1/-1/0)
+SIGNAL_VALUES = {'buy': 1, 'long': 1, 'sell': -1, 'short': -1}
+
+StrategyFactory = Callable[[str, str, Dict], BaseStrategy]
+
+
+def topic_key(strategy_name: str, parameters: Dict, market: str) -> str:
+    """파라미터 순서와 무관하게 같은 조합이면 같은 키를 만듭니다."""
+    canonical = json.dumps(parameters, sort_keys=True, separators=(',', ':'), default=str)
+    return f"{strategy_name}|{market}|{hashlib.sha1(canonical.encode()).hexdigest()[:12]}"
+
+
+def _json_values(values: np.ndarray) -> List:
+    """NaN은 JSON에 쓸 수 없으므로 None으로 바꿉니다."""
+    if values.dtype.kind == 'f':
+        return [None if v != v else v for v in values.tolist()]
+    return values.tolist()
+
+
+class Message:
+    """한 번 인코딩해서 모든 구독자에게 그대로 보내는 메시지입니다."""
+
+    __slots__ = ('type', 'key', 'data', '_sse')
+
+    def __init__(self, type: str, key: str, payload: Dict):
+        self.type = type
+        self.key = key
+        self.data = json.dumps({'type': type, 'key': key, **payload}, separators=(',', ':'))
+        self._sse: Optional[str] = None
+
+    @property
+    def sse(self) -> str:
+        if self._sse is None:
+            self._sse = f"event: {self.type}\ndata: {self.data}\n\n"
+        return self._sse
+
+
+class SignalTopic:
+    """토픽 하나의 전략 인스턴스와 계산 결과입니다."""
+
+    def __init__(self, key: str, strategy_name: str, parameters: Dict, market: str, strategy: BaseStrategy):
+        self.key = key
+        self.strategy_name = strategy_name
+        self.parameters = parameters
+        self.market = market
+        self.strategy = strategy
+        self.clients: Set["SignalClient"] = set()
+        self.series: Dict[str, List] = {}
+        self.signal: Optional[Dict] = None
+        self.price: Optional[float] = None
+        self.seq = 0
+        self.updated_at = 0.0
+        self.last_access = time.monotonic()
+        self.loading: Optional[asyncio.Task] = None
+        self.error: Optional[str] = None
+        self._snapshot: Optional[Message] = None
+        self.series_timer = metrics.STRATEGY_COMPUTE_SECONDS.labels(type(strategy).__name__, 'series')
+
+    @property
+    def ready(self) -> bool:
+        return self.loading is not None and self.loading.done() and self.error is None
+
+    def snapshot(self) -> Dict:
+        return {
+            'key': self.key,
+            'strategy': self.strategy_name,
+            'parameters': self.parameters,
+            'market': self.market,
+            'seq': self.seq,
+            'price': self.price,
+            'signal': self.signal,
+            'series': self.series,
+        }
+
+    def snapshot_message(self) -> Message:
+        """현재 seq의 snapshot 메시지입니다. 같은 seq 동안은 인코딩 결과를 재사용합니다."""
+        if self._snapshot is None:
+            payload = self.snapshot()
+            del payload['key']
+            self._snapshot = Message('snapshot', self.key, payload)
+        return self._snapshot
+
+    def next_seq(self) -> int:
+        self.seq += 1
+        self._snapshot = None
+        return self.seq
+
+
+class SignalClient:
+    """
+    브라우저 연결 하나입니다. 여러 토픽을 구독할 수 있고 메시지 종류로 거를 수 있습니다.
+    snapshot은 types와 관계없이 항상 받습니다.
+    """
+
+    def __init__(self, hub: "SignalHub", types: Optional[Iterable[str]] = None, maxsize: int = 256):
+        self.hub = hub
+        self.types: Optional[Set[str]] = set(types) if types is not None else None
+        if self.types is not None and not self.types <= set(MESSAGE_TYPES):
+            raise ValueError(f"Unknown message types: {sorted(self.types - set(MESSAGE_TYPES))}")
+        self.topics: Dict[str, SignalTopic] = {}
+        self.queue: "asyncio.Queue[Message]" = asyncio.Queue(maxsize=maxsize)
+        self.resyncs = 0
+
+    def wants(self, message: Message) -> bool:
+        return message.type == 'snapshot' or self.types is None or message.type in self.types
+
+    def put(self, message: Message) -> None:
+        if not self.wants(message):
+            return
+        if self.queue.full():
+            self._resync()
+            return
+        self.queue.put_nowait(message)
+
+    def _resync(self) -> None:
+        """밀린 변경분은 버리고 구독 중인 토픽의 최신 snapshot만 다시 넣습니다."""
+        self.resyncs += 1
+        metrics.SIGNAL_HUB_RESYNCS.inc()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        for topic in list(self.topics.values())[:self.queue.maxsize]:
+            self.queue.put_nowait(topic.snapshot_message())
+
+    async def get(self) -> Message:
+        return await self.queue.get()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Message:
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.hub.disconnect(self)
+
+
+class SignalHub:
+    """
+    토픽별 신호/차트 계열 캐시와 구독자 fan-out을 관리합니다. 앱 단위로 하나만 생성합니다.
+    구독자가 있는 토픽만 refresh_interval마다 갱신하며, 구독자가 없는 토픽은 REST 조회 시 필요할 때만 갱신하고
+    idle_ttl 동안 조회가 없으면 정리합니다.
+    """
+
+    def __init__(
+        self,
+        upbit_service: UpbitService,
+        strategy_factory: StrategyFactory,
+        market_feed: Optional[UpbitWebSocketClient] = None,
+        refresh_interval: float = 5,
+        history_bars: int = 365,
+        idle_ttl: float = 300,
+        max_topics: int = 256,
+        client_queue_size: int = 256,
+    ):
+        """
+        Args:
+            strategy_factory: (전략 이름, 마켓, 파라미터) → 전략 인스턴스. 지원하지 않는 전략이면 ValueError
+            market_feed: WebSocket 시세 수집기. 있으면 /ticker 대신 마지막 체결가를 씁니다.
+            refresh_interval: 현재가/신호 갱신 주기 (초)
+            history_bars: 차트 계열에 담을 일봉 개수 (진행 중인 봉 포함)
+            idle_ttl: 구독자가 없는 토픽을 남겨 둘 시간 (초)
+        """
+        self.upbit_service = upbit_service
+        self.strategy_factory = strategy_factory
+        self.market_feed = market_feed
+        self.refresh_interval = refresh_interval
+        self.history_bars = history_bars
+        self.idle_ttl = idle_ttl
+        self.max_topics = max_topics
+        self.client_queue_size = client_queue_size
+        self.topics: "OrderedDict[str, SignalTopic]" = OrderedDict()
+        self.clients: Set[SignalClient] = set()
+        self.refreshes = 0
+        self.series_builds = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for topic in self.topics.values():
+            if topic.loading is not None and not topic.loading.done():
+                topic.loading.cancel()
+
+    # ---- 토픽 ----
+
+    async def topic(self, strategy_name: str, parameters: Dict, market: str) -> SignalTopic:
+        """토픽을 찾거나 만들고 첫 계산이 끝날 때까지 기다립니다. 같은 토픽의 동시 요청은 계산을 공유합니다."""
+        key = topic_key(strategy_name, parameters, market)
+        topic = self.topics.get(key)
+        if topic is None:
+            strategy = self.strategy_factory(strategy_name, market, parameters)
+            topic = SignalTopic(key, strategy_name, parameters, market, strategy)
+            self.topics[key] = topic
+            self._evict()
+            topic.loading = asyncio.create_task(self._load(topic))
+            if self.market_feed is not None:
+                await self.market_feed.add_markets([market])
+        self.topics.move_to_end(key)
+        topic.last_access = time.monotonic()
+        await asyncio.shield(topic.loading)
+        if topic.error is not None:
+            self.topics.pop(key, None)
+            raise ValueError(topic.error)
+        return topic
+
+    async def get(self, strategy_name: str, parameters: Dict, market: str) -> Dict:
+        """
+        토픽의 최신 snapshot을 반환합니다. 구독자가 없어 백그라운드 갱신이 멈춘 토픽은 오래되었으면 여기서 갱신합니다.
+        """
+        topic = await self.topic(strategy_name, parameters, market)
+        if not topic.clients and time.monotonic() - topic.updated_at > self.refresh_interval:
+            await self.refresh([topic])
+        return topic.snapshot()
+
+    def _history_count(self, strategy: BaseStrategy) -> int:
+        # 같은 마켓의 토픽들이 캔들 캐시 키를 공유하도록 개수는 가능한 한 history_bars로 맞춥니다.
+        return max(self.history_bars, strategy.warmup_bars + 1)
+
+    async def _load(self, topic: SignalTopic) -> None:
+        try:
+            frame = await self.upbit_service.get_timeframe(topic.market, topic.strategy.timeframe, self._history_count(topic.strategy))
+            topic.strategy.warm_up(frame[:-1])
+            self._build_series(topic, frame)
+            if len(frame):
+                self._set_price(topic, float(frame.close[-1]))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            topic.error = str(e) or type(e).__name__
+            logger.warning("signal topic load failed", exc_info=e, extra={'key': topic.key})
+
+    def _build_series(self, topic: SignalTopic, frame: CandleFrame) -> None:
+        """캔들, 지표, 봉별 신호를 벡터화 경로로 한 번에 계산합니다. (새 봉이 생길 때만 호출)"""
+        started = time.perf_counter()
+        bars = {'open': frame.open, 'high': frame.high, 'low': frame.low, 'close': frame.close}
+        series = {
+            'timestamp': frame.timestamp.tolist(),
+            **{name: _json_values(values) for name, values in bars.items()},
+            'volume': _json_values(frame.volume),
+        }
+        for name, values in topic.strategy.chart_indicators(bars).items():
+            series[name] = _json_values(values)
+        series['signal'] = topic.strategy.vectorized_signals(bars).tolist()
+        topic.series = series
+        topic.updated_at = time.monotonic()
+        topic.next_seq()
+        self.series_builds += 1
+        topic.series_timer.observe(time.perf_counter() - started)
+
+    def _evict(self) -> None:
+        """구독자가 없는 토픽 중 오래 조회되지 않았거나 max_topics를 넘긴 것부터 정리합니다."""
+        now = time.monotonic()
+        idle = [k for k, t in self.topics.items() if not t.clients and t.ready]
+        overflow = len(self.topics) - self.max_topics
+        for key in idle:
+            topic = self.topics[key]
+            if overflow > 0 or now - topic.last_access > self.idle_ttl:
+                del self.topics[key]
+                overflow -= 1
+
+    # ---- 구독 ----
+
+    def connect(self, types: Optional[Iterable[str]] = None) -> SignalClient:
+        client = SignalClient(self, types, self.client_queue_size)
+        self.clients.add(client)
+        return client
+
+    async def subscribe(self, client: SignalClient, strategy_name: str, parameters: Dict, market: str) -> str:
+        """토픽을 구독하고 현재 snapshot을 바로 큐에 넣습니다. Returns: 토픽 키"""
+        topic = await self.topic(strategy_name, parameters, market)
+        if client not in self.clients:
+            raise ValueError("Client is disconnected")
+        if topic.key not in client.topics:
+            client.topics[topic.key] = topic
+            topic.clients.add(client)
+            client.put(topic.snapshot_message())
+        return topic.key
+
+    def unsubscribe(self, client: SignalClient, key: str) -> None:
+        topic = client.topics.pop(key, None)
+        if topic is not None:
+            topic.clients.discard(client)
+            topic.last_access = time.monotonic()
+
+    def disconnect(self, client: SignalClient) -> None:
+        for key in list(client.topics):
+            self.unsubscribe(client, key)
+        self.clients.discard(client)
+
+    def _publish(self, topic: SignalTopic, type: str, payload: Dict) -> None:
+        message = Message(type, topic.key, {'seq': topic.next_seq(), **payload})
+        metrics.SIGNAL_HUB_MESSAGES.labels(type).inc()
+        for client in list(topic.clients):
+            client.put(message)
+
+    # ---- 갱신 ----
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += self.refresh_interval
+            await asyncio.sleep(max(next_tick - loop.time(), 0))
+            try:
+                self._evict()
+                await self.refresh()
+            except Exception:
+                logger.exception("signal hub refresh failed")
+            if loop.time() > next_tick:
+                next_tick = loop.time()
+
+    async def refresh(self, topics: Optional[List[SignalTopic]] = None) -> None:
+        """
+        새로 마감된 봉이 있는 토픽은 차트 계열을 다시 계산하고, 모든 토픽의 신호를 현재가로 갱신합니다.
+        topics를 생략하면 구독자가 있는 토픽 전체를 갱신합니다. 현재가는 토픽 수가 아니라 마켓 수만큼만 조회합니다.
+        """
+        if topics is None:
+            topics = [t for t in self.topics.values() if t.clients]
+        topics = [t for t in topics if t.ready]
+        if not topics:
+            return
+        self.refreshes += 1
+        now_ms = int(time.time() * 1000)
+        stale = [t for t in topics if t.strategy.has_unsynced_bar(now_ms)]
+        if stale:
+            results = await asyncio.gather(*(self._roll_bar(t) for t in stale), return_exceptions=True)
+            for topic, result in zip(stale, results):
+                if isinstance(result, Exception):
+                    logger.warning("signal topic bar update failed", exc_info=result, extra={'key': topic.key})
+        prices = await self._prices({t.market for t in topics})
+        for topic in topics:
+            price = prices.get(topic.market)
+            if price is not None:
+                self._on_price(topic, price)
+            topic.updated_at = time.monotonic()
+
+    async def _prices(self, markets: Set[str]) -> Dict[str, float]:
+        prices: Dict[str, float] = {}
+        if self.market_feed is not None:
+            for market in markets:
+                price = self.market_feed.last_price(market)
+                if price is not None:
+                    prices[market] = price
+        missing = [m for m in markets if m not in prices]
+        if missing:
+            tickers = await self.upbit_service.get_tickers(missing)
+            prices.update({market: float(ticker['trade_price']) for market, ticker in tickers.items()})
+        return prices
+
+    async def _roll_bar(self, topic: SignalTopic) -> None:
+        """새로 마감된 봉을 증분 지표에 반영하고 차트 계열을 다시 계산해 바뀐 행들만 bar 메시지로 보냅니다."""
+        frame = await self.upbit_service.get_timeframe(topic.market, topic.strategy.timeframe, self._history_count(topic.strategy))
+        last_bar = topic.strategy.last_bar
+        if last_bar is not None and len(frame) >= 2 and int(frame.timestamp[-2]) <= last_bar['timestamp']:
+            return
+        start = 0 if last_bar is None else int(frame.timestamp.searchsorted(last_bar['timestamp'], side='right'))
+        for i in range(start, len(frame) - 1):
+            topic.strategy.update_bar(frame[i])
+        previous_open = topic.series['timestamp'][-1] if topic.series.get('timestamp') else None
+        self._build_series(topic, frame)
+        # 직전까지 진행 중이던 봉(이제 마감)부터 새로 생긴 봉까지가 변경분입니다.
+        first = 0 if previous_open is None else int(frame.timestamp.searchsorted(previous_open, side='left'))
+        self._publish(topic, 'bar', {'rows': {name: values[first:] for name, values in topic.series.items()}})
+
+    def _on_price(self, topic: SignalTopic, price: float) -> None:
+        changed_price = price != topic.price
+        previous = (topic.signal or {}).get('signal')
+        self._set_price(topic, price)
+        if changed_price:
+            self._publish(topic, 'tick', {'price': price, 'signal': topic.signal})
+        if topic.signal.get('signal') != previous:
+            self._publish(topic, 'signal', {'price': price, 'signal': topic.signal})
+
+    def _set_price(self, topic: SignalTopic, price: float) -> None:
+        """현재가로 증분 신호를 계산하고 진행 중인 봉의 종가/고가/저가를 맞춥니다."""
+        topic.signal = topic.strategy.calculate_signals_incremental(price)
+        topic.price = price
+        series = topic.series
+        if series.get('close'):
+            series['close'][-1] = price
+            series['high'][-1] = max(series['high'][-1], price)
+            series['low'][-1] = min(series['low'][-1], price)
+            series['signal'][-1] = SIGNAL_VALUES.get(topic.signal.get('signal'), 0)
+        topic._snapshot = None
+
+    def stats(self) -> Dict:
+        return {
+            'topics': len(self.topics),
+            'subscribed_topics': sum(1 for t in self.topics.values() if t.clients),
+            'clients': len(self.clients),
+            'refreshes': self.refreshes,
+            'series_builds': self.series_builds,
+            'resyncs': sum(c.resyncs for c in self.clients),
+            'queued': sum(c.queue.qsize() for c in self.clients),
+        }
@@ -0,0 +1,320 @@
+"""
+새 봉이 들어올 때마다 O(1)로 갱신되는 스트리밍 지표 모음입니다.
+모든 지표는 snapshot()으로 JSON 직렬화 가능한 상태를 내보내고
+restore_indicator()로 재시작 후 그대로 이어서 계산할 수 있습니다.
+"""
+from typing import Dict, Optional, Type
+from collections import deque
+import math
+
+
+class StreamingIndicator:
+    """스트리밍 지표의 공통 인터페이스입니다."""
+
+    def update(self, value: float) -> Optional[float]:
+        raise NotImplementedError
+
+    @property
+    def value(self) -> Optional[float]:
+        raise NotImplementedError
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def snapshot(self) -> Dict:
+        raise NotImplementedError
+
+    @classmethod
+    def restore(cls, state: Dict) -> "StreamingIndicator":
+        raise NotImplementedError
+
+
+class RunningSMA(StreamingIndicator):
+    """링 버퍼와 누적합으로 관리하는 단순이동평균입니다."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._buffer = deque(maxlen=window)
+        self._sum = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        if len(self._buffer) == self.window:
+            self._sum -= self._buffer[0]
+        self._buffer.append(value)
+        self._sum += value
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if len(self._buffer) < self.window:
+            return None
+        return self._sum / self.window
+
+    def snapshot(self) -> Dict:
+        return {'type': 'sma', 'window': self.window, 'buffer': list(self._buffer)}
+
+    @classmethod
+    def restore(cls, state: Dict) -> "RunningSMA":
+        indicator = cls(state['window'])
+        for value in state['buffer']:
+            indicator.update(value)
+        return indicator
+
+
+class RunningEMA(StreamingIndicator):
+    """
+    지수이동평균입니다. seed_window가 있으면 처음 seed_window개 값의 평균으로 시작합니다.
+    """
+
+    def __init__(self, alpha: float, seed_window: int = 1):
+        self.alpha = alpha
+        self.seed_window = max(seed_window, 1)
+        self._seed = RunningSMA(self.seed_window)
+        self._value: Optional[float] = None
+
+    def update(self, value: float) -> Optional[float]:
+        if self._value is None:
+            seed = self._seed.update(value)
+            if seed is not None:
+                self._value = seed
+        else:
+            self._value += self.alpha * (value - self._value)
+        return self._value
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._value
+
+    def snapshot(self) -> Dict:
+        return {
+            'type': 'ema',
+            'alpha': self.alpha,
+            'seed_window': self.seed_window,
+            'seed': self._seed.snapshot(),
+            'value': self._value,
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> "RunningEMA":
+        indicator = cls(state['alpha'], state['seed_window'])
+        indicator._seed = RunningSMA.restore(state['seed'])
+        indicator._value = state['value']
+        return indicator
+
+
+class RollingVariance(StreamingIndicator):
+    """
+    고정 창 Welford 알고리즘으로 관리하는 이동 분산/표준편차입니다.
+    값이 창에 들어오고 나갈 때 평균과 제곱편차합(M2)을 O(1)로 보정합니다.
+    """
+
+    def __init__(self, window: int, ddof: int = 0):
+        self.window = window
+        self.ddof = ddof
+        self._buffer = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        if len(self._buffer) == self.window:
+            old = self._buffer.popleft()
+            n = len(self._buffer)
+            if n == 0:
+                self._mean, self._m2 = 0.0, 0.0
+            else:
+                old_mean = self._mean
+                self._mean = old_mean - (old - old_mean) / n
+                self._m2 -= (old - old_mean) * (old - self._mean)
+        self._buffer.append(value)
+        n = len(self._buffer)
+        delta = value - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (value - self._mean)
+        return self.value
+
+    @property
+    def variance(self) -> Optional[float]:
+        if len(self._buffer) < self.window or self.window <= self.ddof:
+            return None
+        return max(self._m2, 0.0) / (self.window - self.ddof)
+
+    @property
+    def value(self) -> Optional[float]:
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._mean if self._buffer else None
+
+    def snapshot(self) -> Dict:
+        return {'type': 'variance', 'window': self.window, 'ddof': self.ddof, 'buffer': list(self._buffer)}
+
+    @classmethod
+    def restore(cls, state: Dict) -> "RollingVariance":
+        indicator = cls(state['window'], state['ddof'])
+        for value in state['buffer']:
+            indicator.update(value)
+        return indicator
+
+
+class RollingExtremum(StreamingIndicator):
+    """
+    단조 덱(monotonic deque)으로 관리하는 이동 최댓값/최솟값입니다.
+    각 값은 덱에 한 번 들어가고 한 번 나가므로 update는 분할상환 O(1)입니다.
+    """
+
+    def __init__(self, window: int, mode: str = 'max'):
+        if mode not in ('max', 'min'):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.window = window
+        self.mode = mode
+        self._deque = deque()  # (index, value)
+        self._index = 0
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old if self.mode == 'max' else new <= old
+
+    def update(self, value: float) -> Optional[float]:
+        while self._deque and self._dominates(value, self._deque[-1][1]):
+            self._deque.pop()
+        self._deque.append((self._index, value))
+        if self._deque[0][0] <= self._index - self.window:
+            self._deque.popleft()
+        self._index += 1
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self._index < self.window:
+            return None
+        return self._deque[0][1]
+
+    def snapshot(self) -> Dict:
+        return {
+            'type': 'extremum',
+            'window': self.window,
+            'mode': self.mode,
+            'index': self._index,
+            'deque': [list(item) for item in self._deque],
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> "RollingExtremum":
+        indicator = cls(state['window'], state['mode'])
+        indicator._index = state['index']
+        indicator._deque = deque(tuple(item) for item in state['deque'])
+        return indicator
+
+
+class AverageTrueRange(StreamingIndicator):
+    """
+    True Range의 단순이동평균(ATR)입니다. update에는 봉 dict(high, low, close)를 넘깁니다.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._sma = RunningSMA(window)
+        self._prev_close: Optional[float] = None
+
+    def update(self, bar: Dict) -> Optional[float]:
+        high, low, close = bar['high'], bar['low'], bar['close']
+        if self._prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        return self._sma.update(true_range)
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._sma.value
+
+    def snapshot(self) -> Dict:
+        return {'type': 'atr', 'window': self.window, 'sma': self._sma.snapshot(), 'prev_close': self._prev_close}
+
+    @classmethod
+    def restore(cls, state: Dict) -> "AverageTrueRange":
+        indicator = cls(state['window'])
+        indicator._sma = RunningSMA.restore(state['sma'])
+        indicator._prev_close = state['prev_close']
+        return indicator
+
+
+class RollingOLS(StreamingIndicator):
+    """
+    최근 window개 (y, x) 쌍으로 y = alpha + beta * x 를 추정하는 이동 회귀입니다.
+    창의 합(Σx, Σy, Σxx, Σxy)을 넣고 빼며 O(1)로 갱신합니다. update에는 (y, x) 튜플을 넘깁니다.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._buffer = deque()
+        self._ref: Optional[tuple] = None  # 상쇄 오차를 줄이기 위한 기준점 (첫 관측값)
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+    def _add(self, y: float, x: float, sign: float) -> None:
+        dy, dx = y - self._ref[0], x - self._ref[1]
+        self._sx += sign * dx
+        self._sy += sign * dy
+        self._sxx += sign * dx * dx
+        self._sxy += sign * dx * dy
+
+    def update(self, pair) -> Optional[float]:
+        y, x = pair
+        if self._ref is None:
+            self._ref = (y, x)
+        if len(self._buffer) == self.window:
+            self._add(*self._buffer.popleft(), -1.0)
+        self._buffer.append((y, x))
+        self._add(y, x, 1.0)
+        return self.value
+
+    @property
+    def beta(self) -> Optional[float]:
+        if len(self._buffer) < self.window:
+            return None
+        n = self.window
+        var = self._sxx - self._sx * self._sx / n
+        if var <= 0:
+            return None
+        return (self._sxy - self._sx * self._sy / n) / var
+
+    @property
+    def alpha(self) -> Optional[float]:
+        beta = self.beta
+        if beta is None:
+            return None
+        n = self.window
+        return (self._sy / n + self._ref[0]) - beta * (self._sx / n + self._ref[1])
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.beta
+
+    def snapshot(self) -> Dict:
+        return {'type': 'ols', 'window': self.window, 'ref': self._ref, 'buffer': [list(p) for p in self._buffer]}
+
+    @classmethod
+    def restore(cls, state: Dict) -> "RollingOLS":
+        indicator = cls(state['window'])
+        indicator._ref = tuple(state['ref']) if state['ref'] is not None else None
+        for pair in state['buffer']:
+            indicator.update(tuple(pair))
+        return indicator
+
+
+INDICATOR_TYPES: Dict[str, Type[StreamingIndicator]] = {
+    'sma': RunningSMA,
+    'ema': RunningEMA,
+    'variance': RollingVariance,
+    'extremum': RollingExtremum,
+    'atr': AverageTrueRange,
+    'ols': RollingOLS,
+}
+
+
+def restore_indicator(state: Dict) -> StreamingIndicator:
+    """snapshot()으로 저장한 상태에서 지표를 복원합니다."""
+    return INDICATOR_TYPES[state['type']].restore(state)
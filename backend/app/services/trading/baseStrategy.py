@@ -1,13 +1,22 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+import numpy as np
+from ..candle_frame import CandleFrame
+from ..streaming_indicators import StreamingIndicator, restore_indicator
+from ..resample import interval_ms, normalize_timeframe
 
 class BaseStrategy(ABC):
     def __init__(self, market: str, parameters: Dict):
         self.market = market
         self.parameters = parameters
+        # 봉 단위 (5m, 1h, 4h ... 생략 시 일봉). Upbit이 제공하지 않는 분 단위(2h 등)는 리샘플링한 봉을 씁니다.
+        self.timeframe = normalize_timeframe(parameters.get('timeframe') or 'days')
         self.position = False  # 현재 포지션 상태 (True: 매수, False: 매도)
         self.last_signal = None  # 마지막 신호 시간
+        # 증분 모드 상태: 마감된 봉마다 update_bar()로 O(1) 갱신되는 지표들
+        self.streaming_indicators: Dict[str, StreamingIndicator] = {}
+        self.last_bar: Optional[Dict] = None
 
     @abstractmethod
     def calculate_signals(self, candles: List[Dict]) -> Dict:
@@ -47,4 +56,95 @@ class BaseStrategy(ABC):
         if signal['signal'] == 'buy':
             self.position = True
         elif signal['signal'] == 'sell':
-            self.position = False 
\ No newline at end of file
+            self.position = False
+
+    # ---- 증분(스트리밍) 모드 ----
+    # 전체 이력을 다시 받지 않고, 마감된 봉이 생길 때마다 지표를 O(1)로 갱신합니다.
+
+    @property
+    def bar_interval(self) -> int:
+        """timeframe 봉 하나의 길이 (ms)"""
+        return interval_ms(self.timeframe)
+
+    @property
+    def warmup_bars(self) -> int:
+        """증분 모드 지표를 채우는 데 필요한 마감 봉 개수입니다."""
+        return 0
+
+    def build_indicators(self) -> Dict[str, StreamingIndicator]:
+        """증분 모드에서 사용할 스트리밍 지표를 생성합니다. 하위 클래스에서 구현합니다."""
+        raise NotImplementedError(f"{type(self).__name__} does not support incremental mode")
+
+    def update_bar(self, bar: Dict) -> None:
+        """
+        마감된 봉 하나를 증분 지표에 반영합니다.
+        Args:
+            bar: CandleFrame[i] 형식의 봉 dict (timestamp, open, high, low, close, volume, value)
+        """
+        if not self.streaming_indicators:
+            self.streaming_indicators = self.build_indicators()
+        if self.last_bar is not None and bar['timestamp'] <= self.last_bar['timestamp']:
+            return
+        self.on_bar(bar)
+        self.last_bar = bar
+
+    def on_bar(self, bar: Dict) -> None:
+        """update_bar()에서 호출됩니다. 하위 클래스가 지표 갱신 방식을 정의합니다."""
+        raise NotImplementedError(f"{type(self).__name__} does not support incremental mode")
+
+    def has_unsynced_bar(self, now_ms: int) -> bool:
+        """now_ms(UTC ms) 기준으로 마감되었지만 아직 update_bar()로 반영하지 않은 봉이 있는지 확인합니다."""
+        if self.last_bar is None:
+            return True
+        interval = self.bar_interval
+        return self.last_bar['timestamp'] < now_ms - now_ms % interval - interval
+
+    def warm_up(self, frame: CandleFrame) -> None:
+        """마감된 봉들로 증분 지표를 채웁니다."""
+        for i in range(len(frame)):
+            self.update_bar(frame[i])
+
+    def calculate_signals_incremental(self, price: float) -> Dict:
+        """
+        증분 지표와 현재가(진행 중인 봉의 가격)로 매매 신호를 계산합니다.
+        Returns:
+            Dict: calculate_signals()와 같은 형식의 신호
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support incremental mode")
+
+    # ---- 벡터화(백테스트) 모드 ----
+
+    def vectorized_signals(self, bars: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        전체 이력의 신호를 한 번에 계산합니다.
+        t 봉의 신호는 t-1 봉까지의 지표와 t 봉 종가(현재가)로 정하며 calculate_signals_incremental()과 같은 규칙을 따릅니다.
+        Args:
+            bars: 'open', 'high', 'low', 'close' → (markets × bars) 배열
+        Returns:
+            np.ndarray: 같은 모양의 신호 배열 (1: buy/long, -1: sell/short, 0: hold)
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support vectorized mode")
+
+    def chart_indicators(self, bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        차트에 함께 그릴 지표 계열을 계산합니다. t 봉의 값은 vectorized_signals()가 t 봉 신호에 쓰는 값입니다.
+        Returns:
+            Dict[str, np.ndarray]: 지표 이름 → bars의 각 배열과 같은 모양의 배열
+        """
+        return {}
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """재시작 후 복원할 수 있도록 증분 모드 상태를 JSON 직렬화 가능한 dict로 반환합니다."""
+        return {
+            'position': self.position,
+            'last_bar': self.last_bar,
+            'indicators': {name: ind.snapshot() for name, ind in self.streaming_indicators.items()},
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """snapshot_state()로 저장한 상태를 복원합니다."""
+        self.position = state.get('position', False)
+        self.last_bar = state.get('last_bar')
+        self.streaming_indicators = {
+            name: restore_indicator(indicator) for name, indicator in state.get('indicators', {}).items()
+        }
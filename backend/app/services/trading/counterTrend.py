@@ -1,29 +1,31 @@
 from typing import Dict, List
+import logging
 import numpy as np
 from .baseStrategy import BaseStrategy
+from .. import indicators
+from ..streaming_indicators import RunningSMA
+
+logger = logging.getLogger(__name__)
 
 class CounterTrendStrategy(BaseStrategy):
     def __init__(self, upbitService, parameters: Dict):
-        print(parameters)
+        logger.debug("strategy created", extra={'parameters': parameters})
         self.upbitService = upbitService
         self.ticker = parameters.get('tickers', [])[0]
+        super().__init__(self.ticker, parameters)
         self.kValue = float(parameters.get('kValue', 2.2))
         self.nDays = int(parameters.get('nDays', 20))
     
     async def calculate_signals(self):
-        candles = []
-        candles_from_api = await self.upbitService.get_daily_candles(self.ticker, self.nDays+2)
-        candles = candles_from_api
-        candleswithoutrecent = candles[2:]
-        ranges = [candle['high_price'] - candle['low_price'] for candle in candleswithoutrecent]
-        avgRange = np.mean(ranges)
-        prevHigh = candles[1]['high_price']
-        longHitLevel = prevHigh - self.kValue * avgRange
-        currentPrice = candles[0]['trade_price']
-
-        prevLow = candles[1]['low_price']
-        shortHitLevel = prevLow + self.kValue * avgRange
+        # 프레임은 오래된 봉이 앞: [-1]은 진행 중인 봉, [-2]는 전일 봉
+        candles = await self.upbitService.get_timeframe(self.ticker, self.timeframe, self.nDays+2)
+        levels = indicators.counter_trend_levels(candles.high, candles.low, self.nDays, self.kValue)
+        longHitLevel = levels['long'][-1]
+        shortHitLevel = levels['short'][-1]
+        currentPrice = candles.close[-1]
+        return self._signal(currentPrice, longHitLevel, shortHitLevel)
 
+    def _signal(self, currentPrice: float, longHitLevel: float, shortHitLevel: float) -> Dict:
         if(currentPrice < longHitLevel):
             return {"signal": "long", "message": "will close long position tomorrow"}
         elif(currentPrice > shortHitLevel):
@@ -31,5 +33,37 @@ class CounterTrendStrategy(BaseStrategy):
         else:
             return {"signal": "hold", "message": "no action"}
 
+    # ---- 증분 모드 ----
+
+    @property
+    def warmup_bars(self) -> int:
+        return self.nDays + 1
+
+    def build_indicators(self) -> Dict:
+        return {'avgRange': RunningSMA(self.nDays)}
+
+    def on_bar(self, bar: Dict) -> None:
+        # 평균 변동폭은 전일 봉을 제외한 nDays개 봉으로 계산하므로 한 봉 늦게 반영합니다.
+        if self.last_bar is not None:
+            self.streaming_indicators['avgRange'].update(self.last_bar['high'] - self.last_bar['low'])
+
+    def calculate_signals_incremental(self, price: float) -> Dict:
+        avgRange = self.streaming_indicators['avgRange'].value if self.streaming_indicators else None
+        if avgRange is None:
+            return {"signal": "hold", "message": "warming up indicators"}
+        longHitLevel = self.last_bar['high'] - self.kValue * avgRange
+        shortHitLevel = self.last_bar['low'] + self.kValue * avgRange
+        return self._signal(price, longHitLevel, shortHitLevel)
+
+
+    # ---- 벡터화 모드 ----
 
+    def chart_indicators(self, bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        levels = indicators.counter_trend_levels(bars['high'], bars['low'], self.nDays, self.kValue)
+        return {'longHitLevel': levels['long'], 'shortHitLevel': levels['short']}
 
+    def vectorized_signals(self, bars: Dict[str, np.ndarray]) -> np.ndarray:
+        levels = self.chart_indicators(bars)
+        close = bars['close']
+        with np.errstate(invalid='ignore'):
+            return np.where(close < levels['longHitLevel'], 1, np.where(close > levels['shortHitLevel'], -1, 0))
@@ -1,28 +1,65 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 import numpy as np
+from .. import portfolio
+from ..portfolio import CovarianceCache, EWMACovariance
 
 class InverseVolatilityStrategy:
-    def __init__(self, upbit_service, parameters: Dict):
+    """
+    바스켓 전체의 (tickers × bars) 수익률로 지수가중 공분산을 추정하여 비중을 정합니다.
+    mode: 'inverse_vol'(기본), 'erc'(위험 기여도 균등), 'vol_target'(ERC + 목표 변동성, 나머지는 현금)
+    """
+
+    def __init__(self, upbit_service, parameters: Dict, covariance_cache: Optional[CovarianceCache] = None):
         self.upbit_service = upbit_service
         self.volatility_window = parameters.get('volatility_window', 20)
         self.tickers = parameters.get("tickers", [])
+        self.mode = parameters.get('mode', 'inverse_vol')
+        if self.mode not in portfolio.MODES:
+            raise ValueError(f"Unknown mode: {self.mode}")
+        self.halflife = float(parameters.get('halflife', self.volatility_window))
+        self.shrinkage = float(parameters.get('shrinkage', 0.1))
+        self.target_volatility = float(parameters.get('target_volatility', 0.2))
+        self.max_leverage = float(parameters.get('max_leverage', 1.0))
+        self.lookback = int(parameters.get('lookback', max(self.volatility_window, int(self.halflife * 5))))
+        # 바스켓별 공분산은 앱 단위 캐시를 공유하여 새 봉만 반영합니다.
+        self.covariance_cache = covariance_cache if covariance_cache is not None else CovarianceCache()
+        self._last_weights: Optional[np.ndarray] = None
+
+    def target_weights(self, state: EWMACovariance) -> np.ndarray:
+        """공분산 상태로 목표 비중을 계산합니다. 수익률이 volatility_window개 미만인 마켓은 0입니다."""
+        cov = portfolio.shrink(state.covariance(), self.shrinkage)
+        short = state.counts < self.volatility_window
+        cov[short, :] = 0.0
+        cov[:, short] = 0.0
+        weights = portfolio.target_weights(
+            cov, self.mode, self.target_volatility, max_leverage=self.max_leverage, initial=self._last_weights,
+        )
+        self._last_weights = weights
+        return weights
 
     async def calculate_portfolio_weights(self) -> Dict:
         if len(self.tickers) < 2:
             return {"error": "2개 이상의 티커가 필요합니다."}
 
-        volatilities = []
-
-        for ticker in self.tickers:
-            candles = await self.upbit_service.get_daily_candles(ticker, self.volatility_window)
-            closes = [candle['trade_price'] for candle in candles]
-            pct_changes = []
-            for i in range(len(closes)-1):
-                pct_changes.append((closes[i+1]-closes[i])/closes[i])
-            volatilities.append(np.std(pct_changes))
-        if 0 in volatilities:
-            return {"error": "0 변동성 발견"}
+        frames = await self.upbit_service.get_daily_frames_many(self.tickers, self.lookback + 1)
+        # 진행 중인 봉을 뺀 마감 봉으로만 공분산을 갱신합니다.
+        state = self.covariance_cache.update([frames[ticker][:-1] for ticker in self.tickers], self.halflife)
+        weights = self.target_weights(state)
+        if not weights.any():
+            return {"error": "변동성을 계산할 수 있는 티커가 없습니다."}
+        return {ticker: float(weight) for ticker, weight in zip(self.tickers, weights)}
 
-        weights = np.array([1 / v for v in volatilities])
-        weights = weights / np.sum(weights)
-        return {ticker: float(weight) for ticker, weight in zip(self.tickers, weights)} 
\ No newline at end of file
+    def vectorized_weights(self, close: np.ndarray) -> np.ndarray:
+        """
+        (markets × bars) 종가로 봉마다의 목표 비중을 계산합니다.
+        t 봉의 비중은 t-1 봉까지의 수익률로 추정한 공분산으로 정합니다. (상장 전/변동성 0인 마켓은 0)
+        공분산은 봉마다 rank-1 갱신하므로 전체 비용은 O(bars × markets²)입니다.
+        """
+        n, length = close.shape
+        weights = np.zeros((n, length))
+        state = EWMACovariance(n, self.halflife)
+        self._last_weights = None
+        for t in range(length - 1):
+            state.update_prices(t, close[:, t])
+            weights[:, t + 1] = self.target_weights(state)
+        return weights
@@ -0,0 +1,392 @@
+"""
+전략 레지스트리와 전략 인스턴스 풀입니다.
+
+전략은 이름(과 별칭)으로 한 번 등록하고 O(1)로 찾습니다. 전략 클래스는 "모듈:클래스" 경로로만 적어 두었다가
+처음 생성할 때 import합니다. 파라미터는 선언한 스키마(Param)로 타입 변환/범위 검사 후 기본값을 채워 생성자에 넘깁니다.
+
+    kind
+    - single: 마켓 하나 (tickers=[market]), 증분 모드(warm_up/update_bar/calculate_signals_incremental) 지원
+    - pair: 두 마켓 (tickers=[y, x])
+    - portfolio: 바스켓 (tickers=[...]), 신호 대신 비중을 계산
+
+STRATEGY_PLUGINS 설정에 모듈 경로를 적으면 시작 시 import하여 그 모듈의 register(registry)로 전략을 추가합니다.
+
+StrategyPool은 (전략, 파라미터)별로 살아 있는 인스턴스를 재사용합니다. 같은 요청이 반복되면 검증/생성 없이
+같은 인스턴스를 쓰고, 증분 모드 전략은 처음 한 번만 이력을 받아 지표를 채운 뒤 이후에는 새로 마감된 봉만 반영합니다.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+import asyncio
+import importlib
+import logging
+import time
+import orjson
+from ..candle_frame import CandleFrame
+from ...core import metrics
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('single', 'pair', 'portfolio')
+TICKER_COUNTS = {'single': 1, 'pair': 2}
+
+
+class Param:
+    """전략 파라미터 하나의 선언입니다. parse()는 값을 타입 변환하고 범위/선택지를 검사합니다."""
+
+    __slots__ = ('name', 'type', 'default', 'minimum', 'maximum', 'choices', 'description')
+
+    def __init__(
+        self,
+        name: str,
+        type: Callable = float,
+        default: Any = None,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+        choices: Optional[Sequence] = None,
+        description: str = '',
+    ):
+        self.name = name
+        self.type = type
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.choices = tuple(choices) if choices else None
+        self.description = description
+
+    def parse(self, value: Any) -> Any:
+        if isinstance(value, bool) or value is None:
+            raise ValueError(f"{self.name} must be {self.type.__name__}")
+        try:
+            parsed = self.type(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{self.name} must be {self.type.__name__}: {value!r}")
+        if self.type is int and isinstance(value, float) and value != parsed:
+            raise ValueError(f"{self.name} must be int: {value!r}")
+        if self.choices is not None and parsed not in self.choices:
+            raise ValueError(f"{self.name} must be one of {', '.join(map(str, self.choices))}")
+        if self.minimum is not None and parsed < self.minimum:
+            raise ValueError(f"{self.name} must be >= {self.minimum}")
+        if self.maximum is not None and parsed > self.maximum:
+            raise ValueError(f"{self.name} must be <= {self.maximum}")
+        return parsed
+
+    def to_dict(self) -> Dict:
+        schema = {'name': self.name, 'type': self.type.__name__, 'default': self.default}
+        for key in ('minimum', 'maximum', 'choices', 'description'):
+            value = getattr(self, key)
+            if value:
+                schema[key] = list(value) if key == 'choices' else value
+        return schema
+
+
+class StrategySpec:
+    """레지스트리에 등록하는 전략 선언입니다. 전략 클래스는 load()에서 처음 한 번만 import합니다."""
+
+    __slots__ = ('name', 'path', 'kind', 'params', 'aliases', 'title', 'resources', '_cls', '_by_name')
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        kind: str = 'single',
+        params: Sequence[Param] = (),
+        aliases: Sequence[str] = (),
+        title: Optional[str] = None,
+        resources: Sequence[str] = (),
+    ):
+        """
+        Args:
+            path: "모듈:클래스" (모듈은 절대 경로 또는 이 패키지 기준 상대 경로)
+            resources: 생성자에 키워드 인자로 넘길 앱 단위 공유 객체 이름 (예: pair_cache)
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown strategy kind: {kind}")
+        self.name = name
+        self.path = path
+        self.kind = kind
+        self.params = tuple(params)
+        self.aliases = tuple(aliases)
+        self.title = title or name
+        self.resources = tuple(resources)
+        self._cls = None
+        self._by_name = {param.name: param for param in self.params}
+
+    def load(self) -> type:
+        if self._cls is None:
+            module, _, attribute = self.path.partition(':')
+            self._cls = getattr(importlib.import_module(module, __package__), attribute)
+        return self._cls
+
+    def validate(self, parameters: Dict) -> Dict:
+        """
+        선언한 파라미터를 변환/검사하고 빠진 값은 기본값으로 채웁니다.
+        선언하지 않은 키(tickers, orderAmount 등)는 그대로 둡니다.
+        """
+        if not isinstance(parameters, dict):
+            raise ValueError("parameters must be an object")
+        validated = dict(parameters)
+        for name, param in self._by_name.items():
+            if name in parameters:
+                validated[name] = param.parse(parameters[name])
+            elif param.default is not None:
+                validated[name] = param.default
+        tickers = validated.get('tickers') or []
+        if not isinstance(tickers, list) or not all(isinstance(t, str) for t in tickers):
+            raise ValueError("tickers must be a list of market codes")
+        required = TICKER_COUNTS.get(self.kind)
+        if required is not None and len(tickers) < required:
+            raise ValueError(f"{self.name} requires {required} ticker(s)")
+        if self.kind == 'portfolio' and not tickers:
+            raise ValueError(f"{self.name} requires tickers")
+        return validated
+
+    def create(self, upbit_service, parameters: Dict, resources: Optional[Dict] = None, validated: bool = False):
+        """
+        Args:
+            validated: parameters가 이미 validate()를 거쳤으면 True
+        """
+        parameters = parameters if validated else self.validate(parameters)
+        resources = resources or {}
+        kwargs = {name: resources[name] for name in self.resources if resources.get(name) is not None}
+        return self.load()(upbit_service, parameters, **kwargs)
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'title': self.title,
+            'kind': self.kind,
+            'aliases': list(self.aliases),
+            'parameters': [param.to_dict() for param in self.params],
+        }
+
+
+class StrategyRegistry:
+    """이름/별칭 → StrategySpec 사전입니다."""
+
+    def __init__(self, specs: Iterable[StrategySpec] = ()):
+        self._specs: Dict[str, StrategySpec] = {}
+        self._lookup: Dict[str, StrategySpec] = {}
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: StrategySpec) -> StrategySpec:
+        for key in (spec.name, *spec.aliases):
+            existing = self._lookup.get(key)
+            if existing is not None and existing.name != spec.name:
+                raise ValueError(f"Strategy name already registered: {key}")
+        previous = self._specs.get(spec.name)
+        if previous is not None:
+            for key in (previous.name, *previous.aliases):
+                self._lookup.pop(key, None)
+        self._specs[spec.name] = spec
+        for key in (spec.name, *spec.aliases):
+            self._lookup[key] = spec
+        return spec
+
+    def get(self, name: Optional[str]) -> Optional[StrategySpec]:
+        return self._lookup.get(name) if isinstance(name, str) else None
+
+    def require(self, name: Optional[str], kind: Optional[str] = None) -> StrategySpec:
+        """이름으로 전략을 찾습니다. 없거나 kind가 다르면 ValueError"""
+        spec = self.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown strategy: {name}")
+        if kind is not None and spec.kind != kind:
+            raise ValueError(f"{spec.name} is a {spec.kind} strategy")
+        return spec
+
+    def names(self, kind: Optional[str] = None) -> List[str]:
+        return [name for name, spec in self._specs.items() if kind is None or spec.kind == kind]
+
+    def describe(self) -> List[Dict]:
+        return [spec.to_dict() for spec in self._specs.values()]
+
+    def load_plugins(self, modules: Iterable[str]) -> None:
+        """각 모듈을 import하여 모듈의 register(registry)를 호출합니다."""
+        for module in modules:
+            importlib.import_module(module).register(self)
+            logger.info("strategy plugin loaded", extra={'module': module})
+
+
+# single 전략 공통: 봉 단위 (기간 파라미터는 이 봉 개수입니다)
+TIMEFRAME_PARAM = Param('timeframe', str, 'days', description="봉 단위 (5m, 15m, 1h, 4h, 1d 등, 기본 일봉)")
+
+REGISTRY = StrategyRegistry([
+    StrategySpec(
+        'moving_average', '.trendFollowing:TrendFollowingStrategy', aliases=('Trend',), title='Trend',
+        params=(
+            Param('trendType', str, 'sma', choices=('sma', 'ema', 'breakout')),
+            Param('shortPeriod', int, 20, minimum=1),
+            Param('longPeriod', int, 50, minimum=1),
+            Param('nDays', int, 20, minimum=1, description="breakout 채널 기간"),
+            Param('alpha', float, 0.1, minimum=0, maximum=1, description="EMA 평활 계수"),
+            Param('volatility_window', int, 20, minimum=1),
+            TIMEFRAME_PARAM,
+        ),
+    ),
+    StrategySpec(
+        'counter_trend', '.counterTrend:CounterTrendStrategy', aliases=('CounterTrend',), title='CounterTrend',
+        params=(
+            Param('nDays', int, 20, minimum=1),
+            Param('kValue', float, 2.2, minimum=0),
+            TIMEFRAME_PARAM,
+        ),
+    ),
+    StrategySpec(
+        'spread', '.spread:SpreadStrategy', kind='pair', aliases=('Spread',), title='Spread',
+        resources=('pair_cache',),
+        params=(
+            Param('lookbackDays', int, 20, minimum=2),
+            Param('zScoreDays', int, 60, minimum=2),
+            Param('longEntryThreshold', float, -1),
+            Param('shortEntryThreshold', float, 1),
+            Param('longExitThreshold', float, 1),
+            Param('shortExitThreshold', float, -1),
+            Param('holdingPeriod', int, 5, minimum=1),
+            # /trading/execute는 요청 사이에 포지션을 기억하지 않으므로 보유 중인 포지션은 호출자가 넘깁니다.
+            Param('position', str, 'flat', choices=('flat', 'long', 'short'), description="보유 중인 스프레드 포지션"),
+            Param('barsHeld', int, 0, minimum=0, description="포지션 진입 후 마감된 봉 수"),
+        ),
+    ),
+    StrategySpec(
+        'inverse_volatility', '.inverseVolatility:InverseVolatilityStrategy', kind='portfolio',
+        aliases=('Inverse Volatility',), title='InverseVolatility', resources=('covariance_cache',),
+        params=(
+            Param('mode', str, 'inverse_vol', choices=('inverse_vol', 'erc', 'vol_target')),
+            Param('volatility_window', int, 20, minimum=2),
+            # halflife/lookback의 기본값은 volatility_window에 따라 전략이 정합니다.
+            Param('halflife', float, minimum=1),
+            Param('lookback', int, minimum=2),
+            Param('shrinkage', float, 0.1, minimum=0, maximum=1),
+            Param('target_volatility', float, 0.2, minimum=0),
+            Param('max_leverage', float, 1.0, minimum=0),
+        ),
+    ),
+])
+
+
+async def sync_closed_bars(upbit_service, strategy, market: str) -> CandleFrame:
+    """
+    마지막으로 반영한 봉 이후에 마감된 봉들을 증분 지표에 반영합니다.
+    보통은 최근 2개 봉([-2] 마지막 마감 봉, [-1] 진행 중인 봉)만 조회합니다.
+    Returns:
+        CandleFrame: 진행 중인 봉을 마지막에 포함한 최근 캔들
+    """
+    candles = await upbit_service.get_timeframe(market, strategy.timeframe, 2)
+    if strategy.last_bar is not None and len(candles) >= 2:
+        missing = (int(candles.timestamp[-2]) - strategy.last_bar['timestamp']) // strategy.bar_interval
+        if missing > 1:
+            # 멈춰 있던 동안 놓친 봉까지 함께 받습니다.
+            candles = await upbit_service.get_timeframe(market, strategy.timeframe, int(missing) + 1)
+    started = time.perf_counter()
+    for i in range(len(candles) - 1):
+        strategy.update_bar(candles[i])
+    metrics.STRATEGY_COMPUTE_SECONDS.labels(type(strategy).__name__, 'bar').observe(time.perf_counter() - started)
+    return candles
+
+
+class PooledStrategy:
+    __slots__ = ('spec', 'strategy', 'lock', 'uses')
+
+    def __init__(self, spec: StrategySpec, strategy):
+        self.spec = spec
+        self.strategy = strategy
+        # 같은 인스턴스의 워밍업/봉 반영이 동시에 두 번 일어나지 않도록 합니다.
+        self.lock = asyncio.Lock()
+        self.uses = 0
+
+
+class StrategyPool:
+    """
+    (전략, 파라미터)별로 살아 있는 전략 인스턴스를 LRU로 보관합니다.
+    키는 요청에 온 파라미터 그대로의 직렬화이므로, 적중하면 검증/생성 비용 없이 O(1)로 인스턴스를 돌려줍니다.
+    스케줄러 세션은 포지션 상태를 따로 가지므로 이 풀을 쓰지 않습니다.
+    """
+
+    def __init__(
+        self,
+        upbit_service,
+        registry: StrategyRegistry = REGISTRY,
+        resources: Optional[Dict] = None,
+        max_size: int = 1024,
+    ):
+        """
+        Args:
+            resources: 전략 생성자에 넘길 앱 단위 공유 객체 (pair_cache, covariance_cache)
+            max_size: 보관할 인스턴스 수. 넘치면 가장 오래 쓰지 않은 것부터 버립니다.
+        """
+        self.upbit_service = upbit_service
+        self.registry = registry
+        self.resources = resources or {}
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Tuple[str, bytes], PooledStrategy]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(spec: StrategySpec, parameters: Dict) -> Tuple[str, bytes]:
+        try:
+            return spec.name, orjson.dumps(parameters, option=orjson.OPT_SORT_KEYS)
+        except TypeError as e:
+            raise ValueError(f"parameters must be JSON serializable: {e}")
+
+    def acquire(self, spec: StrategySpec, parameters: Dict) -> PooledStrategy:
+        key = self._key(spec, parameters)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            entry = PooledStrategy(spec, spec.create(self.upbit_service, parameters, self.resources))
+            self._entries[key] = entry
+            self.misses += 1
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        entry.uses += 1
+        return entry
+
+    async def run(self, spec: StrategySpec, parameters: Dict):
+        """
+        풀의 인스턴스로 신호(또는 portfolio 전략의 비중)를 계산합니다.
+        single 전략은 증분 모드로 평가합니다: 처음 한 번 warmup_bars만큼 이력을 받아 지표를 채우고,
+        이후에는 sync_closed_bars()로 새로 마감된 봉만 반영한 뒤 진행 중인 봉의 가격으로 신호를 냅니다.
+        """
+        entry = self.acquire(spec, parameters)
+        strategy = entry.strategy
+        if spec.kind == 'portfolio':
+            return await strategy.calculate_portfolio_weights()
+        if spec.kind != 'single':
+            return await strategy.calculate_signals()
+        async with entry.lock:
+            if strategy.last_bar is None:
+                candles = await self.upbit_service.get_timeframe(strategy.market, strategy.timeframe, strategy.warmup_bars + 1)
+                strategy.warm_up(candles[:-1])
+            else:
+                candles = await sync_closed_bars(self.upbit_service, strategy, strategy.market)
+        if not len(candles):
+            return {}
+        started = time.perf_counter()
+        signal = strategy.calculate_signals_incremental(float(candles.close[-1]))
+        metrics.STRATEGY_COMPUTE_SECONDS.labels(type(strategy).__name__, 'signal').observe(time.perf_counter() - started)
+        return signal
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        by_strategy: Dict[str, int] = {}
+        for name, _ in self._entries:
+            by_strategy[name] = by_strategy.get(name, 0) + 1
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'strategies': by_strategy,
+        }
@@ -1,12 +1,22 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 from .baseStrategy import BaseStrategy
+from ..pair_stats import PairState, PairStatsCache, spread_zscore
+
+SPREAD_POSITIONS = {'flat': 0, 'long': 1, 'short': -1}
 
 class SpreadStrategy(BaseStrategy):
-    def __init__(self, upbitService, parameters: Dict):
+    """
+    두 마켓의 로그 가격 스프레드(y - alpha - beta * x)의 z-score로 진입/청산하는 페어 전략입니다.
+    tickers[0]이 y, tickers[1]이 x이며 헤지 비율은 최근 lookbackDays개 봉의 OLS로 정합니다.
+    long은 y 매수/x 매도, short는 y 매도/x 매수를 뜻합니다.
+    """
+
+    def __init__(self, upbitService, parameters: Dict, pair_cache: Optional[PairStatsCache] = None):
         self.upbitService = upbitService
         self.ticker1 = parameters.get('tickers', [])[0]
         self.ticker2 = parameters.get('tickers', [])[1]
+        super().__init__(self.ticker1, parameters)
         self.longEntryThreshold = float(parameters.get('longEntryThreshold', -1))
         self.shortEntryThreshold = float(parameters.get('shortEntryThreshold', 1))
         self.longExitThreshold = float(parameters.get('longExitThreshold', 1))
@@ -14,32 +24,115 @@ class SpreadStrategy(BaseStrategy):
         self.lookbackDays = int(parameters.get('lookbackDays', 20))
         self.zScoreDays = int(parameters.get('zScoreDays', 60))
         self.holdingPeriod = int(parameters.get('holdingPeriod', 5))
+        # 페어별 증분 상태는 앱 단위 캐시를 공유합니다.
+        self.pairCache = pair_cache if pair_cache is not None else PairStatsCache()
+        # 1: long spread, -1: short spread, 0: 없음
+        # 요청마다 신호를 계산하는 경로(/trading/execute)는 호출자가 넘긴 포지션에서 시작합니다.
+        self.spreadPosition = SPREAD_POSITIONS[parameters.get('position', 'flat')]
+        self.barsHeld = int(parameters.get('barsHeld', 0))
+        self.position = self.spreadPosition != 0
 
-    
     async def calculate_signals(self):
-        candles1 = []
-        candles2 = []
-        candles1_from_api = await self.upbitService.get_daily_candles(self.ticker1, self.lookbackDays + 2)
-        candles2_from_api = await self.upbitService.get_daily_candles(self.ticker2, self.lookbackDays + 2)
+        # 마감된 봉으로 헤지 비율/스프레드 분포를 갱신하고, 진행 중인 봉의 가격으로 현재 z-score를 구합니다.
+        frames = await self.upbitService.get_daily_frames_many(
+            [self.ticker1, self.ticker2], self.lookbackDays + self.zScoreDays + 1
+        )
+        candles1, candles2 = frames[self.ticker1], frames[self.ticker2]
+        state = self.pairCache.update(candles1[:-1], candles2[:-1], self.lookbackDays, self.zScoreDays)
+        zScore = state.zscore(float(candles1.close[-1]), float(candles2.close[-1]))
+        return self._signal(zScore, state.ols.beta)
+
+    def next_position(self, zScore: Optional[float], position: int, held: int) -> int:
+        """현재 포지션과 z-score로 다음 포지션을 정합니다. (벡터화/증분 모드 공통 규칙)"""
+        if zScore is None or np.isnan(zScore):
+            return position
+        if position == 0:
+            if zScore < self.longEntryThreshold:
+                return 1
+            if zScore > self.shortEntryThreshold:
+                return -1
+            return 0
+        if held >= self.holdingPeriod:
+            return 0
+        if position == 1 and zScore > self.longExitThreshold:
+            return 0
+        if position == -1 and zScore < self.shortExitThreshold:
+            return 0
+        return position
+
+    def _signal(self, zScore: Optional[float], hedgeRatio: Optional[float]) -> Dict:
+        if zScore is None:
+            return {"signal": "hold", "message": "not enough history for spread statistics"}
+        position = self.next_position(zScore, self.spreadPosition, self.barsHeld)
+        indicators = {"zscore": zScore, "hedge_ratio": hedgeRatio}
+        if position == self.spreadPosition:
+            return {"signal": "hold", "message": "no action", **indicators}
+        if position == 1:
+            return {"signal": "long", "message": f"buy {self.ticker1}, sell {self.ticker2}", **indicators}
+        if position == -1:
+            return {"signal": "short", "message": f"sell {self.ticker1}, buy {self.ticker2}", **indicators}
+        return {"signal": "exit", "message": "close spread position", **indicators}
+
+    def update_position(self, signal: Dict) -> None:
+        position = {'long': 1, 'short': -1, 'exit': 0}.get(signal['signal'])
+        if position is not None and position != self.spreadPosition:
+            self.spreadPosition = position
+            self.barsHeld = 0
+            self.position = position != 0
+
+    # ---- 증분 모드 ----
+    # update_bar()에는 y 종가(close)와 x 종가(close_x)를 함께 담은 봉을 넘깁니다.
+
+    @property
+    def warmup_bars(self) -> int:
+        return self.lookbackDays + self.zScoreDays - 1
+
+    def build_indicators(self) -> Dict:
+        return {}
 
-        candles1.extend(candles1_from_api)
-        candles2.extend(candles2_from_api)
-        candleCloses1= [candle['close'] for candle in candles1[1:]]
-        candleCloses2 = [candle['close'] for candle in candles2[1:]]
-        candles1Returns  = []
-        candles2Returns = []
+    def on_bar(self, bar: Dict) -> None:
+        state = self.pairCache.get(self.ticker1, self.ticker2, self.lookbackDays, self.zScoreDays)
+        state.update(bar['timestamp'], bar['close'], bar['close_x'])
+        if self.spreadPosition != 0:
+            self.barsHeld += 1
 
-        i = 0
-        while(i < len(candleCloses1)):
-            candles1Returns.append(candleCloses1[i]/candleCloses1[i-1])
-            candles2Returns.append(candleCloses2[i]/candleCloses2[i-1])
-            i += 1
+    def calculate_signals_incremental(self, price: Optional[float] = None, price_x: Optional[float] = None) -> Dict:
+        """price, price_x(두 마켓의 현재가)를 생략하면 마지막 마감 봉 기준으로 신호를 계산합니다."""
+        state = self.pairCache.get(self.ticker1, self.ticker2, self.lookbackDays, self.zScoreDays)
+        return self._signal(state.zscore(price, price_x), state.ols.beta)
 
-        candles1zScore = (candles1Returns - candles1Returns.mean())/candles1Returns.std()
-        candles2zScore = (candles2Returns - candles2Returns.mean())/candles2Returns.std()
+    def snapshot_state(self) -> Dict:
+        state = self.pairCache.get(self.ticker1, self.ticker2, self.lookbackDays, self.zScoreDays)
+        return {
+            **super().snapshot_state(),
+            'spread_position': self.spreadPosition,
+            'bars_held': self.barsHeld,
+            'pair': state.snapshot(),
+        }
 
+    def restore_state(self, state: Dict) -> None:
+        super().restore_state(state)
+        self.spreadPosition = state.get('spread_position', 0)
+        self.barsHeld = state.get('bars_held', 0)
+        if 'pair' in state:
+            self.pairCache.put(self.ticker1, self.ticker2, PairState.restore(state['pair']))
 
+    # ---- 벡터화 모드 ----
 
-        if(candles1zScore > self.longEntryThreshold and candles2zScore < self.shortEntryThreshold):
-            return {"signal": "long", "message": "will close long position tomorrow"}
-        elif(candles1zScore < self.shortEntryThreshold and candles2zScore > self.longEntryThreshold):
+    def vectorized_positions(self, closes1: np.ndarray, closes2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        전체 이력의 z-score를 한 번에 계산하고, 봉 종가 기준 스프레드 포지션을 구합니다.
+        Returns:
+            (포지션 배열(1/-1/0), 헤지 비율 배열)
+        """
+        stats = spread_zscore(np.log(closes1), np.log(closes2), self.lookbackDays, self.zScoreDays)
+        positions = np.zeros(len(closes1), dtype=np.int8)
+        position, held = 0, 0
+        for t, zScore in enumerate(stats['zscore'].tolist()):
+            if position != 0:
+                held += 1
+            nextPosition = self.next_position(zScore, position, held)
+            if nextPosition != position:
+                position, held = nextPosition, 0
+            positions[t] = position
+        return positions, stats['beta']
@@ -1,82 +1,523 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from datetime import datetime
 import asyncio
+import logging
+import math
+import time
+import orjson
 from .baseStrategy import BaseStrategy
-from .trendFollowing import TrendFollowingStrategy
+from .registry import REGISTRY, StrategyRegistry, sync_closed_bars
 from ..upbit_service import UpbitService
-from .counterTrend import CounterTrendStrategy
+from ..candle_frame import CandleFrame
+from ..market_data import UpbitWebSocketClient
+from ..execution import OrderExecutor, order_identifier
+from ..shared_state import LeaderLease, SharedState
+from ...core import metrics
+
+logger = logging.getLogger(__name__)
+
+# 전략 신호 → 주문 방향. buy/sell(breakout, EMA) 외에 long/short(SMA, 역추세)로 신호를 내는 전략도 있습니다.
+# 추세 전략은 추세가 이어지는 동안 매 봉 같은 신호를 내므로, 주문은 포지션이 바뀔 때만 냅니다. (execute_signal)
+SIGNAL_ACTIONS = {'buy': 'buy', 'long': 'buy', 'sell': 'sell', 'short': 'sell'}
+# 다중 워커 모드에서 스케줄러 임대 이름과, 리더가 게시하는 상태의 공유 키
+LEASE_NAME = 'trading-scheduler'
+STATUS_KEY = 'trading/status'
+
+
+class TradingSession:
+    """스케줄러가 관리하는 마켓 하나의 실행 상태입니다."""
+
+    def __init__(self, market: str, strategy_name: str, strategy: BaseStrategy):
+        self.market = market
+        self.strategy_name = strategy_name
+        self.strategy = strategy
+        self.status = 'warming_up'  # warming_up | running | failed
+        self.started_at = datetime.now()
+        self.last_signal: Optional[Dict] = None
+        self.last_price: Optional[float] = None
+        self.evaluations = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.warmup_task: Optional[asyncio.Task] = None
+        # 공유 저장소에 마지막으로 저장한 상태의 봉 시각 (다중 워커 모드)
+        self.saved_bar: Optional[int] = None
+        # 평가마다 라벨을 찾지 않도록 히스토그램 자식을 미리 잡아 둡니다.
+        self.signal_timer = metrics.STRATEGY_COMPUTE_SECONDS.labels(type(strategy).__name__, 'signal')
+
+    def record_error(self, stage: str, error: Exception) -> None:
+        self.errors += 1
+        self.last_error = str(error)
+        logger.warning(
+            "trading session error",
+            exc_info=error,
+            extra={'market': self.market, 'strategy': self.strategy_name, 'stage': stage},
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            'market': self.market,
+            'strategy': self.strategy_name,
+            'status': self.status,
+            'started_at': self.started_at.isoformat(),
+            'last_price': self.last_price,
+            'last_signal': self.last_signal,
+            'evaluations': self.evaluations,
+            'errors': self.errors,
+            'last_error': self.last_error,
+        }
+
 
 class TradingService:
-    def __init__(self, upbit_service: UpbitService):
+    """
+    앱 단위로 하나만 생성되어 모든 마켓의 전략을 실행하는 스케줄러입니다.
+    polling 모드에서는 tick마다 전체 마켓의 현재가를 /ticker 한 번으로 받아 모든 전략을 동시에 평가하고,
+    websocket 모드에서는 하나의 구독으로 들어오는 체결가마다 해당 마켓 전략만 평가합니다.
+    start/stop/status는 세션 dict만 조작하므로 요청을 붙잡아 두지 않습니다.
+
+    shared를 주면 다중 워커 모드로 동작합니다. 모든 워커가 TradingService를 만들지만 스케줄러와 주문 실행기는
+    공유 임대(LEASE_NAME)를 가진 리더 하나만 실행합니다. 세션 설정과 전략 상태는 공유 저장소에 두므로
+    어느 워커에서 start/stop을 호출해도 리더가 임대 갱신 주기마다 반영하고, 리더가 죽으면 임대가 만료된 뒤
+    다른 워커가 저장된 상태에서 이어서 실행합니다.
+    """
+
+    def __init__(
+        self,
+        upbit_service: UpbitService,
+        market_feed: Optional[UpbitWebSocketClient] = None,
+        tick_interval: float = 60,
+        order_executor: Optional[OrderExecutor] = None,
+        registry: StrategyRegistry = REGISTRY,
+        shared: Optional[SharedState] = None,
+        lease_ttl: float = 15,
+    ):
+        """
+        Args:
+            market_feed: WebSocket 시세 수집기. 있으면 tick 폴링 대신 체결가가 들어올 때마다 신호를 계산합니다.
+            tick_interval: polling 모드의 평가 주기 (초)
+            order_executor: 주문 실행기. 생략하면 기본 설정으로 생성합니다.
+            registry: 전략 이름을 찾을 레지스트리
+            shared: 워커 간 공유 저장소. 주면 리더 임대를 가진 워커만 스케줄러를 실행합니다.
+            lease_ttl: 리더 임대 유효 시간 (초). 리더가 죽으면 이 시간 안에 다른 워커가 이어받습니다.
+        """
         self.upbit_service = upbit_service
-        self.active_strategies: Dict[str, BaseStrategy] = {}
+        self.registry = registry
+        self.shared = shared
+        self.lease = LeaderLease(shared, LEASE_NAME, lease_ttl) if shared is not None else None
+        self.is_leader = shared is None
+        self._lease_task: Optional[asyncio.Task] = None
+        self.market_feed = market_feed
+        self.tick_interval = tick_interval
+        self.order_executor = order_executor or OrderExecutor(upbit_service)
+        self.sessions: Dict[str, TradingSession] = {}
         self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+        # 스케줄러가 띄운 세션별 동기화/주문 작업. 참조를 잡아 두어야 도중에 GC되지 않고 종료 시 정리할 수 있습니다.
+        self._tasks: Set[asyncio.Task] = set()
+        self.ticks = 0
+        self.overruns = 0
+        self.missed_ticks = 0
+        self.last_tick_duration = 0.0
+
+    @property
+    def active_strategies(self) -> Dict[str, BaseStrategy]:
+        return {market: session.strategy for market, session in self.sessions.items()}
 
     def create_strategy(self, strategy_name: str, market: str, parameters: Dict) -> BaseStrategy:
-        """전략 인스턴스를 생성합니다."""
-        if strategy_name == 'moving_average':
-            return TrendFollowingStrategy(market, parameters)
-        elif strategy_name == 'counter_trend':
-            return CounterTrendStrategy(market, parameters)
-        # 다른 전략들 추가 예정
-        raise ValueError(f"Unknown strategy: {strategy_name}")
-
-    async def start_trading(self, market: str, strategy_name: str, parameters: Dict):
-        """특정 마켓에 대한 거래를 시작합니다."""
-        if market in self.active_strategies:
-            raise ValueError(f"Trading already active for {market}")
+        """
+        전략 인스턴스를 생성합니다. 마켓별로 증분 평가하므로 single 전략만 지원합니다.
+        세션마다 포지션 상태를 따로 가지므로 StrategyPool을 쓰지 않고 새로 만듭니다.
+        """
+        spec = self.registry.require(strategy_name, 'single')
+        return spec.create(self.upbit_service, {**parameters, 'tickers': [market]})
 
-        strategy = self.create_strategy(strategy_name, market, parameters)
-        self.active_strategies[market] = strategy
+    # ---- 스케줄러 수명주기 ----
+
+    async def start(self) -> None:
+        """
+        백그라운드 스케줄러를 시작합니다. 앱 lifespan 시작 시 한 번 호출됩니다.
+        다중 워커 모드에서는 임대 갱신 루프만 시작하고, 임대를 잡으면 그때 스케줄러를 시작합니다.
+        """
+        if self.is_running:
+            return
+        if self.upbit_service.read_only:
+            # 주문할 수 없으므로 스케줄러와 임대 경쟁에 참여하지 않습니다.
+            logger.info("trading scheduler disabled in read-only mode")
+            return
         self.is_running = True
+        if self.lease is None:
+            await self._start_scheduler()
+        else:
+            self._lease_task = asyncio.create_task(self._lead())
+
+    async def close(self) -> None:
+        """
+        스케줄러와 모든 세션을 정리합니다.
+        다중 워커 모드에서는 공유 저장소의 세션은 남겨 두고 상태를 저장한 뒤 임대를 놓아 다른 워커가 바로 이어받게 합니다.
+        """
+        self.is_running = False
+        if self._lease_task is not None:
+            self._lease_task.cancel()
+            try:
+                await self._lease_task
+            except asyncio.CancelledError:
+                pass
+            self._lease_task = None
+        await self._stop_scheduler()
+        if self.lease is not None and self.is_leader:
+            await asyncio.to_thread(self.shared.save_session_states, self._changed_states(force=True))
+            await asyncio.to_thread(self.lease.release)
+            self.is_leader = False
+        self._stop_sessions()
+
+    async def _start_scheduler(self) -> None:
+        await self.order_executor.start()
+        if self.market_feed is not None:
+            self._task = asyncio.create_task(self._consume_feed())
+        else:
+            self._task = asyncio.create_task(self._tick_loop())
+
+    async def _stop_scheduler(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # 남은 동기화/주문 작업은 주문 실행기를 닫기 전에 취소하고 끝날 때까지 기다립니다.
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.order_executor.close()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """스케줄러에 딸린 백그라운드 작업을 만들고, 끝나면 목록에서 지웁니다."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    # ---- 리더 임대 (다중 워커 모드) ----
 
-        while self.is_running and market in self.active_strategies:
+    async def _lead(self) -> None:
+        """
+        renew_interval마다 임대를 잡거나 갱신합니다.
+        리더가 되면 스케줄러를 시작하고, 임대를 잃으면 스케줄러를 멈추고 로컬 세션을 내려놓습니다.
+        리더인 동안에는 공유 저장소의 세션 목록을 반영하고 전략 상태와 스케줄러 상태를 저장합니다.
+        """
+        while self.is_running:
             try:
-                # 최근 캔들 데이터 조회
-                candles = await self.upbit_service.get_candles(market, '1m', 200)
-                
-                # 매매 신호 계산
-                signal = strategy.calculate_signals(candles)
-                
-                # 거래 실행 여부 확인
-                if strategy.should_execute_trade(signal):
-                    if signal['signal'] == 'buy':
-                        # 매수 주문
-                        order = await self.upbit_service.create_order(
-                            market=market,
-                            side='bid',
-                            volume=None,  # 시장가 매수
-                            price=None,   # 시장가 매수
-                            ord_type='price'
-                        )
-                        if order:
-                            strategy.update_position(signal)
-                    elif signal['signal'] == 'sell':
-                        # 보유 수량 확인
-                        balance = await self.upbit_service.get_balance(market)
-                        if balance and float(balance['balance']) > 0:
-                            # 매도 주문
-                            order = await self.upbit_service.create_order(
-                                market=market,
-                                side='ask',
-                                volume=balance['balance'],
-                                price=None,
-                                ord_type='market'
-                            )
-                            if order:
-                                strategy.update_position(signal)
+                held = await asyncio.to_thread(self.lease.acquire)
+                if held and not self.is_leader:
+                    await self._promote()
+                elif not held and self.is_leader:
+                    await self._demote()
+                if self.is_leader:
+                    await self._reconcile()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("trading lease renewal failed", extra={'worker': self.lease.owner})
+                if self.is_leader and not self.lease.is_valid():
+                    await self._demote()
+            await asyncio.sleep(self.lease.renew_interval)
 
+    async def _promote(self) -> None:
+        logger.info("acquired trading scheduler lease", extra={'worker': self.lease.owner})
+        self.is_leader = True
+        await self._start_scheduler()
+
+    async def _demote(self) -> None:
+        logger.warning("lost trading scheduler lease", extra={'worker': self.lease.owner})
+        self.is_leader = False
+        await self._stop_scheduler()
+        self._stop_sessions()
+
+    async def _reconcile(self) -> None:
+        """공유 저장소의 세션 목록에 맞춰 로컬 세션을 시작/중지하고, 바뀐 전략 상태와 스케줄러 상태를 저장합니다."""
+        persisted = await asyncio.to_thread(self.shared.load_sessions)
+        for market, row in persisted.items():
+            if market in self.sessions:
+                continue
+            try:
+                strategy = self.create_strategy(row['strategy'], market, row['parameters'])
+                await self._start_session(market, row['strategy'], strategy, row['state'])
             except Exception as e:
-                print(f"Error in trading loop: {e}")
+                logger.warning("failed to resume trading session", exc_info=e, extra={'market': market})
+        removed = [market for market in self.sessions if market not in persisted]
+        if removed:
+            self._stop_sessions(removed)
+        states = self._changed_states()
+        if states:
+            await asyncio.to_thread(self.shared.save_session_states, states)
+        await asyncio.to_thread(
+            self.shared.set, STATUS_KEY, orjson.dumps(self._local_status()), self.lease.ttl
+        )
+
+    def _changed_states(self, force: bool = False) -> Dict[str, Dict]:
+        """마지막 저장 이후 새 봉을 반영한 세션의 전략 상태를 모읍니다. (이벤트 루프에서 호출)"""
+        states = {}
+        for market, session in self.sessions.items():
+            if session.status != 'running':
+                continue
+            last_bar = session.strategy.last_bar['timestamp'] if session.strategy.last_bar else None
+            if force or last_bar != session.saved_bar:
+                states[market] = session.strategy.snapshot_state()
+                session.saved_bar = last_bar
+        return states
+
+    # ---- 제어 API (O(1)) ----
+
+    async def start_trading(self, market: str, strategy_name: str, parameters: Dict, state: Optional[Dict] = None) -> Dict:
+        """
+        특정 마켓에 대한 거래를 시작합니다.
+        세션을 등록하고 워밍업은 백그라운드에서 진행하므로 바로 반환합니다.
+        다중 워커 모드에서 리더가 아닌 워커는 세션을 공유 저장소에 등록만 하고 'pending' 상태를 반환합니다.
+        Args:
+            state: 이전 실행에서 strategy.snapshot_state()로 저장한 상태 (있으면 워밍업 대신 복원)
+        """
+        if self.upbit_service.read_only:
+            raise ValueError("Trading is unavailable in read-only mode (Upbit API keys are not configured)")
+        if market in self.sessions:
+            raise ValueError(f"Trading already active for {market}")
 
-            # 1분 대기
-            await asyncio.sleep(60)
+        strategy = self.create_strategy(strategy_name, market, parameters)
+        if self.shared is not None:
+            if not await asyncio.to_thread(self.shared.add_session, market, strategy_name, parameters):
+                raise ValueError(f"Trading already active for {market}")
+            if state is not None:
+                await asyncio.to_thread(self.shared.save_session_states, {market: state})
+            if not self.is_leader:
+                return {'market': market, 'strategy': strategy_name, 'status': 'pending'}
+        session = await self._start_session(market, strategy_name, strategy, state)
+        return session.to_dict()
 
-    def stop_trading(self, market: Optional[str] = None):
-        """거래를 중지합니다."""
-        if market:
-            if market in self.active_strategies:
-                del self.active_strategies[market]
+    async def _start_session(
+        self, market: str, strategy_name: str, strategy: BaseStrategy, state: Optional[Dict] = None
+    ) -> TradingSession:
+        session = TradingSession(market, strategy_name, strategy)
+        self.sessions[market] = session
+        if state is not None:
+            strategy.restore_state(state)
+        # 복원할 봉 상태가 없으면(버려진 이전 형식의 상태 포함) 이력으로 다시 워밍업합니다.
+        if strategy.last_bar is not None:
+            session.status = 'running'
+            session.saved_bar = strategy.last_bar['timestamp']
         else:
-            self.active_strategies.clear()
-            self.is_running = False 
\ No newline at end of file
+            session.warmup_task = asyncio.create_task(self._warm_up(session))
+        if self.market_feed is not None:
+            await self.market_feed.add_markets([market])
+        return session
+
+    async def stop_trading(self, market: Optional[str] = None) -> List[str]:
+        """
+        거래를 중지합니다. market을 생략하면 모든 마켓을 중지합니다.
+        다중 워커 모드에서는 공유 저장소의 세션을 지우며, 리더가 아닌 워커의 요청은 리더가 다음 갱신 때 반영합니다.
+        Returns:
+            List[str]: 중지한 마켓 목록
+        """
+        removed = await asyncio.to_thread(self.shared.remove_sessions, market) if self.shared is not None else []
+        stopped = self._stop_sessions([market] if market else None)
+        return list(dict.fromkeys([*stopped, *removed]))
+
+    def _stop_sessions(self, markets: Optional[List[str]] = None) -> List[str]:
+        """로컬 세션을 정리합니다. markets를 생략하면 모든 세션을 정리합니다."""
+        stopped = []
+        for name in (markets if markets is not None else list(self.sessions)):
+            session = self.sessions.pop(name, None)
+            if session is None:
+                continue
+            if session.warmup_task is not None and not session.warmup_task.done():
+                session.warmup_task.cancel()
+            stopped.append(name)
+        if stopped and self.market_feed is not None:
+            asyncio.get_running_loop().create_task(self.market_feed.remove_markets(stopped))
+        return stopped
+
+    async def status(self, market: Optional[str] = None) -> Dict:
+        """
+        세션별 상태와 스케줄러 통계를 반환합니다.
+        다중 워커 모드에서 리더가 아닌 워커는 리더가 마지막으로 게시한 상태를 반환합니다.
+        """
+        if self.lease is not None and not self.is_leader:
+            published = await asyncio.to_thread(self.shared.get, STATUS_KEY)
+            status = orjson.loads(published) if published else {'sessions': []}
+            if market is not None:
+                return next((s for s in status['sessions'] if s['market'] == market), {})
+            leader = await asyncio.to_thread(self.lease.current_owner)
+            return {**status, 'role': 'follower', 'worker': self.lease.owner, 'leader': leader}
+        if market is not None:
+            session = self.sessions.get(market)
+            return session.to_dict() if session else {}
+        status = self._local_status()
+        if self.lease is not None:
+            status.update(role='leader', worker=self.lease.owner, leader=self.lease.owner)
+        return status
+
+    def _local_status(self) -> Dict:
+        return {
+            'mode': 'websocket' if self.market_feed is not None else 'polling',
+            'read_only': self.upbit_service.read_only,
+            'tick_interval': self.tick_interval,
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'missed_ticks': self.missed_ticks,
+            'last_tick_duration': self.last_tick_duration,
+            'orders': self.order_executor.stats(),
+            'sessions': [session.to_dict() for session in self.sessions.values()],
+        }
+
+    # ---- 내부 실행 ----
+
+    async def _warm_up(self, session: TradingSession) -> None:
+        """시작 시 한 번만 이력을 받아 증분 지표를 채웁니다."""
+        try:
+            strategy = session.strategy
+            history = await self.upbit_service.get_timeframe(session.market, strategy.timeframe, strategy.warmup_bars + 1)
+            strategy.warm_up(history[:-1])
+            session.status = 'running'
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            session.status = 'failed'
+            session.record_error('warm_up', e)
+
+    async def sync_closed_bars(self, strategy: BaseStrategy, market: str) -> CandleFrame:
+        """마지막으로 반영한 봉 이후에 마감된 봉들을 증분 지표에 반영합니다. (registry.sync_closed_bars 참고)"""
+        return await sync_closed_bars(self.upbit_service, strategy, market)
+
+    async def _tick_loop(self) -> None:
+        """
+        tick_interval마다 run_tick()을 실행합니다.
+        tick이 주기보다 오래 걸리면 overrun으로 기록하고, 건너뛴 주기는 missed_ticks로 셉니다.
+        """
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while self.is_running:
+            started = loop.time()
+            metrics.SCHEDULER_TICK_LAG_SECONDS.observe(max(started - next_tick, 0.0))
+            try:
+                await self.run_tick()
+            except Exception:
+                logger.exception("trading tick failed", extra={'tick': self.ticks})
+            now = loop.time()
+            self.ticks += 1
+            self.last_tick_duration = now - started
+            metrics.SCHEDULER_TICK_SECONDS.observe(self.last_tick_duration)
+            next_tick += self.tick_interval
+            if now > next_tick:
+                self.overruns += 1
+                missed = math.floor((now - next_tick) / self.tick_interval) + 1
+                self.missed_ticks += missed
+                next_tick += missed * self.tick_interval
+            await asyncio.sleep(max(next_tick - now, 0))
+
+    async def run_tick(self) -> None:
+        """
+        tick 한 번: 마감 봉이 바뀐 마켓만 동기화하고, 전체 현재가를 한 번에 받아 모든 전략을 동시에 평가합니다.
+        동기화에 실패한 세션은 지표가 마감 봉을 놓친 상태이므로 오류를 기록하고 이번 tick에서는 평가하지 않습니다.
+        """
+        sessions = [s for s in self.sessions.values() if s.status == 'running']
+        if not sessions:
+            return
+        now_ms = int(time.time() * 1000)
+        stale = [s for s in sessions if s.strategy.has_unsynced_bar(now_ms)]
+        if stale:
+            results = await asyncio.gather(
+                *(self.sync_closed_bars(s.strategy, s.market) for s in stale), return_exceptions=True
+            )
+            failed = set()
+            for session, result in zip(stale, results):
+                if isinstance(result, Exception):
+                    session.record_error('sync', result)
+                    failed.add(session.market)
+            sessions = [s for s in sessions if s.market not in failed]
+        tickers = await self.upbit_service.get_tickers([s.market for s in sessions])
+        await asyncio.gather(*(
+            self._evaluate(s, float(tickers[s.market]['trade_price']))
+            for s in sessions if s.market in tickers
+        ))
+
+    async def _consume_feed(self) -> None:
+        """
+        websocket 모드: 하나의 버스 구독으로 모든 마켓의 ticker/bar 이벤트를 받아 해당 세션에 전달합니다.
+        신호 계산에는 최신 가격만 필요하므로 큐가 밀리면 오래된 이벤트부터 버립니다.
+        """
+        subscription = self.market_feed.bus.subscribe(types=('ticker', 'bar'), maxsize=1000, policy='drop_oldest')
+        try:
+            while self.is_running:
+                event = await subscription.get()
+                session = self.sessions.get(event.get('code'))
+                if session is None or session.status != 'running':
+                    continue
+                if event['type'] == 'bar':
+                    # 전략 timeframe의 봉이 마감되면 REST로 확정 봉을 한 번 받아 반영합니다.
+                    # 수집기는 1분봉/일봉만 만들므로, 분봉 timeframe은 1분봉이 마감될 때마다 경계를 넘었는지 확인합니다.
+                    if event['closed'] and session.strategy.has_unsynced_bar(int(time.time() * 1000)):
+                        self._spawn(self._sync_session(session))
+                    continue
+                await self._evaluate(session, float(event['trade_price']))
+        finally:
+            subscription.close()
+
+    async def _sync_session(self, session: TradingSession) -> None:
+        try:
+            await self.sync_closed_bars(session.strategy, session.market)
+        except Exception as e:
+            session.record_error('sync', e)
+
+    async def _evaluate(self, session: TradingSession, price: float) -> None:
+        """
+        현재가로 신호를 계산하고 필요하면 주문을 실행합니다. (O(1), 이력 길이와 무관)
+        주문은 실행기 큐에 넘기고 기다리지 않으므로, 주문 응답이 다른 마켓의 평가를 늦추지 않습니다.
+        """
+        try:
+            started = time.perf_counter()
+            signal = session.strategy.calculate_signals_incremental(price)
+            session.signal_timer.observe(time.perf_counter() - started)
+            session.last_price = price
+            session.last_signal = signal
+            session.evaluations += 1
+        except Exception as e:
+            session.record_error('signal', e)
+            return
+        action = SIGNAL_ACTIONS.get(signal.get('signal'))
+        if action is not None and session.strategy.position != (action == 'buy'):
+            self._spawn(self._execute(session, signal))
+
+    async def _execute(self, session: TradingSession, signal: Dict) -> None:
+        try:
+            await self.execute_signal(session.market, session.strategy, signal, session.strategy_name)
+        except Exception as e:
+            session.record_error('order', e)
+
+    async def execute_signal(self, market: str, strategy: BaseStrategy, signal: Dict, strategy_name: str = ''):
+        """
+        신호에 따라 주문을 실행합니다.
+        매수는 포지션이 없을 때만, 매도는 포지션이 있을 때만 냅니다. 신호는 상태(추세 방향)이므로 같은 신호가
+        여러 봉 이어져도 주문은 포지션이 바뀌는 첫 신호에서 한 번만 나갑니다.
+        주문 ID는 신호를 계산한 마지막 마감 봉 기준으로 만들어지므로, 같은 봉에서 같은 신호가 반복되어도 주문은 한 번만 나갑니다.
+        """
+        action = SIGNAL_ACTIONS.get(signal.get('signal'))
+        if action is None:
+            return
+        if strategy.position == (action == 'buy'):
+            return
+        if self.lease is not None and not self.lease.is_valid():
+            # 임대 갱신이 늦어져 다른 워커가 리더가 되었을 수 있으므로 주문하지 않습니다.
+            logger.warning("order skipped without a valid trading lease", extra={'market': market})
+            return
+        signal = {**signal, 'signal': action}
+        if not strategy.should_execute_trade(signal):
+            return
+        signal_key = strategy.last_bar['timestamp'] if strategy.last_bar is not None else int(time.time() // 60)
+        identifier = order_identifier(market, strategy_name or type(strategy).__name__, action, signal_key)
+        order = await self.order_executor.submit(
+            market,
+            action,
+            identifier,
+            amount=strategy.parameters.get('orderAmount') if action == 'buy' else None,
+        )
+        if order:
+            strategy.update_position(signal)
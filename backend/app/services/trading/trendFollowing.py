@@ -1,20 +1,29 @@
 from typing import Dict, List
+import logging
 import numpy as np
 from .baseStrategy import BaseStrategy
+from .. import indicators
+from ..streaming_indicators import RollingExtremum, RunningSMA
+
+logger = logging.getLogger(__name__)
 
 class TrendFollowingStrategy(BaseStrategy):
     def __init__(self, upbitService, parameters: Dict):
+        tickers = parameters.get('tickers', [])
+        super().__init__(tickers[0] if tickers else None, parameters)
         self.upbitService = upbitService
         self.volatilityWindow = parameters.get('volatility_window', 20)
         self.volatilities = []
         self.tickers = parameters.get('tickers', [])
+        # 신호는 첫 번째 티커 기준으로 계산합니다.
+        self.ticker = self.tickers[0] if self.tickers else None
         self.trendType = parameters.get('trendType', 'sma')
         self.alpha = parameters.get('alpha', 0.1)
         self.prevShortEma = 0
         self.prevLongEma = 0
         self.prevNHigh = float('inf')
         self.prevNLow = float('-inf')
-        print(parameters)
+        logger.debug("strategy created", extra={'parameters': parameters})
 
         if(self.trendType == 'breakout'): # breakout 전략
             self.nDays = int(parameters.get('nDays', 20))
@@ -33,16 +42,16 @@ class TrendFollowingStrategy(BaseStrategy):
             return {}
         
     async def set_n_high_low(self):
-        candles = []
-        for ticker in self.tickers:
-            candles_from_api = await self.upbitService.get_daily_candles(ticker, self.nDays+1)
-            candles.extend(candles_from_api)
-        candleswithoutrecent = candles[1:]
-        self.prevNHigh = max(candleswithoutrecent, key=lambda x: x['high_price'])['high_price']
-        self.prevNLow = min(candleswithoutrecent, key=lambda x: x['low_price'])['low_price']
+        candles = await self.upbitService.get_timeframe(self.ticker, self.timeframe, self.nDays+1)
+        channel = indicators.donchian(candles.high, candles.low, self.nDays)
+        self.prevNHigh = float(channel['upper'][-1])
+        self.prevNLow = float(channel['lower'][-1])
         
-        current_candle = await self.upbitService.get_daily_candles(ticker, 1)
-        current_price = current_candle[0]['trade_price']
+        # 최신(진행 중) 캔들의 가격을 현재가로 사용합니다.
+        current_price = float(candles.close[-1])
+        return self._breakout_signal(current_price)
+
+    def _breakout_signal(self, current_price: float) -> Dict:
         if(self.prevNHigh == float('inf')):
             return {}
         elif(self.prevNLow == float('-inf')):
@@ -58,38 +67,122 @@ class TrendFollowingStrategy(BaseStrategy):
         return self.set_n_high_low()
     
     async def set_sma(self):
-        candles = []
-        for ticker in self.tickers:
-            candles_from_api = await self.upbitService.get_daily_candles(ticker, self.longWindow + 1)
-            candles.extend(candles_from_api)
-        candleswithoutrecent = candles[1:]
-        closes = [candle['trade_price'] for candle in candleswithoutrecent]
-        shortSma = np.mean(closes[-self.shortWindow:])
-        longSma = np.mean(closes[-self.longWindow:])
+        candles = await self.upbitService.get_timeframe(self.ticker, self.timeframe, self.longWindow + 1)
+        closes = candles[:-1].close
+        shortSma = indicators.rolling_mean(closes, self.shortWindow)[-1]
+        longSma = indicators.rolling_mean(closes, self.longWindow)[-1]
+        return self._sma_signal(shortSma, longSma)
+
+    def _sma_signal(self, shortSma: float, longSma: float) -> Dict:
         if(shortSma >= longSma):
             return {"signal": "long", "message": "will close long position tomorrow"}
         else:
             return {"signal": "short", "message": "will close short position tomorrow"}
 
     async def set_ema(self):
-        candles = []
-        for ticker in self.tickers:
-            candles_from_api = await self.upbitService.get_daily_candles(ticker, self.longWindow+1)
-            candles.extend(candles_from_api)
-        candleswithoutrecent = candles[1:]
-        closes = [candle['trade_price'] for candle in candleswithoutrecent]
-        
-        if(self.prevShortEma == 0):
-            firstShortEma = np.mean(closes[-self.shortWindow:])
-            self.prevShortEma = firstShortEma
-        if(self.prevLongEma == 0):
-            firstLongEma = np.mean(closes[-self.longWindow:])
-            self.prevLongEma = firstLongEma
-        
+        candles = await self.upbitService.get_timeframe(self.ticker, self.timeframe, self.longWindow+1)
+        closes = candles[:-1].close
+        # EMA는 창의 SMA에서 시작해 마지막 마감 봉 종가로 한 번 갱신한 값입니다. (_ema_step)
+        self.prevShortEma = indicators.rolling_mean(closes, self.shortWindow)[-1]
+        self.prevLongEma = indicators.rolling_mean(closes, self.longWindow)[-1]
+        shortEma = self._ema_step(self.prevShortEma, closes[-1])
+        longEma = self._ema_step(self.prevLongEma, closes[-1])
+        return self._ema_signal(shortEma, longEma)
+
+    def _ema_step(self, sma, close):
+        """
+        SMA를 seed로 종가 하나만큼 갱신한 EMA입니다.
+        직전 봉들의 종가에만 의존하므로 요청마다 새로 만든 인스턴스, 풀에 오래 살아 있는 인스턴스,
+        스케줄러 세션, 백테스트가 언제 워밍업했는지와 상관없이 같은 값을 냅니다.
+        """
+        return sma + self.alpha * (close - sma)
 
-        shortEma = (closes[-1] - self.prevShortEma) * self.alpha + self.prevShortEma
-        longEma = (closes[-1] - self.prevLongEma) * self.alpha + self.prevLongEma
+    def _ema_signal(self, shortEma: float, longEma: float) -> Dict:
         if(shortEma > longEma):
             return {"signal": "buy"}
         else:
-            return {"signal": "sell"}
\ No newline at end of file
+            return {"signal": "sell"}
+
+    # ---- 증분 모드 ----
+
+    @property
+    def warmup_bars(self) -> int:
+        return self.nDays if self.trendType == 'breakout' else self.longWindow
+
+    def build_indicators(self) -> Dict:
+        if(self.trendType == 'breakout'):
+            return {
+                'nHigh': RollingExtremum(self.nDays, 'max'),
+                'nLow': RollingExtremum(self.nDays, 'min'),
+            }
+        return {
+            'shortSma': RunningSMA(self.shortWindow),
+            'longSma': RunningSMA(self.longWindow),
+        }
+
+    def on_bar(self, bar: Dict) -> None:
+        if(self.trendType == 'breakout'):
+            self.streaming_indicators['nHigh'].update(bar['high'])
+            self.streaming_indicators['nLow'].update(bar['low'])
+        else:
+            for indicator in self.streaming_indicators.values():
+                indicator.update(bar['close'])
+
+    def calculate_signals_incremental(self, price: float) -> Dict:
+        values = {name: ind.value for name, ind in self.streaming_indicators.items()}
+        if not values or None in values.values():
+            return {"signal": "hold", "message": "warming up indicators"}
+        if(self.trendType == 'breakout'):
+            self.prevNHigh = values['nHigh']
+            self.prevNLow = values['nLow']
+            return self._breakout_signal(price)
+        elif(self.trendType == 'ema'):
+            self.prevShortEma = values['shortSma']
+            self.prevLongEma = values['longSma']
+            close = self.last_bar['close']
+            return self._ema_signal(self._ema_step(values['shortSma'], close), self._ema_step(values['longSma'], close))
+        elif(self.trendType == 'sma'):
+            return self._sma_signal(values['shortSma'], values['longSma'])
+        return {}
+
+    def restore_state(self, state: Dict) -> None:
+        super().restore_state(state)
+        # 지표 구성이 바뀐 이전 상태(예: RunningEMA의 shortEma/longEma)는 버리고 다시 워밍업합니다.
+        if self.streaming_indicators and set(self.streaming_indicators) != set(self.build_indicators()):
+            self.streaming_indicators = {}
+            self.last_bar = None
+
+    # ---- 벡터화 모드 ----
+
+    def chart_indicators(self, bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        close = bars['close']
+        if(self.trendType == 'breakout'):
+            channel = indicators.donchian(bars['high'], bars['low'], self.nDays)
+            return {'nHigh': channel['upper'], 'nLow': channel['lower']}
+        if(self.trendType == 'ema'):
+            return {
+                'shortEma': indicators.shift(self._ema_step(indicators.rolling_mean(close, self.shortWindow), close), 1),
+                'longEma': indicators.shift(self._ema_step(indicators.rolling_mean(close, self.longWindow), close), 1),
+            }
+        if(self.trendType == 'sma'):
+            return {
+                'shortSma': indicators.shift(indicators.rolling_mean(close, self.shortWindow), 1),
+                'longSma': indicators.shift(indicators.rolling_mean(close, self.longWindow), 1),
+            }
+        return {}
+
+    def vectorized_signals(self, bars: Dict[str, np.ndarray]) -> np.ndarray:
+        close = bars['close']
+        values = self.chart_indicators(bars)
+        with np.errstate(invalid='ignore'):
+            if(self.trendType == 'breakout'):
+                return np.where(values['nHigh'] <= close, 1, np.where(values['nLow'] >= close, -1, 0))
+            if(self.trendType == 'ema'):
+                short, long = values['shortEma'], values['longEma']
+                ready = ~np.isnan(short) & ~np.isnan(long)
+                return np.where(ready, np.where(short > long, 1, -1), 0)
+            if(self.trendType == 'sma'):
+                short, long = values['shortSma'], values['longSma']
+                ready = ~np.isnan(short) & ~np.isnan(long)
+                return np.where(ready, np.where(short >= long, 1, -1), 0)
+        return np.zeros(close.shape, dtype=int)
@@ -1,41 +1,378 @@
 from typing import Dict, List, Optional
+import asyncio
+import random
+import time
 import aiohttp
-from datetime import datetime, timedelta
-import jwt
+from datetime import datetime, timedelta, timezone
 import uuid
 import hashlib
 from urllib.parse import urlencode
 import numpy as np
+from .rate_limiter import RateLimiter
+from .candle_cache import CandleCache
+from .candle_frame import CandleFrame
+from .candle_store import CandleStore, CandleStoreNotConfiguredError, UNIT_INTERVAL_MS
+from .history_loader import HistoryLoader, PAGE_SIZE as MAX_CANDLES_PER_REQUEST, to_utc_ms
+from .resample import Resampler
+from ..core import metrics
+
+# 같은 identifier의 주문이 이미 접수되어 거절될 때의 error.name
+DUPLICATE_IDENTIFIER_ERROR = 'duplicate_identifier'
+
+
+class UpbitAPIError(Exception):
+    """Upbit API가 오류 응답을 돌려준 경우입니다. name은 응답의 error.name입니다."""
+
+    def __init__(self, path: str, status: int, name: Optional[str] = None, message: Optional[str] = None):
+        super().__init__(f"Failed to request {path}: {status} {name or ''} {message or ''}".strip())
+        self.path = path
+        self.status = status
+        self.name = name
+
 
 class UpbitService:
-    def __init__(self, access_key: str, secret_key: str):
+    def __init__(
+        self,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        pool_limit: int = 100,
+        pool_limit_per_host: int = 30,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: int = 300,
+        request_timeout: float = 10,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.2,
+        candle_cache: Optional[CandleCache] = None,
+        candle_store: Optional[CandleStore] = None,
+        market_list_ttl: float = 60 * 60,
+        account_ttl: float = 30,
+        resample_max_base_bars: int = 2000,
+        base_url: str = "https://api.upbit.com/v1",
+    ):
         self.access_key = access_key
         self.secret_key = secret_key
-        self.base_url = "https://api.upbit.com/v1"
+        self.base_url = base_url.rstrip("/")
+        self.pool_limit = pool_limit
+        self.pool_limit_per_host = pool_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.request_timeout = request_timeout
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.candle_cache = candle_cache or CandleCache()
+        self.candle_store = candle_store
+        self.market_list_ttl = market_list_ttl
+        self.account_ttl = account_ttl
+        self._sync_locks: Dict[tuple, asyncio.Lock] = {}
+        # (market, unit) → 캐시에 넣은 가장 긴 최신 프레임의 count (더 짧은 요청은 그 꼬리로 응답)
+        self._widest: Dict[tuple, int] = {}
+        self.history_loader = HistoryLoader(self)
+        self.resampler = Resampler(self, max_base_bars=resample_max_base_bars)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_limit,
+            limit_per_host=self.pool_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+        )
+
+    async def start(self) -> None:
+        """
+        커넥션 풀을 가진 공유 세션을 생성합니다.
+        앱 lifespan 시작 시 한 번 호출되며, 이후 모든 요청이 keep-alive 연결을 재사용합니다.
+        """
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+
+    async def close(self) -> None:
+        """공유 세션과 커넥션 풀을 정리합니다. 앱 종료 시 호출됩니다."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        공유 세션을 반환합니다.
+        lifespan 밖(스크립트 등)에서 사용하는 경우를 위해 필요하면 지연 생성합니다.
+        """
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    async def _acquire(self, group: str) -> None:
+        """레이트 리미터 토큰을 얻고 대기 시간을 기록합니다."""
+        started = time.perf_counter()
+        await self.rate_limiter.acquire(group)
+        metrics.UPBIT_RATE_LIMIT_WAIT_SECONDS.labels(group).observe(time.perf_counter() - started)
+
+    @staticmethod
+    async def _api_error(path: str, response: aiohttp.ClientResponse) -> UpbitAPIError:
+        """오류 응답 본문({"error": {"name", "message"}})으로 UpbitAPIError를 만듭니다. 본문이 없으면 상태 코드만 담습니다."""
+        try:
+            error = (await response.json(content_type=None)).get('error') or {}
+        except Exception:
+            error = {}
+        return UpbitAPIError(path, response.status, error.get('name'), error.get('message'))
+
+    async def _request(self, path: str, params: Optional[Dict] = None, group: str = "default"):
+        """
+        레이트 리미터를 거쳐 GET 요청을 보내고 JSON 응답을 반환합니다.
+        429 응답은 지수 백오프 + 지터로 max_retries 회까지 재시도합니다.
+        Args:
+            path: base_url 이후 경로 (예: /candles/days)
+            params: 쿼리 파라미터
+            group: 레이트 리밋 그룹 (Remaining-Req 헤더의 group 단위)
+        Raises:
+            UpbitAPIError: 오류 응답 (상태 코드와 error.name 포함)
+        """
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(group)
+            started = time.perf_counter()
+            async with self.session.get(url, params=params) as response:
+                self.rate_limiter.update_from_header(response.headers.get("Remaining-Req"), group)
+                data = await response.json() if response.status == 200 else None
+                metrics.UPBIT_REQUEST_SECONDS.labels(path, response.status).observe(time.perf_counter() - started)
+                if response.status == 200:
+                    return data
+                if response.status != 429 or attempt == self.max_retries:
+                    raise await self._api_error(path, response)
+            # 429: 버킷을 비우고 full jitter 백오프 후 재시도
+            metrics.UPBIT_RETRIES.labels(path).inc()
+            self.rate_limiter.penalize(group)
+            await asyncio.sleep(random.uniform(0, self.retry_backoff * (2 ** attempt)))
+
+    async def get_markets(self, quote: Optional[str] = 'KRW') -> List[Dict]:
+        """
+        거래 가능한 마켓 목록을 가져옵니다. 목록은 자주 바뀌지 않으므로 market_list_ttl 동안 캐시합니다.
+        Args:
+            quote: 호가 통화 (예: KRW, BTC). None이면 전체 마켓
+        Returns:
+            List[Dict]: /market/all 응답 중 해당 호가 통화의 마켓
+        """
+        markets = await self.candle_cache.get_or_load(
+            ('market/all',),
+            lambda: self._request("/market/all"),
+            self.market_list_ttl,
+        )
+        if quote is None:
+            return markets
+        return [m for m in markets if m['market'].startswith(f"{quote}-")]
+
+    async def get_frame(self, market: str, unit: str = 'days', count: int = 21, to: Optional[str] = None) -> CandleFrame:
+        """
+        봉 단위별 최근 캔들을 컬럼형 CandleFrame으로 가져옵니다.
+        count가 200을 넘으면 페이지를 나눠 받습니다.
+        결과는 캐시되어 여러 호출자가 공유하므로 배열을 직접 수정하지 않아야 합니다.
+        Args:
+            market: 마켓 코드 (예: KRW-BTC)
+            unit: 봉 단위 (days, weeks, months, minutes/1, minutes/5 ...)
+            count: 가져올 캔들 개수
+            to: 마지막 캔들 시각 (yyyy-MM-dd HH:mm:ss, 생략 시 최신 캔들까지)
+        Returns:
+            CandleFrame: 오래된 봉이 앞에 오는 캔들 프레임
+        """
+        if to is not None:
+            return await self.candle_cache.get_or_load(
+                (market, unit, count, to),
+                lambda: self._load_candles(unit, market, count, to),
+                self.candle_cache.ttl_for(to),
+            )
+        # 같은 마켓/단위의 더 긴 최신 프레임이 캐시에 있으면 upstream 대신 그 꼬리(뷰)를 반환합니다.
+        # 워밍업이 받아 둔 프레임을 count가 다른 요청도 함께 쓰게 됩니다.
+        span = (market, unit)
+        widest = self._widest.get(span, 0)
+        if widest > count:
+            frame = self.candle_cache.get((market, unit, widest, None))
+            if frame is not None:
+                return frame.tail(count)
+            del self._widest[span]
+        frame = await self.candle_cache.get_or_load(
+            (market, unit, count, None),
+            lambda: self._load_candles(unit, market, count, None),
+            self.candle_cache.ttl_for(None),
+        )
+        if count > self._widest.get(span, 0):
+            self._widest[span] = count
+        return frame
+
+    async def get_timeframe(self, market: str, timeframe: str = 'days', count: int = 21) -> CandleFrame:
+        """
+        임의 타임프레임(5m, 15m, 1h, 2h, 4h, 1d, minutes/N ...)의 최근 캔들을 가져옵니다.
+        Upbit이 제공하는 봉 단위는 그대로 받고, 2h/6h/12h처럼 제공하지 않는 분 단위만 리샘플링합니다. (Resampler 참고)
+        Raises:
+            ValueError: 지원하지 않는 타임프레임
+        """
+        return await self.resampler.get_frame(market, timeframe, count)
 
-    async def get_daily_candles(self, market: str, count: int = 21) -> List[Dict]:
+    async def get_candles(self, market: str, unit: str = 'days', count: int = 21, to: Optional[str] = None) -> List[Dict]:
+        """
+        get_frame()의 결과를 Upbit 응답 형식(최신 봉이 앞)의 리스트로 반환합니다.
+        """
+        frame = await self.get_frame(market, unit, count, to)
+        return frame.to_records()
+
+    async def get_daily_frame(self, market: str, count: int = 21) -> CandleFrame:
+        """최근 일봉을 CandleFrame으로 가져옵니다."""
+        return await self.get_frame(market, 'days', count)
+
+    async def get_daily_candles(self, market: str, count: int = 21, to: Optional[str] = None) -> List[Dict]:
         """
         최근 일봉 데이터를 가져옵니다.
         Args:
             market: 마켓 코드 (예: KRW-BTC)
             count: 가져올 캔들 개수 (기본값: 21)
+            to: 마지막 캔들 시각 (yyyy-MM-dd HH:mm:ss, 생략 시 최신 캔들까지)
         Returns:
             List[Dict]: 일봉 데이터 리스트
         """
-        url = f"{self.base_url}/candles/days"
-        params = {
-            'market': market,
-            'count': count,
-            'to': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data
-                else:
-                    raise Exception(f"Failed to get daily candles: {response.status}")
+        return await self.get_candles(market, 'days', count, to)
+
+    async def get_minute_candles(self, market: str, count: int = 200, unit: int = 1, to: Optional[str] = None) -> List[Dict]:
+        """
+        최근 분봉 데이터를 가져옵니다.
+        Args:
+            market: 마켓 코드 (예: KRW-BTC)
+            count: 가져올 캔들 개수 (기본값: 200)
+            unit: 분 단위 (1, 3, 5, 10, 15, 30, 60, 240)
+            to: 마지막 캔들 시각 (yyyy-MM-dd HH:mm:ss, 생략 시 최신 캔들까지)
+        Returns:
+            List[Dict]: 분봉 데이터 리스트
+        """
+        return await self.get_candles(market, f'minutes/{unit}', count, to)
+
+    async def _fetch_candles(self, unit: str, market: str, count: int, to: Optional[str] = None) -> CandleFrame:
+        """Upbit 캔들 API를 한 번 호출하고 응답을 CandleFrame으로 변환합니다. (count는 최대 200)"""
+        params = {'market': market, 'count': count}
+        if to is not None:
+            params['to'] = to
+        data = await self._request(f"/candles/{unit}", params, group="candles")
+        return CandleFrame.from_upbit(data, market, unit)
+
+    async def _load_candles(self, unit: str, market: str, count: int, to: Optional[str] = None) -> CandleFrame:
+        """
+        로컬 저장소가 있으면 누락된 구간만 동기화한 뒤 저장소에서 읽고,
+        없으면 upstream에서 바로 가져옵니다.
+        """
+        if self.candle_store is None or to is not None or unit not in UNIT_INTERVAL_MS:
+            if count <= MAX_CANDLES_PER_REQUEST or unit not in UNIT_INTERVAL_MS:
+                return await self._fetch_candles(unit, market, count, to)
+            end = datetime.fromisoformat(to.replace('Z', '')) if to is not None else None
+            return await self.history_loader.fetch(market, unit, count, end=end)
+        await self.sync_candles(market, unit, count)
+        return await asyncio.to_thread(self.candle_store.latest, market, unit, count)
+
+    async def _fetch_backwards(self, unit: str, market: str, count: int, end: Optional[datetime] = None) -> bool:
+        """
+        end 이전의 봉 count개를 페이지 단위로 동시에 받아 저장소에 넣습니다.
+        Returns:
+            bool: 상장 시점까지 모두 받아 더 과거 봉이 없으면 True
+        """
+        received = 0
+        async for page in self.history_loader.pages(market, unit, count, end=end):
+            received += await asyncio.to_thread(self.candle_store.upsert, market, unit, page)
+        return received < count
+
+    async def sync_candles(self, market: str, unit: str = 'days', count: int = MAX_CANDLES_PER_REQUEST) -> None:
+        """
+        로컬 저장소를 최신 봉까지 맞추고, 최소 count개의 과거 봉이 저장되어 있도록 채웁니다.
+        이미 저장된 구간은 다시 받지 않고 마지막 저장 봉 이후의 꼬리만 받습니다.
+        Args:
+            market: 마켓 코드 (예: KRW-BTC)
+            unit: 봉 단위 (days, minutes/1 등)
+            count: 최소로 확보할 봉 개수
+        """
+        store = self.candle_store
+        lock = self._sync_locks.setdefault((market, unit), asyncio.Lock())
+        async with lock:
+            bounds = await asyncio.to_thread(store.bounds, market, unit)
+            if bounds is None:
+                history_complete = await self._fetch_backwards(unit, market, count)
+            else:
+                # 마지막 저장 봉은 진행 중이었을 수 있으므로 그 봉부터 다시 받습니다.
+                history_complete = False
+                newest = datetime.fromtimestamp(bounds[1] / 1000, tz=timezone.utc)
+                async for page in self.history_loader.pages(market, unit, start=newest):
+                    await asyncio.to_thread(store.upsert, market, unit, page)
+
+            bounds = await asyncio.to_thread(store.bounds, market, unit)
+            if (
+                not history_complete
+                and bounds is not None
+                and bounds[2] < count
+                and not await asyncio.to_thread(store.is_history_complete, market, unit)
+            ):
+                end = datetime.fromtimestamp(bounds[0] / 1000, tz=timezone.utc)
+                history_complete = await self._fetch_backwards(unit, market, count - bounds[2], end)
+            await asyncio.to_thread(store.mark_synced, market, unit, history_complete)
+
+    async def get_candles_range(self, market: str, start: datetime, end: datetime, unit: str = 'days') -> CandleFrame:
+        """
+        로컬 저장소에서 [start, end] 구간의 봉을 오래된 순으로 조회합니다.
+        필요한 구간이 저장소에 없으면 먼저 동기화합니다.
+        Args:
+            market: 마켓 코드 (예: KRW-BTC)
+            start: 시작 시각 (UTC)
+            end: 종료 시각 (UTC)
+            unit: 봉 단위 (days, minutes/1 등)
+        Returns:
+            CandleFrame: 구간 내 캔들 프레임
+        Raises:
+            CandleStoreNotConfiguredError: 로컬 캔들 저장소가 없는 경우
+        """
+        if self.candle_store is None:
+            raise CandleStoreNotConfiguredError()
+        start_ts = to_utc_ms(start)
+        end_ts = to_utc_ms(end)
+        needed = (int(time.time() * 1000) - start_ts) // UNIT_INTERVAL_MS[unit] + 1
+        await self.sync_candles(market, unit, max(needed, 1))
+        return await asyncio.to_thread(self.candle_store.range, market, unit, start_ts, end_ts)
+
+    async def get_daily_frames_many(self, markets: List[str], count: int = 21) -> Dict[str, CandleFrame]:
+        """
+        여러 마켓의 일봉을 동시에 가져옵니다.
+        모든 요청은 공유 레이트 리미터를 거치므로 쿼터를 넘지 않습니다.
+        Args:
+            markets: 마켓 코드 리스트
+            count: 마켓별 가져올 캔들 개수
+        Returns:
+            Dict[str, CandleFrame]: 마켓 코드별 일봉 프레임 (입력 순서 유지)
+        """
+        unique_markets = list(dict.fromkeys(markets))
+        results = await asyncio.gather(
+            *(self.get_daily_frame(market, count) for market in unique_markets)
+        )
+        return dict(zip(unique_markets, results))
+
+    async def get_tickers(self, markets: List[str], chunk_size: int = 100) -> Dict[str, Dict]:
+        """
+        여러 마켓의 현재가를 /ticker 한 번(마켓 chunk_size개당 1회)으로 가져옵니다.
+        Returns:
+            Dict[str, Dict]: 마켓 코드별 ticker 응답
+        """
+        unique_markets = list(dict.fromkeys(markets))
+        chunks = [unique_markets[i:i + chunk_size] for i in range(0, len(unique_markets), chunk_size)]
+        results = await asyncio.gather(
+            *(self._request("/ticker", {"markets": ",".join(chunk)}) for chunk in chunks)
+        )
+        return {ticker['market']: ticker for tickers in results for ticker in tickers}
+
+    async def get_daily_candles_many(self, markets: List[str], count: int = 21) -> Dict[str, List[Dict]]:
+        """
+        get_daily_frames_many()의 결과를 Upbit 응답 형식의 리스트로 반환합니다.
+        """
+        frames = await self.get_daily_frames_many(markets, count)
+        return {market: frame.to_records() for market, frame in frames.items()}
 
     async def calculate_volatility(self, market: str, window: int = 20) -> Dict:
         """
@@ -50,26 +387,145 @@ class UpbitService:
             }
         """
         # 일봉 데이터 가져오기 (window + 1개의 데이터 필요)
-        candles = await self.get_daily_candles(market, window + 1)
-        
-        # 종가 데이터 추출 (최신 데이터가 앞에 오므로 역순으로 정렬)
-        closes = np.array([candle['trade_price'] for candle in reversed(candles)])
-        
-        # 수익률 계산 (전일 대비)
+        frame = await self.get_daily_frame(market, window + 1)
+        return self.volatility_result(frame)
+
+    @staticmethod
+    def frame_volatility(frame: CandleFrame) -> float:
+        """프레임 종가의 전일 대비 수익률 표준편차입니다."""
+        closes = frame.close
         returns = np.diff(closes) / closes[:-1]
-        
-        # 변동성 계산
-        volatility = np.std(returns)
-        
+        return float(np.std(returns))
+
+    @classmethod
+    def volatility_result(cls, frame: CandleFrame) -> Dict:
+        """calculate_volatility()와 같은 형식의 결과를 프레임으로 만듭니다."""
         return {
-            'volatility': float(volatility),
+            'volatility': cls.frame_volatility(frame),
             'data': [
-                {
-                    'date': candle['candle_date_time_kst'],
-                    'close': candle['trade_price']
-                }
-                for candle in reversed(candles)
+                {'date': date, 'close': close}
+                for date, close in zip(frame.dates(), frame.close.tolist())
             ]
         }
 
-    # ... 기존 코드 ... 
\ No newline at end of file
+    # ---- 거래(private) API ----
+
+    @property
+    def read_only(self) -> bool:
+        """API 키가 없으면 시세(public) API만 쓸 수 있습니다."""
+        return not (self.access_key and self.secret_key)
+
+    def _auth_headers(self, params: Optional[Dict] = None) -> Dict[str, str]:
+        """
+        요청마다 새 nonce로 서명한 JWT 인증 헤더를 만듭니다.
+        파라미터가 있으면 쿼리 문자열의 SHA512 해시(query_hash)를 함께 서명합니다.
+        """
+        import jwt  # 읽기 전용 모드에서는 필요 없으므로 첫 서명 때 import합니다.
+
+        payload = {'access_key': self.access_key, 'nonce': str(uuid.uuid4())}
+        if params:
+            query = urlencode(params, doseq=True).encode()
+            payload['query_hash'] = hashlib.sha512(query).hexdigest()
+            payload['query_hash_alg'] = 'SHA512'
+        token = jwt.encode(payload, self.secret_key, algorithm='HS256')
+        return {'Authorization': f'Bearer {token}'}
+
+    async def _private_request(self, method: str, path: str, params: Optional[Dict] = None, group: str = "exchange"):
+        """
+        인증이 필요한 거래 API를 호출합니다. GET/DELETE는 쿼리 문자열로, POST는 JSON 본문으로 파라미터를 보냅니다.
+        429 응답은 _request()와 같이 백오프 후 재시도하며, 재시도 때마다 nonce를 새로 발급합니다.
+        Raises:
+            UpbitAPIError: 오류 응답 (error.name 포함). 읽기 전용 모드에서는 요청하지 않고 name='read_only'로 발생합니다.
+        """
+        if self.read_only:
+            raise UpbitAPIError(path, 401, 'read_only', "UPBIT_ACCESS_KEY/UPBIT_SECRET_KEY are not configured")
+        url = f"{self.base_url}{path}"
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(group)
+            headers = self._auth_headers(params)
+            started = time.perf_counter()
+            if method == "POST":
+                request = self.session.request(method, url, json=params, headers=headers)
+            else:
+                request = self.session.request(method, url, params=params, headers=headers)
+            async with request as response:
+                self.rate_limiter.update_from_header(response.headers.get("Remaining-Req"), group)
+                metrics.UPBIT_REQUEST_SECONDS.labels(path, response.status).observe(time.perf_counter() - started)
+                if response.status in (200, 201):
+                    return await response.json()
+                if response.status != 429 or attempt == self.max_retries:
+                    raise await self._api_error(path, response)
+            metrics.UPBIT_RETRIES.labels(path).inc()
+            self.rate_limiter.penalize(group)
+            await asyncio.sleep(random.uniform(0, self.retry_backoff * (2 ** attempt)))
+
+    async def get_accounts(self) -> List[Dict]:
+        """
+        전체 계좌 잔고를 가져옵니다. 체결이 생기면 invalidate_accounts()로 지우므로 account_ttl 동안 캐시합니다.
+        """
+        return await self.candle_cache.get_or_load(
+            ('accounts',),
+            lambda: self._private_request("GET", "/accounts"),
+            self.account_ttl,
+            share=False,
+        )
+
+    def invalidate_accounts(self) -> None:
+        """주문/체결로 잔고가 바뀌었을 때 캐시된 잔고를 지웁니다."""
+        self.candle_cache.invalidate(('accounts',))
+
+    async def get_balance(self, market: str) -> Optional[Dict]:
+        """
+        마켓의 기준 자산 잔고를 가져옵니다. (예: KRW-BTC → BTC)
+        Returns:
+            Optional[Dict]: /accounts 응답 중 해당 통화 항목. 보유하지 않으면 None
+        """
+        currency = market.split('-', 1)[1]
+        for account in await self.get_accounts():
+            if account['currency'] == currency:
+                return account
+        return None
+
+    async def create_order(
+        self,
+        market: str,
+        side: str,
+        volume: Optional[str] = None,
+        price: Optional[str] = None,
+        ord_type: str = 'limit',
+        identifier: Optional[str] = None,
+    ) -> Dict:
+        """
+        주문을 생성합니다.
+        identifier(클라이언트 주문 ID)는 거래소에서 유일해야 하므로, 같은 identifier로 다시 보내도 주문이 두 번 나가지 않습니다.
+        응답을 받지 못한 채 실패한 경우(타임아웃, 연결 오류, 중복 identifier 거절)에는 identifier로 주문을 조회해
+        이미 접수된 주문이면 그 주문을 반환합니다.
+        Args:
+            side: bid(매수) / ask(매도)
+            ord_type: limit(지정가), price(시장가 매수, price=주문 총액), market(시장가 매도, volume=수량)
+        """
+        params = {
+            'market': market,
+            'side': side,
+            'volume': None if volume is None else str(volume),
+            'price': None if price is None else str(price),
+            'ord_type': ord_type,
+            'identifier': identifier,
+        }
+        try:
+            order = await self._private_request("POST", "/orders", params, group="order")
+        except (UpbitAPIError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # 잔고 부족/잘못된 파라미터 같은 다른 거절은 주문이 접수되지 않았으므로 조회 없이 그대로 올립니다.
+            if identifier is None or (isinstance(e, UpbitAPIError) and e.name != DUPLICATE_IDENTIFIER_ERROR):
+                raise
+            try:
+                order = await self.get_order(identifier=identifier)
+            except UpbitAPIError:
+                raise e
+        self.invalidate_accounts()
+        return order
+
+    async def get_order(self, uuid: Optional[str] = None, identifier: Optional[str] = None) -> Dict:
+        """uuid 또는 identifier로 주문 하나를 조회합니다."""
+        return await self._private_request("GET", "/order", {'uuid': uuid, 'identifier': identifier})
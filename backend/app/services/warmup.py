@@ -0,0 +1,153 @@
+"""
+API 프로세스 시작 직후의 백그라운드 워밍업입니다.
+
+lifespan은 워밍업을 기다리지 않으므로 /health는 바로 응답하고, 워밍업이 끝나면 /ready가 200을 반환합니다.
+롤링 배포에서 readiness 프로브를 /ready로 두면 캐시와 커넥션이 준비된 워커부터 트래픽을 받습니다.
+
+- 레지스트리의 전략 모듈을 import합니다. (NumPy/지표 모듈 로딩을 첫 요청 밖으로 뺍니다)
+- 마켓 목록(/market/all)을 받아 캐시하고, 이 요청으로 커넥션 풀의 DNS/TLS 연결을 맺습니다.
+- 관심 마켓(markets)의 최근 캔들을 봉 단위별로 동시에 받아 캐시와 로컬 저장소를 채웁니다.
+
+개별 작업의 실패는 기록만 하고 준비 상태를 막지 않습니다. 워밍업은 최적화일 뿐이므로
+upstream이 느리거나 일부 마켓이 없어도 timeout 뒤에는 준비 상태가 됩니다.
+"""
+from typing import Dict, List, Optional, Sequence
+import asyncio
+import logging
+import time
+from .upbit_service import UpbitService
+from .trading.registry import StrategyRegistry
+from ..core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """시작 시 한 번 실행하는 워밍업 작업과 그 진행 상태입니다."""
+
+    def __init__(
+        self,
+        upbit_service: UpbitService,
+        registry: StrategyRegistry,
+        markets: Sequence[str] = (),
+        units: Sequence[str] = ('days',),
+        candle_count: int = 200,
+        concurrency: int = 8,
+        timeout: float = 30,
+        enabled: bool = True,
+    ):
+        """
+        Args:
+            markets: 최근 캔들을 미리 받아 둘 마켓 코드 (예: KRW-BTC)
+            units: 마켓마다 받을 타임프레임 (days, 5m, 1h ...)
+            candle_count: 봉 단위별 받을 캔들 수. 이보다 적은 count의 요청은 같은 프레임의 꼬리로 응답합니다.
+            concurrency: 동시에 받는 (마켓, 봉 단위) 수. 요청은 어차피 레이트 리미터를 거칩니다.
+            timeout: 전체 워밍업 제한 시간 (초)
+            enabled: False면 아무것도 하지 않고 바로 준비 상태가 됩니다.
+        """
+        self.upbit_service = upbit_service
+        self.registry = registry
+        self.markets = list(dict.fromkeys(markets))
+        self.units = list(dict.fromkeys(units))
+        self.candle_count = candle_count
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.enabled = enabled
+        self.status = 'pending'  # pending | running | done | timeout
+        self.duration: Optional[float] = None
+        self.strategies = 0
+        self.frames = 0
+        self.errors: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+        self._done = asyncio.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def start(self) -> None:
+        """워밍업을 백그라운드 작업으로 시작합니다. (lifespan에서 한 번 호출)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def run(self) -> None:
+        if not self.enabled:
+            self._finish('done', time.perf_counter())
+            return
+        self.status = 'running'
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(self._load_strategies(), self._load_market_data()), self.timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning("warm-up timed out", extra={'timeout': self.timeout})
+            self._finish('timeout', started)
+            return
+        self._finish('done', started)
+
+    def _finish(self, status: str, started: float) -> None:
+        self.status = status
+        self.duration = time.perf_counter() - started
+        metrics.WARMUP_SECONDS.set(self.duration)
+        self._done.set()
+        logger.info(
+            "warm-up finished",
+            extra={
+                'status': status,
+                'duration': round(self.duration, 3),
+                'strategies': self.strategies,
+                'frames': self.frames,
+                'errors': len(self.errors),
+            },
+        )
+
+    def _record_error(self, stage: str, error: Exception) -> None:
+        self.errors.append(f"{stage}: {error}")
+        logger.warning("warm-up step failed", extra={'stage': stage, 'error': str(error)})
+
+    async def _load_strategies(self) -> None:
+        """전략 모듈은 레지스트리가 처음 쓸 때 import하므로, 첫 요청 대신 여기서 스레드로 미리 import합니다."""
+        for name in self.registry.names():
+            try:
+                await asyncio.to_thread(self.registry.get(name).load)
+                self.strategies += 1
+            except Exception as e:
+                self._record_error(f"strategy {name}", e)
+
+    async def _load_market_data(self) -> None:
+        try:
+            await self.upbit_service.get_markets(None)
+        except Exception as e:
+            self._record_error("markets", e)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def load(market: str, unit: str) -> None:
+            async with semaphore:
+                try:
+                    await self.upbit_service.get_timeframe(market, unit, self.candle_count)
+                    self.frames += 1
+                except Exception as e:
+                    self._record_error(f"candles {market} {unit}", e)
+
+        await asyncio.gather(*(load(market, unit) for market in self.markets for unit in self.units))
+
+    def to_dict(self) -> Dict:
+        return {
+            'status': self.status,
+            'ready': self.ready,
+            'duration': self.duration,
+            'strategies': self.strategies,
+            'markets': len(self.markets),
+            'frames': self.frames,
+            'errors': self.errors[-10:],
+        }
@@ -0,0 +1,84 @@
+"""
+녹화한 Upbit WebSocket 메시지(JSONL)를 그대로 다시 보내 주는 로컬 WebSocket 서버입니다.
+UpbitWebSocketClient(record_path=...)로 녹화한 파일을 실제 Upbit 대신 재생하여
+수집기와 전략을 네트워크 없이 검증할 때 사용합니다.
+
+    python -m app.services.ws_replay recorded.jsonl --port 8765 --speed 10
+"""
+from typing import Dict, List, Optional, Set, Tuple
+import argparse
+import asyncio
+import json
+from aiohttp import web, WSMsgType
+
+
+def load_messages(path: str) -> List[Dict]:
+    """JSONL 파일에서 녹화된 메시지를 읽습니다."""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def parse_subscription(message: List[Dict]) -> Tuple[Set[str], Set[str]]:
+    """Upbit 구독 메시지에서 (타입 집합, 마켓 코드 집합)을 추출합니다."""
+    types, codes = set(), set()
+    for field in message:
+        if 'type' in field:
+            types.add(field['type'])
+            codes.update(field.get('codes', []))
+    return types, codes
+
+
+def _event_time(event: Dict) -> Optional[int]:
+    return event.get('trade_timestamp') or event.get('timestamp')
+
+
+def create_replay_app(messages: List[Dict], speed: float = 0) -> web.Application:
+    """
+    Args:
+        messages: 재생할 메시지 목록 (녹화 순서)
+        speed: 원래 시간 간격 대비 재생 배속. 0이면 기다리지 않고 바로 보냅니다.
+    """
+
+    async def handle(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        message = await ws.receive()
+        if message.type not in (WSMsgType.TEXT, WSMsgType.BINARY):
+            return ws
+        types, codes = parse_subscription(json.loads(message.data))
+
+        previous = None
+        for event in messages:
+            if event.get('type') not in types or event.get('code') not in codes:
+                continue
+            current = _event_time(event)
+            if speed > 0 and previous is not None and current is not None:
+                await asyncio.sleep(max(current - previous, 0) / 1000 / speed)
+            previous = current if current is not None else previous
+            if ws.closed:
+                break
+            # Upbit와 같이 바이너리 프레임으로 보냅니다.
+            await ws.send_bytes(json.dumps(event).encode('utf-8'))
+
+        # 재생이 끝나도 클라이언트가 닫을 때까지 연결을 유지합니다.
+        async for _ in ws:
+            pass
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/websocket/v1', handle)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="녹화된 Upbit WebSocket 메시지 재생 서버")
+    parser.add_argument('path', help="녹화 파일 (JSONL)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--speed', type=float, default=0, help="재생 배속 (0: 지연 없이)")
+    args = parser.parse_args()
+    web.run_app(create_replay_app(load_messages(args.path), args.speed), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+API 엔드투엔드 벤치마크입니다.
+합성 캔들 모의 거래소와 앱 서버(uvicorn main:app)를 각각 별도 프로세스로 띄우고,
+이 프로세스는 부하 생성만 맡아 요청 지연 시간과 초당 처리량을 잽니다.
+
+앱 서버의 레이트 리미터는 넉넉하게 풀고 캔들 저장소는 끕니다. 첫 요청 이후에는 대부분 캔들 캐시 적중이므로
+결과는 라우팅/직렬화/전략 계산 비용에 가깝고, cold 항목만 캐시가 빈 상태의 첫 요청을 잽니다.
+"""
+from typing import Dict, List, Optional
+import asyncio
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import time
+import aiohttp
+from .common import load
+from .synthetic import BENCH_ACCESS_KEY, BENCH_SECRET_KEY, market_codes
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARKETS = 100
+CONCURRENCY = (1, 16, 64)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _spawn(args: List[str], env: Optional[Dict] = None) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, *args], cwd=BACKEND_DIR, env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def _wait_ready(session: aiohttp.ClientSession, url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with session.get(url) as response:
+                if response.status < 500:
+                    return
+        except aiohttp.ClientError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Server did not start: {url}")
+        await asyncio.sleep(0.1)
+
+
+def _cases(markets: List[str]) -> Dict[str, tuple]:
+    """이름 → (method, path 생성 함수, JSON body 생성 함수[, 요청 헤더])"""
+    cycle = itertools.cycle(markets)
+    basket = markets[:10]
+    return {
+        'execute_counter_trend': ('POST', lambda: '/api/v1/trading/execute', lambda: {
+            'strategy': 'CounterTrend', 'options': {'tickers': [next(cycle)], 'nDays': 20, 'kValue': 2.2}}),
+        'execute_trend_sma': ('POST', lambda: '/api/v1/trading/execute', lambda: {
+            'strategy': 'Trend', 'options': {'tickers': [next(cycle)], 'trendType': 'sma',
+                                             'shortPeriod': 20, 'longPeriod': 50}}),
+        'execute_inverse_volatility_erc': ('POST', lambda: '/api/v1/trading/execute', lambda: {
+            'strategy': 'Inverse Volatility', 'options': {'tickers': basket, 'mode': 'erc', 'lookback': 100}}),
+        'market_daily_candles': ('GET', lambda: f'/api/v1/market/daily-candles/{next(cycle)}?count=100', None),
+        'market_daily_candles_columnar': ('GET', lambda: f'/api/v1/market/daily-candles/{next(cycle)}?count=100', None,
+                                          {'Accept': 'application/vnd.candles.columnar+json'}),
+        'market_daily_candles_packed': ('GET', lambda: f'/api/v1/market/daily-candles/{next(cycle)}?count=100', None,
+                                        {'Accept': 'application/vnd.candles.packed'}),
+        'market_volatility': ('GET', lambda: f'/api/v1/market/volatility/{next(cycle)}?window=20', None),
+        'market_candles': ('GET', lambda: f'/api/v1/market/candles?unit=days&market_code={next(cycle)}&count=50', None),
+        'market_cache_stats': ('GET', lambda: '/api/v1/market/cache/stats', None),
+        'market_scan': ('GET', lambda: '/api/v1/market/scan?limit=50', None),
+        'market_pairs': ('GET', lambda: '/api/v1/market/pairs?lookback=120&limit=50', None),
+    }
+
+
+async def run(quick: bool = False, latency: float = 0.0) -> List[Dict]:
+    requests = 100 if quick else 1000
+    concurrency_levels = CONCURRENCY[:2] if quick else CONCURRENCY
+    markets = market_codes(MARKETS)
+    exchange_port, app_port = _free_port(), _free_port()
+    exchange = _spawn(['-m', 'benchmarks.synthetic', '--port', str(exchange_port),
+                       '--markets', str(MARKETS), '--latency', str(latency)])
+    app = _spawn(['-m', 'uvicorn', 'main:app', '--port', str(app_port), '--log-level', 'warning',
+                  '--no-access-log'], {
+        'UPBIT_ACCESS_KEY': BENCH_ACCESS_KEY,
+        'UPBIT_SECRET_KEY': BENCH_SECRET_KEY,
+        'UPBIT_API_URL': f'http://127.0.0.1:{exchange_port}/v1',
+        'UPBIT_RATE_PER_SEC': '1000000',
+        'UPBIT_RATE_PER_MIN': '60000000',
+        'CANDLE_STORE_ENABLED': 'false',
+        'MARKET_DATA_MODE': 'polling',
+        'LOG_LEVEL': 'WARNING',
+    })
+    base = f'http://127.0.0.1:{app_port}'
+    results = []
+    try:
+        connector = aiohttp.TCPConnector(limit=max(concurrency_levels))
+        async with aiohttp.ClientSession(connector=connector) as session:
+            await _wait_ready(session, f'http://127.0.0.1:{exchange_port}/v1/market/all')
+            await _wait_ready(session, f'{base}/health')
+
+            for name, (method, path, body, *headers) in _cases(markets).items():
+
+                async def call():
+                    async with session.request(method, base + path(), json=body() if body else None,
+                                               headers=headers[0] if headers else None) as response:
+                        await response.read()
+                        if response.status >= 400:
+                            raise RuntimeError(f"{name}: HTTP {response.status}")
+
+                # 캐시가 빈 상태의 첫 요청 (전체 마켓 조회가 필요한 scan/pairs에서 특히 큽니다)
+                started = time.perf_counter()
+                await call()
+                cold_ms = (time.perf_counter() - started) * 1000
+                # 순환하는 마켓의 캔들을 모두 캐시에 올려 둡니다.
+                for _ in range(len(markets)):
+                    await call()
+                for concurrency in concurrency_levels:
+                    results.append({
+                        'endpoint': name, 'method': method, 'cold_ms': cold_ms,
+                        **await load(call, requests, concurrency),
+                    })
+    finally:
+        for process in (app, exchange):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return results
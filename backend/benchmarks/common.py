@@ -0,0 +1,79 @@
+"""
+벤치마크 공통 측정 도구입니다.
+결과는 모두 같은 모양의 dict(ms 단위 지연 시간 + 초당 처리량)로 만들어 run.py가 그대로 JSON에 씁니다.
+"""
+from typing import Awaitable, Callable, Dict, List
+import asyncio
+import time
+import numpy as np
+
+
+def summarize(samples: List[float], elapsed: float = None) -> Dict:
+    """
+    초 단위 샘플 목록을 요약합니다.
+    Args:
+        elapsed: 전체 소요 시간 (초). 동시 실행이면 합계 대신 이 값으로 처리량을 계산합니다.
+    """
+    values = np.asarray(samples, dtype=float) * 1000
+    total = elapsed if elapsed is not None else float(np.sum(samples))
+    return {
+        'n': int(values.size),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p99_ms': float(np.percentile(values, 99)),
+        'max_ms': float(values.max()),
+        'ops_per_sec': float(values.size / total) if total > 0 else None,
+    }
+
+
+def bench(function: Callable[[], object], repeat: int, warmup: int = 3) -> Dict:
+    """동기 함수를 repeat번 호출해 요약합니다."""
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+async def bench_async(function: Callable[[], Awaitable], repeat: int, warmup: int = 3) -> Dict:
+    """코루틴 함수를 한 번에 하나씩 repeat번 실행해 요약합니다."""
+    for _ in range(warmup):
+        await function()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await function()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+async def load(function: Callable[[], Awaitable], requests: int, concurrency: int) -> Dict:
+    """
+    concurrency개의 작업자가 나눠서 모두 requests번 호출합니다. 처리량은 전체 벽시계 시간 기준입니다.
+    function이 예외를 내면 errors로 셉니다.
+    """
+    samples: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                await function()
+            except Exception:
+                errors += 1
+                continue
+            samples.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    result = summarize(samples, elapsed) if samples else {'n': 0}
+    result.update({'concurrency': concurrency, 'errors': errors})
+    return result
@@ -0,0 +1,82 @@
+"""
+데이터 조회 벤치마크입니다. 실제 UpbitService를 로컬 모의 거래소에 연결해 calculate_volatility()를 잽니다.
+
+- cold: 매 호출 전에 캔들 캐시를 비워 HTTP 요청 + 응답 파싱 + 계산 전체를 잽니다.
+- warm: 캐시 적중 경로 (캔들 재사용 + 계산)
+- concurrent: 여러 마켓을 동시에 조회할 때의 초당 처리량 (캐시를 비운 상태에서 시작)
+- resample: get_timeframe()으로 Upbit에 없는 2m/2h/12h 봉을 1분봉/1시간봉/4시간봉에서 만듭니다.
+  cold는 베이스 봉 조회까지, warm은 타임프레임 캐시 적중입니다.
+레이트 리미터는 넉넉하게 풀어 두므로 결과는 클라이언트 스택의 비용이고 Upbit 쿼터와는 무관합니다.
+"""
+from typing import Dict, List
+import itertools
+from app.services.rate_limiter import RateLimiter
+from app.services.upbit_service import UpbitService
+from .common import bench_async, load
+from .synthetic import BENCH_ACCESS_KEY, BENCH_SECRET_KEY, make_frames, market_codes, stub_exchange
+
+WINDOWS = (20, 100, 199)
+TIMEFRAMES = ('2m', '2h', '12h')
+TIMEFRAME_BARS = 100
+MARKETS = 50
+UNLIMITED = 1_000_000
+
+
+async def run(quick: bool = False, latency: float = 0.0) -> List[Dict]:
+    repeat = 20 if quick else 200
+    markets = market_codes(10 if quick else MARKETS)
+    frames = make_frames(markets, 400)
+    # 타임프레임마다 TIMEFRAME_BARS개를 만들 수 있는 베이스 봉
+    for base_unit, ratio in (('minutes/1', 2), ('minutes/60', 2), ('minutes/240', 3)):
+        base_frames = make_frames(markets[:1], (TIMEFRAME_BARS + 2) * ratio, base_unit)
+        frames.update({f'{market}/{base_unit}': frame for market, frame in base_frames.items()})
+    results = []
+    async with stub_exchange(frames, latency) as base_url:
+        service = UpbitService(
+            BENCH_ACCESS_KEY, BENCH_SECRET_KEY,
+            rate_limiter=RateLimiter(UNLIMITED, UNLIMITED * 60),
+            base_url=base_url,
+        )
+        await service.start()
+        try:
+            for window in WINDOWS:
+                market = markets[0]
+
+                async def cold():
+                    service.candle_cache.clear()
+                    await service.calculate_volatility(market, window)
+
+                async def warm():
+                    await service.calculate_volatility(market, window)
+
+                service.candle_cache.clear()
+                cycle = itertools.cycle(markets)
+
+                async def concurrent():
+                    await service.calculate_volatility(next(cycle), window)
+
+                results.append({
+                    'operation': 'calculate_volatility', 'window': window, 'server_latency_ms': latency * 1000,
+                    'cold': await bench_async(cold, repeat),
+                    'warm': await bench_async(warm, repeat),
+                    'concurrent': await load(concurrent, repeat * 5, concurrency=len(markets)),
+                })
+            for timeframe in TIMEFRAMES:
+                market = markets[0]
+
+                async def cold():
+                    service.candle_cache.clear()
+                    await service.get_timeframe(market, timeframe, TIMEFRAME_BARS)
+
+                async def warm():
+                    await service.get_timeframe(market, timeframe, TIMEFRAME_BARS)
+
+                results.append({
+                    'operation': f'resample {timeframe}', 'window': TIMEFRAME_BARS,
+                    'server_latency_ms': latency * 1000,
+                    'cold': await bench_async(cold, repeat),
+                    'warm': await bench_async(warm, repeat),
+                })
+        finally:
+            await service.close()
+    return results
@@ -0,0 +1,122 @@
+"""
+벤치마크 실행기입니다. backend/ 에서 실행합니다.
+
+    python -m benchmarks.run                      # 전체 실행, benchmarks/results/latest.json에 기록
+    python -m benchmarks.run --quick --only strategies data
+    python -m benchmarks.run --baseline benchmarks/results/main.json --threshold 0.25
+
+--baseline을 주면 같은 항목의 p50 지연 시간을 비교하고, threshold(비율)보다 느려진 항목이 있으면
+목록을 출력하고 종료 코드 1로 끝납니다. (CI에서 회귀를 잡는 용도)
+"""
+from typing import Dict, List
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+import numpy as np
+from . import api, data, strategies
+
+SUITES = {
+    'strategies': lambda args: strategies.run(args.quick),
+    'data': lambda args: data.run(args.quick, args.latency),
+    'api': lambda args: api.run(args.quick, args.latency),
+}
+# 결과 항목을 기준 결과와 짝짓는 키
+KEYS = {
+    'strategies': ('strategy', 'basket', 'lookback'),
+    'data': ('operation', 'window'),
+    'api': ('endpoint', 'concurrency'),
+}
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'latest.json')
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def _p50s(entry: Dict, prefix: str = '') -> Dict[str, float]:
+    """항목 안의 모든 p50_ms 값을 'full.p50_ms' 같은 경로로 꺼냅니다."""
+    values = {}
+    for key, value in entry.items():
+        if isinstance(value, dict):
+            values.update(_p50s(value, f'{prefix}{key}.'))
+        elif key == 'p50_ms' and value is not None:
+            values[prefix + key] = value
+    return values
+
+
+def compare(results: Dict, baseline: Dict, threshold: float, min_delta_ms: float = 0.05) -> List[str]:
+    """
+    threshold 비율 이상 느려진 항목을 사람이 읽을 수 있는 문장으로 반환합니다.
+    µs 단위 항목은 측정 잡음이 비율로는 크게 보이므로 min_delta_ms 미만의 차이는 무시합니다.
+    """
+    regressions = []
+    for suite, keys in KEYS.items():
+        before = {tuple(e.get(k) for k in keys): e for e in baseline.get('suites', {}).get(suite, [])}
+        for entry in results['suites'].get(suite, []):
+            key = tuple(entry.get(k) for k in keys)
+            if key not in before:
+                continue
+            old = _p50s(before[key])
+            for metric, value in _p50s(entry).items():
+                if (metric in old and old[metric] > 0 and value > old[metric] * (1 + threshold)
+                        and value - old[metric] >= min_delta_ms):
+                    regressions.append(
+                        f"{suite} {dict(zip(keys, key))} {metric}: {old[metric]:.3f}ms -> {value:.3f}ms "
+                        f"(+{(value / old[metric] - 1) * 100:.0f}%)"
+                    )
+    return regressions
+
+
+async def run_suites(args) -> Dict:
+    results = {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'quick': args.quick,
+        'server_latency_ms': args.latency * 1000,
+        'suites': {},
+    }
+    for name in args.only:
+        print(f"running {name}...", file=sys.stderr)
+        results['suites'][name] = await SUITES[name](args)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전략 계산 / 데이터 조회 / API 벤치마크")
+    parser.add_argument('--only', nargs='+', choices=list(SUITES), default=list(SUITES))
+    parser.add_argument('--quick', action='store_true', help="반복 횟수와 조합을 줄여 빠르게 확인")
+    parser.add_argument('--latency', type=float, default=0.0, help="모의 거래소 응답 지연 (초)")
+    parser.add_argument('--out', default=DEFAULT_OUT, help="결과 JSON 경로")
+    parser.add_argument('--baseline', help="비교할 기준 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=0.2, help="회귀로 볼 p50 증가 비율")
+    parser.add_argument('--min-delta-ms', type=float, default=0.05, help="회귀로 볼 최소 p50 증가량 (ms)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_suites(args))
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {args.out}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_delta_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+전략 신호 계산 벤치마크입니다. 네트워크 없이 합성 캔들만 쓰므로 순수 계산 시간만 잽니다.
+
+단일 마켓 전략의 basket은 스케줄러처럼 마켓마다 전략 인스턴스를 하나씩 두고 모두 평가하는 경우이고,
+InverseVolatility의 basket은 한 번의 비중 계산에 들어가는 티커 수입니다.
+- full: calculate_signals() (매 호출 캔들 슬라이스 + 지표 전체 재계산)
+- incremental: 워밍업을 마친 뒤 calculate_signals_incremental()만 호출 (스케줄러의 tick 경로)
+"""
+from typing import Dict, List
+from app.services.portfolio import CovarianceCache
+from app.services.trading.counterTrend import CounterTrendStrategy
+from app.services.trading.inverseVolatility import InverseVolatilityStrategy
+from app.services.trading.trendFollowing import TrendFollowingStrategy
+from .common import bench, bench_async
+from .synthetic import SyntheticUpbitService, make_frames, market_codes
+
+BASKETS = (1, 10, 100)
+LOOKBACKS = (20, 100, 200)
+PORTFOLIO_MODES = ('inverse_vol', 'erc', 'vol_target')
+HISTORY_BARS = 400
+
+
+def _single_market_cases(lookback: int) -> Dict[str, tuple]:
+    short = max(lookback // 4, 2)
+    return {
+        'counter_trend': (CounterTrendStrategy, {'nDays': lookback, 'kValue': 2.2}),
+        'trend_sma': (TrendFollowingStrategy, {'trendType': 'sma', 'shortPeriod': short, 'longPeriod': lookback}),
+        'trend_ema': (TrendFollowingStrategy, {'trendType': 'ema', 'shortPeriod': short, 'longPeriod': lookback}),
+        'trend_breakout': (TrendFollowingStrategy, {'trendType': 'breakout', 'nDays': lookback}),
+    }
+
+
+async def run(quick: bool = False) -> List[Dict]:
+    repeat = 20 if quick else 200
+    baskets = BASKETS[:2] if quick else BASKETS
+    lookbacks = LOOKBACKS[:2] if quick else LOOKBACKS
+    frames = make_frames(market_codes(max(baskets)), HISTORY_BARS)
+    service = SyntheticUpbitService(frames)
+    results = []
+
+    for basket in baskets:
+        markets = market_codes(basket)
+        for lookback in lookbacks:
+            for name, (strategy_class, parameters) in _single_market_cases(lookback).items():
+                strategies = [strategy_class(service, {**parameters, 'tickers': [m]}) for m in markets]
+
+                async def full():
+                    for strategy in strategies:
+                        await strategy.calculate_signals()
+
+                for strategy, market in zip(strategies, markets):
+                    strategy.warm_up(frames[market][:-1])
+                prices = [float(frames[m].close[-1]) for m in markets]
+
+                def incremental():
+                    for strategy, price in zip(strategies, prices):
+                        strategy.calculate_signals_incremental(price)
+
+                results.append({
+                    'strategy': name, 'basket': basket, 'lookback': lookback,
+                    'full': await bench_async(full, repeat),
+                    'incremental': bench(incremental, repeat),
+                })
+
+    # 포트폴리오는 티커가 2개 이상이어야 하므로 basket 1 대신 2를 씁니다.
+    for basket in (2,) + baskets[1:]:
+        tickers = market_codes(basket)
+        for lookback in lookbacks:
+            for mode in PORTFOLIO_MODES:
+                parameters = {'tickers': tickers, 'mode': mode, 'lookback': lookback, 'halflife': lookback / 2}
+
+                async def cold():
+                    # 캐시가 비어 있으면 lookback 전체로 공분산을 새로 추정합니다.
+                    await InverseVolatilityStrategy(service, parameters, CovarianceCache()).calculate_portfolio_weights()
+
+                cache = CovarianceCache()
+                warm_strategy = InverseVolatilityStrategy(service, parameters, cache)
+
+                async def warm():
+                    # 같은 바스켓의 재평가: 새 봉이 없으므로 공분산 갱신 없이 비중만 다시 풉니다.
+                    await warm_strategy.calculate_portfolio_weights()
+
+                results.append({
+                    'strategy': f'inverse_volatility_{mode}', 'basket': basket, 'lookback': lookback,
+                    'full': await bench_async(cold, max(repeat // 4, 5)),
+                    'incremental': await bench_async(warm, repeat),
+                })
+    return results
@@ -0,0 +1,102 @@
+"""
+벤치마크용 합성 캔들입니다. 같은 seed면 항상 같은 캔들을 만듭니다.
+마지막 봉이 오늘(UTC) 봉이 되도록 시각을 맞추므로 실거래 코드의 '진행 중인 봉' 규칙이 그대로 적용됩니다.
+같은 캔들을 mock_exchange로 HTTP 응답하는 Upbit 대역 서버도 띄울 수 있습니다.
+
+    python -m benchmarks.synthetic --port 8780 --markets 100
+"""
+from typing import Dict, List, Sequence
+from contextlib import asynccontextmanager
+import argparse
+import time
+import numpy as np
+from aiohttp import web
+from app.services.candle_frame import CandleFrame
+from app.services.candle_store import UNIT_INTERVAL_MS
+from app.services.mock_exchange import MockExchange, create_mock_app
+
+BENCH_ACCESS_KEY = 'bench-access-key'
+BENCH_SECRET_KEY = 'bench-secret-key-for-local-benchmarks'
+
+
+def market_codes(count: int, quote: str = 'KRW') -> List[str]:
+    return [f"{quote}-C{i:03d}" for i in range(count)]
+
+
+def make_frame(market: str, bars: int, unit: str = 'days', seed: int = 0, now_ms: int = None) -> CandleFrame:
+    """기하 브라운 운동으로 만든 OHLCV 프레임입니다."""
+    rng = np.random.default_rng([seed, *market.encode()])
+    interval = UNIT_INTERVAL_MS[unit]
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    last = now_ms - now_ms % interval
+    timestamp = last - interval * np.arange(bars - 1, -1, -1, dtype=np.int64)
+    returns = rng.normal(0.0005, 0.03, bars)
+    close = 1000 * np.exp(np.cumsum(returns))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.015, bars))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.lognormal(10, 1, bars)
+    return CandleFrame(market, unit, timestamp, open_, high, low, close, volume, volume * close)
+
+
+def make_frames(markets: Sequence[str], bars: int, unit: str = 'days', seed: int = 0) -> Dict[str, CandleFrame]:
+    now_ms = int(time.time() * 1000)
+    return {market: make_frame(market, bars, unit, seed, now_ms) for market in markets}
+
+
+class SyntheticUpbitService:
+    """
+    네트워크 없이 합성 캔들을 돌려주는 UpbitService 대역입니다.
+    전략의 순수 계산 시간만 재기 위해 사용하며, 요청한 개수만큼 최근 봉을 잘라 줍니다.
+    """
+
+    def __init__(self, frames: Dict[str, CandleFrame]):
+        self.frames = frames
+
+    async def get_daily_frame(self, market: str, count: int = 21) -> CandleFrame:
+        return self.frames[market][-count:]
+
+    async def get_timeframe(self, market: str, timeframe: str = 'days', count: int = 21) -> CandleFrame:
+        return self.frames[market][-count:]
+
+    async def get_daily_frames_many(self, markets: List[str], count: int = 21) -> Dict[str, CandleFrame]:
+        return {market: self.frames[market][-count:] for market in dict.fromkeys(markets)}
+
+
+@asynccontextmanager
+async def stub_exchange(frames: Dict[str, CandleFrame], latency: float = 0.0, port: int = 0):
+    """
+    합성 캔들을 응답하는 로컬 모의 거래소를 띄우고 base_url을 돌려줍니다. (port=0이면 빈 포트)
+    실제 Upbit 대신 이 서버를 상대로 HTTP 클라이언트/캐시/파싱 경로 전체를 잽니다.
+    """
+    exchange = MockExchange({}, frames=frames.values(), access_key=BENCH_ACCESS_KEY,
+                            secret_key=BENCH_SECRET_KEY, latency=latency)
+    runner = web.AppRunner(create_mock_app(exchange), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', port)
+    await site.start()
+    try:
+        bound_port = runner.addresses[0][1]
+        yield f"http://127.0.0.1:{bound_port}/v1"
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    """api.py가 앱 서버와 별도 프로세스로 모의 거래소를 띄울 때 사용합니다."""
+    parser = argparse.ArgumentParser(description="합성 캔들을 응답하는 모의 거래소")
+    parser.add_argument('--port', type=int, default=8780)
+    parser.add_argument('--markets', type=int, default=100)
+    parser.add_argument('--bars', type=int, default=400)
+    parser.add_argument('--latency', type=float, default=0.0, help="요청마다 더할 지연 (초)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    frames = make_frames(market_codes(args.markets), args.bars, seed=args.seed)
+    exchange = MockExchange({}, frames=frames.values(), access_key=BENCH_ACCESS_KEY,
+                            secret_key=BENCH_SECRET_KEY, latency=args.latency)
+    web.run_app(create_mock_app(exchange), host='127.0.0.1', port=args.port, access_log=None, print=None)
+
+
+if __name__ == '__main__':
+    main()
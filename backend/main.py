@@ -1,17 +1,85 @@
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+import logging
+from fastapi import FastAPI, Request, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1 import trading, market
+from fastapi.responses import JSONResponse, Response
+from app.api.v1 import trading, market, signals
 from app.core.config import settings
-from app.services.trading.inverseVolatility import InverseVolatilityStrategy
-from app.services.trading.trendFollowing import TrendFollowingStrategy
-from app.services.trading.counterTrend import CounterTrendStrategy
-from app.services.upbit_service import UpbitService
+from app.core import metrics
+from app.core.logging import setup_logging, shutdown_logging
+from app.core.middleware import MetricsMiddleware
+from app.core.deps import create_shared_state, create_upbit_service, create_candle_store, create_market_feed, create_trading_service, create_signal_hub, create_strategy_pool, create_warmup, load_strategy_plugins, get_strategy_pool, get_warmup
+from app.services.trading.registry import REGISTRY, StrategyPool
+from app.services.pair_stats import PairStatsCache
+from app.services.portfolio import CovarianceCache
+from app.services.warmup import Warmup
 
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 로그는 큐에 넣고 별도 스레드가 출력하므로 이벤트 루프를 막지 않습니다.
+    setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
+    load_strategy_plugins()
+    # 다중 워커 모드에서는 캔들 캐시/레이트 리밋/거래 세션을 워커끼리 공유 저장소로 나눠 씁니다.
+    shared_state = create_shared_state()
+    # 앱 전역에서 하나의 커넥션 풀을 공유합니다.
+    candle_store = create_candle_store()
+    upbit_service = create_upbit_service(candle_store, shared_state)
+    await upbit_service.start()
+    app.state.upbit_service = upbit_service
+    metrics.bind_candle_cache(upbit_service.candle_cache)
+    # websocket 모드에서는 하나의 연결로 활성 마켓 전체의 시세를 구독합니다.
+    market_feed = create_market_feed()
+    if market_feed is not None:
+        await market_feed.start()
+    app.state.market_feed = market_feed
+    # 모든 마켓의 전략은 하나의 스케줄러가 백그라운드에서 실행합니다. (다중 워커 모드에서는 리더 워커만)
+    trading_service = create_trading_service(upbit_service, market_feed, shared_state)
+    await trading_service.start()
+    app.state.trading_service = trading_service
+    metrics.SCHEDULER_SESSIONS.set_function(lambda: len(trading_service.sessions))
+    metrics.SCHEDULER_LEADER.set_function(lambda: int(trading_service.is_leader))
+    # 대시보드 구독자는 (전략, 파라미터, 마켓)별로 한 번 계산한 신호를 SSE/WebSocket으로 받습니다.
+    signal_hub = create_signal_hub(upbit_service, trading_service, market_feed)
+    await signal_hub.start()
+    app.state.signal_hub = signal_hub
+    metrics.bind_signal_hub(signal_hub)
+    # 페어별 헤지 비율/스프레드 상태는 요청 간에 공유하여 새 봉만 반영합니다.
+    app.state.pair_cache = PairStatsCache()
+    # 바스켓별 공분산도 같은 방식으로 새 봉만 반영합니다.
+    app.state.covariance_cache = CovarianceCache()
+    # /trading/execute는 (전략, 파라미터)별 인스턴스를 재사용하여 지표 상태를 요청 간에 유지합니다.
+    strategy_pool = create_strategy_pool(upbit_service, app.state.pair_cache, app.state.covariance_cache)
+    app.state.strategy_pool = strategy_pool
+    metrics.bind_strategy_pool(strategy_pool)
+    if upbit_service.read_only:
+        logger.warning("Upbit API keys are not configured; running in read-only mode")
+    # 워밍업은 기다리지 않고 백그라운드로 돌립니다. 끝나면 /ready가 200을 반환합니다.
+    warmup = create_warmup(upbit_service)
+    warmup.start()
+    app.state.warmup = warmup
+    try:
+        yield
+    finally:
+        await warmup.close()
+        strategy_pool.clear()
+        await signal_hub.close()
+        await trading_service.close()
+        if market_feed is not None:
+            await market_feed.stop()
+        await upbit_service.close()
+        if candle_store is not None:
+            candle_store.close()
+        if shared_state is not None:
+            shared_state.close()
+        shutdown_logging()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -23,9 +91,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 라우트별 처리 시간 (/metrics)
+app.add_middleware(MetricsMiddleware)
+
 # 라우터 등록
 app.include_router(trading.router, prefix=f"{settings.API_V1_STR}/trading", tags=["trading"])
 app.include_router(market.router, prefix=f"{settings.API_V1_STR}/market", tags=["market"])
+app.include_router(signals.router, prefix=f"{settings.API_V1_STR}/signals", tags=["signals"])
 
 @app.get("/")
 async def root():
@@ -36,44 +108,45 @@ async def root():
 
 @app.get("/api/v1/trading/{strategy}")
 async def trading(strategy: str):
-    if strategy == "Inverse Volatility":
-        return {"message": "InverseVolatility"}
-    elif strategy == "Trend":
-        return {"message": "Trend"}
-    elif strategy == "CounterTrend":
-        return {"message": "CounterTrend"}
-    elif strategy == "Spread":
-        return {"message": "Spread"}
-    else:
+    spec = REGISTRY.get(strategy)
+    if spec is None:
         return {"message": "Invalid strategy"}
+    return {"message": spec.title, **spec.to_dict()}
 
 @app.post("/api/v1/trading/execute")
-async def trading_execute(request: Request):
+async def trading_execute(
+    request: Request,
+    strategy_pool: StrategyPool = Depends(get_strategy_pool)
+):
     body = await request.json()
-    strategy = body.get("strategy")
-    options = body.get("options", {})
-    
-    if strategy == "Inverse Volatility":
-        print(options)
-        upbit_service = UpbitService(settings.UPBIT_ACCESS_KEY, settings.UPBIT_SECRET_KEY)
-        strat = InverseVolatilityStrategy(upbit_service, options)
-        weights = await strat.calculate_portfolio_weights()
-        return {"weights": weights}
-    elif strategy == "Trend":
-        upbit_service = UpbitService(settings.UPBIT_ACCESS_KEY, settings.UPBIT_SECRET_KEY)
-        strat = TrendFollowingStrategy(upbit_service, options)
-        signals = await strat.calculate_signals()
-        return {"signals": signals}
-    elif strategy == "CounterTrend":
-        upbit_service = UpbitService(settings.UPBIT_ACCESS_KEY, settings.UPBIT_SECRET_KEY)
-        strat = CounterTrendStrategy(upbit_service, options)
-        signals = await strat.calculate_signals()
-        return {"signals": signals}
-    elif strategy == "Spread":
-        return {"message": "Spread 전략 처리 예정"}
-    else:
+    spec = REGISTRY.get(body.get("strategy"))
+    if spec is None:
         return {"error": "지원하지 않는 전략입니다."}
+    options = body.get("options", {})
+    logger.debug("strategy execution requested", extra={'strategy': spec.name, 'options': options})
+    try:
+        result = await strategy_pool.run(spec, options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if spec.kind == "portfolio":
+        return {"weights": result}
+    return {"signals": result}
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus 텍스트 형식의 메트릭을 반환합니다."""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"} 
+
+@app.get("/ready")
+async def readiness_check(warmup: Warmup = Depends(get_warmup)):
+    """워밍업이 끝나면 200, 그 전에는 503을 반환합니다. (/health는 프로세스 생존 여부만 봅니다)"""
+    body = {
+        "status": "ready" if warmup.ready else "warming_up",
+        "read_only": warmup.upbit_service.read_only,
+        "warmup": warmup.to_dict(),
+    }
+    return JSONResponse(body, status_code=200 if warmup.ready else 503)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# backend/를 import 경로에 넣어 `app`, `benchmarks` 패키지를 테스트에서 바로 import합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
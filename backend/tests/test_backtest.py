@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from app.services.backtest import align, run_bars, run_backtest, signals_to_positions
+from app.services.optimizer import Optimizer, grid, random_search, walk_forward_splits
+from benchmarks.synthetic import make_frames
+
+MARKETS = ['KRW-AAA', 'KRW-BBB']
+BARS = 500
+
+CASES = [
+    ('moving_average', {'trendType': 'sma', 'shortPeriod': 5, 'longPeriod': 20}),
+    ('moving_average', {'trendType': 'ema', 'shortPeriod': 5, 'longPeriod': 20, 'alpha': 0.3}),
+    ('moving_average', {'trendType': 'breakout', 'nDays': 10}),
+    ('counter_trend', {'nDays': 10, 'kValue': 1.0}),
+    ('spread', {'lookbackDays': 10, 'zScoreDays': 20}),
+]
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return list(make_frames(MARKETS, BARS, seed=3).values())
+
+
+def test_signals_become_positions_on_the_next_bar():
+    signals = np.array([[0, 1, 0, 0, -1, 0, 1]])
+    np.testing.assert_array_equal(signals_to_positions(signals), [[0, 0, 1, 1, 1, 0, 0]])
+
+
+@pytest.mark.parametrize(
+    'name,parameters', CASES, ids=lambda value: value if isinstance(value, str) else value.get('trendType', ''),
+)
+def test_vectorized_and_event_driven_equity_match(frames, name, parameters):
+    vectorized = run_backtest(name, frames, parameters, mode='vectorized')
+    event = run_backtest(name, frames, parameters, mode='event')
+    assert vectorized['stats']['trades'] == event['stats']['trades'] > 0
+    assert vectorized['timestamps'] == event['timestamps']
+    # 페어 전략은 헤지 비율을 누적합(벡터화)과 이동 합(증분)으로 따로 구하므로 그 차이만큼 허용합니다.
+    rtol = 1e-11 if name == 'spread' else 1e-14
+    np.testing.assert_allclose(vectorized['equity'], event['equity'], rtol=rtol, atol=0)
+
+
+def test_portfolio_strategies_are_vectorized_only(frames):
+    result = run_backtest('inverse_volatility', frames, {'volatility_window': 10})
+    assert len(result['equity']) == BARS
+    with pytest.raises(ValueError):
+        run_backtest('inverse_volatility', frames, {'volatility_window': 10}, mode='event')
+
+
+def test_search_space_helpers():
+    assert grid({'nDays': [10, 20], 'kValue': [1.0]}) == [{'nDays': 10, 'kValue': 1.0}, {'nDays': 20, 'kValue': 1.0}]
+    space = {'nDays': {'min': 5, 'max': 30}, 'kValue': {'min': 0.5, 'max': 2.0}, 'mode': ['a', 'b']}
+    candidates = random_search(space, 20, seed=1)
+    assert candidates == random_search(space, 20, seed=1)
+    assert all(isinstance(c['nDays'], int) and 5 <= c['nDays'] <= 30 for c in candidates)
+    assert all(0.5 <= c['kValue'] <= 2.0 and c['mode'] in ('a', 'b') for c in candidates)
+    assert walk_forward_splits(100, 40, 25) == [(0, 40, 65), (25, 65, 90), (50, 90, 100)]
+
+
+def test_optimizer_ranks_candidates_like_a_direct_backtest(frames, tmp_path):
+    candidates = grid({'nDays': [5, 10, 20], 'kValue': [0.5, 1.0]})
+    timestamps, bars = align(frames)
+    out_path = tmp_path / 'results.jsonl'
+    with Optimizer('counter_trend', frames, workers=2, batch_size=2, out_path=str(out_path)) as optimizer:
+        ranked = optimizer.search(candidates)
+        report = optimizer.walk_forward(candidates, train_bars=200, test_bars=100)
+
+    expected = {
+        str(params): run_bars('counter_trend', MARKETS, timestamps, bars, params)['stats']['sharpe']
+        for params in candidates
+    }
+    assert sorted(str(row['params']) for row in ranked) == sorted(expected)
+    assert [row['stats']['sharpe'] for row in ranked] == sorted(expected.values(), reverse=True)
+    assert all(row['stats']['sharpe'] == expected[str(row['params'])] for row in ranked)
+    # 전체 탐색 1번 + 분할마다 학습 구간 탐색과 검증 1건을 기록합니다.
+    assert len(out_path.read_text().splitlines()) == len(candidates) + len(report['splits']) * (len(candidates) + 1)
+
+    assert [split['test'] for split in report['splits']] == [[200, 300], [300, 400], [400, 500]]
+    # 검증 구간의 자산 곡선은 앞 구간의 마지막 값에 이어 붙이므로 구간마다 첫 봉이 겹칩니다.
+    assert len(report['equity']) == 1 + sum(end - start - 1 for start, end in (s['test'] for s in report['splits']))
+
+
+def test_optimizer_prunes_before_the_full_evaluation(frames):
+    candidates = grid({'nDays': [5, 10, 20, 30], 'kValue': [0.5, 1.0]})
+    with Optimizer('counter_trend', frames, workers=2, prune_ratio=0.5) as optimizer:
+        ranked = optimizer.search(candidates)
+    assert len(ranked) == len(candidates) // 2
@@ -0,0 +1,114 @@
+import asyncio
+import numpy as np
+import pytest
+from app.services.candle_cache import CandleCache
+from app.services.shared_state import SharedState
+from benchmarks.synthetic import make_frame
+
+
+class CountingLoader:
+    """호출 횟수를 세고, 잠깐 기다린 뒤 값을 돌려주는 upstream 대역입니다."""
+
+    def __init__(self, value, delay=0.01, error=None):
+        self.value = value
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    cache = CandleCache()
+    loader = CountingLoader(['candles'])
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load('key', loader, 60) for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert results == [['candles']] * 10
+    assert loader.calls == 1
+    assert (cache.misses, cache.coalesced, cache.hits) == (1, 9, 0)
+
+    asyncio.run(cache.get_or_load('key', loader, 60))
+    assert loader.calls == 1 and cache.hits == 1
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = CandleCache()
+    loader = CountingLoader(None, error=RuntimeError('upstream down'))
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load('key', loader, 60) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert loader.calls == 1
+    assert cache.stats()['inflight'] == 0
+
+    loader.error, loader.value = None, ['recovered']
+    assert asyncio.run(cache.get_or_load('key', loader, 60)) == ['recovered']
+    assert loader.calls == 2
+
+
+def test_expired_entries_are_reloaded():
+    cache = CandleCache(open_bar_ttl=5, closed_bar_ttl=3600)
+    assert cache.ttl_for(None) == 5
+    assert cache.ttl_for('2024-01-01 00:00:00') == 3600
+    cache.set('fresh', 1, 60)
+    cache.set('stale', 2, -1)
+    assert cache.get('fresh') == 1
+    assert cache.get('stale') is None
+    assert cache.stats()['size'] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = CandleCache(max_size=2)
+    cache.set('a', 1, 60)
+    cache.set('b', 2, 60)
+    cache.get('a')
+    cache.set('c', 3, 60)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.evictions == 1
+
+
+def test_shared_tier_serves_other_workers(tmp_path):
+    path = str(tmp_path / 'shared.db')
+    first, second = SharedState(path), SharedState(path)
+    frame = make_frame('KRW-BTC', 30, seed=1)
+    try:
+        worker_a = CandleCache(shared=first)
+        worker_b = CandleCache(shared=second)
+        loader = CountingLoader(frame)
+        asyncio.run(worker_a.get_or_load(('KRW-BTC', 'days', 30, None), loader, 60))
+        loaded = asyncio.run(worker_b.get_or_load(('KRW-BTC', 'days', 30, None), loader, 60))
+
+        assert loader.calls == 1
+        assert worker_b.shared_hits == 1
+        np.testing.assert_array_equal(loaded.timestamp, frame.timestamp)
+        np.testing.assert_array_equal(loaded.close, frame.close)
+
+        # share=False인 값(계좌 잔고 등)은 워커 안에만 둡니다.
+        accounts = CountingLoader([{'currency': 'KRW'}])
+        asyncio.run(worker_a.get_or_load('accounts', accounts, 60, share=False))
+        asyncio.run(worker_b.get_or_load('accounts', accounts, 60, share=False))
+        assert accounts.calls == 2
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.parametrize('value', [{'a': 1}, [1.5, 'x', None]])
+def test_json_values_round_trip_through_the_shared_tier(tmp_path, value):
+    shared = SharedState(str(tmp_path / 'shared.db'))
+    try:
+        asyncio.run(CandleCache(shared=shared).get_or_load('key', CountingLoader(value), 60))
+        assert asyncio.run(CandleCache(shared=shared).get_or_load('key', CountingLoader(None), 60)) == value
+    finally:
+        shared.close()
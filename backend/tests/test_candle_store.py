@@ -0,0 +1,138 @@
+import asyncio
+from datetime import datetime, timezone
+import numpy as np
+from app.services.candle_frame import CandleFrame
+from app.services.candle_store import CandleStore, UNIT_INTERVAL_MS
+from app.services.history_loader import PAGE_SIZE, HistoryLoader, format_cursor
+from app.services.upbit_service import UpbitService
+from benchmarks.synthetic import make_frame
+
+DAY = UNIT_INTERVAL_MS['days']
+HOUR = UNIT_INTERVAL_MS['minutes/60']
+
+
+class CandleSource:
+    """
+    Upbit 캔들 API처럼 to(제외) 이전의 최근 count개 봉을 돌려주는 _fetch_candles 대역입니다.
+    end를 줄이면 아직 생기지 않은 최근 봉을 감춥니다.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.end = len(frame)
+        self.calls = []
+
+    async def _fetch_candles(self, unit, market, count, to=None):
+        assert count <= PAGE_SIZE
+        self.calls.append((count, to))
+        frame = self.frame[:self.end]
+        if to is not None:
+            to_ms = int(datetime.strptime(to, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc).timestamp() * 1000)
+            frame = frame[:int(frame.timestamp.searchsorted(to_ms))]
+        return frame[max(len(frame) - count, 0):]
+
+
+def _with_gaps(frame, seed=0, ratio=0.1):
+    """거래가 없어 빠진 봉을 흉내 내어 봉 일부를 지웁니다."""
+    keep = np.random.default_rng(seed).random(len(frame)) >= ratio
+    keep[-1] = True
+    index = np.flatnonzero(keep)
+    return CandleFrame(
+        frame.market, frame.unit, frame.timestamp[index], frame.open[index], frame.high[index],
+        frame.low[index], frame.close[index], frame.volume[index], frame.value[index],
+    )
+
+
+def _assert_same(actual, expected):
+    np.testing.assert_array_equal(actual.timestamp, expected.timestamp)
+    np.testing.assert_array_equal(actual.close, expected.close)
+
+
+def test_store_upsert_range_and_bounds(tmp_path):
+    store = CandleStore(str(tmp_path / 'candles.db'))
+    frame = make_frame('KRW-BTC', 50, seed=1)
+    try:
+        assert store.bounds('KRW-BTC', 'days') is None
+        assert store.upsert('KRW-BTC', 'days', frame) == 50
+        # 같은 봉은 최신 값으로 덮어씁니다.
+        assert store.upsert('KRW-BTC', 'days', frame[-10:]) == 10
+        assert tuple(store.bounds('KRW-BTC', 'days')) == (frame.timestamp[0], frame.timestamp[-1], 50)
+
+        _assert_same(store.latest('KRW-BTC', 'days', 20), frame[-20:])
+        _assert_same(store.range('KRW-BTC', 'days', int(frame.timestamp[5]), int(frame.timestamp[14])), frame[5:15])
+        assert len(store.latest('KRW-BTC', 'minutes/1', 20)) == 0
+
+        assert not store.is_history_complete('KRW-BTC', 'days')
+        store.mark_synced('KRW-BTC', 'days', True)
+        store.mark_synced('KRW-BTC', 'days', False)
+        assert store.is_history_complete('KRW-BTC', 'days')
+    finally:
+        store.close()
+
+
+def test_sync_fetches_history_once_and_then_only_the_tail(tmp_path):
+    store = CandleStore(str(tmp_path / 'candles.db'))
+    service = UpbitService('access', 'secret', candle_store=store)
+    source = CandleSource(make_frame('KRW-BTC', 400, seed=2))
+    service._fetch_candles = source._fetch_candles
+
+    async def run():
+        try:
+            source.end = len(source.frame) - 3
+            await service.sync_candles('KRW-BTC', 'days', 300)
+            first_calls = list(source.calls)
+            _assert_same(store.latest('KRW-BTC', 'days', 1000), source.frame[source.end - 300:source.end])
+
+            # 봉 3개가 새로 마감되면 마지막 저장 봉(진행 중이었을 수 있음)부터 꼬리만 받습니다.
+            source.end = len(source.frame)
+            source.calls.clear()
+            frame = await service.get_frame('KRW-BTC', 'days', 100)
+            return first_calls, list(source.calls), frame
+        finally:
+            await service.close()
+
+    try:
+        first_calls, tail_calls, frame = asyncio.run(run())
+        assert sum(count for count, _ in first_calls) >= 300
+        assert [count for count, _ in tail_calls] == [4]
+        assert store.bounds('KRW-BTC', 'days')[2] == 303
+        _assert_same(frame, source.frame[-100:])
+    finally:
+        store.close()
+
+
+def test_history_pages_skip_gaps_without_duplicates():
+    source = CandleSource(_with_gaps(make_frame('KRW-BTC', 3000, 'minutes/60', seed=3), seed=3))
+    loader = HistoryLoader(source, concurrency=4)
+
+    async def run():
+        pages = [page async for page in loader.pages('KRW-BTC', 'minutes/60', 1000)]
+        frame = await loader.fetch('KRW-BTC', 'minutes/60', 1000)
+        return pages, frame
+
+    pages, frame = asyncio.run(run())
+    # 페이지는 최신 구간부터 내려오고, 각 페이지 안은 오래된 순입니다.
+    assert all(page.timestamp[-1] < newer.timestamp[0] for newer, page in zip(pages, pages[1:]))
+    assert np.all(np.diff(frame.timestamp) > 0)
+    _assert_same(frame, source.frame[-1000:])
+
+
+def test_history_fetch_between_start_and_end():
+    source = CandleSource(_with_gaps(make_frame('KRW-BTC', 2000, 'minutes/60', seed=4), seed=4))
+    loader = HistoryLoader(source)
+    timestamps = source.frame.timestamp
+    start_ts, end_ts = int(timestamps[300]) - HOUR // 2, int(timestamps[1500])
+    start = datetime.fromtimestamp(start_ts / 1000, tz=timezone.utc)
+    end = datetime.fromtimestamp(end_ts / 1000, tz=timezone.utc)
+
+    frame = asyncio.run(loader.fetch('KRW-BTC', 'minutes/60', start=start, end=end))
+    _assert_same(frame, source.frame[300:1500])
+    # 첫 페이지를 포함한 모든 요청이 end를 커서로 씁니다.
+    assert source.calls[0][1] == format_cursor(end_ts)
+
+
+def test_history_stops_at_the_listing_date():
+    source = CandleSource(make_frame('KRW-NEW', 250, seed=5))
+    frame = asyncio.run(HistoryLoader(source).fetch('KRW-NEW', 'days', 1000))
+    _assert_same(frame, source.frame)
+    assert np.all(np.diff(frame.timestamp) == DAY)
@@ -0,0 +1,94 @@
+import gzip
+import numpy as np
+import orjson
+import pytest
+from starlette.requests import Request
+from app.core import encoding
+from app.core.encoding import (
+    COLUMNAR,
+    PACKED,
+    RECORDS,
+    candle_response,
+    decode_packed,
+    encode_columnar,
+    encode_packed,
+    frame_etag,
+    negotiate_encoding,
+    negotiate_format,
+)
+from benchmarks.synthetic import make_frame
+
+
+@pytest.fixture
+def frame():
+    return make_frame('KRW-BTC', 100, seed=8)
+
+
+def _request(**headers):
+    return Request({
+        'type': 'http',
+        'headers': [(name.replace('_', '-').encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.mark.parametrize('accept,expected', [
+    (None, RECORDS),
+    ('*/*', RECORDS),
+    (COLUMNAR, COLUMNAR),
+    ('application/octet-stream', PACKED),
+    (f'{COLUMNAR};q=0.5, {PACKED}', PACKED),
+    (f'{PACKED};q=0, {COLUMNAR}', COLUMNAR),
+    ('text/html', RECORDS),
+])
+def test_negotiate_format(accept, expected):
+    assert negotiate_format(accept) == expected
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding('identity') is None
+    assert negotiate_encoding('gzip;q=0.5, br') == ('br' if encoding.brotli is not None else 'gzip')
+    assert negotiate_encoding('br;q=0, gzip;q=0') is None
+
+
+def test_packed_round_trip(frame):
+    header, columns = decode_packed(encode_packed(frame, extra={'volatility': 0.5}))
+    assert (header['market'], header['unit'], header['rows'], header['volatility']) == ('KRW-BTC', 'days', 100, 0.5)
+    assert columns['timestamp'].dtype == np.dtype('<i8')
+    np.testing.assert_array_equal(columns['timestamp'], frame.timestamp)
+    for name in ('open', 'high', 'low', 'close', 'volume', 'value'):
+        np.testing.assert_array_equal(columns[name], getattr(frame, name))
+    with pytest.raises(ValueError):
+        decode_packed(b'JUNK' + bytes(16))
+
+
+def test_columnar_is_oldest_first(frame):
+    payload = orjson.loads(encode_columnar(frame, ('timestamp', 'close')))
+    assert set(payload) == {'market', 'unit', 'timestamp', 'close'}
+    assert payload['timestamp'] == frame.timestamp.tolist()
+    assert payload['close'] == frame.close.tolist()
+
+
+def test_etag_depends_on_content_and_format(frame):
+    columns = encoding.CANDLE_COLUMNS
+    etag = frame_etag(frame, PACKED, columns)
+    assert etag.startswith('W/"')
+    assert frame_etag(make_frame('KRW-BTC', 100, seed=8, now_ms=int(frame.timestamp[-1])), PACKED, columns) == etag
+    assert frame_etag(frame, COLUMNAR, columns) != etag
+    assert frame_etag(frame[:-1], PACKED, columns) != etag
+    assert frame_etag(frame, PACKED, columns, {'volatility': 0.1}) != etag
+
+
+def test_candle_response_compresses_and_answers_not_modified(frame):
+    response = candle_response(_request(accept=PACKED, accept_encoding='gzip'), frame)
+    assert response.status_code == 200
+    assert response.headers['content-encoding'] == 'gzip'
+    header, columns = decode_packed(gzip.decompress(response.body))
+    np.testing.assert_array_equal(columns['close'], frame.close)
+
+    cached = candle_response(_request(accept=PACKED, if_none_match=response.headers['etag']), frame)
+    assert cached.status_code == 304 and cached.body == b''
+
+    records = candle_response(_request(), frame)
+    assert records.media_type == RECORDS
+    assert orjson.loads(records.body) == frame.to_records()
@@ -0,0 +1,74 @@
+import asyncio
+from app.services.execution import OrderExecutor, order_identifier
+
+
+class AccountsUpbitService:
+    """고정된 /accounts 응답을 돌려주고 주문을 기록하는 UpbitService 대역입니다."""
+
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.orders = []
+        self.account_requests = 0
+
+    async def get_accounts(self):
+        self.account_requests += 1
+        return self.accounts
+
+    def invalidate_accounts(self):
+        pass
+
+    async def create_order(self, market, side, volume=None, price=None, ord_type='limit', identifier=None):
+        order = {'uuid': identifier, 'market': market, 'side': side, 'volume': volume, 'price': price}
+        self.orders.append(order)
+        return order
+
+
+def test_batched_sells_share_one_balance_lookup():
+    service = AccountsUpbitService([
+        {'currency': 'KRW', 'balance': '1000000', 'unit_currency': 'KRW'},
+        {'currency': 'BTC', 'balance': '0.5', 'unit_currency': 'KRW'},
+        {'currency': 'ETH', 'balance': '3'},
+    ])
+    executor = OrderExecutor(service)
+
+    async def run():
+        await executor.start()
+        try:
+            return await asyncio.gather(
+                executor.submit('KRW-BTC', 'sell', 'sell-krw-btc'),
+                executor.submit('BTC-ETH', 'sell', 'sell-btc-eth'),
+                executor.submit('KRW-XRP', 'sell', 'sell-krw-xrp'),
+            )
+        finally:
+            await executor.close()
+
+    krw_btc, btc_eth, krw_xrp = asyncio.run(run())
+    assert krw_btc['volume'] == 0.5
+    assert btc_eth['volume'] == 3.0
+    # 잔고가 없으면 주문하지 않습니다.
+    assert krw_xrp is None
+    assert service.account_requests == 1
+
+
+def test_the_same_identifier_is_ordered_once():
+    service = AccountsUpbitService([{'currency': 'KRW', 'balance': '1000000', 'unit_currency': 'KRW'}])
+    executor = OrderExecutor(service)
+    identifier = order_identifier('KRW-BTC', 'counter_trend', 'buy', 1_700_000_000_000)
+    assert identifier == order_identifier('KRW-BTC', 'counter_trend', 'buy', 1_700_000_000_000)
+    assert identifier != order_identifier('KRW-BTC', 'counter_trend', 'buy', 1_700_086_400_000)
+
+    async def run():
+        await executor.start()
+        try:
+            # 처리 중인 주문과 같은 identifier는 그 결과를 함께 기다립니다.
+            concurrent = await asyncio.gather(*(executor.submit('KRW-BTC', 'buy', identifier) for _ in range(3)))
+            # 완료된 주문과 같은 identifier는 다시 내지 않고 기억한 결과를 돌려줍니다.
+            repeated = await executor.submit('KRW-BTC', 'buy', identifier)
+            return concurrent, repeated
+        finally:
+            await executor.close()
+
+    concurrent, repeated = asyncio.run(run())
+    assert len(service.orders) == 1
+    assert all(order is service.orders[0] for order in concurrent) and repeated is service.orders[0]
+    assert (executor.submitted, executor.duplicates) == (1, 3)
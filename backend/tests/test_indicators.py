@@ -0,0 +1,127 @@
+import json
+import numpy as np
+import pytest
+from app.services import indicators
+from app.services.pair_stats import rolling_ols
+from app.services.streaming_indicators import (
+    AverageTrueRange,
+    RollingExtremum,
+    RollingOLS,
+    RollingVariance,
+    RunningEMA,
+    RunningSMA,
+    restore_indicator,
+)
+from benchmarks.synthetic import make_frames
+
+WINDOW = 7
+
+
+@pytest.fixture
+def closes():
+    """길이가 다른 두 마켓을 최근 봉 기준으로 쌓은 종가 (짧은 마켓의 앞부분은 NaN)"""
+    frames = make_frames(['KRW-AAA', 'KRW-BBB'], 60, seed=11)
+    frames['KRW-BBB'] = frames['KRW-BBB'][-40:]
+    return indicators.stack(list(frames.values()))
+
+
+def _naive(x, window, func):
+    result = np.full(x.shape, np.nan)
+    for row in range(x.shape[0]):
+        for t in range(window - 1, x.shape[1]):
+            result[row, t] = func(x[row, t - window + 1:t + 1])
+    return result
+
+
+@pytest.mark.parametrize('vectorized,naive', [
+    (indicators.rolling_mean, np.mean),
+    (indicators.rolling_std, np.std),
+    (indicators.rolling_max, np.max),
+    (indicators.rolling_min, np.min),
+])
+def test_rolling_windows_match_a_naive_loop(closes, vectorized, naive):
+    assert np.isnan(closes[1, :20]).all()
+    np.testing.assert_allclose(vectorized(closes, WINDOW), _naive(closes, WINDOW, naive), rtol=1e-10, equal_nan=True)
+    # 1차원 입력은 한 마켓으로 취급합니다.
+    np.testing.assert_array_equal(vectorized(closes[0], WINDOW), vectorized(closes, WINDOW)[0])
+
+
+def test_ema_matches_running_ema_exactly(closes):
+    result = indicators.ema(closes, 0.2, seed_window=WINDOW)
+    for row in range(closes.shape[0]):
+        running = RunningEMA(0.2, WINDOW)
+        expected = [running.update(v) if not np.isnan(v) else None for v in closes[row]]
+        expected = [np.nan if v is None else v for v in expected]
+        np.testing.assert_array_equal(result[row], expected)
+
+
+def test_counter_trend_levels_and_donchian_use_only_past_bars(closes):
+    high, low = closes * 1.01, closes * 0.99
+    levels = indicators.counter_trend_levels(high, low, 5, 0.5)
+    t = 30
+    avg_range = np.mean(high[0, t - 6:t - 1] - low[0, t - 6:t - 1])
+    assert levels['avg_range'][0, t] == pytest.approx(avg_range)
+    assert levels['long'][0, t] == pytest.approx(high[0, t - 1] - 0.5 * avg_range)
+    channel = indicators.donchian(high, low, 5)
+    assert channel['upper'][0, t] == np.max(high[0, t - 5:t])
+    assert channel['lower'][0, t] == np.min(low[0, t - 5:t])
+
+
+def _bars(seed=12, n=80):
+    frame = make_frames(['KRW-AAA'], n, seed=seed)['KRW-AAA']
+    return [{'high': h, 'low': l, 'close': c} for h, l, c in zip(frame.high, frame.low, frame.close)]
+
+
+STREAMING = {
+    'sma': (lambda: RunningSMA(WINDOW), lambda bar: bar['close']),
+    'ema': (lambda: RunningEMA(0.3, WINDOW), lambda bar: bar['close']),
+    'variance': (lambda: RollingVariance(WINDOW), lambda bar: bar['close']),
+    'max': (lambda: RollingExtremum(WINDOW, 'max'), lambda bar: bar['high']),
+    'min': (lambda: RollingExtremum(WINDOW, 'min'), lambda bar: bar['low']),
+    'atr': (lambda: AverageTrueRange(WINDOW), lambda bar: bar),
+    'ols': (lambda: RollingOLS(WINDOW), lambda bar: (bar['close'], bar['high'])),
+}
+
+
+@pytest.mark.parametrize('name', STREAMING)
+def test_restored_indicator_continues_identically(name):
+    create, value_of = STREAMING[name]
+    bars = _bars()
+    uninterrupted = create()
+    expected = [uninterrupted.update(value_of(bar)) for bar in bars]
+
+    indicator = create()
+    for bar in bars[:50]:
+        indicator.update(value_of(bar))
+    # 재시작을 흉내 내어 JSON으로 저장했다가 복원합니다.
+    restored = restore_indicator(json.loads(json.dumps(indicator.snapshot())))
+    assert type(restored) is type(indicator)
+    continued = [restored.update(value_of(bar)) for bar in bars[50:]]
+    # 합을 관리하는 지표는 버퍼를 다시 더해 복원하므로 누적 반올림 오차만큼 다를 수 있습니다.
+    np.testing.assert_allclose(continued, expected[50:], rtol=1e-9)
+
+
+def test_streaming_indicators_match_vectorized_ones():
+    bars = _bars()
+    close = np.array([bar['close'] for bar in bars])
+    high = np.array([bar['high'] for bar in bars])
+    low = np.array([bar['low'] for bar in bars])
+
+    def stream(indicator, values, attribute='value'):
+        result = []
+        for value in values:
+            indicator.update(value)
+            result.append(getattr(indicator, attribute))
+        return np.array([np.nan if v is None else v for v in result])
+
+    np.testing.assert_allclose(stream(RunningSMA(WINDOW), close), indicators.rolling_mean(close, WINDOW), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(stream(RollingVariance(WINDOW), close), indicators.rolling_std(close, WINDOW), rtol=1e-9, equal_nan=True)
+    np.testing.assert_array_equal(stream(RollingExtremum(WINDOW, 'max'), high), indicators.rolling_max(high, WINDOW))
+    np.testing.assert_allclose(
+        stream(AverageTrueRange(WINDOW), bars), indicators.average_true_range(high, low, close, WINDOW),
+        rtol=1e-12, equal_nan=True,
+    )
+    ols = rolling_ols(close, high, WINDOW)
+    pairs = list(zip(close, high))
+    np.testing.assert_allclose(stream(RollingOLS(WINDOW), pairs, 'beta'), ols['beta'], rtol=1e-8, equal_nan=True)
+    np.testing.assert_allclose(stream(RollingOLS(WINDOW), pairs, 'alpha'), ols['alpha'], rtol=1e-8, equal_nan=True)
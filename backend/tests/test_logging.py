@@ -0,0 +1,62 @@
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import pytest
+from app.core import logging as app_logging
+
+
+@pytest.fixture
+def root_logger():
+    """setup_logging()이 바꾸는 루트 로거 설정을 테스트가 끝나면 되돌립니다."""
+    root = logging.getLogger()
+    level = root.level
+    yield root
+    app_logging.shutdown_logging()
+    root.setLevel(level)
+
+
+def _queue_handlers(root):
+    return [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]
+
+
+def test_records_are_written_as_json_by_the_listener_thread(root_logger, capsys):
+    app_logging.setup_logging('INFO', 'json')
+    # 여러 번 호출해도 핸들러는 하나만 설치됩니다.
+    app_logging.setup_logging('DEBUG', 'json')
+    assert len(_queue_handlers(root_logger)) == 1
+    assert root_logger.level == logging.INFO
+
+    logger = logging.getLogger('tests.logging')
+    logger.debug("hidden")
+    try:
+        raise ValueError("bad price")
+    except ValueError as e:
+        logger.warning("order %s failed", 'buy', exc_info=e, extra={'market': 'KRW-BTC', 'attempt': 2})
+    app_logging.shutdown_logging()
+    assert not _queue_handlers(root_logger)
+
+    [line] = capsys.readouterr().err.splitlines()
+    entry = json.loads(line)
+    assert (entry['level'], entry['logger'], entry['message']) == ('WARNING', 'tests.logging', 'order buy failed')
+    assert (entry['market'], entry['attempt']) == ('KRW-BTC', 2)
+    assert entry['exc_info'].startswith('Traceback') and 'ValueError: bad price' in entry['exc_info']
+    assert entry['ts'].endswith('+00:00')
+
+
+def test_queue_handler_keeps_the_exception_out_of_the_message():
+    records = queue.SimpleQueue()
+    handler = app_logging._QueueHandler(records)
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = logging.getLogger('tests.logging').makeRecord(
+            'tests.logging', logging.ERROR, __file__, 0, "tick %d failed", (3,), sys.exc_info(),
+        )
+    handler.emit(record)
+    queued = records.get_nowait()
+    assert (queued.msg, queued.args, queued.exc_info) == ("tick 3 failed", None, None)
+    assert 'RuntimeError: boom' in queued.exc_text
+    entry = json.loads(app_logging.JsonFormatter().format(queued))
+    assert entry['message'] == "tick 3 failed" and 'RuntimeError: boom' in entry['exc_info']
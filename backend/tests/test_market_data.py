@@ -0,0 +1,154 @@
+import asyncio
+from aiohttp.test_utils import TestServer
+from app.services.market_data import BarAggregator, MarketDataBus, UpbitWebSocketClient
+from app.services.ws_replay import create_replay_app
+
+MINUTE = 60_000
+T0 = 1_700_000_040_000  # 분 경계 (T0 % MINUTE == 0)
+
+
+def _trade(code, price, timestamp, volume=1.0):
+    return {
+        'type': 'trade',
+        'code': code,
+        'trade_price': price,
+        'trade_volume': volume,
+        'trade_timestamp': timestamp,
+    }
+
+
+async def _wait_until(predicate, timeout=5.0):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+async def _run_with_replay(messages, markets, body):
+    """재생 서버를 띄우고 그 서버를 구독하는 수집기로 body(bus, client)를 실행합니다."""
+    server = TestServer(create_replay_app(messages))
+    await server.start_server()
+    bus = MarketDataBus()
+    # 테스트의 체결 시각은 과거이므로, 벽시계 기준 flush가 봉을 먼저 마감하지 않게 합니다.
+    client = UpbitWebSocketClient(
+        bus,
+        url=str(server.make_url('/websocket/v1')),
+        types=('trade',),
+        bar_units={'minutes/1': MINUTE},
+        flush_interval=3600,
+    )
+    await client.set_markets(markets)
+    try:
+        await body(bus, client)
+    finally:
+        await client.stop()
+        await server.close()
+
+
+def test_trades_are_aggregated_into_bars_at_boundaries():
+    messages = [
+        _trade('KRW-BTC', 100, T0),
+        _trade('KRW-BTC', 105, T0 + 20_000, 2.0),
+        _trade('KRW-BTC', 95, T0 + 40_000),
+        _trade('KRW-BTC', 101, T0 + MINUTE - 1),
+        # 경계 시각의 체결은 다음 봉의 첫 체결입니다.
+        _trade('KRW-BTC', 110, T0 + MINUTE),
+        _trade('KRW-BTC', 112, T0 + 2 * MINUTE - 1),
+        _trade('KRW-BTC', 90, T0 + 2 * MINUTE),
+    ]
+
+    async def body(bus, client):
+        bars = bus.subscribe(types=['bar'], policy='block')
+        await client.start()
+        first = await asyncio.wait_for(bars.get(), 5)
+        second = await asyncio.wait_for(bars.get(), 5)
+
+        assert first['code'] == 'KRW-BTC' and first['unit'] == 'minutes/1' and first['closed']
+        assert first['bar'] == {
+            'timestamp': T0,
+            'open': 100,
+            'high': 105,
+            'low': 95,
+            'close': 101,
+            'volume': 5.0,
+            'value': 100 + 105 * 2 + 95 + 101,
+        }
+        assert second['bar']['timestamp'] == T0 + MINUTE
+        assert (second['bar']['open'], second['bar']['close']) == (110, 112)
+        # 마지막 체결의 봉은 다음 구간의 체결이 올 때까지 진행 중입니다.
+        assert bars.queue.empty()
+        assert client.aggregator.current('KRW-BTC', 'minutes/1')['timestamp'] == T0 + 2 * MINUTE
+
+    asyncio.run(_run_with_replay(messages, ['KRW-BTC'], body))
+
+
+def test_late_trades_for_a_closed_bar_are_dropped():
+    aggregator = BarAggregator({'minutes/1': MINUTE})
+    assert aggregator.add_trade('KRW-BTC', 100, 1.0, T0) == []
+    # 체결이 없어 flush로 마감된 구간의 늦은 체결은 새 봉을 열지 않습니다.
+    [flushed] = aggregator.flush(T0 + MINUTE)
+    assert flushed['bar']['timestamp'] == T0
+    assert aggregator.add_trade('KRW-BTC', 90, 1.0, T0 + MINUTE - 1) == []
+    assert aggregator.current('KRW-BTC', 'minutes/1') is None
+    assert aggregator.flush(T0 + 2 * MINUTE) == []
+
+    # 다음 구간의 체결로 마감된 경우도 같습니다.
+    aggregator.add_trade('KRW-BTC', 110, 1.0, T0 + MINUTE)
+    [closed] = aggregator.add_trade('KRW-BTC', 120, 1.0, T0 + 2 * MINUTE)
+    assert closed['bar']['timestamp'] == T0 + MINUTE
+    assert aggregator.add_trade('KRW-BTC', 115, 1.0, T0 + 2 * MINUTE - 1) == []
+    assert aggregator.current('KRW-BTC', 'minutes/1')['close'] == 120
+
+
+def test_reconnect_resubscribes_current_markets():
+    messages = [_trade('KRW-BTC', 100 + i, T0 + i) for i in range(3)]
+    messages += [_trade('KRW-ETH', 10 + i, T0 + i) for i in range(2)]
+
+    async def body(bus, client):
+        trades = bus.subscribe(types=['trade'])
+        await client.start()
+        received = [await asyncio.wait_for(trades.get(), 5) for _ in range(3)]
+        assert [e['code'] for e in received] == ['KRW-BTC'] * 3
+
+        # 연결 중에 바꾼 마켓 목록은 재연결 때 보내는 구독 메시지에 반영됩니다.
+        await client.set_markets(['KRW-ETH'])
+        await client._ws.close()
+        await _wait_until(lambda: client.reconnects == 1 and client.connected.is_set())
+
+        received = [await asyncio.wait_for(trades.get(), 5) for _ in range(2)]
+        assert [e['trade_price'] for e in received] == [10, 11]
+        assert [e['code'] for e in received] == ['KRW-ETH'] * 2
+        assert client.last_price('KRW-ETH') == 11
+        assert trades.queue.empty()
+
+    asyncio.run(_run_with_replay(messages, ['KRW-BTC'], body))
+
+
+def test_slow_subscribers_block_or_drop_by_policy():
+    messages = [_trade('KRW-BTC', price, T0 + price) for price in range(1, 6)]
+
+    async def body(bus, client):
+        latest = bus.subscribe(types=['trade'], maxsize=2)
+        blocking = bus.subscribe(types=['trade'], maxsize=1, policy='block')
+        await client.start()
+
+        # block 구독자의 큐가 차면 수집기가 발행에서 기다리므로 세 번째 이벤트가 발행되지 않습니다.
+        await _wait_until(lambda: bus.published == 2)
+        await asyncio.sleep(0.1)
+        assert bus.published == 2
+        assert latest.queue.qsize() == 2 and latest.dropped == 0
+
+        prices = [(await asyncio.wait_for(blocking.get(), 5))['trade_price'] for _ in range(5)]
+        assert prices == [1, 2, 3, 4, 5]
+        await _wait_until(lambda: bus.published == 5)
+
+        # drop_oldest 구독자는 가장 최근 이벤트만 남기고 나머지를 버립니다.
+        assert [latest.queue.get_nowait()['trade_price'] for _ in range(2)] == [4, 5]
+        assert latest.dropped == 3
+        assert bus.stats()['dropped'] == 3
+
+        latest.close()
+        assert bus.stats()['subscribers'] == 1
+
+    asyncio.run(_run_with_replay(messages, ['KRW-BTC'], body))
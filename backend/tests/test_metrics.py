@@ -0,0 +1,71 @@
+import re
+from fastapi.testclient import TestClient
+from app.core import metrics
+from main import app
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(?:[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*",?)*\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def _parse(text):
+    """
+    Prometheus 텍스트 형식을 검사하며 읽습니다.
+    모든 샘플은 앞선 HELP/TYPE이 선언한 메트릭에 속해야 합니다.
+    Returns:
+        Dict[str, str], List[tuple]: 메트릭 이름 → 종류, (샘플 이름, 라벨 dict, 값) 목록
+    """
+    assert text.endswith('\n')
+    kinds, samples = {}, []
+    current = None
+    for line in text.splitlines():
+        if line.startswith('# HELP '):
+            current = line.split(' ')[2]
+            continue
+        if line.startswith('# TYPE '):
+            _, _, name, kind = line.split(' ')
+            assert name == current and kind in ('counter', 'gauge', 'histogram', 'untyped')
+            kinds[name] = kind
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        name, labels, value = match.group(1), match.group(2) or '', match.group(3)
+        suffixes = ('_bucket', '_sum', '_count') if kinds[current] == 'histogram' else ('',)
+        assert any(name == current + suffix for suffix in suffixes), line
+        float(value)
+        samples.append((name, dict(LABEL.findall(labels)), value))
+    return kinds, samples
+
+
+def _route_samples(samples, route):
+    return [(name, labels, value) for name, labels, value in samples if labels.get('route') == route]
+
+
+def test_metrics_endpoint_renders_route_templates():
+    client = TestClient(app)
+    for strategy in ('moving_average', 'counter_trend'):
+        assert client.get(f'/api/v1/trading/{strategy}').status_code == 200
+    assert client.get('/no/such/path').status_code == 404
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['content-type'] == metrics.CONTENT_TYPE
+    kinds, samples = _parse(response.text)
+    assert kinds['http_request_duration_seconds'] == 'histogram'
+
+    # 경로 파라미터가 다른 두 요청이 하나의 라우트 템플릿 라벨로 모입니다.
+    route = _route_samples(samples, '/api/v1/trading/{strategy}')
+    assert not _route_samples(samples, '/api/v1/trading/moving_average')
+    count = next(value for name, labels, value in route if name.endswith('_count') and labels['status'] == '200')
+    assert int(count) >= 2
+    buckets = [int(value) for name, labels, value in route if name.endswith('_bucket') and labels['status'] == '200']
+    assert buckets == sorted(buckets) and buckets[-1] == int(count)
+    assert [labels['le'] for name, labels, _ in route if name.endswith('_bucket')][-1] == '+Inf'
+    assert _route_samples(samples, 'unmatched')
+
+
+def test_label_values_are_escaped():
+    registry = metrics.Registry()
+    counter = metrics.Counter('test_escaped_total', "이스케이프 확인용", ('path',), registry=registry)
+    counter.labels('a"b\\c\nd').inc()
+    _, samples = _parse(registry.render())
+    assert samples == [('test_escaped_total', {'path': 'a\\"b\\\\c\\nd'}, '1')]
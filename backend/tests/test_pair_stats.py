@@ -0,0 +1,85 @@
+import json
+import numpy as np
+import pytest
+from app.services.pair_stats import EG_CRITICAL_VALUES, PairState, rolling_ols, screen_pairs, spread_zscore
+
+MARKETS = [f'KRW-C{i:02d}' for i in range(6)]
+BARS = 500
+
+
+@pytest.fixture(scope='module')
+def log_prices():
+    """C01은 C00과 공적분(정상 AR(1) 잔차)이고, 나머지는 서로 독립인 랜덤 워크입니다."""
+    rng = np.random.default_rng(21)
+    prices = np.cumsum(rng.normal(0, 0.02, (len(MARKETS), BARS)), axis=1) + 7.0
+    residual = np.zeros(BARS)
+    for t in range(1, BARS):
+        residual[t] = 0.5 * residual[t - 1] + rng.normal(0, 0.01)
+    prices[1] = 0.3 + 1.2 * prices[0] + residual
+    return prices
+
+
+def _engle_granger(y, x):
+    """페어 하나의 잔차를 직접 만들어 구한 (헤지 비율, ADF t-통계량)입니다."""
+    beta, alpha = np.polyfit(x, y, 1)
+    e = y - alpha - beta * x
+    lagged, diff = e[:-1], np.diff(e)
+    rho = (lagged @ diff) / (lagged @ lagged)
+    ssr = np.sum((diff - rho * lagged) ** 2)
+    return beta, rho / np.sqrt(ssr / (len(y) - 2) / (lagged @ lagged))
+
+
+def test_screen_matches_a_per_pair_regression(log_prices):
+    significance = 0.10
+    pairs = screen_pairs(log_prices, MARKETS, significance, min_correlation=-1.0)
+
+    expected = {}
+    for i in range(len(MARKETS)):
+        for j in range(i + 1, len(MARKETS)):
+            forward = _engle_granger(log_prices[i], log_prices[j])
+            backward = _engle_granger(log_prices[j], log_prices[i])
+            y, x, (beta, stat) = (i, j, forward) if not backward[1] < forward[1] else (j, i, backward)
+            if stat < EG_CRITICAL_VALUES[significance]:
+                expected[(MARKETS[y], MARKETS[x])] = (beta, stat)
+
+    assert ('KRW-C00', 'KRW-C01') in expected or ('KRW-C01', 'KRW-C00') in expected
+    assert {(p['y'], p['x']) for p in pairs} == set(expected)
+    for pair in pairs:
+        beta, stat = expected[(pair['y'], pair['x'])]
+        assert pair['hedge_ratio'] == pytest.approx(beta, rel=1e-9)
+        assert pair['adf_stat'] == pytest.approx(stat, rel=1e-9)
+    assert [p['adf_stat'] for p in pairs] == sorted(p['adf_stat'] for p in pairs)
+
+
+def test_screen_skips_markets_with_missing_bars(log_prices):
+    prices = log_prices.copy()
+    prices[0, :10] = np.nan
+    pairs = screen_pairs(prices, MARKETS, 0.10, min_correlation=-1.0)
+    assert all('KRW-C00' not in (p['y'], p['x']) for p in pairs)
+
+
+def test_rolling_ols_matches_a_fit_per_window(log_prices):
+    y, x, window = log_prices[1], log_prices[0], 30
+    ols = rolling_ols(y, x, window)
+    assert np.isnan(ols['beta'][:window - 1]).all()
+    for t in (window - 1, 200, BARS - 1):
+        beta, alpha = np.polyfit(x[t - window + 1:t + 1], y[t - window + 1:t + 1], 1)
+        assert ols['beta'][t] == pytest.approx(beta, rel=1e-8)
+        assert ols['alpha'][t] == pytest.approx(alpha, rel=1e-8)
+
+
+def test_pair_state_follows_the_vectorized_zscore(log_prices):
+    y, x = np.exp(log_prices[1]), np.exp(log_prices[0])
+    ols_window, z_window = 30, 20
+    expected = spread_zscore(np.log(y), np.log(x), ols_window, z_window)['zscore']
+
+    state = PairState(ols_window, z_window)
+    zscores = []
+    for t in range(BARS):
+        if t == 300:
+            # 저장 후 복원해도 같은 값으로 이어집니다.
+            state = PairState.restore(json.loads(json.dumps(state.snapshot())))
+        state.update(t, y[t], x[t])
+        zscores.append(state.zscore())
+    zscores = np.array([np.nan if z is None else z for z in zscores])
+    np.testing.assert_allclose(zscores, expected, rtol=1e-6, equal_nan=True)
@@ -0,0 +1,68 @@
+import json
+import numpy as np
+import pytest
+from app.services.portfolio import (
+    EWMACovariance,
+    equal_risk_contribution_weights,
+    ewma_covariance,
+    inverse_volatility_weights,
+)
+
+
+@pytest.fixture
+def cov():
+    rng = np.random.default_rng(5)
+    returns = rng.normal(0, 1, (5, 300)) * np.array([[0.01], [0.02], [0.03], [0.05], [0.08]])
+    returns[1] += 0.8 * returns[0]
+    return np.cov(returns)
+
+
+def _risk_contributions(weights, cov):
+    return weights * (cov @ weights)
+
+
+def test_erc_weights_have_equal_risk_contributions(cov):
+    weights = equal_risk_contribution_weights(cov)
+    assert weights.sum() == pytest.approx(1.0)
+    assert (weights > 0).all()
+    contributions = _risk_contributions(weights, cov)
+    np.testing.assert_allclose(contributions, contributions.mean(), rtol=1e-8)
+    # 상관이 없으면 ERC는 변동성 역수 비중과 같습니다.
+    diagonal = np.diag(np.diag(cov))
+    np.testing.assert_allclose(equal_risk_contribution_weights(diagonal), inverse_volatility_weights(diagonal), rtol=1e-8)
+
+
+def test_erc_follows_the_risk_budget(cov):
+    budget = np.array([1.0, 1.0, 2.0, 2.0, 4.0])
+    contributions = _risk_contributions(equal_risk_contribution_weights(cov, budget=budget), cov)
+    np.testing.assert_allclose(contributions / contributions.sum(), budget / budget.sum(), rtol=1e-8)
+
+
+def test_erc_warm_start_reaches_the_same_weights(cov):
+    cold = equal_risk_contribution_weights(cov)
+    warm = equal_risk_contribution_weights(cov * 1.01, initial=cold)
+    np.testing.assert_allclose(warm, cold, rtol=1e-8)
+
+
+def test_erc_excludes_markets_without_variance(cov):
+    padded = np.zeros((6, 6))
+    padded[:5, :5] = cov
+    weights = equal_risk_contribution_weights(padded)
+    assert weights[5] == 0
+    np.testing.assert_allclose(weights[:5], equal_risk_contribution_weights(cov), rtol=1e-10)
+
+
+def test_incremental_covariance_matches_the_batch_one():
+    rng = np.random.default_rng(6)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (3, 120)), axis=1))
+    closes[2, :30] = np.nan  # 늦게 상장한 마켓
+    with np.errstate(invalid='ignore'):
+        returns = closes[:, 1:] / closes[:, :-1] - 1
+
+    state = EWMACovariance(3, halflife=20)
+    for t in range(closes.shape[1]):
+        if t == 60:
+            state = EWMACovariance.restore(json.loads(json.dumps(state.snapshot())))
+        state.update_prices(t, closes[:, t])
+        state.update_prices(t, closes[:, t])  # 이미 반영한 봉은 무시합니다.
+    np.testing.assert_allclose(state.covariance(), ewma_covariance(returns, 20), rtol=1e-10)
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from app.services.rate_limiter import RateLimiter, TokenBucket, parse_remaining_req
+from app.services.shared_state import SharedState
+
+
+def test_parse_remaining_req():
+    assert parse_remaining_req("group=candles; min=1799; sec=29") == {'group': 'candles', 'min': '1799', 'sec': '29'}
+    assert parse_remaining_req(None) == {}
+    assert parse_remaining_req("") == {}
+
+
+def test_token_bucket_waits_for_the_next_token():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    async def run():
+        await bucket.acquire()
+        await bucket.acquire()
+
+    asyncio.run(run())
+    # 토큰 2개를 다 썼으므로 다음 토큰은 1 / rate 초 뒤에 채워집니다.
+    assert bucket.wait_time() == pytest.approx(0.1, abs=0.02)
+
+
+def test_token_bucket_serializes_waiters():
+    bucket = TokenBucket(rate=50, capacity=1)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+        return loop.time() - started
+
+    # 첫 토큰은 바로, 나머지 3개는 20ms 간격으로 나옵니다.
+    assert asyncio.run(run()) >= 0.05
+
+
+def test_remaining_req_header_limits_the_group_bucket():
+    limiter = RateLimiter(per_second=10, per_minute=600)
+    limiter.update_from_header("group=candles; min=1799; sec=0")
+    candles_sec, candles_min = limiter._get_buckets('candles')
+    default_sec, _ = limiter._get_buckets('default')
+    assert candles_sec.wait_time() > 0
+    assert candles_min.tokens == pytest.approx(600, abs=1)
+    assert default_sec.wait_time() == 0
+
+    # group을 넘기면 헤더의 그룹 이름 대신 요청을 보낸 그룹을 보정합니다.
+    limiter.update_from_header("group=default; sec=0", group='order')
+    assert limiter._get_buckets('order')[0].wait_time() > 0
+    assert default_sec.wait_time() == 0
+
+
+def test_group_limits_and_penalize():
+    limiter = RateLimiter(per_second=10, per_minute=600, limits={'order': (8, 200)})
+    order_sec, order_min = limiter._get_buckets('order')
+    assert (order_sec.rate, order_sec.capacity) == (8, 8)
+    assert order_min.capacity == 200
+    limiter.penalize('order')
+    assert order_sec.wait_time() == pytest.approx(1 / 8, abs=0.02)
+
+
+def test_shared_buckets_split_one_budget_between_workers(tmp_path):
+    path = str(tmp_path / 'shared.db')
+    workers = [SharedState(path), SharedState(path)]
+    limiters = [RateLimiter(per_second=2, per_minute=600, shared=shared) for shared in workers]
+
+    async def run():
+        # 워커마다 한 건씩 보내면 두 워커가 함께 초당 쿼터 2건을 다 씁니다.
+        for limiter in limiters:
+            await limiter.acquire('candles')
+
+    try:
+        asyncio.run(run())
+        wait = workers[0].reserve_token('candles/sec', 2, 2)
+        assert wait == pytest.approx(0.5, abs=0.05)
+    finally:
+        for shared in workers:
+            shared.close()
+
+
+def test_shared_bucket_updates_from_headers_run_off_the_event_loop(tmp_path):
+    shared = SharedState(str(tmp_path / 'shared.db'))
+    limiter = RateLimiter(per_second=10, per_minute=600, shared=shared)
+    second_bucket, _ = limiter._get_buckets('candles')
+
+    async def run():
+        limiter.update_from_header("group=candles; sec=0")
+        assert len(second_bucket._updates) == 1
+        await asyncio.gather(*second_bucket._updates)
+
+    try:
+        asyncio.run(run())
+        assert not second_bucket._updates
+        assert shared.reserve_token('candles/sec', 10, 10) > 0
+    finally:
+        shared.close()
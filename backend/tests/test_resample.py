@@ -0,0 +1,118 @@
+import asyncio
+import numpy as np
+import pytest
+from app.services.candle_cache import CandleCache
+from app.services.candle_frame import CandleFrame
+from app.services.candle_store import UNIT_INTERVAL_MS
+from app.services.resample import Resampler, normalize_timeframe, resample
+from benchmarks.synthetic import make_frame
+
+HOUR = UNIT_INTERVAL_MS['minutes/60']
+FOUR_HOURS = UNIT_INTERVAL_MS['minutes/240']
+
+
+class FrameUpbitService:
+    """Upbit 봉 단위별 합성 프레임의 최근 count개를 돌려주고 요청을 기록하는 UpbitService 대역입니다."""
+
+    def __init__(self, bars=3000):
+        self.candle_cache = CandleCache()
+        self.frames = {}
+        self.bars = bars
+        self.calls = []
+
+    async def get_frame(self, market, unit, count):
+        self.calls.append((unit, count))
+        if unit not in self.frames:
+            self.frames[unit] = make_frame(market, self.bars, unit, seed=9)
+        return self.frames[unit][-count:]
+
+
+@pytest.mark.parametrize('timeframe,unit', [
+    ('5m', 'minutes/5'),
+    ('2h', 'minutes/120'),
+    ('4h', 'minutes/240'),
+    ('1d', 'days'),
+    ('24h', 'days'),
+    ('minutes/30', 'minutes/30'),
+    ('days', 'days'),
+])
+def test_normalize_timeframe(timeframe, unit):
+    assert normalize_timeframe(timeframe) == unit
+
+
+@pytest.mark.parametrize('timeframe', ['7m', '2d', '1w', 'minutes/0', '', None])
+def test_unsupported_timeframes_are_rejected(timeframe):
+    with pytest.raises(ValueError):
+        normalize_timeframe(timeframe)
+
+
+def test_resample_matches_a_naive_aggregation():
+    frame = make_frame('KRW-BTC', 500, 'minutes/60', seed=10)
+    keep = np.random.default_rng(10).random(len(frame)) >= 0.2
+    columns = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'value')
+    frame = CandleFrame(frame.market, frame.unit, *(getattr(frame, name)[keep] for name in columns))
+    result = resample(frame, 'minutes/240')
+
+    buckets = frame.timestamp // FOUR_HOURS
+    expected = []
+    for bucket in np.unique(buckets):
+        rows = np.flatnonzero(buckets == bucket)
+        expected.append((
+            bucket * FOUR_HOURS, frame.open[rows[0]], frame.high[rows].max(), frame.low[rows].min(),
+            frame.close[rows[-1]], frame.volume[rows].sum(),
+        ))
+    actual = list(zip(result.timestamp, result.open, result.high, result.low, result.close, result.volume))
+    np.testing.assert_allclose(np.array(actual), np.array(expected), rtol=1e-12)
+
+
+def test_drop_partial_discards_a_cut_first_bucket():
+    frame = make_frame('KRW-BTC', 50, 'minutes/60', seed=11)
+    # 4시간 버킷의 두 번째 봉부터 시작하도록 자릅니다.
+    cut = frame[int(np.flatnonzero(frame.timestamp % FOUR_HOURS == HOUR)[0]):]
+    full = resample(cut, 'minutes/240')
+    dropped = resample(cut, 'minutes/240', drop_partial=True)
+    assert full.timestamp[0] < cut.timestamp[0]
+    assert dropped.timestamp[0] % FOUR_HOURS == 0 and dropped.timestamp[0] >= cut.timestamp[0]
+    np.testing.assert_array_equal(dropped.timestamp, full.timestamp[1:])
+
+
+def test_base_units():
+    assert Resampler.base_unit('minutes/60') == 'minutes/60'
+    assert Resampler.base_unit('days') == 'days'
+    assert Resampler.base_unit('minutes/120') == 'minutes/60'
+    assert Resampler.base_unit('minutes/720') == 'minutes/240'
+    assert Resampler.base_unit('minutes/6') == 'minutes/3'
+    resampler = Resampler(FrameUpbitService(), max_base_bars=500)
+    assert resampler.base_count('minutes/120', 100) == 202
+    assert resampler.base_count('minutes/120', 300) is None
+
+
+def test_native_units_are_fetched_directly():
+    service = FrameUpbitService()
+    frame = asyncio.run(Resampler(service).get_frame('KRW-BTC', '4h', 51))
+    assert service.calls == [('minutes/240', 51)]
+    assert len(frame) == 51 and frame.unit == 'minutes/240'
+
+
+def test_other_units_are_resampled_from_the_largest_dividing_unit():
+    service = FrameUpbitService()
+    resampler = Resampler(service)
+
+    async def run():
+        first = await resampler.get_frame('KRW-BTC', '2h', 100)
+        again = await resampler.get_frame('KRW-BTC', '2h', 100)
+        return first, again
+
+    frame, again = asyncio.run(run())
+    assert service.calls == [('minutes/60', 202)]
+    assert again is frame
+    assert len(frame) == 100 and frame.unit == 'minutes/120'
+    assert np.all(np.diff(frame.timestamp) == 2 * HOUR)
+    # 마감된 2시간봉의 종가는 두 번째 1시간봉의 종가이고, 마지막 봉은 진행 중인 1시간봉까지 반영합니다.
+    base = service.frames['minutes/60']
+    closes = dict(zip(base.timestamp.tolist(), base.close.tolist()))
+    assert frame.close.tolist()[:-1] == [closes[ts + HOUR] for ts in frame.timestamp.tolist()[:-1]]
+    assert frame.close[-1] == base.close[-1]
+
+    with pytest.raises(ValueError):
+        asyncio.run(resampler.get_frame('KRW-BTC', '12h', 1000))
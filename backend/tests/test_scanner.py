@@ -0,0 +1,115 @@
+import asyncio
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1 import market
+from app.core.deps import get_upbit_service
+from app.services.candle_cache import CandleCache
+from app.services.scanner import MarketScanner, rank, scan_frames
+from benchmarks.synthetic import SyntheticUpbitService, make_frames
+
+MARKETS = ['KRW-AAA', 'KRW-BBB', 'KRW-CCC', 'KRW-DDD', 'BTC-EEE']
+N_DAYS = 5
+
+
+class ScanUpbitService(SyntheticUpbitService):
+    """마켓 목록과 캔들 캐시를 갖추고 일봉 일괄 조회 횟수를 세는 UpbitService 대역입니다."""
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.candle_cache = CandleCache()
+        self.frame_requests = 0
+
+    async def get_markets(self, quote='KRW'):
+        return [{'market': code, 'korean_name': code[4:]} for code in self.frames if code.startswith(f'{quote}-')]
+
+    async def get_daily_frames_many(self, markets, count=21):
+        self.frame_requests += 1
+        return await super().get_daily_frames_many(markets, count)
+
+
+@pytest.fixture
+def frames():
+    frames = make_frames(MARKETS, 60, seed=13)
+    # 이력이 짧아 이동평균을 구할 수 없는 마켓입니다.
+    frames['KRW-DDD'] = frames['KRW-DDD'][-8:]
+    return frames
+
+
+@pytest.fixture
+def client(frames):
+    service = ScanUpbitService(frames)
+    app = FastAPI()
+    app.include_router(market.router, prefix='/market')
+    app.dependency_overrides[get_upbit_service] = lambda: service
+    return TestClient(app), service
+
+
+def test_scan_flags_follow_the_strategy_rules(frames):
+    codes = MARKETS[:4]
+    rows = scan_frames([frames[code] for code in codes], n_days=N_DAYS, short_period=5, long_period=20)
+    assert [row['market'] for row in rows] == codes
+    for row in rows:
+        frame = frames[row['market']]
+        price, upper = frame.close[-1], frame.high[-N_DAYS - 1:-1].max()
+        assert row['price'] == price
+        assert row['change'] == pytest.approx(price / frame.close[-2] - 1)
+        assert ('breakout' in row['signals']) == (price >= upper)
+        assert row['breakout_distance'] == pytest.approx(price / upper - 1)
+    short = rows[3]
+    assert short['trend'] is None
+    assert 'uptrend' not in short['signals'] and 'downtrend' not in short['signals']
+
+
+def test_rank_filters_by_signal_and_keeps_missing_values_last(frames):
+    rows = scan_frames([frames[code] for code in MARKETS[:4]], n_days=N_DAYS, short_period=5, long_period=20)
+    ranked = rank(rows, 'trend')
+    trends = [row['trend'] for row in ranked]
+    assert trends[-1] is None and trends[:-1] == sorted(trends[:-1], reverse=True)
+    ascending = rank(rows, 'change', descending=False)
+    assert [row['change'] for row in ascending] == sorted(row['change'] for row in rows)
+    # 이력이 짧은 마켓은 추세 신호가 없으므로 걸러집니다.
+    downtrend = rank(rows, 'change', signal='downtrend')
+    assert [row['market'] for row in downtrend] == [row['market'] for row in rank(rows, 'change') if row['trend'] is not None]
+    assert [row['market'] for row in rank(rows, 'change', signal='breakout')] == ['KRW-CCC']
+    with pytest.raises(ValueError):
+        rank(rows, 'volume')
+    with pytest.raises(ValueError):
+        rank(rows, 'change', signal='moon')
+
+
+def test_scan_endpoint_pages_one_cached_scan(client):
+    client, service = client
+    first = client.get('/market/scan', params={'n_days': N_DAYS, 'short_period': 5, 'long_period': 20, 'limit': 2})
+    second = client.get(
+        '/market/scan', params={'n_days': N_DAYS, 'short_period': 5, 'long_period': 20, 'limit': 2, 'offset': 2},
+    )
+    assert first.status_code == second.status_code == 200
+    first, second = first.json(), second.json()
+    # 호가 통화가 다른 마켓(BTC-EEE)은 빠지고, 두 페이지가 같은 스캔 결과를 나눕니다.
+    assert first['total'] == second['total'] == 4
+    items = first['items'] + second['items']
+    assert sorted(row['market'] for row in items) == MARKETS[:4]
+    changes = [row['change'] for row in items]
+    assert changes == sorted(changes, reverse=True)
+    assert items[0]['korean_name'] == items[0]['market'][4:]
+    assert service.frame_requests == 1
+
+
+def test_scan_endpoint_rejects_unknown_sort_keys(client):
+    client, _ = client
+    response = client.get('/market/scan', params={'sort': 'volume'})
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Unknown sort key: volume'
+
+
+def test_pairs_endpoint_rejects_unsupported_significance(client):
+    client, service = client
+    response = client.get('/market/pairs', params={'significance': 0.2})
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Unsupported significance: 0.2 (choose one of 0.01, 0.05, 0.1)'
+    assert service.frame_requests == 0
+
+    pairs = asyncio.run(MarketScanner(service).screen_pairs(lookback=30, significance=0.1))
+    assert all(np.isfinite(pair['adf_stat']) for pair in pairs)
@@ -0,0 +1,65 @@
+import time
+import pytest
+from app.services.shared_state import LeaderLease, SharedState
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """같은 파일을 여는 두 워커 프로세스의 SharedState입니다."""
+    path = str(tmp_path / 'shared.db')
+    states = [SharedState(path), SharedState(path)]
+    yield states
+    for state in states:
+        state.close()
+
+
+def test_only_one_worker_holds_the_lease(workers):
+    first = LeaderLease(workers[0], 'scheduler', ttl=30, owner='worker-a')
+    second = LeaderLease(workers[1], 'scheduler', ttl=30, owner='worker-b')
+    assert first.acquire()
+    assert not second.acquire()
+    assert first.is_valid() and not second.is_valid()
+    assert second.current_owner() == 'worker-a'
+    # 갱신은 같은 소유자만 할 수 있습니다.
+    assert first.acquire()
+    assert not second.acquire()
+
+
+def test_released_lease_is_taken_over(workers):
+    first = LeaderLease(workers[0], 'scheduler', ttl=30, owner='worker-a')
+    second = LeaderLease(workers[1], 'scheduler', ttl=30, owner='worker-b')
+    first.acquire()
+    first.release()
+    assert not first.is_valid()
+    assert first.current_owner() is None
+    assert second.acquire()
+    assert first.current_owner() == 'worker-b'
+
+
+def test_expired_lease_is_taken_over(workers):
+    first = LeaderLease(workers[0], 'scheduler', ttl=0.2, owner='worker-a')
+    second = LeaderLease(workers[1], 'scheduler', ttl=30, owner='worker-b')
+    assert first.acquire()
+    assert not second.acquire()
+    # 갱신을 놓치면 만료 전부터 리더로 행동하지 않고, 만료 뒤에는 다른 워커가 가져갑니다.
+    time.sleep(0.17)
+    assert not first.is_valid()
+    time.sleep(0.1)
+    assert second.acquire()
+    assert not first.acquire()
+
+
+def test_leases_with_different_names_are_independent(workers):
+    assert LeaderLease(workers[0], 'scheduler', owner='worker-a').acquire()
+    assert LeaderLease(workers[1], 'collector', owner='worker-b').acquire()
+
+
+def test_kv_values_expire(workers):
+    writer, reader = workers
+    writer.set('fresh', b'1', 60)
+    writer.set('stale', b'2', -1)
+    assert reader.get('fresh') == b'1'
+    assert reader.get('stale') is None
+    value, remaining = reader.get_with_ttl('fresh')
+    assert value == b'1' and 59 < remaining <= 60
+    assert reader.purge_expired() == 1
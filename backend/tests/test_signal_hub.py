@@ -0,0 +1,174 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1 import signals
+from app.core.deps import get_signal_hub
+from app.services.signal_hub import SignalHub
+from app.services.trading.tradingService import TradingService
+from benchmarks.synthetic import SyntheticUpbitService, make_frames
+
+SMA = {'trendType': 'sma', 'shortPeriod': 5, 'longPeriod': 20}
+
+
+class HubUpbitService(SyntheticUpbitService):
+    """합성 일봉과 바꿀 수 있는 현재가를 돌려주고 조회 횟수를 세는 UpbitService 대역입니다."""
+
+    read_only = True
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.prices = {market: float(frame.close[-1]) for market, frame in frames.items()}
+        self.history_requests = 0
+        self.ticker_requests = []
+
+    async def get_timeframe(self, market, timeframe='days', count=21):
+        self.history_requests += 1
+        # 첫 계산이 겹치도록 잠깐 양보합니다.
+        await asyncio.sleep(0.01)
+        return await super().get_timeframe(market, timeframe, count)
+
+    async def get_tickers(self, markets):
+        self.ticker_requests.append(sorted(markets))
+        return {market: {'trade_price': self.prices[market]} for market in markets}
+
+
+@pytest.fixture
+def hub():
+    service = HubUpbitService(make_frames(['KRW-AAA', 'KRW-BBB'], 120, seed=14))
+    trading = TradingService(service)
+    return SignalHub(service, trading.create_strategy, refresh_interval=3600, history_bars=60)
+
+
+def test_same_topic_is_computed_once(hub):
+    async def run():
+        # 파라미터 순서가 달라도 같은 토픽입니다.
+        reordered = dict(reversed(list(SMA.items())))
+        results = await asyncio.gather(
+            *(hub.get('moving_average', SMA, 'KRW-AAA') for _ in range(4)),
+            hub.get('moving_average', reordered, 'KRW-AAA'),
+        )
+        again = await hub.get('moving_average', SMA, 'KRW-AAA')
+        other = await hub.get('moving_average', SMA, 'KRW-BBB')
+        return results, again, other
+
+    results, again, other = asyncio.run(run())
+    assert len({result['key'] for result in results}) == 1
+    assert again == results[0]
+    assert other['key'] != again['key']
+    assert hub.upbit_service.history_requests == 2
+    assert hub.series_builds == 2 and len(hub.topics) == 2
+    assert len(again['series']['close']) == 60
+    assert again['price'] == hub.upbit_service.prices['KRW-AAA']
+
+
+def test_unknown_strategies_are_not_cached(hub):
+    with pytest.raises(ValueError):
+        asyncio.run(hub.get('no_such_strategy', {}, 'KRW-AAA'))
+    assert not hub.topics
+
+
+def test_messages_fan_out_to_every_subscriber(hub):
+    service = hub.upbit_service
+
+    async def run():
+        first, second = hub.connect(), hub.connect()
+        signals_only = hub.connect(types=['signal'])
+        for client in (first, second, signals_only):
+            key = await hub.subscribe(client, 'moving_average', SMA, 'KRW-AAA')
+        # 같은 마켓의 다른 토픽은 현재가 조회를 함께 씁니다.
+        await hub.subscribe(first, 'moving_average', {**SMA, 'shortPeriod': 3}, 'KRW-AAA')
+        service.prices['KRW-AAA'] *= 1.01
+        await hub.refresh()
+        return key, first, second, signals_only
+
+    key, first, second, signals_only = asyncio.run(run())
+    drained = {}
+    for name, client in (('first', first), ('second', second), ('signals_only', signals_only)):
+        drained[name] = [client.queue.get_nowait() for _ in range(client.queue.qsize())]
+
+    assert service.ticker_requests == [['KRW-AAA']]
+    shared = [m for m in drained['first'] if m.key == key]
+    assert [m.type for m in shared][:2] == ['snapshot', 'tick']
+    # 구독자마다 다시 인코딩하지 않고 같은 메시지를 넣습니다.
+    assert all(a is b for a, b in zip(shared[1:], drained['second'][1:]))
+    assert len(shared) == len(drained['second'])
+    assert {m.type for m in drained['signals_only']} <= {'snapshot', 'signal'}
+    assert drained['signals_only'][0] is drained['second'][0]
+
+
+def test_slow_clients_are_resynced_with_a_snapshot(hub):
+    hub.client_queue_size = 2
+    service = hub.upbit_service
+
+    async def run():
+        client = hub.connect()
+        await hub.subscribe(client, 'moving_average', SMA, 'KRW-AAA')
+        for _ in range(3):
+            service.prices['KRW-AAA'] *= 1.001
+            await hub.refresh()
+        return client
+
+    client = asyncio.run(run())
+    assert client.resyncs >= 1
+    messages = [client.queue.get_nowait() for _ in range(client.queue.qsize())]
+    assert messages[0].type == 'snapshot'
+
+
+def test_disconnect_unsubscribes_from_every_topic(hub):
+    async def run():
+        client = hub.connect()
+        await hub.subscribe(client, 'moving_average', SMA, 'KRW-AAA')
+        await hub.subscribe(client, 'moving_average', SMA, 'KRW-BBB')
+        client.close()
+        with pytest.raises(ValueError):
+            await hub.subscribe(client, 'moving_average', SMA, 'KRW-AAA')
+        await hub.refresh()
+
+    asyncio.run(run())
+    assert not hub.clients
+    assert all(not topic.clients for topic in hub.topics.values())
+    # 구독자가 없는 토픽은 백그라운드에서 갱신하지 않습니다.
+    assert hub.upbit_service.ticker_requests == []
+    assert hub.stats()['subscribed_topics'] == 0
+
+
+def _client(hub):
+    app = FastAPI()
+    app.include_router(signals.router, prefix='/signals')
+    app.dependency_overrides[get_signal_hub] = lambda: hub
+    return TestClient(app)
+
+
+def test_signals_endpoint_validates_parameters(hub):
+    client = _client(hub)
+    response = client.get('/signals', params={'strategy': 'moving_average', 'market': 'KRW-AAA', 'parameters': '[1]'})
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'parameters must be a JSON object'
+    response = client.get('/signals', params={'strategy': 'no_such_strategy', 'market': 'KRW-AAA'})
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Unknown strategy: no_such_strategy'
+
+
+def test_websocket_subscribers_are_removed_on_disconnect(hub):
+    client = _client(hub)
+    with client.websocket_connect('/signals/ws') as websocket:
+        websocket.send_json({'action': 'subscribe', 'strategy': 'moving_average', 'market': 'KRW-AAA', 'parameters': SMA})
+        received = [websocket.receive_json(), websocket.receive_json()]
+        key = next(m['key'] for m in received if m['type'] == 'subscribed')
+        snapshot = next(m for m in received if m['type'] == 'snapshot')
+        assert snapshot['key'] == key and snapshot['market'] == 'KRW-AAA'
+        assert len(hub.clients) == 1 and hub.topics[key].clients
+
+        websocket.send_json({'action': 'unsubscribe', 'key': key})
+        assert websocket.receive_json() == {'type': 'unsubscribed', 'key': key}
+        assert not hub.topics[key].clients
+
+        websocket.send_json({'action': 'subscribe', 'strategy': 'moving_average', 'market': 'KRW-BBB', 'parameters': SMA})
+        received = [websocket.receive_json(), websocket.receive_json()]
+        assert {m['type'] for m in received} == {'subscribed', 'snapshot'}
+
+        websocket.send_json({'action': 'bogus'})
+        assert websocket.receive_json() == {'type': 'error', 'message': 'Unknown action: bogus'}
+    assert not hub.clients
+    assert all(not topic.clients for topic in hub.topics.values())
@@ -0,0 +1,130 @@
+import asyncio
+import numpy as np
+import pytest
+from app.services.pair_stats import PairStatsCache
+from app.services.portfolio import CovarianceCache
+from app.services.trading.registry import REGISTRY, StrategyPool
+from benchmarks.synthetic import make_frames
+
+MARKETS = ['KRW-AAA', 'KRW-BBB', 'KRW-CCC']
+BARS = 400
+REQUESTS = 200
+
+
+class ClockedUpbitService:
+    """
+    합성 캔들을 end 봉까지만 보여 주는 UpbitService 대역입니다.
+    advance()로 봉 하나를 마감시켜 요청이 이어지는 동안 시간이 흐르는 상황을 재현합니다.
+    """
+
+    def __init__(self, frames, end):
+        self.frames = frames
+        self.end = end
+
+    def advance(self):
+        self.end += 1
+
+    def _frame(self, market, count):
+        return self.frames[market][:self.end][-count:]
+
+    async def get_timeframe(self, market, timeframe='days', count=21):
+        return self._frame(market, count)
+
+    async def get_daily_frames_many(self, markets, count=21):
+        return {market: self._frame(market, count) for market in dict.fromkeys(markets)}
+
+
+CASES = {
+    'moving_average': [
+        {'tickers': MARKETS[:1], 'trendType': 'sma', 'shortPeriod': 5, 'longPeriod': 20},
+        {'tickers': MARKETS[:1], 'trendType': 'ema', 'shortPeriod': 5, 'longPeriod': 20, 'alpha': 0.3},
+        {'tickers': MARKETS[:1], 'trendType': 'breakout', 'nDays': 10},
+    ],
+    'counter_trend': [{'tickers': MARKETS[:1], 'nDays': 10, 'kValue': 1.0}],
+    'spread': [{'tickers': MARKETS[:2], 'lookbackDays': 10, 'zScoreDays': 20}],
+    'inverse_volatility': [{'tickers': MARKETS, 'volatility_window': 10}],
+}
+
+
+def test_every_registered_strategy_has_a_parity_case():
+    assert set(CASES) == set(REGISTRY.names())
+
+
+def _resources():
+    # 앱과 같이 페어/공분산 캐시는 요청 사이에 공유합니다. (deps.create_strategy_pool)
+    return {'pair_cache': PairStatsCache(), 'covariance_cache': CovarianceCache()}
+
+
+async def _fresh(spec, service, parameters, resources):
+    strategy = spec.create(service, parameters, resources)
+    if spec.kind == 'portfolio':
+        return await strategy.calculate_portfolio_weights()
+    return await strategy.calculate_signals()
+
+
+def _same(kind, pooled, fresh):
+    if kind != 'portfolio':
+        return pooled.get('signal') == fresh.get('signal')
+    # 비중은 공분산 갱신 순서에 따른 반올림 오차만 허용합니다.
+    return pooled.keys() == fresh.keys() and all(
+        np.isclose(pooled[market], fresh[market], rtol=1e-9, atol=1e-12) for market in fresh
+    )
+
+
+@pytest.mark.parametrize(
+    'name,parameters',
+    [(name, parameters) for name, cases in CASES.items() for parameters in cases],
+    ids=lambda value: value if isinstance(value, str) else value.get('trendType', ''),
+)
+def test_pooled_instance_matches_a_fresh_instance_on_every_request(name, parameters):
+    """풀의 인스턴스(증분 모드)와 요청마다 새로 만든 인스턴스가 봉이 흐르는 동안 같은 결과를 내야 합니다."""
+    spec = REGISTRY.require(name)
+    service = ClockedUpbitService(make_frames(MARKETS, BARS, seed=7), BARS - REQUESTS)
+    pool = StrategyPool(service, resources=_resources())
+    resources = _resources()
+
+    async def run():
+        mismatches = []
+        for step in range(REQUESTS):
+            pooled = await pool.run(spec, parameters)
+            fresh = await _fresh(spec, service, parameters, resources)
+            if not _same(spec.kind, pooled, fresh):
+                mismatches.append((step, pooled, fresh))
+            service.advance()
+        return mismatches
+
+    assert asyncio.run(run()) == []
+    assert pool.misses == 1
+
+
+def test_spread_position_from_the_request_drives_entry_and_exit():
+    """/trading/execute는 포지션을 기억하지 않으므로 호출자가 이전 신호의 포지션을 넘겨 청산 신호를 받습니다."""
+    spec = REGISTRY.require('spread')
+    base = dict(CASES['spread'][0], holdingPeriod=50, longExitThreshold=0.5, shortExitThreshold=-0.5)
+    service = ClockedUpbitService(make_frames(MARKETS, BARS, seed=7), BARS - REQUESTS)
+    pool = StrategyPool(service, resources=_resources())
+
+    async def run():
+        entry = None
+        while entry is None:
+            signal = await pool.run(spec, base)
+            if signal['signal'] in ('long', 'short'):
+                entry = signal['signal']
+            service.advance()
+        held = 1
+        while True:
+            signal = await pool.run(spec, {**base, 'position': entry, 'barsHeld': held})
+            if signal['signal'] != 'hold':
+                return entry, signal
+            service.advance()
+            held += 1
+
+    entry, exit_signal = asyncio.run(run())
+    assert exit_signal['signal'] == 'exit'
+    threshold = base['longExitThreshold'] if entry == 'long' else base['shortExitThreshold']
+    assert (exit_signal['zscore'] > threshold) if entry == 'long' else (exit_signal['zscore'] < threshold)
+
+    async def held_too_long():
+        return await pool.run(spec, {**base, 'position': entry, 'barsHeld': base['holdingPeriod']})
+
+    assert asyncio.run(held_too_long())['signal'] == 'exit'
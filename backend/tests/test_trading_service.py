@@ -0,0 +1,138 @@
+import asyncio
+import orjson
+from app.services.shared_state import LeaderLease, SharedState
+from app.services.trading.tradingService import LEASE_NAME, STATUS_KEY, TradingService, TradingSession
+from app.services.trading.trendFollowing import TrendFollowingStrategy
+
+
+class RecordingExecutor:
+    """주문을 보내지 않고 submit() 호출만 기록하는 주문 실행기 대역입니다."""
+
+    def __init__(self):
+        self.orders = []
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def submit(self, market, action, identifier, amount=None):
+        self.orders.append((market, action, identifier))
+        return {'uuid': identifier, 'side': action}
+
+
+def _service():
+    executor = RecordingExecutor()
+    return TradingService(upbit_service=None, order_executor=executor), executor
+
+
+def _strategy():
+    strategy = TrendFollowingStrategy(None, {'tickers': ['KRW-BTC'], 'trendType': 'sma'})
+    strategy.last_bar = {'timestamp': 0}
+    return strategy
+
+
+async def _replay(service, strategy, signals):
+    for bar, signal in enumerate(signals, start=1):
+        strategy.last_bar = {'timestamp': bar * 60_000}
+        # should_execute_trade()의 최소 주문 간격은 이 테스트의 관심사가 아닙니다.
+        strategy.last_signal = None
+        await service.execute_signal('KRW-BTC', strategy, {'signal': signal}, 'moving_average')
+
+
+def test_regime_signals_only_order_on_position_change():
+    service, executor = _service()
+    strategy = _strategy()
+    asyncio.run(_replay(service, strategy, ['long', 'long', 'long', 'short', 'short', 'long']))
+    assert [action for _, action, _ in executor.orders] == ['buy', 'sell', 'buy']
+    assert strategy.position is True
+
+
+def test_sell_without_position_is_skipped():
+    service, executor = _service()
+    strategy = _strategy()
+    asyncio.run(_replay(service, strategy, ['sell', 'short', 'buy', 'buy', 'sell']))
+    assert [action for _, action, _ in executor.orders] == ['buy', 'sell']
+    assert strategy.position is False
+
+
+class TickStrategy:
+    """매 tick 마감 봉이 바뀐 것으로 보고 받은 현재가만 기록하는 전략 대역입니다."""
+
+    position = False
+
+    def __init__(self):
+        self.prices = []
+
+    def has_unsynced_bar(self, now_ms):
+        return True
+
+    def calculate_signals_incremental(self, price):
+        self.prices.append(price)
+        return {'signal': 'hold'}
+
+
+class TickerUpbitService:
+    read_only = False
+
+    async def get_tickers(self, markets):
+        return {market: {'trade_price': 100.0} for market in markets}
+
+
+def test_failed_sync_is_recorded_and_skips_evaluation():
+    service = TradingService(upbit_service=TickerUpbitService(), order_executor=RecordingExecutor())
+
+    async def sync_closed_bars(strategy, market):
+        if market == 'KRW-ETH':
+            raise RuntimeError('candles unavailable')
+
+    service.sync_closed_bars = sync_closed_bars
+    for market in ('KRW-BTC', 'KRW-ETH'):
+        session = TradingSession(market, 'moving_average', TickStrategy())
+        session.status = 'running'
+        service.sessions[market] = session
+
+    asyncio.run(service.run_tick())
+    btc, eth = service.sessions['KRW-BTC'], service.sessions['KRW-ETH']
+    assert btc.strategy.prices == [100.0] and btc.errors == 0
+    assert eth.strategy.prices == [] and eth.evaluations == 0
+    assert (eth.errors, eth.last_error) == (1, 'candles unavailable')
+
+
+def test_close_cancels_background_tasks():
+    service, _ = _service()
+
+    async def run():
+        done = service._spawn(asyncio.sleep(0))
+        pending = service._spawn(asyncio.sleep(60))
+        await done
+        assert service._tasks == {pending}
+        await service.close()
+        return pending
+
+    pending = asyncio.run(run())
+    assert pending.cancelled()
+    assert not service._tasks
+
+
+def test_follower_stops_shared_sessions_and_reports_the_leader(tmp_path):
+    path = str(tmp_path / 'shared.db')
+    leader_state, follower_state = SharedState(path), SharedState(path)
+    try:
+        assert LeaderLease(leader_state, LEASE_NAME, owner='worker-a').acquire()
+        leader_state.set(STATUS_KEY, orjson.dumps({'sessions': [{'market': 'KRW-BTC'}]}), 60)
+        leader_state.add_session('KRW-BTC', 'moving_average', {})
+        follower = TradingService(upbit_service=None, order_executor=RecordingExecutor(), shared=follower_state)
+
+        async def run():
+            return await follower.status(), await follower.stop_trading('KRW-BTC')
+
+        status, stopped = asyncio.run(run())
+        assert (status['role'], status['leader']) == ('follower', 'worker-a')
+        assert status['sessions'] == [{'market': 'KRW-BTC'}]
+        assert stopped == ['KRW-BTC']
+        assert leader_state.load_sessions() == {}
+    finally:
+        leader_state.close()
+        follower_state.close()
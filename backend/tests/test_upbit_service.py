@@ -0,0 +1,124 @@
+import asyncio
+from datetime import datetime, timezone
+import aiohttp
+import pytest
+from aiohttp.test_utils import TestServer
+from app.services.mock_exchange import MockExchange, create_mock_app
+from app.services.candle_store import CandleStoreNotConfiguredError
+from app.services.upbit_service import UpbitAPIError, UpbitService
+
+ACCESS_KEY = 'test-access-key'
+SECRET_KEY = 'test-secret-key-for-local-unit-tests'
+
+
+async def _with_exchange(exchange, body):
+    """모의 거래소를 띄우고 그 서버에 연결한 UpbitService로 body(service)를 실행합니다."""
+    server = TestServer(create_mock_app(exchange))
+    await server.start_server()
+    service = UpbitService(ACCESS_KEY, SECRET_KEY, base_url=str(server.make_url('/v1')))
+    try:
+        await body(service)
+    finally:
+        await service.close()
+        await server.close()
+
+
+def _exchange(**kwargs):
+    return MockExchange({'KRW-BTC': 50_000_000.0}, access_key=ACCESS_KEY, secret_key=SECRET_KEY, **kwargs)
+
+
+def _record_lookups(service):
+    lookups = []
+    get_order = service.get_order
+
+    async def recording(uuid=None, identifier=None):
+        lookups.append(identifier)
+        return await get_order(uuid=uuid, identifier=identifier)
+
+    service.get_order = recording
+    return lookups
+
+
+def test_duplicate_identifier_returns_the_existing_order():
+    exchange = _exchange()
+
+    async def body(service):
+        lookups = _record_lookups(service)
+        first = await service.create_order('KRW-BTC', 'bid', price='10000', ord_type='price', identifier='order-1')
+        second = await service.create_order('KRW-BTC', 'bid', price='10000', ord_type='price', identifier='order-1')
+        assert second['uuid'] == first['uuid']
+        assert lookups == ['order-1']
+        assert len(exchange.orders) == 1
+
+    asyncio.run(_with_exchange(exchange, body))
+
+
+def test_other_rejections_are_raised_without_lookup():
+    exchange = _exchange(balances={'KRW': 1000.0})
+
+    async def body(service):
+        lookups = _record_lookups(service)
+        with pytest.raises(UpbitAPIError) as error:
+            await service.create_order('KRW-BTC', 'bid', price='10000', ord_type='price', identifier='order-2')
+        assert (error.value.status, error.value.name) == (400, 'insufficient_funds_bid')
+        assert lookups == []
+
+    asyncio.run(_with_exchange(exchange, body))
+
+
+def test_transport_error_after_acceptance_returns_the_accepted_order():
+    exchange = _exchange()
+
+    async def body(service):
+        lookups = _record_lookups(service)
+        private_request = service._private_request
+
+        async def lost_response(method, path, params=None, group='exchange'):
+            result = await private_request(method, path, params, group)
+            if method == 'POST':
+                # 거래소는 주문을 접수했지만 응답이 오는 도중 연결이 끊긴 경우입니다.
+                raise aiohttp.ServerDisconnectedError()
+            return result
+
+        service._private_request = lost_response
+        order = await service.create_order('KRW-BTC', 'bid', price='10000', ord_type='price', identifier='order-3')
+        assert order['identifier'] == 'order-3'
+        assert lookups == ['order-3']
+
+    asyncio.run(_with_exchange(exchange, body))
+
+
+def test_mock_exchange_quota_header_only_limits_the_second_bucket():
+    exchange = _exchange()
+
+    async def body(service):
+        await service.create_order('KRW-BTC', 'bid', price='10000', ord_type='price', identifier='order-4')
+        second_bucket, minute_bucket = service.rate_limiter._get_buckets('order')
+        assert second_bucket.tokens < second_bucket.capacity
+        assert minute_bucket.wait_time() == 0
+
+    asyncio.run(_with_exchange(exchange, body))
+
+
+def test_public_api_errors_carry_status_and_name():
+    exchange = _exchange()
+
+    async def body(service):
+        with pytest.raises(UpbitAPIError) as error:
+            await service.get_frame('KRW-NONE', 'days', 10)
+        assert (error.value.path, error.value.status, error.value.name) == ('/candles/days', 404, 'not_found')
+
+    asyncio.run(_with_exchange(exchange, body))
+
+
+def test_history_without_a_candle_store_raises_a_specific_error():
+    service = UpbitService(ACCESS_KEY, SECRET_KEY)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    async def run():
+        with pytest.raises(CandleStoreNotConfiguredError):
+            await service.get_candles_range('KRW-BTC', start, datetime(2024, 2, 1, tzinfo=timezone.utc))
+        with pytest.raises(CandleStoreNotConfiguredError):
+            await service.history_loader.backfill(['KRW-BTC'], 'days', start)
+
+    asyncio.run(run())
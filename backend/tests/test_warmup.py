@@ -0,0 +1,105 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.core.deps import get_warmup
+from app.services.trading.registry import REGISTRY
+from app.services.warmup import Warmup
+from main import app
+
+
+class WarmupUpbitService:
+    """캔들 요청을 release가 설정될 때까지 붙잡아 두고, failing 마켓은 실패시키는 UpbitService 대역입니다."""
+
+    read_only = True
+
+    def __init__(self, failing=(), delay=0.0):
+        self.failing = set(failing)
+        self.delay = delay
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.release.set()
+        self.requests = []
+
+    async def get_markets(self, quote='KRW'):
+        return [{'market': 'KRW-BTC'}, {'market': 'KRW-ETH'}]
+
+    async def get_timeframe(self, market, timeframe='days', count=21):
+        self.requests.append((market, timeframe, count))
+        self.started.set()
+        await self.release.wait()
+        await asyncio.sleep(self.delay)
+        if market in self.failing:
+            raise RuntimeError(f"no candles for {market}")
+        return []
+
+
+def _ready(warmup):
+    app.dependency_overrides[get_warmup] = lambda: warmup
+    try:
+        return TestClient(app).get('/ready')
+    finally:
+        app.dependency_overrides.pop(get_warmup, None)
+
+
+def _warmup(service, **kwargs):
+    return Warmup(service, REGISTRY, markets=['KRW-BTC', 'KRW-ETH'], units=['days', '1h'], candle_count=50, **kwargs)
+
+
+def test_ready_turns_200_after_the_warm_up():
+    service = WarmupUpbitService()
+    service.release.clear()
+    warmup = _warmup(service)
+    before = _ready(warmup)
+    assert before.status_code == 503
+    assert before.json()['status'] == 'warming_up' and before.json()['warmup']['status'] == 'pending'
+
+    async def run():
+        warmup.start()
+        await service.started.wait()
+        # 캔들 요청이 끝나기 전에는 준비 상태가 아닙니다.
+        during = await asyncio.to_thread(_ready, warmup)
+        service.release.set()
+        await warmup._task
+        return during
+
+    during = asyncio.run(run())
+    assert during.status_code == 503 and during.json()['warmup']['status'] == 'running'
+
+    after = _ready(warmup)
+    assert after.status_code == 200
+    body = after.json()
+    assert body['status'] == 'ready' and body['read_only'] is True
+    assert body['warmup']['status'] == 'done' and body['warmup']['frames'] == 4
+    assert body['warmup']['strategies'] == len(REGISTRY.names())
+    assert sorted(service.requests) == sorted(
+        (market, unit, 50) for market in ('KRW-BTC', 'KRW-ETH') for unit in ('days', '1h')
+    )
+
+
+def test_ready_after_a_timeout():
+    warmup = _warmup(WarmupUpbitService(delay=5), timeout=0.05)
+    asyncio.run(warmup.run())
+    response = _ready(warmup)
+    assert response.status_code == 200
+    assert response.json()['warmup']['status'] == 'timeout'
+    assert response.json()['warmup']['frames'] == 0
+
+
+def test_ready_after_a_partial_failure():
+    warmup = _warmup(WarmupUpbitService(failing={'KRW-ETH'}))
+    asyncio.run(warmup.run())
+    response = _ready(warmup)
+    assert response.status_code == 200
+    status = response.json()['warmup']
+    assert (status['status'], status['frames']) == ('done', 2)
+    assert sorted(status['errors']) == [
+        'candles KRW-ETH 1h: no candles for KRW-ETH',
+        'candles KRW-ETH days: no candles for KRW-ETH',
+    ]
+
+
+def test_disabled_warm_up_is_ready_at_once():
+    service = WarmupUpbitService()
+    warmup = _warmup(service, enabled=False)
+    asyncio.run(warmup.run())
+    assert _ready(warmup).status_code == 200
+    assert service.requests == []